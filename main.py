@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import argparse
 import copy
+import importlib.util
 import json
 import os
 from datetime import datetime
@@ -12,7 +13,6 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
-import torch
 
 from src import utils
 from src.atlas import compare_region_table_to_atlas, load_atlas_reference, summarize_atlas_comparison
@@ -34,12 +34,13 @@ from src.cohort import build_sample_table, build_study_region_table, write_table
 from src.figures import (
     save_atlas_deviation_plot,
     save_condition_summary_plot,
+    save_object_eccentricity_plot,
     save_paired_plot,
     save_phenotype_composition_plot,
     save_region_density_plot,
 )
 from src.methods import build_methods_appendix, write_methods_appendix
-from src.visualize import create_debug_overlay, save_debug_image, apply_out_of_focus_overlay
+from src.visualize import create_debug_overlay, preview_step, save_debug_image, apply_out_of_focus_overlay
 from src.config import (
     CELL_DIAMETER, MODEL_TYPE, USE_GPU,
     MIN_CELL_SIZE, MAX_CELL_SIZE, OVERLAY_ALPHA,
@@ -49,6 +50,8 @@ from src.context import RunContext
 from src.io_ome import load_any_image
 from src.manifest import load_manifest
 from src.measurements import object_table_path_for, write_object_table
+from src.object_dataset import OBJECT_DATASET_DIRNAME, append_object_table, prune_object_dataset
+from src.model_evaluation import ModelAssetHashes, model_weights_hashes
 from src.model_registry import model_spec_to_dict, model_summary_fields, model_warning, resolve_model_spec
 from src.modalities import adapt_image_for_modality
 from src.models import build_segmenter
@@ -67,6 +70,7 @@ from src.retina_coords import (
     write_retina_frame_json,
 )
 from src.review import resolve_edit_log_path
+from src.roi_data import file_sha256
 from src.spatial import (
     pair_correlation_plot_output_path,
     ripley_l_plot_output_path,
@@ -88,7 +92,14 @@ from src.track import (
     build_longitudinal_tracking_outputs,
 )
 from src.uncertainty_io import save_float_map
-from src.run_service import RuntimeOptions, build_runtime, run_one_image
+from src.run_service import RuntimeOptions, build_runtime, run_one_image, runtime_options_key
+from src.study_store import (
+    SAMPLE_STORE_DIRNAME,
+    SampleResultStore,
+    image_fingerprint,
+    sample_config_hash,
+    sample_result_key,
+)
 from src.validation import (
     build_benchmark_quality_table,
     build_validation_table,
@@ -144,6 +155,7 @@ def _adapt_loaded_image(
         channel_index=args.modality_channel_index,
         slab_start=args.modality_slab_start,
         slab_end=args.modality_slab_end,
+        projection_workers=args.modality_projection_workers,
     )
     adapted_meta["modality"] = modality
     return adapted_image, adapted_meta
@@ -169,6 +181,8 @@ def _build_pipeline_cfg(
         "tiling": args.tiling,
         "tile_size": args.tile_size,
         "tile_overlap": args.tile_overlap,
+        "memory_budget_mb": args.memory_budget_mb,
+        "debug_allocations": args.debug_allocations,
         "min_size": min_size,
         "max_size": max_size,
         "qc_config": copy.deepcopy(CONFIG_DATA.get("qc", {})),
@@ -176,6 +190,9 @@ def _build_pipeline_cfg(
         "spatial_mode": args.spatial_mode,
         "spatial_envelope_sims": args.spatial_envelope_sims,
         "spatial_random_seed": args.spatial_random_seed,
+        "spatial_workers": args.spatial_workers,
+        "region_area_engine": args.region_area_engine,
+        "tissue_mask_scale": args.tissue_mask_scale,
         "backend": backend,
         "use_gpu": use_gpu,
         "model_spec": model_spec,
@@ -322,6 +339,7 @@ def _runtime_options_from_args(
         modality_channel_index=args.modality_channel_index,
         modality_slab_start=args.modality_slab_start,
         modality_slab_end=args.modality_slab_end,
+        modality_projection_workers=args.modality_projection_workers,
         apply_clahe=args.apply_clahe,
         focus_mode=focus_mode,
         sam_checkpoint=args.sam_checkpoint,
@@ -336,6 +354,9 @@ def _runtime_options_from_args(
         spatial_mode=args.spatial_mode,
         spatial_envelope_sims=args.spatial_envelope_sims,
         spatial_random_seed=args.spatial_random_seed,
+        spatial_workers=args.spatial_workers,
+        region_area_engine=args.region_area_engine,
+        tissue_mask_scale=args.tissue_mask_scale,
         register_retina=args.register_retina,
         region_schema=args.region_schema,
         onh_mode=args.onh_mode,
@@ -343,6 +364,8 @@ def _runtime_options_from_args(
         dorsal_xy=tuple(args.dorsal_xy) if args.dorsal_xy is not None else None,
         retina_frame_path=args.retina_frame_path,
         save_debug=args.save_debug,
+        debug_overlay_mode=args.debug_overlay_mode,
+        debug_overlay_max_side=args.debug_overlay_max_side,
         save_ome_zarr=args.save_ome_zarr,
         write_html_report=args.write_html_report,
         write_object_table=args.write_object_table,
@@ -354,6 +377,8 @@ def _runtime_options_from_args(
         tiling=args.tiling,
         tile_size=args.tile_size,
         tile_overlap=args.tile_overlap,
+        memory_budget_mb=args.memory_budget_mb,
+        debug_allocations=args.debug_allocations,
     )
 
 
@@ -387,17 +412,24 @@ def _write_context_artifacts(
     filepath = str(filepath)
 
     if args.save_debug and ctx.gray is not None and ctx.labels is not None:
-        debug_image = create_debug_overlay(ctx.gray, ctx.labels, alpha=OVERLAY_ALPHA)
+        debug_image = create_debug_overlay(
+            ctx.gray,
+            ctx.labels,
+            alpha=OVERLAY_ALPHA,
+            mode=args.debug_overlay_mode,
+            max_side=args.debug_overlay_max_side,
+        )
         if focus_mode in ("auto", "qc"):
-            debug_image = apply_out_of_focus_overlay(debug_image, ctx.qc_mask, alpha=0.3)
+            step = preview_step(ctx.gray.shape, args.debug_overlay_max_side)
+            debug_image = apply_out_of_focus_overlay(debug_image, ctx.qc_mask[::step, ::step], alpha=0.3)
         debug_filename = _output_stem(filepath) + "_debug.png"
         out_path = os.path.join(output_dir, debug_filename)
         save_debug_image(debug_image, out_path)
         saved_images_for_report.append(("Debug overlay " + os.path.basename(filepath), os.path.relpath(out_path, report_root)))
         ctx.artifacts["debug_overlay"] = Path(out_path)
 
-        if args.spatial_stats and "isodensity_map" in ctx.state:
-            iso = ctx.state["isodensity_map"]
+        if args.spatial_stats and "isodensity_grid" in ctx.state:
+            iso = ctx.state["isodensity_grid"].render(debug_image.shape[:2])
             import cv2
             iso8 = utils.safe_uint8(iso)
             iso_color = cv2.applyColorMap(iso8, cv2.COLORMAP_JET)
@@ -494,7 +526,7 @@ def _write_context_artifacts(
                 "use_gpu": use_gpu,
                 "microns_per_pixel": MICRONS_PER_PIXEL,
             }
-            save_labels_to_ome_zarr(ctx.gray, ctx.labels, zarr_dir, meta_to_write, chunk=256)
+            save_labels_to_ome_zarr(ctx.gray, ctx.labels, zarr_dir, meta_to_write)
             ctx.artifacts["ome_zarr"] = Path(zarr_dir)
         except Exception as exc:
             print(f"[WARN] Failed to save OME-Zarr: {exc}")
@@ -602,6 +634,8 @@ def _resolved_config_dict(
         "focus_mode": focus_mode,
         "backend": backend,
         "save_debug": args.save_debug,
+        "debug_overlay_mode": args.debug_overlay_mode,
+        "debug_overlay_max_side": args.debug_overlay_max_side,
         "save_ome_zarr": args.save_ome_zarr,
         "write_html_report": args.write_html_report,
         "write_object_table": args.write_object_table,
@@ -617,6 +651,7 @@ def _resolved_config_dict(
         "tiling": args.tiling,
         "tile_size": args.tile_size,
         "tile_overlap": args.tile_overlap,
+        "memory_budget_mb": args.memory_budget_mb,
         "modality": args.modality,
         "modality_projection": args.modality_projection,
         "modality_channel_index": args.modality_channel_index,
@@ -778,6 +813,36 @@ def _tracking_provenance_payload(args: argparse.Namespace, track_pair_qc: pd.Dat
     }
 
 
+def _write_object_dataset(
+    *,
+    manifest_df: pd.DataFrame,
+    contexts: list[RunContext],
+    root: Path,
+    default_study_id: str,
+    strict: bool,
+) -> Path | None:
+    samples = [
+        (manifest_row, ctx)
+        for manifest_row, ctx in zip(manifest_df.to_dict("records"), contexts)
+        if ctx.object_table is not None and not ctx.object_table.empty
+    ]
+    # The dataset outlives a run; drop samples no longer in this cohort (or now without objects).
+    prune_object_dataset(root, [str(manifest_row["sample_id"]) for manifest_row, _ in samples])
+    written = False
+    for manifest_row, ctx in samples:
+        append_object_table(
+            root,
+            ctx.object_table,
+            sample_id=str(manifest_row["sample_id"]),
+            study_id=manifest_row.get("study_id", default_study_id),
+            condition=manifest_row.get("condition"),
+            animal_id=manifest_row.get("animal_id"),
+            strict=strict,
+        )
+        written = True
+    return root if written else None
+
+
 def _write_tracking_outputs(
     *,
     manifest_df: pd.DataFrame,
@@ -808,6 +873,22 @@ def _write_tracking_outputs(
     return track_table, track_pair_qc, track_summary, assets
 
 
+# CLI flags that change what _write_context_artifacts writes for a sample.
+_SAMPLE_ARTIFACT_ARGS = (
+    "apply_edits",
+    "register_retina",
+    "save_debug",
+    "debug_overlay_mode",
+    "debug_overlay_max_side",
+    "save_ome_zarr",
+    "spatial_stats",
+    "strict_schemas",
+    "write_object_table",
+    "write_qc_maps",
+    "write_uncertainty_maps",
+)
+
+
 def _run_manifest_contexts(
     *,
     args: argparse.Namespace,
@@ -816,11 +897,15 @@ def _run_manifest_contexts(
     pipeline_cfg: dict[str, object],
     output_root: Path | None,
     write_artifacts: bool,
+    sample_store: SampleResultStore | None = None,
 ) -> tuple[list[RunContext], list[tuple[str, str]], list[tuple[str, str]], list[dict[str, str]]]:
     processed_contexts: list[RunContext] = []
     saved_images_for_report: list[tuple[str, str]] = []
     report_assets: list[tuple[str, str]] = []
     report_tables: list[dict[str, str]] = []
+    # Registered tracking re-reads each sample's gray image, so stored entries must carry it.
+    keep_gray = bool(getattr(args, "track_longitudinal", False) and getattr(args, "tracking_mode", None) == "registered")
+    asset_hashes = ModelAssetHashes()
 
     for idx, row in enumerate(manifest_df.to_dict("records"), start=1):
         sample_id = str(row["sample_id"])
@@ -833,6 +918,35 @@ def _run_manifest_contexts(
             register_retina=args.register_retina,
             retina_frame_path=args.retina_frame_path,
         )
+
+        sample_key = fingerprint = config_hash = None
+        if sample_store is not None:
+            fingerprint = image_fingerprint(image_path)
+            # The review stage applies this log on its own, so its contents change the result.
+            edit_log = resolve_edit_log_path(image_path, runtime.options.apply_edits)
+            config_hash = sample_config_hash(
+                {
+                    "sample_id": sample_id,
+                    "runtime_options": runtime_options_key(runtime.options),
+                    "model_weights": model_weights_hashes(runtime.options, asset_hashes=asset_hashes),
+                    "edit_log_sha256": file_sha256(edit_log) if edit_log is not None else "none",
+                    "pipeline_cfg": sample_cfg,
+                    "modality": modality,
+                    "output_root": str(output_root),
+                    "artifact_args": {name: getattr(args, name, None) for name in _SAMPLE_ARTIFACT_ARGS},
+                }
+            )
+            sample_key = sample_result_key(fingerprint, config_hash)
+            restored = sample_store.load(sample_key, require_gray=keep_gray)
+            if restored is not None:
+                ctx, report = restored
+                saved_images_for_report.extend(report.get("saved_images", []))
+                report_assets.extend(report.get("assets", []))
+                report_tables.extend(report.get("tables", []))
+                processed_contexts.append(ctx)
+                print(f"Reused stored result for {sample_id} | Cells: {ctx.metrics['cell_count']}")
+                continue
+
         ctx = run_one_image(
             runtime,
             image_path=image_path,
@@ -840,6 +954,7 @@ def _run_manifest_contexts(
             pipeline_cfg_overrides=sample_cfg,
         )
 
+        sample_report: dict[str, list] = {"saved_images": [], "assets": [], "tables": []}
         if write_artifacts:
             assert output_root is not None
             sample_output_dir = output_root / "samples" / sample_id
@@ -852,11 +967,24 @@ def _run_manifest_contexts(
                 args=args,
                 use_gpu=runtime.use_gpu,
                 focus_mode=runtime.options.focus_mode,
-                saved_images_for_report=saved_images_for_report,
-                report_assets=report_assets,
-                report_tables=report_tables,
+                saved_images_for_report=sample_report["saved_images"],
+                report_assets=sample_report["assets"],
+                report_tables=sample_report["tables"],
+            )
+            saved_images_for_report.extend(sample_report["saved_images"])
+            report_assets.extend(sample_report["assets"])
+            report_tables.extend(sample_report["tables"])
+
+        if sample_store is not None and sample_key is not None:
+            sample_store.put(
+                sample_key,
+                ctx,
+                sample_id=sample_id,
+                fingerprint=fingerprint,
+                config_hash=config_hash,
+                report=sample_report,
+                keep_gray=keep_gray,
             )
-
         processed_contexts.append(ctx)
         print(
             f"Processed {sample_id} | "
@@ -1007,6 +1135,7 @@ def _run_study_mode(
         pipeline_cfg=runtime.pipeline_cfg,
         output_root=study_output_dir,
         write_artifacts=True,
+        sample_store=None if args.no_sample_store else SampleResultStore(study_output_dir / SAMPLE_STORE_DIRNAME),
     )
 
     sample_table = build_sample_table(manifest_df, processed_contexts)
@@ -1025,6 +1154,16 @@ def _run_study_mode(
             strict=args.strict_schemas,
         )
 
+    object_dataset_root = None
+    if args.write_object_table and importlib.util.find_spec("pyarrow") is not None:
+        object_dataset_root = _write_object_dataset(
+            manifest_df=manifest_df,
+            contexts=processed_contexts,
+            root=study_output_dir / OBJECT_DATASET_DIRNAME,
+            default_study_id=Path(args.manifest).stem,
+            strict=args.strict_schemas,
+        )
+
     atlas_comparison = pd.DataFrame()
     atlas_summary = pd.DataFrame()
     if args.atlas_reference and not region_table.empty:
@@ -1060,7 +1199,13 @@ def _run_study_mode(
 
     stats_dir = study_output_dir / "stats"
     stats_mixed_dir = study_output_dir / "stats_mixed"
-    stats_result = run_study_statistics(sample_table, region_table, requested_mode=args.stats_mode)
+    stats_result = run_study_statistics(
+        sample_table,
+        region_table,
+        requested_mode=args.stats_mode,
+        max_workers=args.stats_workers,
+        race_optimizers=args.stats_race_optimizers,
+    )
     stats_artifacts = write_study_statistics_artifacts(stats_result, stats_dir=stats_dir, stats_mixed_dir=stats_mixed_dir)
     stats_frame = stats_result.study_stats
     region_stats = stats_result.region_stats
@@ -1102,6 +1247,13 @@ def _run_study_mode(
     phenotype_plot = save_phenotype_composition_plot(sample_table, figures_dir / "phenotype_composition.png")
     if phenotype_plot is not None:
         saved_images_for_report.append(("Phenotype composition", os.path.relpath(phenotype_plot, study_output_dir)))
+    eccentricity_plot = (
+        save_object_eccentricity_plot(object_dataset_root, figures_dir / "object_eccentricity_by_condition.png")
+        if object_dataset_root is not None
+        else None
+    )
+    if eccentricity_plot is not None:
+        saved_images_for_report.append(("Object eccentricity by condition", os.path.relpath(eccentricity_plot, study_output_dir)))
 
     resolved_config = runtime.resolved_config
     methods_appendix = build_methods_appendix(
@@ -1240,6 +1392,7 @@ def main():
     parser.add_argument("--output_dir", type=str, default="Outputs", help="Folder for outputs")
     parser.add_argument("--manifest", type=str, default=None, help="CSV manifest for study-mode processing")
     parser.add_argument("--study_output_dir", type=str, default=None, help="Folder for study-mode outputs")
+    parser.add_argument("--no_sample_store", action="store_true", help="Do not reuse or persist per-sample results under <study_output_dir>/sample_store")
     parser.add_argument("--manual_annotations", type=str, default=None, help="Optional CSV with sample_id plus manual_count or label_path")
     parser.add_argument("--diameter", type=float, default=None, help="Override config.yaml cell diameter in pixels")
     parser.add_argument("--model_type", type=str, default=None, help="Cellpose built-in model type (for example 'cyto' or 'nuclei'); custom paths remain supported here only as a legacy compatibility path")
@@ -1251,6 +1404,8 @@ def main():
     parser.add_argument("--max_size", type=int, default=None, help="Override maximum mask area in pixels")
 
     parser.add_argument("--save_debug", action="store_true", help="Save debug overlays")
+    parser.add_argument("--debug_overlay_mode", type=str, choices=["fill", "contours"], default="fill", help="Debug overlay style: filled objects or object contours only")
+    parser.add_argument("--debug_overlay_max_side", type=int, default=None, help="Render debug overlays as strided previews no longer than this many pixels per side")
     parser.add_argument("--use_gpu", action="store_true", help="Force GPU on")
     parser.add_argument("--no_gpu", action="store_true", help="Force GPU off")
 
@@ -1260,6 +1415,7 @@ def main():
     parser.add_argument("--modality_channel_index", type=int, default=0, help="Channel index for modality adapters when channel reduction is needed")
     parser.add_argument("--modality_slab_start", type=int, default=None, help="Optional starting depth index for volume projection")
     parser.add_argument("--modality_slab_end", type=int, default=None, help="Optional ending depth index for volume projection")
+    parser.add_argument("--modality_projection_workers", type=int, default=1, help="Threads reducing depth chunks during volume projection")
 
     # Focus modes
     focus_group = parser.add_mutually_exclusive_group()
@@ -1287,10 +1443,13 @@ def main():
     parser.add_argument("--spatial_mode", type=str, choices=["legacy", "rigorous"], default="legacy", help="Spatial analysis mode when --spatial_stats is enabled")
     parser.add_argument("--spatial_envelope_sims", type=int, default=999, help="Number of CSR simulations for rigorous spatial envelopes")
     parser.add_argument("--spatial_random_seed", type=int, default=1337, help="Base random seed for rigorous spatial envelopes")
+    parser.add_argument("--spatial_workers", type=int, default=1, help="Worker threads for per-domain rigorous spatial analysis")
 
     # Retina registration
     parser.add_argument("--register_retina", action="store_true", help="Register cells into an ONH-centered retina coordinate frame")
     parser.add_argument("--region_schema", type=str, default="mouse_flatmount_v1", help="Named region schema for retina registration")
+    parser.add_argument("--tissue_mask_scale", type=int, default=None, help="Downsampling factor for the tissue mask and ONH search (default: automatic, 1 = full resolution)")
+    parser.add_argument("--region_area_engine", type=str, choices=["raster", "polygon"], default="raster", help="Region area engine: raster pixel counts or sub-pixel polygon intersections")
     parser.add_argument("--onh_mode", type=str, choices=["cli", "sidecar", "auto_hole", "auto_combined"], default="cli", help="How to resolve ONH/orientation inputs")
     parser.add_argument("--onh_xy", type=float, nargs=2, default=None, metavar=("X", "Y"), help="ONH center in image pixel coordinates")
     parser.add_argument("--dorsal_xy", type=float, nargs=2, default=None, metavar=("X", "Y"), help="Point indicating the dorsal direction in pixel coordinates")
@@ -1302,6 +1461,8 @@ def main():
     parser.add_argument("--tracking_mode", type=str, choices=["centroid", "registered"], default="centroid", help="Longitudinal tracking path: centroid or registration-aware")
     parser.add_argument("--track_max_disp_px", type=float, default=20.0, help="Maximum centroid displacement for longitudinal matching")
     parser.add_argument("--stats_mode", type=str, choices=["auto", "simple", "mixed"], default="auto", help="Study-mode statistics path: auto, simple, or mixed")
+    parser.add_argument("--stats_workers", type=int, default=1, help="Worker processes for study statistics; >1 fits sample and region models concurrently")
+    parser.add_argument("--stats_race_optimizers", action="store_true", help="Run mixed-model optimizers concurrently and keep the first usable fit in preference order")
 
     # I/O options
     parser.add_argument("--save_ome_zarr", action="store_true", help="Write image + masks as OME-Zarr")
@@ -1316,6 +1477,8 @@ def main():
     parser.add_argument("--tiling", action="store_true", help="Run segmentation in overlapping tiles")
     parser.add_argument("--tile_size", type=int, default=1024, help="Tile size in pixels for tiled inference")
     parser.add_argument("--tile_overlap", type=int, default=128, help="Tile overlap in pixels for tiled inference")
+    parser.add_argument("--memory_budget_mb", type=float, default=None, help="Per-image memory budget in MB; tiling, tile size and retention of intermediate maps are chosen to fit it")
+    parser.add_argument("--debug_allocations", action="store_true", help="Record each stage's peak allocation and warn about unexpectedly large ones")
     parser.add_argument("--calibration_grid", type=str, default=None, help="YAML file describing a calibration sweep over a manifest")
 
     # Optic nerve axon module
@@ -1338,6 +1501,8 @@ def main():
         use_gpu = USE_GPU
 
     if use_gpu:
+        import torch
+
         if torch.cuda.is_available():
             print("[INFO] GPU is enabled and CUDA is available.")
         else:
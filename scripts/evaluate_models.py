@@ -19,6 +19,12 @@ def main() -> None:
     gpu_group.add_argument("--use_gpu", action="store_true", help="Enable GPU evaluation where available")
     gpu_group.add_argument("--no_gpu", action="store_true", help="Force CPU evaluation")
     parser.add_argument("--strict_schemas", action="store_true", help="Fail on missing manifest or reference files")
+    parser.add_argument("--workers", default=1, type=int, help="Number of manifest rows evaluated concurrently")
+    parser.add_argument(
+        "--prediction_cache_dir",
+        default=None,
+        help="Cache predicted label images here, keyed by model weights, image content and segmentation config",
+    )
     args = parser.parse_args()
 
     manifest = load_model_manifest(args.model_manifest)
@@ -27,6 +33,8 @@ def main() -> None:
         manifest,
         use_gpu=use_gpu,
         strict_schemas=args.strict_schemas,
+        max_workers=args.workers,
+        prediction_cache_dir=args.prediction_cache_dir,
     )
     outputs = write_evaluation_outputs(
         output_dir=args.output_dir,
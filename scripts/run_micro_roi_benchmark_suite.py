@@ -18,10 +18,10 @@ from src.micro_roi_benchmark import (
     moderate_locked_eval_gate,
     summarize_split_metrics,
 )
-from src.point_detection import detect_dog_peaks, detect_hmax_peaks, detect_log_peaks
+from src.point_detection import DetectorInput, detect_dog_peaks, detect_hmax_peaks, detect_log_peaks, prepare_detector_input
 from src.roi_benchmark import PRIMARY_TOLERANCE_PX, SENSITIVITY_TOLERANCES_PX, save_roi_match_overlay, summarize_truth_provenance
 from src.roi_data import crop_2d_or_yxc, iter_roi_records, load_roi_manifest
-from src.validation import load_manual_points, point_matching_metrics
+from src.validation import load_manual_points, point_matching_sweep
 
 
 def _log(message: str) -> None:
@@ -50,7 +50,7 @@ def _markdown_table(frame: pd.DataFrame) -> str:
     return "\n".join(lines)
 
 
-def _detect_points(image: np.ndarray, exclude_mask: np.ndarray | None, backend: str, config: dict) -> pd.DataFrame:
+def _detect_points(image: np.ndarray | DetectorInput, exclude_mask: np.ndarray | None, backend: str, config: dict) -> pd.DataFrame:
     normalized = str(backend).strip().lower()
     if normalized == "log":
         return detect_log_peaks(image, exclude_mask=exclude_mask, **config)
@@ -74,15 +74,56 @@ def _load_exclude_mask(path: str | Path | None) -> np.ndarray | None:
     return np.asarray(tifffile.imread(str(resolved))).astype(bool)
 
 
-def _matching_view_row(views: pd.DataFrame, roi_id: str, projection_recipe_json: str, preprocess_json: str) -> pd.Series:
-    matches = views.loc[
-        (views["roi_id"].astype(str) == roi_id)
-        & (views["projection_recipe_json"].astype(str) == str(projection_recipe_json))
-        & (views["preprocess_json"].astype(str) == str(preprocess_json))
-    ].copy()
-    if matches.empty:
+def _index_view_rows(views: pd.DataFrame) -> dict[tuple[str, str, str], dict]:
+    index: dict[tuple[str, str, str], dict] = {}
+    for row in views.to_dict("records"):
+        key = (str(row["roi_id"]), str(row["projection_recipe_json"]), str(row["preprocess_json"]))
+        index.setdefault(key, row)
+    return index
+
+
+def _matching_view_row(view_index: dict[tuple[str, str, str], dict], roi_id: str, projection_recipe_json: str, preprocess_json: str) -> dict:
+    row = view_index.get((str(roi_id), str(projection_recipe_json), str(preprocess_json)))
+    if row is None:
         raise ValueError(f"No projection-lab view found for ROI {roi_id} with projection={projection_recipe_json} preprocess={preprocess_json}")
-    return matches.iloc[0]
+    return row
+
+
+class _RoiInputs:
+    """Detector inputs, exclude masks and the source image, each loaded once per ROI.
+
+    Detector inputs are kept as ``DetectorInput`` objects, so configs that
+    share a view and a sigma set reuse the same LoG/DoG scale space. The
+    source image is kept across consecutive ROIs cropped from the same file.
+    """
+
+    def __init__(self) -> None:
+        self._detector_inputs: dict[str, DetectorInput] = {}
+        self._exclude_masks: dict[str, np.ndarray | None] = {}
+        self._source_path: str | None = None
+        self._source_image: np.ndarray | None = None
+
+    def start_roi(self) -> None:
+        self._detector_inputs.clear()
+        self._exclude_masks.clear()
+
+    def detector_input(self, path: str) -> DetectorInput:
+        if path not in self._detector_inputs:
+            self._detector_inputs[path] = prepare_detector_input(_load_detector_input(Path(path)))
+        return self._detector_inputs[path]
+
+    def exclude_mask(self, path) -> np.ndarray | None:
+        key = str(path)
+        if key not in self._exclude_masks:
+            self._exclude_masks[key] = _load_exclude_mask(path)
+        return self._exclude_masks[key]
+
+    def source_crop(self, record) -> np.ndarray:
+        path = str(record.image_path)
+        if path != self._source_path:
+            self._source_image = tifffile.imread(path)
+            self._source_path = path
+        return crop_2d_or_yxc(self._source_image, x0=record.x0, y0=record.y0, width=record.width, height=record.height)
 
 
 def _build_report(comparison: pd.DataFrame, quality: pd.DataFrame) -> str:
@@ -152,26 +193,33 @@ def main(argv: list[str] | None = None) -> int:
         f"{len(records)} ROI(s) = {total_runs} detector runs"
     )
 
-    primary_rows: list[dict[str, object]] = []
-    all_rows: list[dict[str, object]] = []
     provenance_summary = summarize_truth_provenance(records)
+    view_index = _index_view_rows(views)
+    config_rows = configs.to_dict("records")
+    predictor_configs = [json.loads(str(config["predictor_config_json"])) for config in config_rows]
+    # Rows are collected per config so the written tables keep config-major order
+    # even though execution is ROI-major.
+    rows_by_config: list[list[dict[str, object]]] = [[] for _ in config_rows]
+    roi_inputs = _RoiInputs()
     completed_runs = 0
 
-    for config_index, config in enumerate(configs.to_dict("records"), start=1):
-        predictor_backend = str(config["predictor_backend"])
-        predictor_config = json.loads(str(config["predictor_config_json"]))
-        projection_recipe_json = str(config["projection_recipe_json"])
-        preprocess_json = str(config["preprocess_json"])
-        _log(f"[run_micro_roi_benchmark_suite] [{config_index}/{len(configs)}] {config['config_id']}")
-        for record_index, record in enumerate(records, start=1):
+    for record_index, record in enumerate(records, start=1):
+        _log(f"[run_micro_roi_benchmark_suite] [{record_index}/{len(records)}] ROI {record.roi_id}")
+        roi_inputs.start_roi()
+        manual_points = load_manual_points(record.manual_points_path) if record.manual_points_path is not None else np.empty((0, 2), dtype=float)
+        crop = roi_inputs.source_crop(record)
+        for config_index, config in enumerate(config_rows):
+            predictor_backend = str(config["predictor_backend"])
+            projection_recipe_json = str(config["projection_recipe_json"])
+            preprocess_json = str(config["preprocess_json"])
             _log(
                 f"[run_micro_roi_benchmark_suite] run {completed_runs + 1}/{total_runs}: "
-                f"{config['config_id']} on ROI {record.roi_id} ({record_index}/{len(records)} in config)"
+                f"{config['config_id']} on ROI {record.roi_id} ({config_index + 1}/{len(config_rows)} in ROI)"
             )
-            view_row = _matching_view_row(views, record.roi_id, projection_recipe_json, preprocess_json)
-            image = _load_detector_input(Path(str(view_row["detector_input_path"])))
-            exclude_mask = _load_exclude_mask(view_row.get("exclude_mask_path"))
-            predicted = _detect_points(image, exclude_mask, predictor_backend, predictor_config)
+            view_row = _matching_view_row(view_index, record.roi_id, projection_recipe_json, preprocess_json)
+            detector_input = roi_inputs.detector_input(str(view_row["detector_input_path"]))
+            exclude_mask = roi_inputs.exclude_mask(view_row.get("exclude_mask_path"))
+            predicted = _detect_points(detector_input, exclude_mask, predictor_backend, predictor_configs[config_index])
             points_dir = results_dir / str(config["config_id"]) / "points"
             overlay_dir = results_dir / str(config["config_id"]) / "overlays"
             points_dir.mkdir(parents=True, exist_ok=True)
@@ -179,36 +227,32 @@ def main(argv: list[str] | None = None) -> int:
             predicted_path = points_dir / f"{record.roi_id}__predicted_points.csv"
             predicted.to_csv(predicted_path, index=False)
 
-            manual_points = load_manual_points(record.manual_points_path) if record.manual_points_path is not None else np.empty((0, 2), dtype=float)
             predicted_points = predicted[["y_px", "x_px"]].to_numpy(dtype=float) if not predicted.empty else np.empty((0, 2), dtype=float)
-            for tolerance in SENSITIVITY_TOLERANCES_PX:
-                metrics = point_matching_metrics(manual_points, predicted_points, tolerance_px=float(tolerance))
-                row = {
-                    "config_id": str(config["config_id"]),
-                    "roi_id": record.roi_id,
-                    "split": record.split,
-                    "marker": record.marker,
-                    "modality": record.modality,
-                    "image_marker": record.image_marker,
-                    "image_source_channel": record.image_source_channel,
-                    "truth_marker": record.truth_marker,
-                    "truth_source_channel": record.truth_source_channel,
-                    "truth_derivation": record.truth_derivation,
-                    "truth_provenance_status": record.truth_provenance_status,
-                    "truth_provenance_valid": bool(record.truth_provenance_valid),
-                    "projection_recipe_json": projection_recipe_json,
-                    "preprocess_json": preprocess_json,
-                    "predictor_backend": predictor_backend,
-                    "predictor_config_json": str(config["predictor_config_json"]),
-                    "predicted_points_path": str(predicted_path),
-                    **metrics,
-                }
-                all_rows.append(row)
-                if np.isclose(float(tolerance), PRIMARY_TOLERANCE_PX):
-                    primary_rows.append(row)
+            sweep = point_matching_sweep(manual_points, predicted_points, tolerances_px=SENSITIVITY_TOLERANCES_PX)
+            for metrics in sweep.to_dict("records"):
+                rows_by_config[config_index].append(
+                    {
+                        "config_id": str(config["config_id"]),
+                        "roi_id": record.roi_id,
+                        "split": record.split,
+                        "marker": record.marker,
+                        "modality": record.modality,
+                        "image_marker": record.image_marker,
+                        "image_source_channel": record.image_source_channel,
+                        "truth_marker": record.truth_marker,
+                        "truth_source_channel": record.truth_source_channel,
+                        "truth_derivation": record.truth_derivation,
+                        "truth_provenance_status": record.truth_provenance_status,
+                        "truth_provenance_valid": bool(record.truth_provenance_valid),
+                        "projection_recipe_json": projection_recipe_json,
+                        "preprocess_json": preprocess_json,
+                        "predictor_backend": predictor_backend,
+                        "predictor_config_json": str(config["predictor_config_json"]),
+                        "predicted_points_path": str(predicted_path),
+                        **metrics,
+                    }
+                )
 
-            image_source, _ = tifffile.imread(str(record.image_path)), None
-            crop = crop_2d_or_yxc(image_source, x0=record.x0, y0=record.y0, width=record.width, height=record.height)
             save_roi_match_overlay(
                 roi_image=crop,
                 manual_points_yx=manual_points,
@@ -223,6 +267,9 @@ def main(argv: list[str] | None = None) -> int:
                 f"{config['config_id']} ROI {record.roi_id} -> predicted={len(predicted_points)} truth={len(manual_points)}"
             )
 
+    all_rows = [row for rows in rows_by_config for row in rows]
+    primary_rows = [row for row in all_rows if np.isclose(float(row["match_tolerance_px"]), PRIMARY_TOLERANCE_PX)]
+
     primary = pd.DataFrame(primary_rows)
     all_metrics = pd.DataFrame(all_rows)
     comparison_rows: list[dict[str, object]] = []
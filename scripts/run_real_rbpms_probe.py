@@ -4,6 +4,7 @@ import argparse
 import json
 import sys
 import time
+from concurrent.futures import Future
 from pathlib import Path
 
 import pandas as pd
@@ -12,9 +13,10 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from src.context import RunContext
 from src.io_ome import load_any_image
 from src.roi_benchmark import default_config_manifest_for_marker
-from src.run_service import RuntimeOptions, build_runtime, export_context, run_one_image
+from src.run_service import ArtifactExporter, RuntimeOptions, build_runtime, run_one_image
 
 
 def _log_progress(message: str) -> None:
@@ -58,6 +60,31 @@ def runtime_options_from_row(row: pd.Series, *, use_gpu: bool, tiling: bool, til
     )
 
 
+def _drain_finished_exports(
+    pending_exports: list[tuple[dict[str, object], RunContext, Future]],
+    summary_rows: list[dict[str, object]],
+) -> None:
+    # Finished contexts are dropped here so only in-flight exports keep their images alive.
+    still_pending = []
+    for row, ctx, export_future in pending_exports:
+        if not export_future.done():
+            still_pending.append((row, ctx, export_future))
+            continue
+        artifacts = export_future.result()
+        row.update(
+            {
+                "warning_count": len(ctx.warnings),
+                "warnings": "; ".join(ctx.warnings),
+                "debug_overlay": str(artifacts.get("debug_overlay", "")),
+                "object_table": str(artifacts.get("object_table", "")),
+                "provenance": str(artifacts.get("provenance", "")),
+                "report": str(artifacts.get("html_report", "")),
+            }
+        )
+        summary_rows.append(row)
+    pending_exports[:] = still_pending
+
+
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Run the private real-data RBPMS probe across projected TIFFs.")
     parser.add_argument("--projected-dir", required=True, type=Path)
@@ -84,6 +111,8 @@ def main(argv: list[str] | None = None) -> int:
     config_frame.to_csv(output_dir / "resolved_config_manifest.csv", index=False)
 
     summary_rows: list[dict[str, object]] = []
+    pending_exports: list[tuple[dict[str, object], RunContext, Future]] = []
+    exporter = ArtifactExporter(max_pending=2, export_workers=4)
     total_runs = int(len(projected_paths) * len(config_frame))
     completed_runs = 0
     _log_progress(
@@ -113,24 +142,23 @@ def main(argv: list[str] | None = None) -> int:
                 )
             )
             ctx = run_one_image(runtime, image_path=projected_path, modality_override="flatmount")
-            artifacts = export_context(runtime, ctx, run_dir)
-            summary_rows.append(
-                {
-                    "config_id": config_id,
-                    "projected_tiff_path": str(projected_path),
-                    "run_dir": str(run_dir),
-                    "cell_count": ctx.summary_row.get("cell_count"),
-                    "warning_count": len(ctx.warnings),
-                    "warnings": "; ".join(ctx.warnings),
-                    "backend": runtime.backend,
-                    "model_label": runtime.model_spec.model_label,
-                    "tiling": tiling,
-                    "debug_overlay": str(artifacts.get("debug_overlay", "")),
-                    "object_table": str(artifacts.get("object_table", "")),
-                    "provenance": str(artifacts.get("provenance", "")),
-                    "report": str(artifacts.get("html_report", "")),
-                }
+            # Artifacts are written in the background while the next config runs.
+            pending_exports.append(
+                (
+                    {
+                        "config_id": config_id,
+                        "projected_tiff_path": str(projected_path),
+                        "run_dir": str(run_dir),
+                        "cell_count": ctx.summary_row.get("cell_count"),
+                        "backend": runtime.backend,
+                        "model_label": runtime.model_spec.model_label,
+                        "tiling": tiling,
+                    },
+                    ctx,
+                    exporter.submit(runtime, ctx, run_dir),
+                )
             )
+            _drain_finished_exports(pending_exports, summary_rows)
             completed_runs += 1
             _log_progress(
                 f"[run_real_rbpms_probe] completed {completed_runs}/{total_runs}: {projected_path.name} config {config_id} in {time.perf_counter() - run_started_at:.1f}s"
@@ -139,6 +167,9 @@ def main(argv: list[str] | None = None) -> int:
             f"[run_real_rbpms_probe] [{image_index}/{len(projected_paths)}] {projected_path.name}: finished in {time.perf_counter() - image_started_at:.1f}s"
         )
 
+    exporter.close()
+    _drain_finished_exports(pending_exports, summary_rows)
+
     summary = pd.DataFrame(summary_rows).sort_values(["projected_tiff_path", "config_id"]).reset_index(drop=True)
     summary.to_csv(output_dir / "probe_summary.csv", index=False)
     (output_dir / "review_index.md").write_text(
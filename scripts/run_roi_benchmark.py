@@ -43,6 +43,8 @@ def run_roi_benchmark_config(
     runtime_runner=None,
     include_splits: list[str] | None = None,
     exclude_splits: list[str] | None = None,
+    max_workers: int = 1,
+    resume: bool = True,
 ) -> dict:
     config = RoiBenchmarkConfig(
         config_id=config_id,
@@ -65,6 +67,8 @@ def run_roi_benchmark_config(
         "save_overlays": save_overlays,
         "include_splits": include_splits,
         "exclude_splits": exclude_splits,
+        "max_workers": max_workers,
+        "resume": resume,
     }
     if runtime_builder is not None:
         kwargs["runtime_builder"] = runtime_builder
@@ -91,6 +95,8 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser.add_argument("--save_overlays", action="store_true")
     parser.add_argument("--include-splits", nargs="*", default=None)
     parser.add_argument("--exclude-splits", nargs="*", default=None)
+    parser.add_argument("--workers", default=1, type=int, help="Number of (config, ROI) cells evaluated concurrently")
+    parser.add_argument("--no_resume", action="store_true", help="Ignore finished cells recorded in the result store")
     gpu_group = parser.add_mutually_exclusive_group()
     gpu_group.add_argument("--use_gpu", action="store_true")
     gpu_group.add_argument("--no_gpu", action="store_true")
@@ -117,6 +123,8 @@ def main(argv: list[str] | None = None) -> int:
         save_overlays=bool(args.save_overlays),
         include_splits=args.include_splits,
         exclude_splits=args.exclude_splits,
+        max_workers=args.workers,
+        resume=not bool(args.no_resume),
     )
     return 0
 
@@ -35,6 +35,8 @@ def run_benchmark_suite(
     use_gpu: bool = False,
     include_splits: list[str] | None = None,
     exclude_splits: list[str] | None = None,
+    max_workers: int = 1,
+    resume: bool = True,
 ) -> dict:
     manifest = filter_roi_manifest_by_split(
         load_roi_manifest(roi_manifest),
@@ -52,6 +54,8 @@ def run_benchmark_suite(
         "use_gpu": use_gpu,
         "include_splits": include_splits,
         "exclude_splits": exclude_splits,
+        "max_workers": max_workers,
+        "resume": resume,
     }
     if runtime_builder is not None:
         kwargs["runtime_builder"] = runtime_builder
@@ -76,6 +80,8 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser.add_argument("--save_overlays", action="store_true")
     parser.add_argument("--include-splits", nargs="*", default=None)
     parser.add_argument("--exclude-splits", nargs="*", default=None)
+    parser.add_argument("--workers", default=1, type=int, help="Number of (config, ROI) cells evaluated concurrently")
+    parser.add_argument("--no_resume", action="store_true", help="Ignore finished cells recorded in the result store")
     gpu_group = parser.add_mutually_exclusive_group()
     gpu_group.add_argument("--use_gpu", action="store_true")
     gpu_group.add_argument("--no_gpu", action="store_true")
@@ -92,6 +98,8 @@ def main(argv: list[str] | None = None) -> int:
         use_gpu=bool(args.use_gpu and not args.no_gpu),
         include_splits=args.include_splits,
         exclude_splits=args.exclude_splits,
+        max_workers=args.workers,
+        resume=not bool(args.no_resume),
     )
     return int(result["exit_code"])
 
@@ -4,17 +4,68 @@ from typing import Any
 
 import numpy as np
 from scipy import ndimage as ndi
-from skimage import exposure, feature, filters, measure, segmentation
+from skimage import exposure, feature, filters, segmentation
 
+from src.dtypes import compact_label_dtype
 
-def _normalize_float(image: np.ndarray) -> np.ndarray:
-    arr = np.asarray(image, dtype=np.float32)
+
+def _normalize_float(image: np.ndarray, intensity_range: tuple[float, float] | None = None) -> np.ndarray:
+    arr = np.array(image, dtype=np.float32)
     if arr.size == 0:
-        return np.zeros_like(arr, dtype=np.float32)
-    lo, hi = np.percentile(arr, [1.0, 99.5])
+        return arr
+    lo, hi = intensity_range if intensity_range is not None else np.percentile(arr, [1.0, 99.5])
     if not np.isfinite(lo) or not np.isfinite(hi) or hi <= lo:
         return np.zeros_like(arr, dtype=np.float32)
-    return np.clip((arr - lo) / (hi - lo), 0.0, 1.0).astype(np.float32, copy=False)
+    np.subtract(arr, lo, out=arr)
+    np.divide(arr, hi - lo, out=arr)
+    return np.clip(arr, 0.0, 1.0, out=arr)
+
+
+def preprocess_blob_input(
+    image: np.ndarray,
+    *,
+    apply_clahe: bool = False,
+    intensity_range: tuple[float, float] | None = None,
+) -> np.ndarray:
+    """
+    Float32 input for ``segment_blob_watershed(..., preprocessed=True)``:
+    rescaled so ``intensity_range`` (default: the image's 1st/99.5th
+    percentiles) maps to [0, 1], then optionally CLAHE-equalized.
+    """
+    return _apply_clahe_if_requested(_normalize_float(image, intensity_range), apply_clahe)
+
+
+def _difference_of_gaussians(image: np.ndarray, sigma_small: float, sigma_large: float) -> np.ndarray:
+    """Rectified ``gaussian(sigma_small) - gaussian(sigma_large)`` using two float32 buffers."""
+    response = np.empty_like(image, dtype=np.float32)
+    background = np.empty_like(image, dtype=np.float32)
+    ndi.gaussian_filter(image, sigma=sigma_small, output=response, mode="nearest", truncate=4.0)
+    ndi.gaussian_filter(image, sigma=sigma_large, output=background, mode="nearest", truncate=4.0)
+    np.subtract(response, background, out=response)
+    return np.maximum(response, 0.0, out=response)
+
+
+def _filter_regions(
+    labels: np.ndarray,
+    intensity: np.ndarray,
+    *,
+    min_size: int,
+    max_size: int,
+    min_mean_intensity: float | None,
+) -> tuple[np.ndarray, int]:
+    """Drop regions outside the size/mean-intensity limits and renumber the rest in label order."""
+    flat = labels.ravel()
+    areas = np.bincount(flat)
+    keep = (areas >= int(min_size)) & (areas <= int(max_size))
+    keep[0] = False
+    if min_mean_intensity is not None:
+        sums = np.bincount(flat, weights=intensity.ravel(), minlength=areas.size)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            keep &= (sums / np.maximum(areas, 1)) >= float(min_mean_intensity)
+    n_kept = int(keep.sum())
+    lut = np.zeros(areas.size, dtype=compact_label_dtype(n_kept))
+    lut[keep] = np.arange(1, n_kept + 1, dtype=lut.dtype)
+    return lut[labels], n_kept
 
 
 def _apply_clahe_if_requested(image: np.ndarray, enabled: bool) -> np.ndarray:
@@ -36,18 +87,16 @@ def segment_blob_watershed(
     max_size: int = 400,
     min_mean_intensity: float | None = None,
     compactness: float = 0.0,
+    preprocessed: bool = False,
 ) -> tuple[np.ndarray, dict[str, Any]]:
-    norm = _normalize_float(image)
-    enhanced = _apply_clahe_if_requested(norm, apply_clahe)
+    if preprocessed:
+        enhanced = np.asarray(image, dtype=np.float32)
+    else:
+        enhanced = preprocess_blob_input(image, apply_clahe=apply_clahe)
 
     sigma_small = max(0.5, float(min_sigma))
     sigma_large = max(sigma_small + 0.5, float(max_sigma))
-    response = filters.gaussian(enhanced, sigma=sigma_small, preserve_range=True) - filters.gaussian(
-        enhanced,
-        sigma=sigma_large,
-        preserve_range=True,
-    )
-    response = np.clip(response, 0.0, None).astype(np.float32, copy=False)
+    response = _difference_of_gaussians(enhanced, sigma_small, sigma_large)
 
     coords = feature.peak_local_max(
         response,
@@ -79,21 +128,18 @@ def segment_blob_watershed(
     foreground = response > threshold
     labels = segmentation.watershed(-response, markers=markers, mask=foreground, compactness=float(compactness))
 
-    filtered = np.zeros_like(labels, dtype=np.uint16)
-    next_id = 1
-    for region in measure.regionprops(labels, intensity_image=enhanced):
-        area = int(region.area)
-        if area < int(min_size) or area > int(max_size):
-            continue
-        if min_mean_intensity is not None and float(region.mean_intensity) < float(min_mean_intensity):
-            continue
-        filtered[labels == region.label] = next_id
-        next_id += 1
+    filtered, n_regions = _filter_regions(
+        labels,
+        enhanced,
+        min_size=min_size,
+        max_size=max_size,
+        min_mean_intensity=min_mean_intensity,
+    )
 
     return filtered, {
         "backend": "blob_watershed",
         "n_peaks": int(len(coords)),
-        "n_regions": int(next_id - 1),
+        "n_regions": n_regions,
         "foreground_probability": response.astype(np.float32, copy=False),
         "min_sigma": float(min_sigma),
         "max_sigma": float(max_sigma),
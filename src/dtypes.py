@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+import numpy as np
+
+
+# Intensity buffers derived from images (normalized inputs, probability and
+# response maps) are float32; label images are uint32 while they are built
+# and may be compacted to uint16 once the object count is known.
+INTENSITY_DTYPE = np.dtype(np.float32)
+LABEL_DTYPE = np.dtype(np.uint32)
+COMPACT_LABEL_DTYPE = np.dtype(np.uint16)
+
+ALLOCATION_WARN_FACTOR = 8.0
+
+
+def as_intensity(image: np.ndarray, *, copy: bool = False) -> np.ndarray:
+    """``image`` as float32, cast at most once and only copied when needed or asked."""
+    if copy:
+        return np.array(image, dtype=INTENSITY_DTYPE)
+    return np.asarray(image, dtype=INTENSITY_DTYPE)
+
+
+def label_dtype_for(max_label: int) -> np.dtype:
+    """The label dtype for ``max_label`` objects, raising instead of wrapping around."""
+    if max_label < 0:
+        raise ValueError(f"Label images cannot contain negative ids (found {max_label}).")
+    if max_label > np.iinfo(LABEL_DTYPE).max:
+        raise OverflowError(f"{max_label} objects do not fit in {LABEL_DTYPE.name} labels.")
+    return LABEL_DTYPE
+
+
+def compact_label_dtype(max_label: int) -> np.dtype:
+    """uint16 when ``max_label`` fits, otherwise the (checked) uint32 label dtype."""
+    dtype = label_dtype_for(max_label)
+    return COMPACT_LABEL_DTYPE if max_label <= np.iinfo(COMPACT_LABEL_DTYPE).max else dtype
+
+
+def as_labels(labels: np.ndarray) -> np.ndarray:
+    """``labels`` as uint32, without a copy when it already is, checking the id range first."""
+    array = np.asarray(labels)
+    if array.dtype == LABEL_DTYPE:
+        return array
+    if array.dtype.kind not in "biu":
+        raise TypeError(f"Label images must be integer typed, got {array.dtype}.")
+    if array.size:
+        if array.dtype.kind == "i":
+            label_dtype_for(int(array.min()))
+        label_dtype_for(int(array.max()))
+    return array.astype(LABEL_DTYPE, copy=False)
+
+
+def compact_labels(labels: np.ndarray, *, max_label: int | None = None) -> np.ndarray:
+    """``labels`` in uint16 when every id fits, otherwise uint32."""
+    array = np.asarray(labels)
+    if max_label is None:
+        max_label = int(array.max()) if array.size else 0
+    if array.dtype.kind == "i" and array.size:
+        label_dtype_for(int(array.min()))
+    return array.astype(compact_label_dtype(max_label), copy=False)
+
+
+def relabel_lut(max_label: int, keep_ids: np.ndarray) -> np.ndarray:
+    """Lookup table sending each id in ``keep_ids`` to 1..n in order and everything else to 0."""
+    keep_ids = np.asarray(keep_ids, dtype=np.int64)
+    lut = np.zeros(int(max_label) + 1, dtype=compact_label_dtype(len(keep_ids)))
+    lut[keep_ids] = np.arange(1, len(keep_ids) + 1, dtype=lut.dtype)
+    return lut
+
+
+@dataclass
+class AllocationMonitor:
+    """
+    Debug helper that records the Python/numpy heap peak of each pipeline stage.
+
+    Stages whose peak exceeds ``threshold_bytes`` are reported as unexpected;
+    tracing slows numpy allocation down, so this is only enabled on request.
+    """
+
+    threshold_bytes: int
+    records: list[dict[str, Any]] = field(default_factory=list)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            if started:
+                tracemalloc.stop()
+            self.records.append(
+                {
+                    "stage": name,
+                    "peak_bytes": int(max(0, peak - base)),
+                    "retained_bytes": int(current - base),
+                    "unexpected": bool(peak - base > self.threshold_bytes),
+                }
+            )
+
+    def unexpected(self) -> list[dict[str, Any]]:
+        return [record for record in self.records if record["unexpected"]]
+
+
+def allocation_threshold(image: np.ndarray, factor: float = ALLOCATION_WARN_FACTOR) -> int:
+    """Bytes of ``factor`` float32 copies of ``image``."""
+    return int(factor * np.size(image) * INTENSITY_DTYPE.itemsize)
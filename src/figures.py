@@ -2,11 +2,14 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import matplotlib.pyplot as plt
 import pandas as pd
 
+from src.object_dataset import read_object_dataset
+
 
 def save_condition_summary_plot(sample_table: pd.DataFrame, destination: str | Path, outcome: str = "cell_count") -> Path:
+    import matplotlib.pyplot as plt
+
     destination = Path(destination)
     destination.parent.mkdir(parents=True, exist_ok=True)
     grouped = sample_table.groupby("condition", dropna=False)[outcome]
@@ -26,6 +29,8 @@ def save_condition_summary_plot(sample_table: pd.DataFrame, destination: str | P
 
 
 def save_paired_plot(sample_table: pd.DataFrame, destination: str | Path, outcome: str = "cell_count") -> Path | None:
+    import matplotlib.pyplot as plt
+
     if "animal_id" not in sample_table.columns or "condition" not in sample_table.columns:
         return None
     pivot = sample_table.pivot_table(index="animal_id", columns="condition", values=outcome, aggfunc="mean").dropna()
@@ -47,6 +52,8 @@ def save_paired_plot(sample_table: pd.DataFrame, destination: str | Path, outcom
 
 
 def save_region_density_plot(region_table: pd.DataFrame, destination: str | Path) -> Path | None:
+    import matplotlib.pyplot as plt
+
     if region_table.empty:
         return None
     subset = region_table[region_table["region_axis"] == "ring"].copy()
@@ -76,6 +83,8 @@ def save_region_density_plot(region_table: pd.DataFrame, destination: str | Path
 
 
 def save_phenotype_composition_plot(sample_table: pd.DataFrame, destination: str | Path) -> Path | None:
+    import matplotlib.pyplot as plt
+
     phenotype_columns = [column for column in sample_table.columns if column.startswith("phenotype_count_")]
     if not phenotype_columns:
         return None
@@ -100,6 +109,8 @@ def save_phenotype_composition_plot(sample_table: pd.DataFrame, destination: str
 
 
 def save_atlas_deviation_plot(atlas_comparison: pd.DataFrame, destination: str | Path) -> Path | None:
+    import matplotlib.pyplot as plt
+
     if atlas_comparison.empty:
         return None
     subset = atlas_comparison[atlas_comparison["region_axis"] == "ring"].copy()
@@ -137,3 +148,32 @@ def save_atlas_deviation_plot(atlas_comparison: pd.DataFrame, destination: str |
     fig.savefig(destination, dpi=200)
     plt.close(fig)
     return destination
+
+
+def save_object_eccentricity_plot(object_dataset_root: str | Path, destination: str | Path) -> Path | None:
+    import matplotlib.pyplot as plt
+
+    objects = read_object_dataset(
+        object_dataset_root,
+        columns=["condition", "ecc_um"],
+        filters=[("kept", "==", True)],
+    )
+    if objects.empty or "ecc_um" not in objects.columns:
+        return None
+    objects = objects.dropna(subset=["ecc_um"])
+    if objects.empty:
+        return None
+
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    fig, ax = plt.subplots(figsize=(7, 4))
+    for condition, group in objects.groupby("condition", sort=True):
+        ax.hist(group["ecc_um"].to_numpy(dtype=float), bins=30, histtype="step", density=True, label=str(condition))
+    ax.set_xlabel("Eccentricity (um)")
+    ax.set_ylabel("Object density")
+    ax.set_title("Kept objects by eccentricity")
+    ax.legend(fontsize=8)
+    fig.tight_layout()
+    fig.savefig(destination, dpi=200)
+    plt.close(fig)
+    return destination
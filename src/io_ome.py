@@ -25,6 +25,21 @@ def is_ome_tiff(path: str) -> bool:
 def is_zarr_like(path: str) -> bool:
     return path.lower().endswith(".zarr") or os.path.isdir(path) and path.lower().endswith(".zarr")
 
+def _add_aics_pixel_sizes(img, meta: Dict[str, Any]) -> None:
+    # Pull pixel size if present
+    try:
+        pixel_sizes = getattr(img, "physical_pixel_sizes", None)
+        if pixel_sizes is not None:
+            if getattr(pixel_sizes, "X", None) is not None:
+                meta["microns_per_pixel_x"] = float(pixel_sizes.X)
+            if getattr(pixel_sizes, "Y", None) is not None:
+                meta["microns_per_pixel_y"] = float(pixel_sizes.Y)
+            if getattr(pixel_sizes, "Z", None) is not None:
+                meta["microns_per_pixel_z"] = float(pixel_sizes.Z)
+    except Exception:
+        pass
+
+
 def load_any_image(path: str) -> Tuple[np.ndarray, Dict[str, Any]]:
     """
     Load OME-TIFF, OME-Zarr, or standard TIFF. Returns (array, metadata).
@@ -61,19 +76,7 @@ def load_any_image(path: str) -> Tuple[np.ndarray, Dict[str, Any]]:
         data = _normalize_loaded_array(data)
         meta["canonical_loaded_shape"] = _shape_list(data.shape)
 
-        # Pull pixel size if present
-        try:
-            pixel_sizes = getattr(img, "physical_pixel_sizes", None)
-            if pixel_sizes is not None:
-                if getattr(pixel_sizes, "X", None) is not None:
-                    meta["microns_per_pixel_x"] = float(pixel_sizes.X)
-                if getattr(pixel_sizes, "Y", None) is not None:
-                    meta["microns_per_pixel_y"] = float(pixel_sizes.Y)
-                if getattr(pixel_sizes, "Z", None) is not None:
-                    meta["microns_per_pixel_z"] = float(pixel_sizes.Z)
-        except Exception:
-            pass
-
+        _add_aics_pixel_sizes(img, meta)
         return data, meta
     except Exception:
         # Fallback to tifffile for standard microscopy formats first
@@ -102,14 +105,329 @@ def load_any_image(path: str) -> Tuple[np.ndarray, Dict[str, Any]]:
                 raise RuntimeError(f"Could not read image: {path}. Error: {e}") from e
 
 
+def _squeeze_lazy(array: Any) -> Any:
+    """``_normalize_loaded_array`` for on-disk arrays; None if squeezing would have to load the data."""
+    if 1 not in tuple(array.shape):
+        return array
+    if hasattr(array, "squeeze"):
+        # np.memmap and dask arrays squeeze into views.
+        return array.squeeze()
+    try:
+        import dask.array as da
+    except ImportError:
+        return None
+    return da.from_zarr(array).squeeze()
+
+
+def _open_tiff_lazily(path: str) -> Tuple[Any, str]:
+    import tifffile
+
+    try:
+        return tifffile.memmap(path, mode="r"), "memmap"
+    except Exception:
+        import zarr
+
+        # Compressed or tiled data cannot be memory-mapped; read it through
+        # tifffile's zarr store, one chunk at a time.
+        store = zarr.open(tifffile.imread(path, aszarr=True), mode="r")
+        if isinstance(store, zarr.hierarchy.Group):
+            store = store["0"]
+        return store, "zarr"
+
+
+def open_lazy_image(path: str) -> Tuple[Any, Dict[str, Any]]:
+    """
+    ``load_any_image`` for volumes too large to hold in memory.
+
+    Returns the same layout and metadata, but the pixels stay on disk: a dask
+    array from aicsimageio, a ``np.memmap`` or a zarr view of a TIFF. Slices
+    are only read when indexed, which is how ``project_volume`` consumes them.
+    Falls back to ``load_any_image`` when no lazy reader handles the file.
+    """
+    meta: Dict[str, Any] = {"path": path}
+    if path.lower().endswith((".jpg", ".jpeg", ".png")):
+        return load_any_image(path)
+    try:
+        from aicsimageio import AICSImage
+
+        img = AICSImage(path)
+        data = img.get_image_dask_data("CZYX")
+        meta["reader"] = "aicsimageio"
+        meta["aics_requested_dims"] = "CZYX"
+        meta["aics_raw_shape"] = _shape_list(data.shape)
+        if data.ndim in (3, 4):
+            data = np.moveaxis(data, 0, -1)
+        data = data.squeeze()
+        meta["canonical_loaded_shape"] = _shape_list(data.shape)
+        meta["lazy_reader"] = "dask"
+        _add_aics_pixel_sizes(img, meta)
+        return data, meta
+    except Exception:
+        pass
+    try:
+        raw, lazy_reader = _open_tiff_lazily(path)
+        arr = _squeeze_lazy(raw)
+    except Exception:
+        arr = None
+    if arr is None:
+        return load_any_image(path)
+    meta["reader"] = "tifffile"
+    meta["reader_raw_shape"] = _shape_list(raw.shape)
+    meta["canonical_loaded_shape"] = _shape_list(arr.shape)
+    meta["lazy_reader"] = lazy_reader
+    return arr, meta
+
+
+LABEL_CHUNK_TARGET_BYTES = 4 * 1024 * 1024
+LABEL_PYRAMID_MIN_SIDE = 256
+
+
+def choose_label_chunk_side(shape: tuple[int, ...], dtype: Any, target_bytes: int = LABEL_CHUNK_TARGET_BYTES) -> int:
+    """Square chunk side (a power of two) holding roughly ``target_bytes`` of labels."""
+    itemsize = np.dtype(dtype).itemsize
+    side = 1 << int(np.floor(np.log2(max(np.sqrt(target_bytes / itemsize), 1.0))))
+    longest = max(int(dim) for dim in shape[-2:])
+    return int(max(64, min(side, 1 << int(np.ceil(np.log2(max(longest, 1)))))))
+
+
+def _label_compressor(dtype: Any):
+    from numcodecs import Blosc
+
+    # Label chunks are long runs of identical ids; byte shuffle only helps
+    # once the ids span several bytes.
+    shuffle = Blosc.SHUFFLE if np.dtype(dtype).itemsize > 1 else Blosc.NOSHUFFLE
+    return Blosc(cname="zstd", clevel=5, shuffle=shuffle)
+
+
+def _label_pyramid_shapes(shape: tuple[int, int], levels: Optional[int]) -> list[tuple[int, int]]:
+    shapes = [(int(shape[0]), int(shape[1]))]
+    while True:
+        if levels is not None and len(shapes) >= levels:
+            break
+        height, width = shapes[-1]
+        if levels is None and max(height, width) <= LABEL_PYRAMID_MIN_SIDE:
+            break
+        if min(height, width) < 2:
+            break
+        shapes.append(((height + 1) // 2, (width + 1) // 2))
+    return shapes
+
+
+def downsample_labels_mode(labels: np.ndarray) -> np.ndarray:
+    """
+    Halve a 2D label image, keeping the most frequent id of each 2x2 block.
+
+    Ties prefer nonzero ids, then the earliest pixel in raster order, so a
+    1-px line survives every level whichever row or column it sits on instead
+    of being erased the way strided (nearest) downsampling does. Odd edges are
+    padded by replication.
+    """
+    arr = np.asarray(labels)
+    height, width = arr.shape
+    if height % 2 or width % 2:
+        arr = np.pad(arr, ((0, height % 2), (0, width % 2)), mode="edge")
+    blocks = np.stack(
+        [arr[0::2, 0::2], arr[0::2, 1::2], arr[1::2, 0::2], arr[1::2, 1::2]],
+        axis=-1,
+    )
+    votes = (blocks[..., :, None] == blocks[..., None, :]).sum(axis=-1)
+    # Doubling the votes leaves room for the nonzero tie-break without letting
+    # it outweigh a real majority.
+    winner = np.argmax(2 * votes + (blocks != 0), axis=-1)
+    return np.take_along_axis(blocks, winner[..., None], axis=-1)[..., 0]
+
+
+def _chunk_windows(shape: tuple[int, int], side: int) -> list[tuple[int, int, int, int]]:
+    return [
+        (y0, min(y0 + side, shape[0]), x0, min(x0 + side, shape[1]))
+        for y0 in range(0, shape[0], side)
+        for x0 in range(0, shape[1], side)
+    ]
+
+
+def _tile_is_chunk_aligned(y0: int, x0: int, tile_shape: tuple[int, ...], shape: tuple[int, int], side: int) -> bool:
+    """Whether a tile covers whole chunks only (the image edge counts as a chunk boundary)."""
+    y1 = int(y0) + int(tile_shape[0])
+    x1 = int(x0) + int(tile_shape[1])
+    return (
+        int(y0) % side == 0
+        and int(x0) % side == 0
+        and (y1 % side == 0 or y1 >= shape[0])
+        and (x1 % side == 0 or x1 >= shape[1])
+    )
+
+
+def _write_tiles_level0(dataset, labels, tiles, side: int, max_workers: int) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    shape = tuple(dataset.shape[-2:])
+
+    def write_window(window: tuple[int, int, int, int]) -> None:
+        y0, y1, x0, x1 = window
+        dataset[0, y0:y1, x0:x1] = np.asarray(labels[y0:y1, x0:x1])
+
+    def write_tile(item: tuple[int, int, Any]) -> None:
+        y0, x0, tile = item
+        tile = np.asarray(tile)
+        dataset[0, y0:y0 + tile.shape[0], x0:x0 + tile.shape[1]] = tile
+
+    if tiles is None:
+        windows = _chunk_windows(shape, side)
+        if max_workers <= 1:
+            for window in windows:
+                write_window(window)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(write_window, windows))
+        return
+
+    if max_workers <= 1:
+        for item in tiles:
+            write_tile(item)
+        return
+    # A tile that only partly covers a chunk is a read-modify-write of that
+    # chunk, which would race with any worker writing a neighbouring tile.
+    # Chunk-aligned tiles are written concurrently; any other tile waits for
+    # the in-flight writes to finish and is then written on its own.
+    from threading import BoundedSemaphore
+
+    slots = BoundedSemaphore(max_workers * 2)
+    pending = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for y0, x0, tile in tiles:
+            item = (y0, x0, np.asarray(tile))
+            if not _tile_is_chunk_aligned(y0, x0, item[2].shape, shape, side):
+                for future in pending:
+                    future.result()
+                pending = []
+                write_tile(item)
+                continue
+            slots.acquire()
+            future = executor.submit(write_tile, item)
+            future.add_done_callback(lambda _f: slots.release())
+            pending.append(future)
+        for future in pending:
+            future.result()
+
+
+def _write_downsampled_level(source, target, side: int, max_workers: int) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    source_shape = tuple(source.shape[-2:])
+
+    def write_window(window: tuple[int, int, int, int]) -> None:
+        y0, y1, x0, x1 = window
+        block = np.asarray(source[0, 2 * y0:min(2 * y1, source_shape[0]), 2 * x0:min(2 * x1, source_shape[1])])
+        target[0, y0:y1, x0:x1] = downsample_labels_mode(block)
+
+    windows = _chunk_windows(tuple(target.shape[-2:]), side)
+    if max_workers <= 1:
+        for window in windows:
+            write_window(window)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(write_window, windows))
+
+
+def write_label_pyramid(group,
+                        labels: Any,
+                        *,
+                        name: str = "masks",
+                        shape: Optional[tuple[int, int]] = None,
+                        dtype: Any = None,
+                        chunk: Optional[int] = None,
+                        levels: Optional[int] = None,
+                        max_workers: int = 1,
+                        metadata: Optional[Dict[str, Any]] = None):
+    """
+    Write a multiscale NGFF label image under ``group/labels/<name>``.
+
+    ``labels`` is either a 2D array-like that supports slicing (ndarray,
+    memmap, zarr or dask array) and is read one chunk window at a time, or an
+    iterable of ``(y0, x0, tile)`` tuples streamed from a tiled producer, in
+    which case ``shape`` and ``dtype`` are required. Tiles aligned with the
+    chunk grid are written in parallel; unaligned tiles are written serially.
+    Level 0 is written chunk by chunk; each further level is mode-downsampled
+    from the previous one on disk, so the full resolution image never has to
+    be held in memory.
+    """
+    is_array = hasattr(labels, "shape") and hasattr(labels, "__getitem__")
+    if is_array:
+        if np.ndim(labels) == 3 and labels.shape[0] == 1:
+            labels = labels[0]
+        shape = tuple(int(dim) for dim in labels.shape)
+        dtype = labels.dtype
+    elif shape is None or dtype is None:
+        raise ValueError("Streamed label tiles require explicit shape and dtype.")
+    if len(shape) != 2:
+        raise ValueError(f"Label image must be 2D (Y, X); got shape {shape}.")
+
+    side = int(chunk) if chunk else choose_label_chunk_side(shape, dtype)
+    compressor = _label_compressor(dtype)
+    labels_grp = group.require_group("labels")
+    existing = list(labels_grp.attrs.get("labels", []))
+    if name not in existing:
+        labels_grp.attrs["labels"] = existing + [name]
+    label_grp = labels_grp.create_group(name, overwrite=True)
+
+    datasets = []
+    previous = None
+    for level, (height, width) in enumerate(_label_pyramid_shapes(shape, levels)):
+        dataset = label_grp.zeros(
+            str(level),
+            shape=(1, height, width),
+            chunks=(1, min(side, height), min(side, width)),
+            dtype=dtype,
+            compressor=compressor,
+        )
+        if previous is None:
+            _write_tiles_level0(dataset, labels if is_array else None, None if is_array else labels, side, max_workers)
+        else:
+            _write_downsampled_level(previous, dataset, side, max_workers)
+        factor = float(2 ** level)
+        datasets.append(
+            {
+                "path": str(level),
+                "coordinateTransformations": [{"type": "scale", "scale": [1.0, factor, factor]}],
+            }
+        )
+        previous = dataset
+
+    label_grp.attrs["multiscales"] = [
+        {
+            "version": "0.4",
+            "name": name,
+            "axes": [
+                {"name": "c", "type": "channel"},
+                {"name": "y", "type": "space"},
+                {"name": "x", "type": "space"},
+            ],
+            "datasets": datasets,
+            "metadata": {"method": "mode", "description": "2x2 mode downsampling"},
+        }
+    ]
+    label_grp.attrs["image-label"] = {"version": "0.4", "source": {"image": "../../"}}
+    for key, value in (metadata or {}).items():
+        label_grp.attrs[key] = value
+    return label_grp
+
+
 def save_labels_to_ome_zarr(image: np.ndarray,
-                            labels: np.ndarray,
+                            labels: Any,
                             out_dir: str,
                             metadata: Optional[Dict[str, Any]] = None,
-                            chunk: int = 256) -> str:
+                            chunk: Optional[int] = None,
+                            *,
+                            levels: Optional[int] = None,
+                            max_workers: int = 1,
+                            label_shape: Optional[tuple[int, int]] = None,
+                            label_dtype: Any = None) -> str:
     """
-    Save an image and label mask to an OME-Zarr store.
-    This is a minimal writer. For full NGFF metadata, use ome_zarr.writer.
+    Save an image and a multiscale label pyramid to an OME-Zarr store.
+
+    ``labels`` may be an in-memory array, a lazily sliced array-like, or a
+    stream of ``(y0, x0, tile)`` tuples (see ``write_label_pyramid``). When
+    ``chunk`` is None, the label chunk side is chosen from the dtype.
     """
     try:
         import zarr
@@ -128,22 +446,21 @@ def save_labels_to_ome_zarr(image: np.ndarray,
             # attempt best effort
             img = image
 
-        chunks = (1, chunk, chunk) if img.ndim == 3 else None
-        write_image(image=img, group=root, axes="CYX", storage_options={"chunks": chunks})
-
-        # Labels
-        labels_grp = root.create_group("labels")
-        lg = labels_grp.create_group("masks")
-        # Store as (1, Y, X)
-        if labels.ndim == 2:
-            lab = labels[np.newaxis, ...]
-        else:
-            lab = labels
-        lg.array("0", data=lab, chunks=(1, chunk, chunk), dtype=labels.dtype)
-        if metadata:
-            for k, v in metadata.items():
-                lg.attrs[k] = v
+        image_chunk = int(chunk) if chunk else choose_label_chunk_side(img.shape, img.dtype)
+        chunks = (1, image_chunk, image_chunk) if img.ndim == 3 else None
+        write_image(image=img, group=root, axes="cyx", storage_options={"chunks": chunks})
 
+        write_label_pyramid(
+            root,
+            labels,
+            name="masks",
+            shape=label_shape,
+            dtype=label_dtype,
+            chunk=chunk,
+            levels=levels,
+            max_workers=max_workers,
+            metadata=metadata,
+        )
         return out_dir
     except Exception as e:
         raise RuntimeError(
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+
+def json_ready(value: Any) -> Any:
+    """
+    Convert numpy values, paths and sets to JSON types; JSON values pass
+    through unchanged. Anything else raises ``TypeError`` rather than being
+    stringified, so an unexpected object in a stored result fails the write
+    instead of coming back as a different value.
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if value is None or isinstance(value, (str, int, float, bool, list, tuple, dict)):
+        return value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class JsonlIndex:
+    """
+    Append-only JSON-lines file of dict entries keyed by ``key_field``.
+
+    Later lines win on reload. A line truncated by a crash is ignored, and the
+    next append starts on a fresh line so the partial one never swallows it.
+    """
+
+    def __init__(self, path: str | Path, key_field: str, *, load_existing: bool = True):
+        self.path = Path(path)
+        self.key_field = key_field
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._pending_newline = False
+        if self.path.exists() and self.path.stat().st_size > 0:
+            with self.path.open("rb") as handle:
+                handle.seek(-1, 2)
+                self._pending_newline = handle.read(1) != b"\n"
+        if load_existing and self.path.exists():
+            for line in self.path.read_text(encoding="utf-8").splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(entry, dict) and key_field in entry:
+                    self._entries[str(entry[key_field])] = entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        return self._entries.get(key)
+
+    def add(self, entry: dict[str, Any]) -> None:
+        """Durably append ``entry``; it is visible to ``get`` once its line is on disk."""
+        line = json.dumps(entry, default=json_ready)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                if self._pending_newline:
+                    handle.write("\n")
+                    self._pending_newline = False
+                handle.write(line + "\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+            self._entries[str(entry[self.key_field])] = entry
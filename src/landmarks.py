@@ -1,43 +1,194 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import Any
 
 import cv2
 import numpy as np
-from scipy.ndimage import binary_closing, binary_fill_holes, binary_opening
+from scipy.ndimage import binary_closing, binary_dilation, binary_erosion, binary_fill_holes, binary_opening
 from skimage.filters import threshold_otsu
 from skimage.measure import label, regionprops
 
 
-def build_tissue_mask(gray: np.ndarray) -> np.ndarray:
+TISSUE_MASK_TARGET_SIDE = 1024
+_OPENING_SIZE = 5
+_CLOSING_SIZE = 9
+
+
+@dataclass(frozen=True)
+class TissueMask:
+    """Tissue mask at full resolution and at the coarse level it was derived from.
+
+    ``coarse`` covers ``ceil(shape / scale)`` blocks of ``scale`` x ``scale``
+    full-resolution pixels; with ``scale == 1`` both levels are the same array.
+    """
+
+    mask: np.ndarray
+    coarse: np.ndarray
+    scale: int
+    threshold: float
+
+    def coarse_pixel_centers_xy(self) -> tuple[np.ndarray, np.ndarray]:
+        """Full-resolution (x, y) centres of the coarse tissue pixels."""
+        ys, xs = np.where(self.coarse)
+        return (xs + 0.5) * self.scale - 0.5, (ys + 0.5) * self.scale - 0.5
+
+
+def tissue_mask_scale(shape: tuple[int, ...], target_side: int = TISSUE_MASK_TARGET_SIDE) -> int:
+    """Largest power-of-two factor that keeps the coarse level at least ``target_side`` pixels long."""
+    longest = max(int(dim) for dim in shape[:2]) if len(shape) >= 2 else 0
+    if longest <= target_side:
+        return 1
+    return int(2 ** int(np.floor(np.log2(longest / target_side))))
+
+
+def _structure(size: int, scale: int) -> np.ndarray:
+    side = max(1, int(round(size / scale))) | 1
+    return np.ones((side, side), dtype=bool)
+
+
+def _block_mean(image: np.ndarray, scale: int) -> np.ndarray:
+    height, width = image.shape
+    out_h, out_w = -(-height // scale), -(-width // scale)
+    padded = np.pad(image, ((0, out_h * scale - height), (0, out_w * scale - width)), mode="edge")
+    return padded.reshape(out_h, scale, out_w, scale).mean(axis=(1, 3))
+
+
+def _upsample(mask: np.ndarray, scale: int, shape: tuple[int, int]) -> np.ndarray:
+    return np.repeat(np.repeat(mask, scale, axis=0), scale, axis=1)[: shape[0], : shape[1]]
+
+
+def _full_resolution_mask(image: np.ndarray, threshold: float) -> np.ndarray:
+    mask = image > threshold
+    mask = binary_opening(mask, structure=np.ones((_OPENING_SIZE, _OPENING_SIZE)))
+    mask = binary_closing(mask, structure=np.ones((_CLOSING_SIZE, _CLOSING_SIZE)))
+    return mask
+
+
+def _refine_boundary_band(
+    image: np.ndarray,
+    coarse: np.ndarray,
+    threshold: float,
+    scale: int,
+    tile_blocks: int = 64,
+) -> np.ndarray:
+    """Upsample ``coarse`` and redo the full-resolution threshold and morphology
+    only in blocks within one coarse pixel of the tissue outline."""
+    shape = image.shape
+    full = _upsample(coarse, scale, shape)
+    band = binary_dilation(coarse, np.ones((3, 3), dtype=bool)) & ~binary_erosion(
+        coarse, np.ones((3, 3), dtype=bool), border_value=1
+    )
+    margin = _CLOSING_SIZE + _OPENING_SIZE
+    for by in range(0, band.shape[0], tile_blocks):
+        for bx in range(0, band.shape[1], tile_blocks):
+            tile_band = band[by:by + tile_blocks, bx:bx + tile_blocks]
+            if not tile_band.any():
+                continue
+            y0, x0 = by * scale, bx * scale
+            y1, x1 = min((by + tile_blocks) * scale, shape[0]), min((bx + tile_blocks) * scale, shape[1])
+            wy0, wx0 = max(y0 - margin, 0), max(x0 - margin, 0)
+            wy1, wx1 = min(y1 + margin, shape[0]), min(x1 + margin, shape[1])
+            refined = _full_resolution_mask(image[wy0:wy1, wx0:wx1], threshold)[y0 - wy0:y1 - wy0, x0 - wx0:x1 - wx0]
+            selected = _upsample(tile_band, scale, (y1 - y0, x1 - x0))
+            full[y0:y1, x0:x1][selected] = refined[selected]
+    return full
+
+
+def build_tissue_mask_levels(gray: np.ndarray, *, scale: int | None = None) -> TissueMask:
+    """
+    Otsu tissue mask computed at ``1/scale`` and refined along its outline.
+
+    The threshold comes from a strided sample of the full image, the coarse
+    level is the thresholded block mean with scaled opening/closing, and only
+    the band around the coarse outline is recomputed at full resolution.
+    ``scale=None`` picks ``tissue_mask_scale(gray.shape)``; ``scale=1`` is the
+    plain full-resolution computation.
+    """
     image = np.asarray(gray, dtype=np.float32)
     if image.size == 0:
-        return np.zeros_like(image, dtype=bool)
-    threshold = threshold_otsu(image)
-    mask = image > threshold
-    mask = binary_opening(mask, structure=np.ones((5, 5)))
-    mask = binary_closing(mask, structure=np.ones((9, 9)))
-    return mask.astype(bool)
+        empty = np.zeros_like(image, dtype=bool)
+        return TissueMask(mask=empty, coarse=empty, scale=1, threshold=0.0)
+    scale = int(scale) if scale is not None else tissue_mask_scale(image.shape)
+    scale = max(1, scale)
+    threshold = float(threshold_otsu(image[::scale, ::scale]))
+    if scale == 1:
+        mask = _full_resolution_mask(image, threshold).astype(bool)
+        return TissueMask(mask=mask, coarse=mask, scale=1, threshold=threshold)
 
+    coarse = _block_mean(image, scale) > threshold
+    coarse = binary_opening(coarse, structure=_structure(_OPENING_SIZE, scale))
+    coarse = binary_closing(coarse, structure=_structure(_CLOSING_SIZE, scale))
+    mask = _refine_boundary_band(image, coarse, threshold, scale)
+    return TissueMask(mask=mask.astype(bool), coarse=coarse.astype(bool), scale=scale, threshold=threshold)
 
-def detect_onh_hole(gray: np.ndarray) -> tuple[tuple[float, float] | None, dict[str, Any]]:
-    tissue_mask = build_tissue_mask(gray)
-    filled = binary_fill_holes(tissue_mask)
-    holes = filled & ~tissue_mask
 
-    props = regionprops(label(holes.astype(np.uint8)))
-    if not props:
-        return None, {"method": "auto_hole", "confidence": 0.0, "reason": "no_hole_found"}
+def build_tissue_mask(gray: np.ndarray, *, scale: int | None = None) -> np.ndarray:
+    return build_tissue_mask_levels(gray, scale=scale).mask
+
 
-    def score(region) -> float:
-        perimeter = max(float(region.perimeter), 1.0)
-        circularity = 4.0 * np.pi * float(region.area) / (perimeter * perimeter)
-        return float(region.area) * float(circularity)
+def _hole_score(region) -> float:
+    perimeter = max(float(region.perimeter), 1.0)
+    circularity = 4.0 * np.pi * float(region.area) / (perimeter * perimeter)
+    return float(region.area) * float(circularity)
+
+
+def _refine_hole(tissue: TissueMask, hole_labels: np.ndarray, coarse_region) -> tuple[Any, tuple[int, int]] | None:
+    """The full-resolution hole under a coarse hole, searched in its bounding box only."""
+    s = tissue.scale
+    min_row, min_col, max_row, max_col = coarse_region.bbox
+    by0, bx0 = max(min_row - 1, 0), max(min_col - 1, 0)
+    by1, bx1 = min(max_row + 1, hole_labels.shape[0]), min(max_col + 1, hole_labels.shape[1])
+    y0, x0 = by0 * s, bx0 * s
+    y1, x1 = min(by1 * s, tissue.mask.shape[0]), min(bx1 * s, tissue.mask.shape[1])
+    window = ~tissue.mask[y0:y1, x0:x1]
+    seed = _upsample(hole_labels[by0:by1, bx0:bx1] == coarse_region.label, s, window.shape)
+    labels = label(window)
+    overlap = np.bincount(labels[seed & window], minlength=int(labels.max()) + 1)
+    if overlap.size <= 1 or overlap[1:].max() == 0:
+        return None
+    best_label = int(np.argmax(overlap[1:]) + 1)
+    region = regionprops((labels == best_label).astype(np.uint8))[0]
+    return region, (y0, x0)
+
+
+def detect_onh_hole(
+    gray: np.ndarray,
+    *,
+    tissue: TissueMask | None = None,
+    scale: int | None = None,
+) -> tuple[tuple[float, float] | None, dict[str, Any]]:
+    """
+    Locate the optic nerve head as the most circular, largest hole in the tissue.
+
+    Candidate holes are filled and scored on the coarse level; the winner is
+    measured again at full resolution inside its bounding box.
+    """
+    if tissue is None:
+        tissue = build_tissue_mask_levels(gray, scale=scale)
+    filled = binary_fill_holes(tissue.coarse)
+    holes = filled & ~tissue.coarse
+
+    hole_labels = label(holes.astype(np.uint8))
+    props = regionprops(hole_labels)
+    if not props:
+        return None, {"method": "auto_hole", "confidence": 0.0, "reason": "no_hole_found", "scale": tissue.scale}
 
-    best = max(props, key=score)
-    y, x = best.centroid
-    confidence = min(1.0, score(best) / max(float(gray.shape[0] * gray.shape[1]) * 0.01, 1.0))
-    return (float(x), float(y)), {"method": "auto_hole", "confidence": float(confidence)}
+    best = max(props, key=_hole_score)
+    if tissue.scale == 1:
+        y, x = best.centroid
+        best_score = _hole_score(best)
+    else:
+        refined = _refine_hole(tissue, hole_labels, best)
+        if refined is None:
+            y, x = (np.asarray(best.centroid) + 0.5) * tissue.scale - 0.5
+            best_score = _hole_score(best) * tissue.scale**2
+        else:
+            region, (y0, x0) = refined
+            y, x = region.centroid[0] + y0, region.centroid[1] + x0
+            best_score = _hole_score(region)
+    confidence = min(1.0, best_score / max(float(gray.shape[0] * gray.shape[1]) * 0.01, 1.0))
+    return (float(x), float(y)), {"method": "auto_hole", "confidence": float(confidence), "scale": tissue.scale}
 
 
 def mask_coverage_fraction(mask: np.ndarray) -> float:
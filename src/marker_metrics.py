@@ -6,7 +6,9 @@ from typing import Any
 import cv2
 import numpy as np
 import pandas as pd
-from scipy.ndimage import distance_transform_edt
+from scipy.ndimage import distance_transform_edt, find_objects
+
+from src.dtypes import INTENSITY_DTYPE
 
 
 def _is_channel_last(image: np.ndarray) -> bool:
@@ -14,46 +16,51 @@ def _is_channel_last(image: np.ndarray) -> bool:
 
 
 def _channel_arrays(image: np.ndarray, config: dict[str, Any] | None) -> dict[str, np.ndarray]:
+    # Channels are views of ``image`` in its own dtype; per-object statistics
+    # are reduced from them directly, so no float copy of each channel is made.
     channels_cfg = (config or {}).get("channels", {})
     arrays: dict[str, np.ndarray] = {}
 
     if image.ndim == 2:
-        arrays["GRAY"] = image.astype(np.float32)
+        arrays["GRAY"] = image
     elif _is_channel_last(image):
         for idx in range(image.shape[-1]):
-            arrays[f"C{idx}"] = image[..., idx].astype(np.float32)
+            arrays[f"C{idx}"] = image[..., idx]
     else:
-        arrays["GRAY"] = image.astype(np.float32)
+        arrays["GRAY"] = image
 
     for name, index in channels_cfg.items():
         if isinstance(index, int):
             if image.ndim == 2:
                 if index != 0:
                     raise ValueError(f"Channel index {index} requested for single-channel image.")
-                arrays[str(name)] = image.astype(np.float32)
+                arrays[str(name)] = image
             elif _is_channel_last(image):
-                arrays[str(name)] = image[..., int(index)].astype(np.float32)
+                arrays[str(name)] = image[..., int(index)]
             else:
-                arrays[str(name)] = image[int(index), ...].astype(np.float32)
+                arrays[str(name)] = image[int(index), ...]
 
     for name, compose_cfg in (config or {}).get("compose", {}).items():
         mode = compose_cfg.get("mode", "max")
         sources = compose_cfg.get("sources", [])
         if not sources:
             continue
-        built = []
+        if mode not in {"max", "sum"}:
+            raise ValueError(f"Unsupported compose mode: {mode}")
+        # Weighted sources are folded into one float32 buffer instead of stacking a copy per source.
+        composed: np.ndarray | None = None
         for source in sources:
             source_name = str(source["channel"])
             if source_name not in arrays:
                 raise ValueError(f"Composed channel '{name}' references unknown channel '{source_name}'.")
-            weight = float(source.get("weight", 1.0))
-            built.append(arrays[source_name] * weight)
-        if mode == "max":
-            arrays[str(name)] = np.maximum.reduce(built)
-        elif mode == "sum":
-            arrays[str(name)] = np.sum(built, axis=0)
-        else:
-            raise ValueError(f"Unsupported compose mode: {mode}")
+            weighted = np.multiply(arrays[source_name], INTENSITY_DTYPE.type(source.get("weight", 1.0)), dtype=INTENSITY_DTYPE)
+            if composed is None:
+                composed = weighted
+            elif mode == "max":
+                np.maximum(composed, weighted, out=composed)
+            else:
+                np.add(composed, weighted, out=composed)
+        arrays[str(name)] = composed
 
     return arrays
 
@@ -155,10 +162,21 @@ def add_marker_metrics(
         relation_values[f"relation.overlap_fraction.{mask_name}"] = []
         relation_values[f"relation.distance_to_mask_px.{mask_name}"] = []
 
+    windows = find_objects(labels)
     for object_id in out["object_id"].astype(int):
-        mask = labels == object_id
+        # Work inside the object's bounding box, padded by one pixel so contours see background on every side.
+        bounds = windows[object_id - 1] if 0 < object_id <= len(windows) else None
+        if bounds is None:
+            y0 = x0 = 0
+            mask = np.zeros((1, 1), dtype=bool)
+        else:
+            y0 = max(0, bounds[0].start - 1)
+            x0 = max(0, bounds[1].start - 1)
+            mask = labels[y0:bounds[0].stop + 1, x0:bounds[1].stop + 1] == object_id
         ys, xs = np.where(mask)
         peri, circ = _circularity(mask)
+        ys += y0
+        xs += x0
         ecc = _eccentricity(ys, xs)
         perimeters.append(peri)
         circularities.append(circ)
@@ -6,8 +6,10 @@ from typing import Any
 
 import numpy as np
 import pandas as pd
+from scipy import ndimage as ndi
 from skimage.measure import regionprops_table
 
+from src.dtypes import compact_label_dtype, relabel_lut
 from src.schema import OBJECT_TABLE_COLUMNS, OBJECT_TABLE_VERSION, order_columns, validate_object_table
 
 
@@ -58,24 +60,26 @@ def build_object_table(
         ]
         if gray_image is not None:
             properties.extend(["intensity_mean", "intensity_max"])
-        props = pd.DataFrame(regionprops_table(labels.astype(np.int32), intensity_image=gray_image, properties=properties))
+        # regionprops handles unsigned labels directly, so no int32 copy of the label image.
+        props = pd.DataFrame(regionprops_table(labels, intensity_image=gray_image, properties=properties))
         props = props.sort_values("label").reset_index(drop=True)
 
         for record in props.to_dict("records"):
             object_id = int(record["label"])
-            ys, xs = np.where(labels == object_id)
-            if len(ys) == 0:
-                continue
             area_px = int(record["area"])
-            focus_overlap_px = int(focus_mask[ys, xs].sum()) if focus_mask is not None else area_px
-            perimeter = float(record.get("perimeter", 0.0) or 0.0)
-            circularity = float(4.0 * np.pi * area_px / (perimeter * perimeter)) if perimeter > 1e-6 else 0.0
             bbox = (
                 int(record["bbox-0"]),
                 int(record["bbox-1"]),
                 int(record["bbox-2"]),
                 int(record["bbox-3"]),
             )
+            if focus_mask is not None:
+                window = (slice(bbox[0], bbox[2]), slice(bbox[1], bbox[3]))
+                focus_overlap_px = int(np.count_nonzero(focus_mask[window][labels[window] == object_id]))
+            else:
+                focus_overlap_px = area_px
+            perimeter = float(record.get("perimeter", 0.0) or 0.0)
+            circularity = float(4.0 * np.pi * area_px / (perimeter * perimeter)) if perimeter > 1e-6 else 0.0
 
             row = {
                 "object_table_version": OBJECT_TABLE_VERSION,
@@ -170,15 +174,11 @@ def relabel_kept_objects(labels: np.ndarray, object_table: pd.DataFrame) -> np.n
     if "kept" in kept.columns:
         kept = kept.loc[kept["kept"].fillna(True).astype(bool)]
     if kept.empty:
-        return np.zeros_like(labels, dtype=np.uint16)
+        return np.zeros_like(labels, dtype=compact_label_dtype(0))
 
-    relabeled = np.zeros_like(labels, dtype=np.uint32)
-    next_id = 1
-    for object_id in kept["object_id"].astype(int).tolist():
-        relabeled[labels == object_id] = next_id
-        next_id += 1
-    dtype = np.uint16 if next_id - 1 <= np.iinfo(np.uint16).max else np.uint32
-    return relabeled.astype(dtype, copy=False)
+    keep_ids = kept["object_id"].astype(np.int64).to_numpy()
+    max_label = max(int(labels.max()) if labels.size else 0, int(keep_ids.max()))
+    return relabel_lut(max_label, keep_ids)[labels]
 
 
 def add_uncertainty_summary_columns(
@@ -190,8 +190,13 @@ def add_uncertainty_summary_columns(
         return object_table.copy()
 
     rows: list[dict[str, float | int]] = []
+    windows = ndi.find_objects(labels)
     for object_id in object_table["object_id"].astype(int).tolist():
-        pixels = foreground_probability[labels == object_id]
+        window = windows[object_id - 1] if 0 < object_id <= len(windows) else None
+        if window is None:
+            pixels = foreground_probability[:0, 0]
+        else:
+            pixels = foreground_probability[window][labels[window] == object_id]
         if pixels.size == 0:
             rows.append(
                 {
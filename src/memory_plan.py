@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import numpy as np
+
+
+MB = 1024 * 1024
+TILE_SIZE_CANDIDATES = (4096, 2048, 1024, 512, 256)
+
+# Rough transient bytes per input pixel while one segmenter call runs
+# (network activations, flows, distance/probability maps, watershed buffers).
+BACKEND_WORKSPACE_BYTES_PER_PX = {
+    "blob_watershed": 40,
+    "cellpose": 120,
+    "stardist": 160,
+    "sam": 200,
+}
+DEFAULT_WORKSPACE_BYTES_PER_PX = 120
+
+# Bytes per pixel of the preprocessed copy a backend keeps (see Segmenter.preprocess).
+BACKEND_PREPROCESSED_BYTES_PER_PX = {
+    "blob_watershed": 4,
+    "stardist": 4,
+    "sam": 3,
+}
+
+
+@dataclass(frozen=True)
+class MemoryPlan:
+    """Execution settings chosen so the estimated peak stays within ``budget_bytes``."""
+
+    budget_bytes: int
+    estimated_peak_bytes: int
+    stage_peak_bytes: dict[str, int]
+    tiling: bool
+    tile_size: int
+    tile_overlap: int
+    keep_intermediate_maps: bool
+    within_budget: bool
+
+    def summary(self) -> dict[str, Any]:
+        payload = asdict(self)
+        payload["budget_mb"] = round(self.budget_bytes / MB, 1)
+        payload["estimated_peak_mb"] = round(self.estimated_peak_bytes / MB, 1)
+        return payload
+
+
+def estimate_stage_memory(
+    *,
+    image_shape: tuple[int, ...],
+    image_dtype: Any,
+    gray_shape: tuple[int, ...],
+    gray_dtype: Any,
+    backend: str,
+    tta_views: int = 1,
+    tile_size: int | None = None,
+    tile_overlap: int = 128,
+    gray_is_image: bool = False,
+    keep_intermediate_maps: bool = True,
+) -> dict[str, int]:
+    """
+    Peak bytes per pipeline phase for one image, from shapes and dtypes only.
+
+    ``prepare`` covers the source image, grayscale and preprocessed copies,
+    ``segment`` adds the segmenter workspace (per tile when ``tile_size`` is
+    set) and TTA vote stacks, and ``measure`` the label, mask and
+    probability maps that stay on the context afterwards.
+    """
+    height, width = (int(gray_shape[0]), int(gray_shape[1])) if len(gray_shape) >= 2 else (1, 1)
+    pixels = height * width
+    image_bytes = int(np.prod(image_shape, dtype=np.int64)) * np.dtype(image_dtype).itemsize
+    gray_bytes = 0 if gray_is_image else pixels * np.dtype(gray_dtype).itemsize
+    backend = (backend or "").lower()
+    preprocessed_bytes = pixels * BACKEND_PREPROCESSED_BYTES_PER_PX.get(backend, 0)
+    workspace_per_px = BACKEND_WORKSPACE_BYTES_PER_PX.get(backend, DEFAULT_WORKSPACE_BYTES_PER_PX)
+    views = max(1, int(tta_views))
+    qc_mask_bytes = pixels
+    labels_bytes = pixels * 4
+    probability_bytes = pixels * 4
+
+    resident = image_bytes + gray_bytes + preprocessed_bytes + qc_mask_bytes
+    prepare = resident
+
+    if tile_size:
+        tile_pixels = min(int(tile_size), height) * min(int(tile_size), width)
+        step = max(1, int(tile_size) - int(tile_overlap))
+        coverage = (min(int(tile_size), height) / min(step, height)) * (min(int(tile_size), width) / min(step, width))
+        # Canvas plus every tile's uint32 labels, which are kept for stitching.
+        stitch_bytes = labels_bytes + int(pixels * 4 * max(1.0, coverage))
+        workspace = tile_pixels * workspace_per_px + tile_pixels * views * 5 + stitch_bytes
+        workspace += probability_bytes if views > 1 else 0
+    else:
+        # TTA keeps one uint8 vote per view and stacks them as float32 to average.
+        workspace = pixels * workspace_per_px + (pixels * views * 5 + probability_bytes if views > 1 else 0) + labels_bytes
+    segment = resident + workspace
+
+    retained = resident if keep_intermediate_maps else resident - preprocessed_bytes
+    measure = retained + labels_bytes * 2 + probability_bytes
+    return {"prepare": int(prepare), "segment": int(segment), "measure": int(measure)}
+
+
+def plan_memory(
+    *,
+    image_shape: tuple[int, ...],
+    image_dtype: Any,
+    gray_shape: tuple[int, ...],
+    gray_dtype: Any,
+    backend: str,
+    budget_mb: float,
+    tta_views: int = 1,
+    tiling: bool = False,
+    tile_size: int = 1024,
+    tile_overlap: int = 128,
+    gray_is_image: bool = False,
+) -> MemoryPlan:
+    """
+    Pick tiling, tile size and whether to keep intermediate maps for a budget.
+
+    Untiled runs are preferred when they fit. Otherwise the largest candidate
+    tile size that fits is used (never larger than a requested ``tile_size``
+    when ``tiling`` was already on), and intermediate maps are dropped only if
+    the smallest tile still does not fit.
+    """
+    budget = int(float(budget_mb) * MB)
+    common = dict(
+        image_shape=image_shape,
+        image_dtype=image_dtype,
+        gray_shape=gray_shape,
+        gray_dtype=gray_dtype,
+        backend=backend,
+        tta_views=tta_views,
+        tile_overlap=tile_overlap,
+        gray_is_image=gray_is_image,
+    )
+    longest = max(int(dim) for dim in gray_shape[:2])
+
+    candidates: list[int | None] = [] if tiling else [None]
+    limit = int(tile_size) if tiling else longest
+    candidates += [size for size in TILE_SIZE_CANDIDATES if size < limit and size > int(tile_overlap)]
+    if tiling:
+        candidates.insert(0, int(tile_size))
+
+    for keep_maps in (True, False):
+        for candidate in candidates:
+            stages = estimate_stage_memory(tile_size=candidate, keep_intermediate_maps=keep_maps, **common)
+            peak = max(stages.values())
+            if peak <= budget:
+                return MemoryPlan(
+                    budget_bytes=budget,
+                    estimated_peak_bytes=peak,
+                    stage_peak_bytes=stages,
+                    tiling=candidate is not None,
+                    tile_size=int(candidate or tile_size),
+                    tile_overlap=int(tile_overlap),
+                    keep_intermediate_maps=keep_maps,
+                    within_budget=True,
+                )
+
+    smallest = candidates[-1] if candidates else None
+    stages = estimate_stage_memory(tile_size=smallest, keep_intermediate_maps=False, **common)
+    return MemoryPlan(
+        budget_bytes=budget,
+        estimated_peak_bytes=max(stages.values()),
+        stage_peak_bytes=stages,
+        tiling=smallest is not None,
+        tile_size=int(smallest or tile_size),
+        tile_overlap=int(tile_overlap),
+        keep_intermediate_maps=False,
+        within_budget=False,
+    )
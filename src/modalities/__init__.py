@@ -9,6 +9,14 @@ from src.modalities.oct import adapt_oct_image
 from src.modalities.vis_octf import adapt_vis_octf_image
 
 
+VOLUMETRIC_MODALITIES = ("oct", "vis_octf", "visoctf", "vis-octf", "lightsheet", "light_sheet", "cleared_retina")
+
+
+def is_volumetric_modality(modality: str | None) -> bool:
+    """Whether ``modality`` projects a volume, so its input can be read lazily."""
+    return (modality or "flatmount").lower() in VOLUMETRIC_MODALITIES
+
+
 def adapt_image_for_modality(
     image: np.ndarray,
     meta: dict[str, Any] | None = None,
@@ -18,6 +26,7 @@ def adapt_image_for_modality(
     channel_index: int | None = 0,
     slab_start: int | None = None,
     slab_end: int | None = None,
+    projection_workers: int = 1,
 ) -> tuple[np.ndarray, dict[str, Any]]:
     normalized = (modality or "flatmount").lower()
     if normalized in ("flatmount", "fluorescence", "histology"):
@@ -33,6 +42,7 @@ def adapt_image_for_modality(
             channel_index=channel_index,
             slab_start=slab_start,
             slab_end=slab_end,
+            projection_workers=projection_workers,
         )
     if normalized in ("vis_octf", "visoctf", "vis-octf"):
         return adapt_vis_octf_image(
@@ -41,6 +51,7 @@ def adapt_image_for_modality(
             projection=projection,
             slab_start=slab_start,
             slab_end=slab_end,
+            projection_workers=projection_workers,
         )
     if normalized in ("lightsheet", "light_sheet", "cleared_retina"):
         return adapt_lightsheet_image(
@@ -49,5 +60,6 @@ def adapt_image_for_modality(
             projection=projection,
             slab_start=slab_start,
             slab_end=slab_end,
+            projection_workers=projection_workers,
         )
     raise ValueError(f"Unsupported modality: {modality}")
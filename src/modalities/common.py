@@ -5,62 +5,183 @@ from typing import Any
 import numpy as np
 
 
-def _projection_fn(name: str):
-    if name == "mean":
-        return np.mean
-    if name == "sum":
-        return np.sum
-    return np.max
+PROJECTION_CHUNK_BYTES = 256 * 1024 * 1024
 
 
-def reduce_channel_last(image: np.ndarray, *, channel_index: int | None = None) -> tuple[np.ndarray, dict[str, Any]]:
+def _projection_name(name: str) -> str:
+    return name if name in ("mean", "sum") else "max"
+
+
+def as_volume(image: Any) -> Any:
+    """Keep lazy or memory-mapped array-likes (``np.memmap``, zarr, dask) as they are; convert anything else."""
+    if isinstance(image, np.ndarray) or (hasattr(image, "shape") and hasattr(image, "dtype") and hasattr(image, "__getitem__")):
+        return image
+    return np.asarray(image)
+
+
+def _projection_dtypes(dtype: np.dtype, projection: str) -> tuple[np.dtype, np.dtype]:
+    """(accumulator, output) dtypes; the output matches what ``np.max/np.sum/np.mean`` return."""
+    probe = np.zeros((1, 1), dtype=dtype)
+    if projection == "max":
+        return dtype, dtype
+    if projection == "sum":
+        out = np.sum(probe, axis=0).dtype
+        return out, out
+    out = np.mean(probe, axis=0).dtype
+    # Running sums in float64 keep integer means exact; only one plane is ever held at that width.
+    return np.dtype(np.float64), out
+
+
+def _chunk_depth(shape: tuple[int, ...], itemsize: int, axis: int, chunk_bytes: int) -> int:
+    plane_bytes = max(int(np.prod([dim for index, dim in enumerate(shape) if index != axis])) * itemsize, 1)
+    return max(1, min(int(shape[axis]), chunk_bytes // plane_bytes))
+
+
+def _reduce_chunk(chunk: np.ndarray, axis: int, projection: str, accumulator: np.dtype) -> np.ndarray:
+    if projection == "max":
+        return np.max(chunk, axis=axis)
+    return np.sum(chunk, axis=axis, dtype=accumulator)
+
+
+def _combine(total: np.ndarray | None, part: np.ndarray, projection: str) -> np.ndarray:
+    if total is None:
+        return part
+    if projection == "max":
+        return np.maximum(total, part, out=total)
+    return np.add(total, part, out=total)
+
+
+def channel_last_selection(shape: tuple[int, ...], *, channel_index: int | None = None) -> tuple[int | None, dict[str, Any]]:
+    """The channel ``reduce_channel_last`` would keep for an image of ``shape``, without reading it."""
     info: dict[str, Any] = {}
-    if image.ndim < 3 or image.shape[-1] > 4:
-        return image, info
-    info["channel_axis"] = image.ndim - 1
-    info["n_channels"] = int(image.shape[-1])
+    if len(shape) < 3 or shape[-1] > 4:
+        return None, info
+    info["channel_axis"] = len(shape) - 1
+    info["n_channels"] = int(shape[-1])
     if channel_index is None:
-        return image, info
-    index = int(np.clip(channel_index, 0, image.shape[-1] - 1))
+        return None, info
+    index = int(np.clip(channel_index, 0, shape[-1] - 1))
     info["selected_channel"] = index
+    return index, info
+
+
+def reduce_channel_last(image: np.ndarray, *, channel_index: int | None = None) -> tuple[np.ndarray, dict[str, Any]]:
+    index, info = channel_last_selection(tuple(image.shape), channel_index=channel_index)
+    if index is None:
+        return image, info
     return image[..., index], info
 
 
-def choose_depth_axis(image: np.ndarray) -> int | None:
-    if image.ndim < 3:
+def _depth_axis_for_shape(shape: tuple[int, ...]) -> int | None:
+    if len(shape) < 3:
         return None
-    axes = list(range(image.ndim))
-    if image.ndim >= 3 and image.shape[-1] <= 4:
+    axes = list(range(len(shape)))
+    if shape[-1] <= 4:
         axes = axes[:-1]
     if not axes:
         return None
-    candidate = min(axes, key=lambda axis: image.shape[axis])
+    candidate = min(axes, key=lambda axis: shape[axis])
     return int(candidate)
 
 
+def choose_depth_axis(image: Any) -> int | None:
+    return _depth_axis_for_shape(tuple(image.shape))
+
+
 def project_volume(
-    image: np.ndarray,
+    image: Any,
     *,
     projection: str = "max",
     depth_axis: int | None = None,
     slab_start: int | None = None,
     slab_end: int | None = None,
+    chunk_bytes: int = PROJECTION_CHUNK_BYTES,
+    max_workers: int = 1,
+    channel_index: int | None = None,
 ) -> tuple[np.ndarray, dict[str, Any]]:
-    if image.ndim < 3:
-        return image, {"projection": "identity", "depth_axis": None}
+    """
+    Max, mean or sum projection of ``image`` along its depth axis.
+
+    ``image`` may be any sliceable array-like, such as ``np.memmap`` or a zarr
+    array; the slab is read and reduced ``chunk_bytes`` at a time, so only one
+    chunk per worker and one accumulator plane are ever in memory. Sums use
+    the dtype ``np.sum`` would return and means accumulate in float64 before
+    casting to ``np.mean``'s output dtype. ``max_workers > 1`` reduces chunks
+    on a thread pool. ``channel_index`` selects one channel of a channel-last
+    image as each chunk is read, so other channels are never materialized.
+    """
+    volume = as_volume(image)
+    # Slicing with a trailing channel index drops that axis from every read.
+    channel = () if channel_index is None else (int(channel_index),)
+    shape = tuple(volume.shape)[: len(volume.shape) - len(channel)]
+    ndim = len(shape)
+
+    def read(slicer: list[slice]) -> np.ndarray:
+        return np.asarray(volume[tuple(slicer) + channel])
+
+    def identity() -> tuple[np.ndarray, dict[str, Any]]:
+        whole = read([slice(None)] * ndim)
+        # A read-only memmap view must not become the pipeline's working image.
+        return (whole if whole.flags.writeable else whole.copy()), {"projection": "identity", "depth_axis": None}
 
-    axis = choose_depth_axis(image) if depth_axis is None else depth_axis
+    if ndim < 3:
+        return identity()
+
+    axis = _depth_axis_for_shape(shape) if depth_axis is None else depth_axis
     if axis is None:
-        return image, {"projection": "identity", "depth_axis": None}
-
-    slicer = [slice(None)] * image.ndim
-    if slab_start is not None or slab_end is not None:
-        slicer[axis] = slice(slab_start, slab_end)
-    slab = image[tuple(slicer)]
-    reduced = _projection_fn(projection)(slab, axis=axis)
-    return reduced, {
+        return identity()
+    axis = int(axis) % ndim
+
+    name = _projection_name(projection)
+    start, stop, _ = slice(slab_start, slab_end).indices(int(shape[axis]))
+    stop = max(stop, start)
+    depth = stop - start
+    dtype = np.dtype(volume.dtype)
+    accumulator, out_dtype = _projection_dtypes(dtype, name)
+    step = _chunk_depth(shape, dtype.itemsize, axis, int(chunk_bytes))
+    bounds = [(z0, min(z0 + step, stop)) for z0 in range(start, stop, step)]
+
+    def reduce_range(bound: tuple[int, int]) -> np.ndarray:
+        slicer = [slice(None)] * ndim
+        slicer[axis] = slice(*bound)
+        return _reduce_chunk(read(slicer), axis, name, accumulator)
+
+    info = {
         "projection": projection,
         "depth_axis": axis,
         "slab_start": slab_start,
         "slab_end": slab_end,
+        "chunk_depth": int(step),
+        "n_chunks": len(bounds),
     }
+    if depth == 0:
+        # Keep numpy's behaviour for empty slabs (max raises, sum/mean give 0/NaN).
+        slicer = [slice(None)] * ndim
+        slicer[axis] = slice(start, stop)
+        empty = read(slicer)
+        reduced = np.max(empty, axis=axis) if name == "max" else getattr(np, name)(empty, axis=axis)
+        return reduced, info
+
+    total: np.ndarray | None = None
+    if max_workers <= 1 or len(bounds) == 1:
+        for bound in bounds:
+            total = _combine(total, reduce_range(bound), name)
+    else:
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        # At most ``max_workers`` chunks are read at once and partial planes are
+        # folded in as soon as they finish, so memory stays bounded.
+        pending = iter(bounds)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running = {executor.submit(reduce_range, bound) for _, bound in zip(range(max_workers), pending)}
+            while running:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    total = _combine(total, future.result(), name)
+                    following = next(pending, None)
+                    if following is not None:
+                        running.add(executor.submit(reduce_range, following))
+
+    if name == "mean":
+        total = total / depth
+    return np.asarray(total).astype(out_dtype, copy=False), info
@@ -4,7 +4,7 @@ from typing import Any
 
 import numpy as np
 
-from src.modalities.common import project_volume
+from src.modalities.common import as_volume, project_volume
 
 
 def adapt_lightsheet_image(
@@ -14,13 +14,15 @@ def adapt_lightsheet_image(
     projection: str = "max",
     slab_start: int | None = None,
     slab_end: int | None = None,
+    projection_workers: int = 1,
 ) -> tuple[np.ndarray, dict[str, Any]]:
-    arr = np.asarray(image)
+    arr = as_volume(image)
     adapted, projection_info = project_volume(
         arr,
         projection=projection,
         slab_start=slab_start,
         slab_end=slab_end,
+        max_workers=projection_workers,
     )
     out_meta = dict(meta or {})
     out_meta.update(
@@ -28,7 +30,7 @@ def adapt_lightsheet_image(
             "modality_adapter": "lightsheet",
             "modality_projection": projection_info["projection"],
             "modality_depth_axis": projection_info["depth_axis"],
-            "modality_source_ndim": int(arr.ndim),
+            "modality_source_ndim": len(arr.shape),
         }
     )
     return adapted, out_meta
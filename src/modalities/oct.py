@@ -4,7 +4,7 @@ from typing import Any
 
 import numpy as np
 
-from src.modalities.common import project_volume, reduce_channel_last
+from src.modalities.common import as_volume, channel_last_selection, project_volume
 
 
 def adapt_oct_image(
@@ -15,13 +15,17 @@ def adapt_oct_image(
     channel_index: int | None = 0,
     slab_start: int | None = None,
     slab_end: int | None = None,
+    projection_workers: int = 1,
 ) -> tuple[np.ndarray, dict[str, Any]]:
-    adapted, info = reduce_channel_last(np.asarray(image), channel_index=channel_index)
+    volume = as_volume(image)
+    selected, info = channel_last_selection(tuple(volume.shape), channel_index=channel_index)
     adapted, projection_info = project_volume(
-        adapted,
+        volume,
         projection=projection,
         slab_start=slab_start,
         slab_end=slab_end,
+        max_workers=projection_workers,
+        channel_index=selected,
     )
     out_meta = dict(meta or {})
     out_meta.update(
@@ -30,7 +34,7 @@ def adapt_oct_image(
             "modality_projection": projection_info["projection"],
             "modality_depth_axis": projection_info["depth_axis"],
             "modality_channel_index": info.get("selected_channel"),
-            "modality_source_ndim": int(np.asarray(image).ndim),
+            "modality_source_ndim": len(volume.shape),
         }
     )
     return adapted, out_meta
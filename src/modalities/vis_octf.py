@@ -4,7 +4,7 @@ from typing import Any
 
 import numpy as np
 
-from src.modalities.common import project_volume
+from src.modalities.common import as_volume, project_volume
 
 
 def adapt_vis_octf_image(
@@ -14,29 +14,28 @@ def adapt_vis_octf_image(
     projection: str = "max",
     slab_start: int | None = None,
     slab_end: int | None = None,
+    projection_workers: int = 1,
 ) -> tuple[np.ndarray, dict[str, Any]]:
-    arr = np.asarray(image)
+    arr = as_volume(image)
     out_meta = dict(meta or {})
 
-    if arr.ndim == 4 and arr.shape[-1] <= 4:
-        projected_channels = []
-        depth_axis = 0
-        for channel_index in range(arr.shape[-1]):
-            projected, projection_info = project_volume(
-                arr[..., channel_index],
-                projection=projection,
-                depth_axis=depth_axis,
-                slab_start=slab_start,
-                slab_end=slab_end,
-            )
-            projected_channels.append(projected)
-        adapted = np.stack(projected_channels, axis=-1)
+    if len(arr.shape) == 4 and arr.shape[-1] <= 4:
+        # Projecting along depth keeps the channel axis, so every chunk is read
+        # once for all channels instead of once per channel.
+        adapted, projection_info = project_volume(
+            arr,
+            projection=projection,
+            depth_axis=0,
+            slab_start=slab_start,
+            slab_end=slab_end,
+            max_workers=projection_workers,
+        )
         out_meta.update(
             {
                 "modality_adapter": "vis_octf",
                 "modality_projection": projection_info["projection"],
                 "modality_depth_axis": projection_info["depth_axis"],
-                "modality_source_ndim": int(arr.ndim),
+                "modality_source_ndim": len(arr.shape),
             }
         )
         return adapted, out_meta
@@ -46,13 +45,14 @@ def adapt_vis_octf_image(
         projection=projection,
         slab_start=slab_start,
         slab_end=slab_end,
+        max_workers=projection_workers,
     )
     out_meta.update(
         {
             "modality_adapter": "vis_octf",
             "modality_projection": projection_info["projection"],
             "modality_depth_axis": projection_info["depth_axis"],
-            "modality_source_ndim": int(arr.ndim),
+            "modality_source_ndim": len(arr.shape),
         }
     )
     return adapted, out_meta
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
 from pathlib import Path
 from typing import Any, Callable
 
@@ -9,7 +14,8 @@ import pandas as pd
 
 from src.io_ome import load_any_image
 from src.model_registry import model_summary_fields
-from src.run_service import RuntimeOptions, build_runtime, run_array
+from src.roi_data import file_sha256
+from src.run_service import RuntimeCache, RuntimeOptions, build_runtime, run_array
 
 
 REQUIRED_MODEL_MANIFEST_COLUMNS = [
@@ -28,6 +34,8 @@ REQUIRED_MODEL_MANIFEST_COLUMNS = [
     "notes",
 ]
 
+MODEL_ASSET_FIELDS = ("cellpose_model", "stardist_weights", "sam_checkpoint")
+
 
 def load_model_manifest(path: str | Path) -> pd.DataFrame:
     frame = pd.read_csv(path)
@@ -168,6 +176,217 @@ def _resolve_reference_count(row: pd.Series, reference_labels: np.ndarray | None
     return None, None
 
 
+def _optional_text(row: pd.Series, column: str) -> str | None:
+    value = row.get(column)
+    if value is None or pd.isna(value) or not str(value).strip():
+        return None
+    return str(value)
+
+
+def runtime_options_from_row(row: pd.Series, *, use_gpu: bool = False) -> RuntimeOptions:
+    return RuntimeOptions(
+        backend=str(row["backend"]) if pd.notna(row["backend"]) else "cellpose",
+        segmentation_preset=_optional_text(row, "segmentation_preset"),
+        model_type=_optional_text(row, "model_type"),
+        cellpose_model=_optional_text(row, "cellpose_model"),
+        stardist_weights=_optional_text(row, "stardist_weights"),
+        sam_checkpoint=_optional_text(row, "sam_checkpoint"),
+        model_alias=_optional_text(row, "model_alias"),
+        diameter=float(row["diameter"]) if pd.notna(row["diameter"]) else None,
+        modality_channel_index=int(row["channel_index"]) if pd.notna(row["channel_index"]) else 0,
+        use_gpu=use_gpu,
+        focus_mode="none",
+        save_debug=False,
+        write_html_report=False,
+        write_object_table=False,
+        write_provenance=False,
+    )
+
+
+def model_asset_sha256(path: str | Path) -> str:
+    """Content hash of a model weights file, or of every file under a model directory."""
+    path = Path(path)
+    if path.is_file():
+        return file_sha256(path)
+    if path.is_dir():
+        digest = hashlib.sha256()
+        for child in sorted(item for item in path.rglob("*") if item.is_file()):
+            digest.update(child.relative_to(path).as_posix().encode("utf-8"))
+            digest.update(file_sha256(child).encode("utf-8"))
+        return digest.hexdigest()
+    return f"missing:{path}"
+
+
+def _asset_fingerprint(path: Path) -> tuple[Any, ...] | None:
+    if path.is_file():
+        stat = path.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+    if path.is_dir():
+        entries = []
+        for child in sorted(item for item in path.rglob("*") if item.is_file()):
+            stat = child.stat()
+            entries.append((child.relative_to(path).as_posix(), stat.st_mtime_ns, stat.st_size))
+        return tuple(entries)
+    return None
+
+
+class ModelAssetHashes:
+    """Memoize ``model_asset_sha256`` per (path, mtime, size) for one evaluation run.
+
+    Every manifest row keys its prediction by the weights hash, so without this a
+    multi-GB checkpoint would be re-read once per image.
+    """
+
+    def __init__(self):
+        self._hashes: dict[tuple[str, Any], str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str | Path) -> str:
+        path = Path(path)
+        key = (str(path.resolve()), _asset_fingerprint(path))
+        with self._lock:
+            cached = self._hashes.get(key)
+        if cached is None:
+            cached = model_asset_sha256(path)
+            with self._lock:
+                self._hashes[key] = cached
+        return cached
+
+
+def model_weights_hashes(
+    options: RuntimeOptions,
+    *,
+    asset_hashes: ModelAssetHashes | None = None,
+) -> dict[str, str | None]:
+    """Content hash of every model asset ``options`` points at, keyed by option name."""
+    hash_asset = asset_hashes.get if asset_hashes is not None else model_asset_sha256
+    return {
+        field: hash_asset(value) if (value := getattr(options, field)) else None
+        for field in MODEL_ASSET_FIELDS
+    }
+
+
+def prediction_cache_key(
+    options: RuntimeOptions,
+    image_path: str | Path,
+    *,
+    asset_hashes: ModelAssetHashes | None = None,
+) -> str:
+    """Key predictions by (model weights hash, image hash, segmentation config)."""
+    config = {key: value for key, value in asdict(options).items() if not (key in MODEL_ASSET_FIELDS and value)}
+    payload = {
+        "weights": model_weights_hashes(options, asset_hashes=asset_hashes),
+        "image_sha256": file_sha256(image_path),
+        "config": config,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class PredictionCache:
+    """On-disk cache of predicted label images, one ``.npz`` per prediction key."""
+
+    def __init__(self, cache_dir: str | Path):
+        self.cache_dir = Path(cache_dir)
+
+    def path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    def get(self, key: str) -> tuple[np.ndarray, dict[str, Any]] | None:
+        path = self.path_for(key)
+        if not path.exists():
+            return None
+        with np.load(path, allow_pickle=False) as payload:
+            return np.asarray(payload["labels"]), json.loads(str(payload["info_json"]))
+
+    def put(self, key: str, labels: np.ndarray, info: dict[str, Any]) -> Path:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(key)
+        # Write under a temporary name so concurrent readers never see a partial file.
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.{id(labels)}.tmp.npz")
+        np.savez_compressed(tmp_path, labels=np.asarray(labels), info_json=np.asarray(json.dumps(info, default=str)))
+        os.replace(tmp_path, path)
+        return path
+
+
+def _predict_row(
+    row: pd.Series,
+    image_path: Path,
+    *,
+    use_gpu: bool,
+    runtimes: RuntimeCache,
+    runtime_runner: Callable[..., Any],
+    prediction_cache: PredictionCache | None,
+    asset_hashes: ModelAssetHashes | None = None,
+) -> tuple[np.ndarray, dict[str, Any]]:
+    options = runtime_options_from_row(row, use_gpu=use_gpu)
+    cache_key = prediction_cache_key(options, image_path, asset_hashes=asset_hashes) if prediction_cache is not None else None
+    if prediction_cache is not None:
+        cached = prediction_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    image, meta = load_any_image(str(image_path))
+    runtime = runtimes.get(options)
+    ctx = runtime_runner(runtime, image=image, source_path=image_path, meta=meta)
+    predicted_labels = np.asarray(ctx.labels) if ctx.labels is not None else np.zeros(image.shape[:2], dtype=np.uint32)
+    info = {
+        "backend": runtime.model_spec.backend,
+        "model_fields": model_summary_fields(runtime.model_spec),
+        "predicted_count": float(ctx.metrics.get("cell_count", count_objects(predicted_labels))),
+    }
+    if prediction_cache is not None:
+        prediction_cache.put(cache_key, predicted_labels, info)
+    return predicted_labels, info
+
+
+def _evaluate_row(
+    row: pd.Series,
+    image_path: Path,
+    label_path: Path | None,
+    *,
+    use_gpu: bool,
+    runtimes: RuntimeCache,
+    runtime_runner: Callable[..., Any],
+    prediction_cache: PredictionCache | None,
+    asset_hashes: ModelAssetHashes | None = None,
+) -> dict[str, Any]:
+    predicted_labels, info = _predict_row(
+        row,
+        image_path,
+        use_gpu=use_gpu,
+        runtimes=runtimes,
+        runtime_runner=runtime_runner,
+        prediction_cache=prediction_cache,
+        asset_hashes=asset_hashes,
+    )
+    reference_labels = load_label_image(label_path) if label_path is not None and label_path.exists() else None
+    reference_count, reference_source = _resolve_reference_count(row, reference_labels)
+
+    metric_row: dict[str, Any] = {
+        "run_id": row["run_id"],
+        "image_path": str(image_path),
+        "label_path": str(label_path) if label_path is not None else None,
+        "backend": info["backend"],
+        **info["model_fields"],
+        "predicted_count": float(info["predicted_count"]),
+        "reference_count": reference_count,
+        "reference_source": reference_source,
+        "has_overlap_reference": bool(reference_labels is not None),
+        "dice_score": np.nan,
+        "iou_score": np.nan,
+        "count_bias": np.nan,
+        "count_abs_error": np.nan,
+        "notes": row.get("notes"),
+    }
+    if reference_labels is not None:
+        metric_row.update(overlap_metrics(predicted_labels, reference_labels))
+    if reference_count is not None:
+        bias = float(metric_row["predicted_count"]) - float(reference_count)
+        metric_row["count_bias"] = bias
+        metric_row["count_abs_error"] = abs(bias)
+    return metric_row
+
+
 def evaluate_model_manifest(
     manifest_df: pd.DataFrame,
     *,
@@ -175,13 +394,15 @@ def evaluate_model_manifest(
     strict_schemas: bool = False,
     runtime_builder: Callable[..., Any] = build_runtime,
     runtime_runner: Callable[..., Any] = run_array,
+    max_workers: int = 1,
+    prediction_cache_dir: str | Path | None = None,
 ) -> tuple[pd.DataFrame, pd.DataFrame, dict[str, Any]]:
     manifest_df = manifest_df.copy()
     for column in REQUIRED_MODEL_MANIFEST_COLUMNS:
         if column not in manifest_df.columns:
             manifest_df[column] = pd.NA
-    rows: list[dict[str, Any]] = []
 
+    tasks: list[tuple[pd.Series, Path, Path | None]] = []
     for item in manifest_df.to_dict("records"):
         row = pd.Series(item)
         image_path = Path(str(row["image_path"]))
@@ -193,55 +414,32 @@ def evaluate_model_manifest(
             label_path = Path(str(row["label_path"]))
             if strict_schemas and not label_path.exists():
                 raise FileNotFoundError(f"Evaluation label not found: {label_path}")
-
-        image, meta = load_any_image(str(image_path))
-        runtime = runtime_builder(
-            RuntimeOptions(
-                backend=str(row["backend"]) if pd.notna(row["backend"]) else "cellpose",
-                segmentation_preset=str(row["segmentation_preset"]) if pd.notna(row["segmentation_preset"]) and str(row["segmentation_preset"]).strip() else None,
-                model_type=str(row["model_type"]) if pd.notna(row["model_type"]) and str(row["model_type"]).strip() else None,
-                cellpose_model=str(row["cellpose_model"]) if pd.notna(row["cellpose_model"]) and str(row["cellpose_model"]).strip() else None,
-                stardist_weights=str(row["stardist_weights"]) if pd.notna(row["stardist_weights"]) and str(row["stardist_weights"]).strip() else None,
-                sam_checkpoint=str(row["sam_checkpoint"]) if pd.notna(row["sam_checkpoint"]) and str(row["sam_checkpoint"]).strip() else None,
-                model_alias=str(row["model_alias"]) if pd.notna(row["model_alias"]) and str(row["model_alias"]).strip() else None,
-                diameter=float(row["diameter"]) if pd.notna(row["diameter"]) else None,
-                modality_channel_index=int(row["channel_index"]) if pd.notna(row["channel_index"]) else 0,
-                use_gpu=use_gpu,
-                focus_mode="none",
-                save_debug=False,
-                write_html_report=False,
-                write_object_table=False,
-                write_provenance=False,
-            )
+        tasks.append((row, image_path, label_path))
+
+    # Runtimes are built once per distinct model config (per worker thread), and
+    # predictions are cached on disk so changing only the metrics re-scores instantly.
+    runtimes = RuntimeCache(runtime_builder)
+    prediction_cache = PredictionCache(prediction_cache_dir) if prediction_cache_dir is not None else None
+    asset_hashes = ModelAssetHashes()
+
+    def evaluate(task: tuple[pd.Series, Path, Path | None]) -> dict[str, Any]:
+        row, image_path, label_path = task
+        return _evaluate_row(
+            row,
+            image_path,
+            label_path,
+            use_gpu=use_gpu,
+            runtimes=runtimes,
+            runtime_runner=runtime_runner,
+            prediction_cache=prediction_cache,
+            asset_hashes=asset_hashes,
         )
-        ctx = runtime_runner(runtime, image=image, source_path=image_path, meta=meta)
-        predicted_labels = np.asarray(ctx.labels) if ctx.labels is not None else np.zeros(image.shape[:2], dtype=np.uint32)
-        reference_labels = load_label_image(label_path) if label_path is not None and label_path.exists() else None
-        reference_count, reference_source = _resolve_reference_count(row, reference_labels)
-
-        metric_row: dict[str, Any] = {
-            "run_id": row["run_id"],
-            "image_path": str(image_path),
-            "label_path": str(label_path) if label_path is not None else None,
-            "backend": runtime.model_spec.backend,
-            **model_summary_fields(runtime.model_spec),
-            "predicted_count": float(ctx.metrics.get("cell_count", count_objects(predicted_labels))),
-            "reference_count": reference_count,
-            "reference_source": reference_source,
-            "has_overlap_reference": bool(reference_labels is not None),
-            "dice_score": np.nan,
-            "iou_score": np.nan,
-            "count_bias": np.nan,
-            "count_abs_error": np.nan,
-            "notes": row.get("notes"),
-        }
-        if reference_labels is not None:
-            metric_row.update(overlap_metrics(predicted_labels, reference_labels))
-        if reference_count is not None:
-            bias = float(metric_row["predicted_count"]) - float(reference_count)
-            metric_row["count_bias"] = bias
-            metric_row["count_abs_error"] = abs(bias)
-        rows.append(metric_row)
+
+    if int(max_workers) > 1:
+        with ThreadPoolExecutor(max_workers=int(max_workers)) as executor:
+            rows = list(executor.map(evaluate, tasks))
+    else:
+        rows = [evaluate(task) for task in tasks]
 
     per_run_frame = pd.DataFrame(rows)
     summary_frame = summarize_model_runs(per_run_frame)
@@ -4,27 +4,43 @@ from __future__ import annotations
 import warnings
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Tuple, Optional, Dict, Any
+from typing import Tuple, Optional, Dict, Any, Hashable
 
 import numpy as np
 
-from src.blob_watershed import segment_blob_watershed
-# We keep Cellpose as a dependable default
-from src.cell_segmentation import segment_cells_cellpose
+from src.blob_watershed import preprocess_blob_input, segment_blob_watershed
 from src.model_registry import (
     DEFAULT_STARDIST_MODEL,
     DEFAULT_SAM_MODEL_TYPE,
     ModelSpec,
     model_summary_fields,
 )
+from src.preprocessing import IntensityStats
 
 
 class Segmenter(ABC):
     """Abstract segmenter interface. All segmenters must return integer masks."""
+
+    def preprocess_key(self) -> Optional[Hashable]:
+        """
+        Identifies the output of ``preprocess`` for caching; ``None`` means the
+        segmenter normalizes internally and takes the raw image.
+        """
+        return None
+
+    def preprocess(self, image: np.ndarray, stats: IntensityStats) -> np.ndarray:
+        """
+        Whole-image normalization using image-wide ``stats``. Tiles and TTA
+        views of the result are passed to ``segment(..., preprocessed=True)``,
+        so every tile is normalized identically.
+        """
+        return image
+
     @abstractmethod
-    def segment(self, image: np.ndarray) -> Tuple[np.ndarray, Dict[str, Any]]:
+    def segment(self, image: np.ndarray, *, preprocessed: bool = False) -> Tuple[np.ndarray, Dict[str, Any]]:
         """
         :param image: 2D numpy array (grayscale) to segment.
+        :param preprocessed: ``image`` is (a view of) the output of ``preprocess``.
         :return: (masks, info)
                  masks: 2D uint16 labeled mask, 0 = background.
                  info: dict with model metadata (e.g., 'backend', 'diams', 'extras').
@@ -39,7 +55,10 @@ class CellposeSegmenter(Segmenter):
         self.model_spec = model_spec
         self.use_gpu = use_gpu
 
-    def segment(self, image: np.ndarray) -> Tuple[np.ndarray, Dict[str, Any]]:
+    def segment(self, image: np.ndarray, *, preprocessed: bool = False) -> Tuple[np.ndarray, Dict[str, Any]]:
+        # Cellpose pulls in torch; import on first use so non-model commands start fast.
+        from src.cell_segmentation import segment_cells_cellpose
+
         effective_model_type = self.model_spec.asset_path or self.model_spec.builtin_name or self.model_spec.model_type
         masks, flows, styles, diams = segment_cells_cellpose(
             image,
@@ -97,11 +116,23 @@ class StarDistSegmenter(Segmenter):
                 "Provide a StarDist model directory or weights file compatible with StarDist2D."
             ) from exc
 
-    def segment(self, image: np.ndarray) -> Tuple[np.ndarray, Dict[str, Any]]:
+    def preprocess_key(self) -> Optional[Hashable]:
+        return ("stardist",)
+
+    def preprocess(self, image: np.ndarray, stats: IntensityStats) -> np.ndarray:
         # StarDist expects float in [0,1]
         img = image.astype(np.float32)
-        if img.max() > 1.0:
-            img = img / 255.0
+        if stats.max > 1.0:
+            img /= 255.0
+        return img
+
+    def segment(self, image: np.ndarray, *, preprocessed: bool = False) -> Tuple[np.ndarray, Dict[str, Any]]:
+        if preprocessed:
+            img = np.asarray(image, dtype=np.float32)
+        else:
+            img = image.astype(np.float32)
+            if img.max() > 1.0:
+                img = img / 255.0
         labels, _ = self.model.predict_instances(img)
         labels = labels.astype(np.uint16, copy=False)
         info = {"backend": "stardist", "pretrained": self.pretrained}
@@ -157,18 +188,29 @@ class SAMSegmenter(Segmenter):
             next_id += 1
         return label
 
-    def segment(self, image: np.ndarray) -> Tuple[np.ndarray, Dict[str, Any]]:
+    @staticmethod
+    def _to_rgb_uint8(image: np.ndarray, max_value: float) -> np.ndarray:
         # SAM expects 3-channel RGB in uint8
         img = image
         if img.ndim == 2:
             # stack to 3 channels
             if img.dtype != np.uint8:
-                norm = (img.astype(np.float32) / max(1.0, float(img.max()))) * 255.0
-                img_rgb = np.stack([norm, norm, norm], axis=-1).astype(np.uint8)
-            else:
-                img_rgb = np.stack([img, img, img], axis=-1)
-        else:
+                norm = (img.astype(np.float32) / max(1.0, float(max_value))) * 255.0
+                return np.stack([norm, norm, norm], axis=-1).astype(np.uint8)
+            return np.stack([img, img, img], axis=-1)
+        return image
+
+    def preprocess_key(self) -> Optional[Hashable]:
+        return ("sam",)
+
+    def preprocess(self, image: np.ndarray, stats: IntensityStats) -> np.ndarray:
+        return self._to_rgb_uint8(image, stats.max)
+
+    def segment(self, image: np.ndarray, *, preprocessed: bool = False) -> Tuple[np.ndarray, Dict[str, Any]]:
+        if preprocessed:
             img_rgb = image
+        else:
+            img_rgb = self._to_rgb_uint8(image, float(image.max()) if image.ndim == 2 and image.size else 1.0)
 
         masks = self.mask_generator.generate(img_rgb)
         labels = self._masks_to_label(masks, shape=img_rgb.shape[:2])
@@ -189,7 +231,17 @@ class BlobWatershedSegmenter(Segmenter):
         self.model_spec = model_spec
         self.config = dict(config or {})
 
-    def segment(self, image: np.ndarray) -> Tuple[np.ndarray, Dict[str, Any]]:
+    def preprocess_key(self) -> Optional[Hashable]:
+        return ("blob_watershed", bool(self.config.get("apply_clahe", False)))
+
+    def preprocess(self, image: np.ndarray, stats: IntensityStats) -> np.ndarray:
+        return preprocess_blob_input(
+            image,
+            apply_clahe=bool(self.config.get("apply_clahe", False)),
+            intensity_range=stats.intensity_range,
+        )
+
+    def segment(self, image: np.ndarray, *, preprocessed: bool = False) -> Tuple[np.ndarray, Dict[str, Any]]:
         labels, info = segment_blob_watershed(
             image,
             apply_clahe=bool(self.config.get("apply_clahe", False)),
@@ -202,6 +254,7 @@ class BlobWatershedSegmenter(Segmenter):
             max_size=int(self.config.get("max_size", 400)),
             min_mean_intensity=float(self.config["min_mean_intensity"]) if self.config.get("min_mean_intensity") is not None else None,
             compactness=float(self.config.get("compactness", 0.0)),
+            preprocessed=preprocessed,
         )
         info.update(model_summary_fields(self.model_spec))
         info["model_type"] = self.model_spec.model_type or "blob_watershed"
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Any, Iterable
+
+import pandas as pd
+
+from src.schema import OBJECT_REQUIRED, STRING_DTYPE, validate_object_table, validate_parquet_schema
+
+
+OBJECT_DATASET_DIRNAME = "objects_dataset"
+OBJECT_DATASET_PARTITIONS = ("study_id", "condition", "animal_id")
+OBJECT_DATASET_ROW_GROUP_SIZE = 64 * 1024
+_MISSING_PARTITION = "unknown"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise RuntimeError("pyarrow is required for the study object dataset.") from exc
+    return pa, ds, pq
+
+
+def _partition_value(value: Any) -> str:
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return _MISSING_PARTITION
+    text = str(value).strip()
+    return text or _MISSING_PARTITION
+
+
+def _file_prefix(sample_id: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", sample_id) or "sample"
+
+
+def _file_token(sample_id: str) -> str:
+    # The digest keeps "M1" and "M1-OS" (or "M 1" and "M_1") from sharing file names.
+    digest = hashlib.sha1(sample_id.encode("utf-8")).hexdigest()[:12]
+    return f"{_file_prefix(sample_id)}.{digest}"
+
+
+def _stored_sample_ids(pq, path: Path) -> set[str]:
+    table = pq.read_table(path, columns=["sample_id"])
+    return {str(value) for value in table.column("sample_id").unique().to_pylist()}
+
+
+def _remove_sample_files(pq, root: Path, sample_id: str) -> None:
+    # Candidates share the file-name prefix (including files named before the
+    # digest was added); only files whose stored sample_id matches are removed.
+    for candidate in root.glob(f"**/{_file_prefix(sample_id)}*.parquet"):
+        if _stored_sample_ids(pq, candidate) == {sample_id}:
+            candidate.unlink()
+
+
+def prune_object_dataset(root: str | Path, sample_ids: Iterable[str]) -> list[Path]:
+    """Delete files holding objects of samples outside ``sample_ids`` (e.g. dropped from the manifest)."""
+    pa, ds, pq = _require_pyarrow()
+    root = Path(root)
+    keep = {str(sample_id) for sample_id in sample_ids}
+    removed: list[Path] = []
+    if not root.exists():
+        return removed
+    for candidate in sorted(root.glob("**/*.parquet")):
+        if not _stored_sample_ids(pq, candidate) <= keep:
+            candidate.unlink()
+            removed.append(candidate)
+    return removed
+
+
+def _partitioning(ds, pa):
+    return ds.partitioning(pa.schema([(name, pa.string()) for name in OBJECT_DATASET_PARTITIONS]), flavor="hive")
+
+
+def _storage_table(pa, table):
+    """
+    Store strings as ``string`` (pandas' Arrow strings convert to
+    ``large_string``, which older files do not use) and optional numeric
+    columns that are entirely missing as ``null``, so another sample may fill
+    the same column with any type.
+    """
+    fields = []
+    columns = []
+    for field, column in zip(table.schema, table.columns):
+        if pa.types.is_large_string(field.type):
+            field, column = field.with_type(pa.string()), column.cast(pa.string())
+        elif field.name not in OBJECT_REQUIRED and pa.types.is_floating(field.type) and len(column) and column.null_count == len(column):
+            field, column = field.with_type(pa.null()), pa.nulls(len(column))
+        fields.append(field)
+        columns.append(column)
+    return pa.Table.from_arrays(columns, schema=pa.schema(fields, metadata=table.schema.metadata))
+
+
+def _unified_field_type(pa, name: str, types: list[Any]):
+    resolved = {pa.string() if pa.types.is_large_string(arrow_type) else arrow_type for arrow_type in types}
+    resolved.discard(pa.null())
+    if not resolved:
+        # Missing in every sample: read back as NaN, as the column was written.
+        return pa.float64()
+    if len(resolved) == 1:
+        return resolved.pop()
+    try:
+        return pa.unify_schemas([pa.schema([pa.field(name, arrow_type)]) for arrow_type in resolved], promote_options="permissive").field(name).type
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        strings = [arrow_type for arrow_type in resolved if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)]
+        if strings:
+            # Files written before all-missing columns were stored as null hold them as double.
+            return pa.large_string() if any(pa.types.is_large_string(arrow_type) for arrow_type in strings) else pa.string()
+        raise
+
+
+def _unify_dataset_schemas(pa, schemas: list[Any]):
+    types: dict[str, list[Any]] = {}
+    for schema in schemas:
+        for field in schema:
+            types.setdefault(field.name, []).append(field.type)
+    fields = [pa.field(name, _unified_field_type(pa, name, field_types)) for name, field_types in types.items()]
+    return pa.schema(fields, metadata=schemas[0].metadata)
+
+
+def normalize_object_dataset_frame(frame: pd.DataFrame, *, strict: bool = False) -> pd.DataFrame:
+    """
+    Validate an object table and pin every column to a dtype that depends only
+    on its name and kind, so files appended from different samples share one
+    schema: required columns keep their schema dtype, other numeric columns
+    become float64 (an all-NaN column must not turn int into float between
+    samples), booleans become nullable booleans, everything else strings.
+    """
+    out = validate_object_table(frame, strict=strict)
+    for column in out.columns:
+        if column in OBJECT_REQUIRED:
+            continue
+        series = out[column]
+        if pd.api.types.is_bool_dtype(series):
+            out[column] = series.astype("boolean")
+        elif pd.api.types.is_numeric_dtype(series):
+            out[column] = series.astype("float64")
+        else:
+            out[column] = series if isinstance(series.dtype, pd.StringDtype) else series.astype(STRING_DTYPE)
+    return out
+
+
+def append_object_table(
+    root: str | Path,
+    frame: pd.DataFrame,
+    *,
+    sample_id: str,
+    study_id: Any,
+    condition: Any,
+    animal_id: Any,
+    strict: bool = False,
+) -> list[Path]:
+    """
+    Write one sample's objects into the hive-partitioned parquet dataset at
+    ``root`` (``study_id=/condition=/animal_id=``). Files are named after the
+    sample, so re-appending a sample replaces its previous files, even if it
+    moved to another partition.
+    """
+    pa, ds, pq = _require_pyarrow()
+    root = Path(root)
+    sample_id = str(sample_id)
+    token = _file_token(sample_id)
+    if root.exists():
+        _remove_sample_files(pq, root, sample_id)
+
+    out = normalize_object_dataset_frame(frame, strict=strict)
+    out["sample_id"] = pd.Series([sample_id] * len(out), index=out.index, dtype=STRING_DTYPE)
+    for name, value in zip(OBJECT_DATASET_PARTITIONS, (study_id, condition, animal_id)):
+        out[name] = _partition_value(value)
+    table = _storage_table(pa, pa.Table.from_pandas(out, preserve_index=False))
+
+    written: list[Path] = []
+    ds.write_dataset(
+        table,
+        root,
+        format="parquet",
+        partitioning=_partitioning(ds, pa),
+        basename_template=f"{token}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd", write_statistics=True),
+        max_rows_per_group=OBJECT_DATASET_ROW_GROUP_SIZE,
+        min_rows_per_group=min(OBJECT_DATASET_ROW_GROUP_SIZE, max(table.num_rows, 1)),
+        file_visitor=lambda written_file: written.append(Path(written_file.path)),
+    )
+    return written
+
+
+def open_object_dataset(root: str | Path):
+    """Open the dataset with one schema unified across all appended files."""
+    pa, ds, pq = _require_pyarrow()
+    dataset = ds.dataset(Path(root), format="parquet", partitioning=_partitioning(ds, pa))
+    schemas = [fragment.physical_schema for fragment in dataset.get_fragments()]
+    if not schemas:
+        return dataset
+    partition_fields = [pa.field(name, pa.string()) for name in OBJECT_DATASET_PARTITIONS]
+    schema = _unify_dataset_schemas(pa, schemas + [pa.schema(partition_fields)])
+    return ds.dataset(Path(root), format="parquet", partitioning=_partitioning(ds, pa), schema=schema)
+
+
+def validate_object_dataset(root: str | Path, *, strict: bool = False) -> dict[str, str]:
+    """Check the dataset's unified schema against the object contract without reading rows."""
+    return validate_parquet_schema(open_object_dataset(root), required=OBJECT_REQUIRED, table_kind="object", strict=strict)
+
+
+def read_object_dataset(
+    root: str | Path,
+    columns: Iterable[str] | None = None,
+    filters: list[tuple[str, str, Any]] | None = None,
+) -> pd.DataFrame:
+    """
+    Load objects from the study dataset, reading only ``columns``.
+
+    ``filters`` uses the pandas/pyarrow ``read_parquet`` tuple form, e.g.
+    ``[("condition", "==", "treated"), ("kept", "==", True)]``. Partition
+    filters prune directories and column filters are pushed down to parquet
+    row-group statistics.
+
+    A field no appended sample carries (``ecc_um`` in a study without retina
+    registration) is treated as missing everywhere: it is left out of the
+    result, and no row satisfies a filter on it.
+    """
+    pa, ds, pq = _require_pyarrow()
+    root = Path(root)
+    if not root.exists():
+        return pd.DataFrame(columns=list(columns) if columns is not None else None)
+    dataset = open_object_dataset(root)
+    available = set(dataset.schema.names)
+    selected = [name for name in columns if name in available] if columns is not None else None
+    if filters and any(name not in available for name, _, _ in filters):
+        empty = dataset.schema.empty_table()
+        return (empty.select(selected) if selected is not None else empty).to_pandas()
+    expression = pq.filters_to_expression(filters) if filters else None
+    table = dataset.to_table(columns=selected, filter=expression)
+    return table.to_pandas()
@@ -5,6 +5,9 @@ from typing import Dict, Any, Tuple
 import numpy as np
 import yaml
 import cv2
+from scipy.ndimage import find_objects
+
+from src.dtypes import as_intensity, relabel_lut
 
 def load_rules(path: str) -> Dict[str, Any]:
     with open(path, "r", encoding="utf-8") as f:
@@ -13,7 +16,9 @@ def load_rules(path: str) -> Dict[str, Any]:
 def _binarize_channel(img: np.ndarray, min_intensity: int) -> np.ndarray:
     """Simple threshold after contrast normalization to 0..255 if needed."""
     if img.dtype != np.uint8:
-        norm = (img.astype(np.float32) / max(1.0, float(img.max()))) * 255.0
+        norm = as_intensity(img, copy=True)
+        norm /= max(1.0, float(img.max()))
+        norm *= 255.0
         img8 = norm.astype(np.uint8)
     else:
         img8 = img
@@ -77,15 +82,21 @@ def apply_marker_rules(image_multi: np.ndarray,
     rgc_pos = _binarize_channel(rgc_img, rgc_min) if rgc_img is not None else None
     mg_pos = _binarize_channel(mg_img, mg_min) if mg_img is not None else None
 
-    filtered = np.zeros_like(masks, dtype=np.uint16)
     annotations: Dict[int, Dict[str, Any]] = {}
 
     ids = np.unique(masks)
-    next_id = 1
+    windows = find_objects(masks) if ids.size and ids[-1] > 0 else []
+    kept_ids = []
     for oid in ids:
         if oid == 0:
             continue
-        cmask = masks == oid
+        # Each object is checked inside its bounding box padded by one background pixel.
+        bounds = windows[int(oid) - 1]
+        window = (
+            slice(max(0, bounds[0].start - 1), bounds[0].stop + 1),
+            slice(max(0, bounds[1].start - 1), bounds[1].stop + 1),
+        )
+        cmask = masks[window] == oid
         area = int(cmask.sum())
         # Morphology prior
         if area < min_area or area > max_area:
@@ -101,21 +112,22 @@ def apply_marker_rules(image_multi: np.ndarray,
         # Marker logic
         keep = True
         if require_rgc and rgc_pos is not None:
-            if not np.any(rgc_pos & cmask):
+            if not np.any(rgc_pos[window] & cmask):
                 keep = False
                 annotations[oid] = {"kept": False, "reason": "rgc_negative", "circularity": circ, "area": area}
                 continue
 
         if exclude_mg and mg_pos is not None:
-            if np.any(mg_pos & cmask):
+            if np.any(mg_pos[window] & cmask):
                 keep = False
                 annotations[oid] = {"kept": False, "reason": "microglia_overlap", "circularity": circ, "area": area}
                 continue
 
         if keep:
-            filtered[cmask] = next_id
+            kept_ids.append(int(oid))
             annotations[oid] = {"kept": True, "area": area, "circularity": circ}
-            next_id += 1
 
+    # Kept objects are renumbered 1..n in id order with a dtype that fits n.
+    filtered = relabel_lut(int(ids[-1]) if ids.size else 0, np.asarray(kept_ids, dtype=np.int64))[masks]
     return filtered, annotations
 
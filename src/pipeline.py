@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Protocol
+from typing import Any, Callable, Iterator, Protocol
 
 import numpy as np
 
@@ -10,10 +10,12 @@ from src.analysis import compute_cell_count_and_density
 from src.atlas_subtypes import score_atlas_subtypes
 from src.edits import apply_edit_log, load_edit_log
 from src.interactions import add_interaction_metrics
-from src.landmarks import build_tissue_mask
+from src.landmarks import build_tissue_mask_levels
 from src.marker_metrics import add_marker_metrics
+from src.memory_plan import MemoryPlan, plan_memory
 from src.config import data as CONFIG_DATA
 from src.context import RunContext
+from src.dtypes import AllocationMonitor, INTENSITY_DTYPE, allocation_threshold, compact_labels, relabel_lut
 from src.focus_detection import compute_in_focus_mask_auto
 from src.measurements import (
     add_uncertainty_summary_columns,
@@ -24,6 +26,7 @@ from src.measurements import (
 from src.phenotype import apply_marker_rules
 from src.phenotype_engine import assign_phenotypes
 from src.postprocessing import apply_clahe, postprocess_masks
+from src.preprocessing import preprocess_cache
 from src.qc import focus_mask_multimetric
 from src.regions import assign_regions, summarize_regions
 from src.retina_coords import register_cells, register_focus_mask_pixels, resolve_retina_frame
@@ -32,7 +35,7 @@ from src.spatial import (
     DEFAULT_RIGOROUS_RADII_PX,
     compute_rigorous_spatial_bundle,
     centroids_from_masks,
-    isodensity_map,
+    image_density_grid,
     kept_object_table,
     nn_regularity_index,
     ripley_k,
@@ -58,12 +61,40 @@ class PipelineRunner:
     def __init__(self, stages: list[Stage]):
         self.stages = stages
 
+    def iter_run(self, ctx: RunContext, cfg: dict[str, Any]) -> Iterator[tuple[int, str, RunContext]]:
+        """Run the stages in order, yielding ``(index, stage name, ctx)`` after each one.
+
+        With ``cfg["debug_allocations"]`` each stage's heap peak is recorded in
+        ``ctx.metrics["allocations"]`` and stages allocating more than a few
+        float32 copies of the image are reported as warnings.
+        """
+        monitor = AllocationMonitor(allocation_threshold(ctx.image)) if cfg.get("debug_allocations") else None
+        for index, stage in enumerate(self.stages):
+            if monitor is None:
+                ctx = stage.run(ctx, cfg)
+            else:
+                with monitor.stage(stage.name):
+                    ctx = stage.run(ctx, cfg)
+                _record_allocations(ctx, monitor)
+            yield index, stage.name, ctx
+
     def run(self, ctx: RunContext, cfg: dict[str, Any]) -> RunContext:
-        for stage in self.stages:
-            ctx = stage.run(ctx, cfg)
+        for _, _, ctx in self.iter_run(ctx, cfg):
+            pass
         return ctx
 
 
+def _record_allocations(ctx: RunContext, monitor: AllocationMonitor) -> None:
+    ctx.metrics["allocations"] = list(monitor.records)
+    record = monitor.records[-1]
+    if record["unexpected"]:
+        _append_warning(
+            ctx,
+            f"Stage '{record['stage']}' allocated {record['peak_bytes'] / 2**20:.1f} MB at peak "
+            f"(more than {monitor.threshold_bytes / 2**20:.1f} MB expected).",
+        )
+
+
 def _resolved_qc_config(cfg: dict[str, Any]) -> dict[str, Any]:
     return dict(cfg.get("qc_config", CONFIG_DATA.get("qc", {})))
 
@@ -89,6 +120,52 @@ def _append_warning(ctx: RunContext, message: str) -> None:
         ctx.warnings.append(message)
 
 
+def _tissue_mask_levels(ctx: RunContext, cfg: dict[str, Any]):
+    """Tissue mask levels for ``ctx.gray``, built once per sample and shared by later stages."""
+    tissue = ctx.state.get("tissue_mask")
+    if tissue is None or tissue.mask.shape != ctx.gray.shape[:2]:
+        tissue = build_tissue_mask_levels(ctx.gray, scale=cfg.get("tissue_mask_scale"))
+        ctx.state["tissue_mask"] = tissue
+    return tissue
+
+
+def _plan_memory(ctx: RunContext, cfg: dict[str, Any]) -> MemoryPlan | None:
+    budget_mb = cfg.get("memory_budget_mb")
+    if budget_mb is None or ctx.gray is None:
+        return None
+    plan = plan_memory(
+        image_shape=tuple(np.shape(ctx.image)),
+        image_dtype=np.asarray(ctx.image).dtype,
+        gray_shape=tuple(ctx.gray.shape),
+        gray_dtype=ctx.gray.dtype,
+        backend=str(cfg.get("backend", "")),
+        budget_mb=float(budget_mb),
+        tta_views=1 + len(cfg.get("tta_transforms") or []) if cfg.get("tta") else 1,
+        tiling=bool(cfg.get("tiling")),
+        tile_size=int(cfg.get("tile_size", 1024)),
+        tile_overlap=int(cfg.get("tile_overlap", 128)),
+        gray_is_image=ctx.gray is ctx.image,
+    )
+    ctx.state["memory_plan"] = plan
+    ctx.metrics["memory_plan"] = plan.summary()
+    if not plan.within_budget:
+        layout = f"even with {plan.tile_size}px tiles" if plan.tiling else "untiled (the image is too small to tile)"
+        _append_warning(
+            ctx,
+            f"Estimated peak memory {plan.estimated_peak_bytes / 2**20:.0f} MB exceeds the "
+            f"{float(budget_mb):.0f} MB budget {layout}.",
+        )
+    return plan
+
+
+def _tiling_settings(ctx: RunContext, cfg: dict[str, Any]) -> tuple[bool, int, int]:
+    """``(tiling, tile_size, tile_overlap)`` from the memory plan when one was made, else from ``cfg``."""
+    plan = ctx.state.get("memory_plan")
+    if isinstance(plan, MemoryPlan):
+        return plan.tiling, plan.tile_size, plan.tile_overlap
+    return bool(cfg.get("tiling")), int(cfg.get("tile_size", 1024)), int(cfg.get("tile_overlap", 128))
+
+
 def _count_labeled_objects(labels: np.ndarray | None) -> int:
     if labels is None:
         return 0
@@ -162,6 +239,7 @@ class PrepareImageStage:
         ctx.gray = gray
         ctx.metrics["image_shape"] = list(gray.shape)
         ctx.metrics["image_dtype"] = str(gray.dtype)
+        _plan_memory(ctx, cfg)
         if any(int(dim) <= 1 for dim in gray.shape):
             _append_warning(ctx, f"Degenerate grayscale shape detected: {tuple(int(dim) for dim in gray.shape)}")
         return ctx
@@ -238,55 +316,69 @@ class SegmentationStage:
         if segmentation_input is None:
             raise ValueError("SegmentationStage requires segmentation_input in ctx.state.")
 
-        if cfg.get("tiling"):
+        # Normalize the whole input once so tiles and TTA views share one intensity scale.
+        # Its statistics are measured here, on the array actually segmented, and
+        # only for segmenters that preprocess.
+        preprocess_key = getattr(self.segmenter, "preprocess_key", lambda: None)()
+        preprocessed = preprocess_key is not None
+        if preprocessed:
+            segmentation_input = preprocess_cache(ctx).image(preprocess_key, segmentation_input, self.segmenter.preprocess)
+
+        tiling, tile_size, tile_overlap = _tiling_settings(ctx, cfg)
+        if tiling:
             masks, seg_info = segment_tiled(
                 self.segmenter,
                 segmentation_input,
-                tile_size=int(cfg.get("tile_size", 1024)),
-                overlap=int(cfg.get("tile_overlap", 128)),
+                tile_size=tile_size,
+                overlap=tile_overlap,
                 use_tta=bool(cfg.get("tta")),
                 transforms=cfg.get("tta_transforms"),
+                preprocessed=preprocessed,
             )
         elif cfg.get("tta"):
             masks, seg_info = segment_with_tta(
                 self.segmenter,
                 segmentation_input,
                 transforms=cfg.get("tta_transforms"),
+                preprocessed=preprocessed,
             )
+        elif preprocessed:
+            masks, seg_info = self.segmenter.segment(segmentation_input, preprocessed=True)
         else:
             masks, seg_info = self.segmenter.segment(segmentation_input)
 
         bbox = ctx.state.get("bbox")
         if bbox is not None and ctx.gray is not None:
             y1, y2, x1, x2 = bbox
-            full_masks = np.zeros_like(ctx.gray, dtype=np.uint32)
-            next_id = 1
-            for object_id in np.unique(masks):
-                if int(object_id) == 0:
-                    continue
-                full_masks[y1:y2, x1:x2][masks == object_id] = next_id
-                next_id += 1
+            object_ids = np.unique(masks)
+            lut = relabel_lut(int(object_ids[-1]) if object_ids.size else 0, object_ids[object_ids != 0])
+            full_masks = np.zeros(ctx.gray.shape[:2], dtype=lut.dtype)
+            full_masks[y1:y2, x1:x2] = lut[masks]
             masks = full_masks
             if seg_info.get("foreground_probability") is not None:
-                full_probability = np.zeros_like(ctx.gray, dtype=np.float32)
-                full_probability[y1:y2, x1:x2] = np.asarray(seg_info["foreground_probability"], dtype=np.float32)
+                full_probability = np.zeros(ctx.gray.shape[:2], dtype=INTENSITY_DTYPE)
+                full_probability[y1:y2, x1:x2] = seg_info["foreground_probability"]
                 seg_info["foreground_probability"] = full_probability
 
         if seg_info.get("foreground_probability") is not None:
-            ctx.state["foreground_probability"] = np.asarray(seg_info["foreground_probability"], dtype=np.float32)
+            ctx.state["foreground_probability"] = np.asarray(seg_info["foreground_probability"], dtype=INTENSITY_DTYPE)
 
-        label_dtype = np.uint32 if int(np.max(masks)) > np.iinfo(np.uint16).max else np.uint16
-        ctx.labels = masks.astype(label_dtype, copy=False)
+        ctx.labels = compact_labels(masks)
         _set_object_flow_metrics(ctx, n_labels_raw=_count_labeled_objects(ctx.labels))
         ctx.seg_info = seg_info
         ctx.metrics["backend"] = seg_info.get("backend", cfg.get("backend", "unknown"))
         for key, value in _resolved_model_fields(ctx, cfg).items():
             if value is not None:
                 ctx.metrics[key] = value
-        if cfg.get("tiling"):
+        plan = ctx.state.get("memory_plan")
+        if isinstance(plan, MemoryPlan) and not plan.keep_intermediate_maps:
+            # Later stages only need the labels; free the segmenter inputs early.
+            ctx.state.pop("segmentation_input", None)
+            ctx.state.pop("preprocess_cache", None)
+        if tiling:
             ctx.metrics["tiling"] = {
-                "tile_size": int(cfg.get("tile_size", 1024)),
-                "tile_overlap": int(cfg.get("tile_overlap", 128)),
+                "tile_size": tile_size,
+                "tile_overlap": tile_overlap,
                 "tile_count": int(seg_info.get("tile_count", 0)),
                 "stitching": seg_info.get("stitching", "unknown"),
                 "matched_overlap_pairs": int(seg_info.get("matched_overlap_pairs", 0)),
@@ -488,6 +580,7 @@ class RetinaRegistrationStage:
         if ctx.object_table is None or ctx.qc_mask is None or ctx.gray is None:
             raise ValueError("RetinaRegistrationStage requires object_table, qc_mask, and gray image.")
 
+        tissue = _tissue_mask_levels(ctx, cfg)
         frame = resolve_retina_frame(
             image_path=ctx.path,
             gray_image=ctx.gray,
@@ -496,9 +589,10 @@ class RetinaRegistrationStage:
             onh_xy=cfg.get("onh_xy"),
             dorsal_xy=cfg.get("dorsal_xy"),
             retina_frame_path=cfg.get("retina_frame_path"),
+            tissue=tissue,
         )
         focus_pixels = register_focus_mask_pixels(ctx.qc_mask, frame)
-        tissue_mask = build_tissue_mask(ctx.gray)
+        tissue_mask = tissue.mask
         tissue_pixels = register_focus_mask_pixels(tissue_mask, frame)
         max_ecc_um = float(tissue_pixels["ecc_um"].max()) if not tissue_pixels.empty else float(focus_pixels["ecc_um"].max()) if not focus_pixels.empty else 0.0
         registered = register_cells(ctx.object_table, frame)
@@ -515,6 +609,7 @@ class RetinaRegistrationStage:
             frame=frame,
             schema_name=cfg.get("region_schema", "mouse_flatmount_v1"),
             source_path=ctx.path,
+            area_engine=cfg.get("region_area_engine", "raster"),
         )
 
         ctx.object_table = registered
@@ -624,7 +719,7 @@ class SpatialStatsStage:
         }
         ctx.metrics["spatial"] = spatial
         ctx.state["centroids"] = cents
-        ctx.state["isodensity_map"] = isodensity_map(cents, ctx.gray.shape, sigma_px=50.0)
+        ctx.state["isodensity_grid"] = image_density_grid(cents, ctx.gray.shape, sigma_px=50.0)
         ctx.summary_row["spatial_mode"] = cfg.get("spatial_mode", "legacy")
         ctx.summary_row.update(spatial)
 
@@ -634,7 +729,7 @@ class SpatialStatsStage:
                     ctx,
                     f"Rigorous spatial analysis requested with too few points: {int(len(cents))}",
                 )
-            tissue_mask = build_tissue_mask(ctx.gray)
+            tissue_mask = _tissue_mask_levels(ctx, cfg).mask
             um_per_px = None
             max_ecc_um = None
             registered_tissue_pixels = None
@@ -658,6 +753,7 @@ class SpatialStatsStage:
                 radii_px=cfg.get("spatial_radii_px", DEFAULT_RIGOROUS_RADII_PX),
                 simulation_count=int(cfg.get("spatial_envelope_sims", 999)),
                 base_seed=int(cfg.get("spatial_random_seed", 1337)),
+                max_workers=int(cfg.get("spatial_workers", 1)),
             )
             ctx.state["rigorous_spatial"] = rigorous
             ctx.metrics["spatial_analysis"] = rigorous["spatial_analysis"]
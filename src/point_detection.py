@@ -1,15 +1,26 @@
 from __future__ import annotations
 
 import math
+from dataclasses import dataclass, field
 from typing import Any
 
 import cv2
 import numpy as np
 import pandas as pd
-from skimage import feature, morphology
+from scipy import ndimage as ndi
+from skimage import feature, filters, morphology
 
 from src.rbpms_confocal import normalize_for_detection
 
+try:
+    from skimage.feature.blob import _prune_blobs
+except ImportError:  # pragma: no cover - private helper moved; fall back to blob_log/blob_dog
+    _prune_blobs = None
+
+
+BLOB_OVERLAP = 0.5
+DOG_SIGMA_RATIO = 1.6
+
 
 def _as_2d_float(image: np.ndarray) -> np.ndarray:
     arr = np.asarray(image)
@@ -18,6 +29,83 @@ def _as_2d_float(image: np.ndarray) -> np.ndarray:
     return normalize_for_detection(arr, mode="robust_float")
 
 
+@dataclass
+class DetectorInput:
+    """
+    A normalized detector image with its threshold-independent filter responses.
+
+    Detectors given the same ``DetectorInput`` reuse the candidate score map
+    and any LoG/DoG scale space already built for a sigma set, so configs
+    that differ only in threshold or min-distance filter the image once.
+    """
+
+    image: np.ndarray
+    _score_map: np.ndarray | None = None
+    _scale_spaces: dict[tuple[Any, ...], tuple[np.ndarray, np.ndarray]] = field(default_factory=dict)
+
+    def score_map(self) -> np.ndarray:
+        if self._score_map is None:
+            self._score_map = cv2.GaussianBlur(_as_2d_float(self.image), (0, 0), sigmaX=1.0)
+        return self._score_map
+
+    def log_scale_space(self, sigma_min: float, sigma_max: float, num_sigma: int) -> tuple[np.ndarray, np.ndarray]:
+        """``(cube, sigma_list)`` exactly as ``skimage.feature.blob_log`` builds them."""
+        key = ("log", float(sigma_min), float(sigma_max), int(num_sigma))
+        if key not in self._scale_spaces:
+            image = self.image
+            sigma_list = np.linspace(
+                np.full(image.ndim, sigma_min, dtype=image.dtype),
+                np.full(image.ndim, sigma_max, dtype=image.dtype),
+                int(num_sigma),
+            )
+            cube = np.empty(image.shape + (len(sigma_list),), dtype=image.dtype)
+            for index, sigma in enumerate(sigma_list):
+                cube[..., index] = -ndi.gaussian_laplace(image, sigma) * np.mean(sigma) ** 2
+            self._scale_spaces[key] = (cube, sigma_list)
+        return self._scale_spaces[key]
+
+    def dog_scale_space(self, sigma_min: float, sigma_max: float) -> tuple[np.ndarray, np.ndarray]:
+        """``(cube, sigma_list)`` exactly as ``skimage.feature.blob_dog`` builds them."""
+        key = ("dog", float(sigma_min), float(sigma_max), DOG_SIGMA_RATIO)
+        if key not in self._scale_spaces:
+            image = self.image
+            min_sigma = np.full(image.ndim, sigma_min, dtype=image.dtype)
+            max_sigma = np.full(image.ndim, sigma_max, dtype=image.dtype)
+            k = int(np.mean(np.log(max_sigma / min_sigma) / np.log(DOG_SIGMA_RATIO) + 1))
+            sigma_list = np.array([min_sigma * (DOG_SIGMA_RATIO**i) for i in range(k + 1)])
+            cube = np.empty(image.shape + (k,), dtype=image.dtype)
+            previous = filters.gaussian(image, sigma_list[0], mode="reflect")
+            for index, sigma in enumerate(sigma_list[1:]):
+                current = filters.gaussian(image, sigma, mode="reflect")
+                cube[..., index] = previous - current
+                previous = current
+            cube *= 1 / (DOG_SIGMA_RATIO - 1)
+            self._scale_spaces[key] = (cube, sigma_list)
+        return self._scale_spaces[key]
+
+
+def prepare_detector_input(image: np.ndarray | DetectorInput) -> DetectorInput:
+    """Normalize ``image`` once for several detector runs; a ``DetectorInput`` is returned unchanged."""
+    if isinstance(image, DetectorInput):
+        return image
+    return DetectorInput(image=_as_2d_float(image))
+
+
+def _blobs_from_scale_space(cube: np.ndarray, sigma_list: np.ndarray, threshold: float) -> np.ndarray:
+    # The thresholded half of blob_log/blob_dog, run on a cached scale space.
+    local_maxima = feature.peak_local_max(
+        cube,
+        threshold_abs=float(threshold),
+        exclude_border=False,
+        footprint=np.ones((3,) * cube.ndim),
+    )
+    if local_maxima.size == 0:
+        return np.empty((0, cube.ndim))
+    sigmas_of_peaks = sigma_list[local_maxima[:, -1]][:, 0:1]
+    blobs = np.hstack([local_maxima[:, :-1].astype(cube.dtype), sigmas_of_peaks])
+    return _prune_blobs(blobs, BLOB_OVERLAP, sigma_dim=1)
+
+
 def _coerce_points(points: Any) -> pd.DataFrame:
     if isinstance(points, pd.DataFrame):
         frame = points.copy()
@@ -47,24 +135,26 @@ def _suppress_min_distance(frame: pd.DataFrame, min_distance: float) -> pd.DataF
     if frame.empty:
         return frame
     ordered = frame.sort_values(["score", "radius_px", "y_px", "x_px"], ascending=[False, False, True, True]).reset_index(drop=True)
-    kept: list[pd.Series] = []
+    coords = ordered[["y_px", "x_px"]].to_numpy(dtype=float)
     radius = float(min_distance)
-    for _, candidate in ordered.iterrows():
-        yx = np.asarray([float(candidate["y_px"]), float(candidate["x_px"])], dtype=float)
-        if any(float(np.linalg.norm(yx - np.asarray([float(row["y_px"]), float(row["x_px"])], dtype=float))) < radius for row in kept):
-            continue
-        kept.append(candidate)
-    if not kept:
-        return frame.iloc[0:0].copy()
-    return pd.DataFrame(kept).reset_index(drop=True)
+    kept: list[int] = []
+    for index, yx in enumerate(coords):
+        if kept:
+            offsets = coords[kept] - yx
+            if np.any(np.sqrt(np.sum(offsets * offsets, axis=1)) < radius):
+                continue
+        kept.append(index)
+    return ordered.iloc[kept].reset_index(drop=True)
 
 
 def score_peak_candidates(image, points) -> pd.DataFrame:
-    arr = _as_2d_float(image)
     frame = _coerce_points(points)
     if frame.empty:
         return frame
-    smooth = cv2.GaussianBlur(arr, (0, 0), sigmaX=1.0)
+    if isinstance(image, DetectorInput):
+        smooth = image.score_map()
+    else:
+        smooth = cv2.GaussianBlur(_as_2d_float(image), (0, 0), sigmaX=1.0)
     scores: list[float] = []
     for row in frame.itertuples(index=False):
         y = int(np.clip(round(float(row.y_px)), 0, smooth.shape[0] - 1))
@@ -80,50 +170,57 @@ def score_peak_candidates(image, points) -> pd.DataFrame:
 
 
 def detect_log_peaks(image, sigma_min, sigma_max, num_sigma, threshold, min_distance, exclude_mask=None):
-    arr = _as_2d_float(image)
-    blobs = feature.blob_log(
-        arr,
-        min_sigma=float(sigma_min),
-        max_sigma=float(sigma_max),
-        num_sigma=int(num_sigma),
-        threshold=float(threshold),
-    )
+    prepared = prepare_detector_input(image)
+    if _prune_blobs is None:
+        blobs = feature.blob_log(
+            prepared.image,
+            min_sigma=float(sigma_min),
+            max_sigma=float(sigma_max),
+            num_sigma=int(num_sigma),
+            threshold=float(threshold),
+        )
+    else:
+        blobs = _blobs_from_scale_space(*prepared.log_scale_space(sigma_min, sigma_max, num_sigma), threshold)
     frame = pd.DataFrame(
         {
-            "y_px": blobs[:, 0] if len(blobs) else [],
-            "x_px": blobs[:, 1] if len(blobs) else [],
-            "radius_px": blobs[:, 2] * math.sqrt(2.0) if len(blobs) else [],
+            "y_px": blobs[:, 0].astype(float) if len(blobs) else [],
+            "x_px": blobs[:, 1].astype(float) if len(blobs) else [],
+            "radius_px": (blobs[:, 2] * math.sqrt(2.0)).astype(float) if len(blobs) else [],
             "detector": "log",
         }
     )
-    frame = score_peak_candidates(arr, frame)
+    frame = score_peak_candidates(prepared, frame)
     frame = _exclude_mask_filter(frame, exclude_mask)
     return _suppress_min_distance(frame, float(min_distance))
 
 
 def detect_dog_peaks(image, sigma_min, sigma_max, threshold, min_distance, exclude_mask=None):
-    arr = _as_2d_float(image)
-    blobs = feature.blob_dog(
-        arr,
-        min_sigma=float(sigma_min),
-        max_sigma=float(sigma_max),
-        threshold=float(threshold),
-    )
+    prepared = prepare_detector_input(image)
+    if _prune_blobs is None:
+        blobs = feature.blob_dog(
+            prepared.image,
+            min_sigma=float(sigma_min),
+            max_sigma=float(sigma_max),
+            threshold=float(threshold),
+        )
+    else:
+        blobs = _blobs_from_scale_space(*prepared.dog_scale_space(sigma_min, sigma_max), threshold)
     frame = pd.DataFrame(
         {
-            "y_px": blobs[:, 0] if len(blobs) else [],
-            "x_px": blobs[:, 1] if len(blobs) else [],
-            "radius_px": blobs[:, 2] * math.sqrt(2.0) if len(blobs) else [],
+            "y_px": blobs[:, 0].astype(float) if len(blobs) else [],
+            "x_px": blobs[:, 1].astype(float) if len(blobs) else [],
+            "radius_px": (blobs[:, 2] * math.sqrt(2.0)).astype(float) if len(blobs) else [],
             "detector": "dog",
         }
     )
-    frame = score_peak_candidates(arr, frame)
+    frame = score_peak_candidates(prepared, frame)
     frame = _exclude_mask_filter(frame, exclude_mask)
     return _suppress_min_distance(frame, float(min_distance))
 
 
 def detect_hmax_peaks(image, h, min_distance, exclude_mask=None):
-    arr = _as_2d_float(image)
+    prepared = prepare_detector_input(image)
+    arr = prepared.image
     maxima_mask = morphology.h_maxima(arr, float(h))
     coords = feature.peak_local_max(arr, min_distance=int(min_distance), labels=maxima_mask.astype(np.uint8))
     frame = pd.DataFrame(
@@ -134,6 +231,6 @@ def detect_hmax_peaks(image, h, min_distance, exclude_mask=None):
             "detector": "hmax",
         }
     )
-    frame = score_peak_candidates(arr, frame)
+    frame = score_peak_candidates(prepared, frame)
     frame = _exclude_mask_filter(frame, exclude_mask)
     return _suppress_min_distance(frame, float(min_distance))
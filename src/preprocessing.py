@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable
+
+import numpy as np
+
+
+ROBUST_STATS_MAX_SAMPLES = 4_000_000
+ROBUST_LOW_PERCENTILE = 1.0
+ROBUST_HIGH_PERCENTILE = 99.5
+
+
+@dataclass(frozen=True)
+class IntensityStats:
+    """Image-wide intensity statistics shared by every tile and TTA view of one image."""
+
+    low: float
+    high: float
+    max: float
+    low_percentile: float = ROBUST_LOW_PERCENTILE
+    high_percentile: float = ROBUST_HIGH_PERCENTILE
+    sample_step: int = 1
+
+    @property
+    def intensity_range(self) -> tuple[float, float]:
+        return self.low, self.high
+
+
+def robust_intensity_stats(
+    image: np.ndarray,
+    *,
+    low_percentile: float = ROBUST_LOW_PERCENTILE,
+    high_percentile: float = ROBUST_HIGH_PERCENTILE,
+    max_samples: int = ROBUST_STATS_MAX_SAMPLES,
+) -> IntensityStats:
+    """
+    Percentiles from a regular grid subsample of at most ``max_samples`` pixels.
+
+    Images at or below the limit are measured exactly. Percentiles are taken
+    on float32 values so they match normalizing the full image in float32.
+    """
+    arr = np.asarray(image)
+    if arr.size == 0:
+        return IntensityStats(low=0.0, high=0.0, max=0.0, low_percentile=low_percentile, high_percentile=high_percentile)
+    step = 1
+    if arr.size > max_samples:
+        step = int(np.ceil(np.sqrt(arr.size / float(max_samples))))
+    sample = arr[(slice(None, None, step),) * min(arr.ndim, 2)]
+    low, high = np.percentile(np.asarray(sample, dtype=np.float32), [low_percentile, high_percentile])
+    return IntensityStats(
+        low=float(low),
+        high=float(high),
+        max=float(np.max(arr)),
+        low_percentile=float(low_percentile),
+        high_percentile=float(high_percentile),
+        sample_step=step,
+    )
+
+
+@dataclass
+class PreprocessCache:
+    """
+    Per-run store of intensity statistics and preprocessed images.
+
+    Entries are tied to the exact source array object, so a cached result is
+    only reused for the array it was computed from.
+    """
+
+    _stats: list[tuple[np.ndarray, IntensityStats]] = field(default_factory=list)
+    _images: dict[Hashable, tuple[np.ndarray, np.ndarray]] = field(default_factory=dict)
+
+    def stats(self, image: np.ndarray) -> IntensityStats:
+        for source, stats in self._stats:
+            if source is image:
+                return stats
+        stats = robust_intensity_stats(image)
+        self._stats.append((image, stats))
+        return stats
+
+    def image(self, key: Hashable, source: np.ndarray, build: Callable[[np.ndarray, IntensityStats], np.ndarray]) -> np.ndarray:
+        cached = self._images.get(key)
+        if cached is not None and cached[0] is source:
+            return cached[1]
+        prepared = build(source, self.stats(source))
+        self._images[key] = (source, prepared)
+        return prepared
+
+
+def preprocess_cache(ctx: Any) -> PreprocessCache:
+    """The ``PreprocessCache`` kept in ``ctx.state``, created on first use."""
+    cache = ctx.state.get("preprocess_cache")
+    if not isinstance(cache, PreprocessCache):
+        cache = PreprocessCache()
+        ctx.state["preprocess_cache"] = cache
+    return cache
@@ -9,7 +9,7 @@ import pandas as pd
 from shapely.geometry import MultiPolygon, Point, Polygon
 from shapely.ops import unary_union
 
-from src.retina_coords import RetinaFrame
+from src.retina_coords import RetinaFrame, register_focus_mask_pixels
 from src.schema import REGION_TABLE_COLUMNS, order_columns, validate_region_table
 
 
@@ -61,6 +61,11 @@ SCHEMAS: dict[str, RegionSchema] = {
 }
 
 
+QUADRANT_LABELS: tuple[str, ...] = ("dorsal_temporal", "dorsal_nasal", "ventral_nasal", "ventral_temporal")
+PERIPAPILLARY_LABELS: tuple[str, ...] = ("peripapillary", "non_peripapillary")
+REGION_AREA_ENGINES: tuple[str, ...] = ("raster", "polygon")
+
+
 def get_region_schema(name: str) -> RegionSchema:
     if name not in SCHEMAS:
         raise ValueError(f"Unknown region schema: {name}")
@@ -73,22 +78,69 @@ def _normalized_eccentricity(ecc_um: pd.Series | np.ndarray, max_ecc_um: float)
     return np.clip(np.asarray(ecc_um, dtype=float) / max_ecc_um, 0.0, 1.0)
 
 
-def _quadrant_labels(ret_x_um: pd.Series, ret_y_um: pd.Series) -> np.ndarray:
-    x = np.asarray(ret_x_um, dtype=float)
-    y = np.asarray(ret_y_um, dtype=float)
-    labels = np.empty(len(x), dtype=object)
-    labels[(x >= 0) & (y >= 0)] = "dorsal_temporal"
-    labels[(x < 0) & (y >= 0)] = "dorsal_nasal"
-    labels[(x < 0) & (y < 0)] = "ventral_nasal"
-    labels[(x >= 0) & (y < 0)] = "ventral_temporal"
-    return labels
-
-
-def _sector_labels(theta_deg: pd.Series, schema: RegionSchema) -> np.ndarray:
+def _sector_codes(theta_deg: pd.Series | np.ndarray, schema: RegionSchema) -> np.ndarray:
     theta = np.asarray(theta_deg, dtype=float)
     idx = (((theta + 22.5) % 360.0) // 45.0).astype(int)
-    idx = np.clip(idx, 0, len(schema.sector_labels) - 1)
-    return np.asarray(schema.sector_labels, dtype=object)[idx]
+    return np.clip(idx, 0, len(schema.sector_labels) - 1)
+
+
+def _axis_label_order(schema: RegionSchema) -> dict[str, tuple[str, ...]]:
+    return {
+        "ring": schema.ring_labels,
+        "quadrant": QUADRANT_LABELS,
+        "sector": schema.sector_labels,
+        "peripapillary_bin": PERIPAPILLARY_LABELS,
+    }
+
+
+def _region_codes(table: pd.DataFrame, schema: RegionSchema, max_ecc_um: float) -> dict[str, np.ndarray]:
+    """Per-axis label codes indexing ``_axis_label_order(schema)``; -1 where a row has no label."""
+    normalized_ecc = _normalized_eccentricity(table["ecc_um"], max_ecc_um)
+    x = np.asarray(table["ret_x_um"], dtype=float)
+    y = np.asarray(table["ret_y_um"], dtype=float)
+    # Ring bins are right-closed, which is searchsorted(side="left") on the upper edges.
+    ring = np.searchsorted(np.asarray(schema.ring_edges_norm, dtype=float), normalized_ecc, side="left")
+    ring = np.where(np.isnan(normalized_ecc), -1, np.minimum(ring, len(schema.ring_labels) - 1))
+    quadrant = np.where(y >= 0, np.where(x >= 0, 0, 1), np.where(x < 0, 2, 3))
+    quadrant[np.isnan(x) | np.isnan(y)] = -1
+    return {
+        "ring": ring,
+        "quadrant": quadrant,
+        "sector": _sector_codes(table["theta_deg"], schema),
+        "peripapillary_bin": np.where(normalized_ecc <= schema.peripapillary_norm, 0, 1),
+    }
+
+
+def rasterize_region_schema(
+    tissue_mask: np.ndarray,
+    frame: RetinaFrame,
+    *,
+    schema_name: str,
+    max_ecc_um: float,
+    tissue_pixels: pd.DataFrame | None = None,
+) -> dict[str, np.ndarray]:
+    """Return one int8 label image per region axis, aligned with ``tissue_mask``.
+
+    Tissue pixels carry the index of their label in the schema's label order and
+    every other pixel is -1. Pass ``tissue_pixels`` when the caller already ran
+    ``register_focus_mask_pixels(tissue_mask, frame)`` so the mask is not
+    registered twice. Pixel membership is identical to ``assign_regions``.
+    """
+    schema = get_region_schema(schema_name)
+    mask = np.asarray(tissue_mask, dtype=bool)
+    label_order = _axis_label_order(schema)
+    labels = {axis: np.full(mask.shape, -1, dtype=np.int8) for axis in label_order}
+    if tissue_pixels is None or not {"x_px", "y_px"}.issubset(tissue_pixels.columns):
+        tissue_pixels = register_focus_mask_pixels(mask, frame)
+    if tissue_pixels.empty:
+        return labels
+    # Match the polygon engine, whose regions stop at the maximum eccentricity.
+    registered = tissue_pixels[tissue_pixels["ecc_um"].to_numpy(dtype=float) <= float(max_ecc_um)]
+    ys = registered["y_px"].to_numpy(dtype=np.intp)
+    xs = registered["x_px"].to_numpy(dtype=np.intp)
+    for axis, codes in _region_codes(registered, schema, max_ecc_um).items():
+        labels[axis][ys, xs] = codes
+    return labels
 
 
 def assign_regions(object_table: pd.DataFrame, *, schema_name: str, max_ecc_um: float) -> pd.DataFrame:
@@ -99,21 +151,18 @@ def assign_regions(object_table: pd.DataFrame, *, schema_name: str, max_ecc_um:
             out[column] = pd.Series(dtype="object")
         return out
 
-    normalized_ecc = _normalized_eccentricity(object_table["ecc_um"], max_ecc_um)
-    ring = pd.cut(
-        normalized_ecc,
-        bins=[-np.inf, *schema.ring_edges_norm],
-        labels=schema.ring_labels,
-        include_lowest=True,
-    ).astype(str)
-    quadrant = _quadrant_labels(object_table["ret_x_um"], object_table["ret_y_um"])
-    sector = _sector_labels(object_table["theta_deg"], schema)
-    peripapillary = np.where(normalized_ecc <= schema.peripapillary_norm, "peripapillary", "non_peripapillary")
+    codes = _region_codes(object_table, schema, max_ecc_um)
+    label_order = _axis_label_order(schema)
+    # Unassignable rows keep what pd.cut(...).astype(str) and the quadrant masks produced.
+    ring = np.append(np.asarray(label_order["ring"], dtype=object), "nan")[codes["ring"]]
+    quadrant = np.append(np.asarray(label_order["quadrant"], dtype=object), None)[codes["quadrant"]]
+    sector = np.asarray(label_order["sector"], dtype=object)[codes["sector"]]
+    peripapillary = np.asarray(label_order["peripapillary_bin"])[codes["peripapillary_bin"]]
 
     out = object_table.copy()
     out["retina_region_schema"] = schema.name
     out["region_schema"] = schema.name
-    out["normalized_ecc"] = normalized_ecc
+    out["normalized_ecc"] = _normalized_eccentricity(object_table["ecc_um"], max_ecc_um)
     out["ring"] = ring
     out["quadrant"] = quadrant
     out["sector"] = sector
@@ -285,22 +334,32 @@ def summarize_regions(
     frame: RetinaFrame,
     schema_name: str,
     source_path: str | Path,
+    area_engine: str = "raster",
 ) -> pd.DataFrame:
+    """Summarize area, object count, and density for every region of ``schema_name``.
+
+    ``area_engine="raster"`` counts tissue pixels per region from a rasterized
+    label image. ``area_engine="polygon"`` intersects the schema's sector polygons
+    with the traced tissue outline, which is sub-pixel but slow on ragged masks.
+    """
+    if area_engine not in REGION_AREA_ENGINES:
+        raise ValueError(f"Unknown region area engine: {area_engine}")
     schema = get_region_schema(schema_name)
     source_path = str(source_path)
     image_id = Path(source_path).name.rsplit(".", 1)[0]
     max_ecc_um = float(tissue_pixels["ecc_um"].max()) if not tissue_pixels.empty else float(focus_pixels["ecc_um"].max()) if not focus_pixels.empty else 0.0
-    max_radius_px = max_ecc_um / frame.um_per_px if frame.um_per_px > 0 else 0.0
-    tissue_polygon = mask_to_polygon(tissue_mask.astype(bool)) if tissue_mask is not None else Polygon()
-    axis_polygons = _axis_polygons(schema, frame, max_radius_px)
+
+    if area_engine == "polygon":
+        area_by_axis, counts_by_axis = _polygon_region_areas(schema, object_table, tissue_mask, frame, max_ecc_um)
+    else:
+        area_by_axis, counts_by_axis = _raster_region_areas(schema, object_table, tissue_mask, tissue_pixels, frame, max_ecc_um)
 
     rows: list[dict[str, object]] = []
-    for axis, label_polygons in axis_polygons.items():
-        counts = object_table.groupby(axis).size().to_dict() if axis in object_table.columns else {}
-        for label, polygon in label_polygons.items():
-            area_px = _area_px_from_polygons(polygon, tissue_polygon) if tissue_mask is not None else 0.0
+    for axis, labels in _axis_label_order(schema).items():
+        for label in labels:
+            area_px = float(area_by_axis[axis].get(label, 0.0))
             area_mm2 = area_px * (frame.um_per_px ** 2) / 1e6
-            object_count = int(counts.get(label, 0))
+            object_count = int(counts_by_axis[axis].get(label, 0))
             density = float(object_count / area_mm2) if area_mm2 > 0 else 0.0
             rows.append(
                 {
@@ -321,6 +380,71 @@ def summarize_regions(
     return order_columns(pd.DataFrame(rows), REGION_TABLE_COLUMNS)
 
 
+def _assigned_region_counts(object_table: pd.DataFrame, axis: str) -> dict[str, int]:
+    return object_table.groupby(axis).size().to_dict() if axis in object_table.columns else {}
+
+
+def _polygon_region_areas(
+    schema: RegionSchema,
+    object_table: pd.DataFrame,
+    tissue_mask: np.ndarray | None,
+    frame: RetinaFrame,
+    max_ecc_um: float,
+) -> tuple[dict[str, dict[str, float]], dict[str, dict[str, int]]]:
+    max_radius_px = max_ecc_um / frame.um_per_px if frame.um_per_px > 0 else 0.0
+    tissue_polygon = mask_to_polygon(tissue_mask.astype(bool)) if tissue_mask is not None else Polygon()
+    areas: dict[str, dict[str, float]] = {}
+    counts: dict[str, dict[str, int]] = {}
+    for axis, label_polygons in _axis_polygons(schema, frame, max_radius_px).items():
+        counts[axis] = _assigned_region_counts(object_table, axis)
+        areas[axis] = {
+            label: _area_px_from_polygons(polygon, tissue_polygon) if tissue_mask is not None else 0.0
+            for label, polygon in label_polygons.items()
+        }
+    return areas, counts
+
+
+def _raster_region_areas(
+    schema: RegionSchema,
+    object_table: pd.DataFrame,
+    tissue_mask: np.ndarray | None,
+    tissue_pixels: pd.DataFrame,
+    frame: RetinaFrame,
+    max_ecc_um: float,
+) -> tuple[dict[str, dict[str, float]], dict[str, dict[str, int]]]:
+    label_order = _axis_label_order(schema)
+    if tissue_mask is None:
+        return {axis: {} for axis in label_order}, {axis: _assigned_region_counts(object_table, axis) for axis in label_order}
+
+    label_images = rasterize_region_schema(
+        tissue_mask,
+        frame,
+        schema_name=schema.name,
+        max_ecc_um=max_ecc_um,
+        tissue_pixels=tissue_pixels,
+    )
+    has_centroids = {"centroid_y_px", "centroid_x_px"}.issubset(object_table.columns) and not object_table.empty
+    if has_centroids:
+        shape = np.asarray(tissue_mask).shape
+        ys = np.clip(np.round(object_table["centroid_y_px"].to_numpy(dtype=float)).astype(np.intp), 0, shape[0] - 1)
+        xs = np.clip(np.round(object_table["centroid_x_px"].to_numpy(dtype=float)).astype(np.intp), 0, shape[1] - 1)
+
+    areas: dict[str, dict[str, float]] = {}
+    counts: dict[str, dict[str, int]] = {}
+    for axis, labels in label_order.items():
+        codes = label_images[axis].ravel()
+        pixel_counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+        areas[axis] = {label: float(pixel_counts[index]) for index, label in enumerate(labels)}
+        if axis in object_table.columns or not has_centroids:
+            # Objects already carry their assigned label; keep the table and summary consistent.
+            counts[axis] = _assigned_region_counts(object_table, axis)
+            continue
+        object_codes = label_images[axis][ys, xs]
+        object_counts = np.bincount(object_codes[object_codes >= 0], minlength=len(labels))
+        counts[axis] = {label: int(object_counts[index]) for index, label in enumerate(labels)}
+    return areas, counts
+
+
 def region_table_path_for(output_dir: str | Path, source_path: str | Path) -> Path:
     filename = Path(source_path).name.rsplit(".", 1)[0] + "_region_summary.csv"
     return Path(output_dir) / "regions" / filename
@@ -5,12 +5,11 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
 from src.config import MICRONS_PER_PIXEL
-from src.landmarks import build_tissue_mask, detect_onh_hole
+from src.landmarks import TissueMask, build_tissue_mask_levels, detect_onh_hole
 
 
 @dataclass
@@ -89,18 +88,24 @@ def retina_frame_from_points(
     )
 
 
-def _frame_with_tissue_metrics(frame: RetinaFrame, gray_image: np.ndarray | None) -> RetinaFrame:
-    if gray_image is None:
+def _frame_with_tissue_metrics(
+    frame: RetinaFrame,
+    gray_image: np.ndarray | None,
+    tissue: TissueMask | None = None,
+) -> RetinaFrame:
+    if gray_image is None and tissue is None:
         return frame
-    tissue_mask = build_tissue_mask(gray_image)
-    ys, xs = np.where(tissue_mask)
+    if tissue is None:
+        tissue = build_tissue_mask_levels(gray_image)
+    # The outermost tissue radius only needs the coarse level; the area comes from the refined mask.
+    xs, ys = tissue.coarse_pixel_centers_xy()
     if len(xs) == 0:
         frame.tissue_coverage_fraction = 0.0
         return frame
     distances = np.sqrt((xs.astype(float) - frame.onh_xy_px[0]) ** 2 + (ys.astype(float) - frame.onh_xy_px[1]) ** 2)
     max_radius_px = float(distances.max()) if len(distances) else 0.0
     ideal_area = np.pi * (max_radius_px ** 2)
-    frame.tissue_coverage_fraction = float(tissue_mask.sum() / ideal_area) if ideal_area > 0 else 0.0
+    frame.tissue_coverage_fraction = float(tissue.mask.sum() / ideal_area) if ideal_area > 0 else 0.0
     return frame
 
 
@@ -165,8 +170,16 @@ def resolve_retina_frame(
     onh_xy: tuple[float, float] | None,
     dorsal_xy: tuple[float, float] | None,
     retina_frame_path: str | None,
+    tissue: TissueMask | None = None,
 ) -> RetinaFrame:
+    """
+    Build the retina frame for ``onh_mode``. ``tissue`` lets callers that
+    already built the tissue mask levels share them with ONH detection and
+    the coverage metric instead of recomputing them from ``gray_image``.
+    """
     um_per_px = _infer_um_per_px(meta)
+    if tissue is None and gray_image is not None:
+        tissue = build_tissue_mask_levels(gray_image)
     if onh_mode == "cli":
         if onh_xy is None or dorsal_xy is None:
             raise ValueError("CLI retina registration requires both --onh_xy and --dorsal_xy.")
@@ -179,6 +192,7 @@ def resolve_retina_frame(
                 onh_source="cli",
             ),
             gray_image,
+            tissue,
         )
 
     if onh_mode == "sidecar":
@@ -197,12 +211,13 @@ def resolve_retina_frame(
                 onh_source=f"sidecar:{sidecar_source}",
             ),
             gray_image,
+            tissue,
         )
 
     if onh_mode in {"auto_hole", "auto_combined"}:
         if gray_image is None:
             raise ValueError(f"{onh_mode} requires a grayscale image for ONH detection.")
-        detected_onh, info = detect_onh_hole(gray_image)
+        detected_onh, info = detect_onh_hole(gray_image, tissue=tissue)
         if detected_onh is None:
             raise RuntimeError("Failed auto_hole ONH detection.")
 
@@ -227,6 +242,7 @@ def resolve_retina_frame(
                 onh_confidence=float(info.get("confidence", 0.0)),
             ),
             gray_image,
+            tissue,
         )
 
     raise ValueError(f"Unsupported onh_mode: {onh_mode}")
@@ -295,18 +311,24 @@ def registered_density_plot_path(output_dir: str | Path, source_path: str | Path
 
 
 def save_registered_density_plot(object_table: pd.DataFrame, destination: str | Path) -> Path:
+    import matplotlib.pyplot as plt
+
+    from src.spatial import registered_density_grid
+
     destination = Path(destination)
     destination.parent.mkdir(parents=True, exist_ok=True)
     fig, ax = plt.subplots(figsize=(6, 6))
     if not object_table.empty:
-        hb = ax.hexbin(
-            object_table["ret_x_um"],
-            object_table["ret_y_um"],
-            gridsize=28,
-            mincnt=1,
+        grid = registered_density_grid(object_table)
+        y0, x0 = grid.origin
+        image = ax.imshow(
+            grid.values * 1e6,
+            origin="lower",
+            extent=(x0, x0 + grid.values.shape[1] * grid.cell_size, y0, y0 + grid.values.shape[0] * grid.cell_size),
             cmap="viridis",
+            interpolation="bilinear",
         )
-        fig.colorbar(hb, ax=ax, label="Cell count")
+        fig.colorbar(image, ax=ax, label="Cells / mm^2")
     ax.scatter([0], [0], color="crimson", s=40, label="ONH")
     ax.axhline(0, color="#888", linewidth=0.8)
     ax.axvline(0, color="#888", linewidth=0.8)
@@ -1,38 +1,42 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import time
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any, Callable
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
 from src.io_ome import load_any_image
+from src.jsonl_index import JsonlIndex, json_ready
 from src.roi_data import (
     TRUTH_PROVENANCE_STATUS_INVALID,
     TRUTH_PROVENANCE_STATUS_MATCHED,
     TRUTH_PROVENANCE_STATUS_UNKNOWN,
     RoiRecord,
     crop_2d_or_yxc,
+    file_sha256,
     filter_roi_manifest_by_split,
     iter_roi_records,
     load_roi_manifest,
 )
-from src.run_service import RuntimeOptions, build_runtime, run_array
+from src.run_service import RuntimeCache, RuntimeOptions, build_runtime, run_array
 from src.validation import (
     build_benchmark_quality_table,
     load_manual_points,
     match_points,
-    point_matching_metrics,
+    point_matching_sweep,
 )
 
 
 SENSITIVITY_TOLERANCES_PX = (6.0, 8.0, 10.0)
 PRIMARY_TOLERANCE_PX = 8.0
 BENCHMARK_MIN_ROIS = 20
+RESULT_STORE_FILENAME = "cell_results.jsonl"
 
 
 @dataclass(frozen=True)
@@ -73,12 +77,49 @@ def markdown_table(frame: pd.DataFrame) -> str:
     return "\n".join(lines)
 
 
-def _json_ready(value: Any) -> Any:
-    if isinstance(value, np.generic):
-        return value.item()
-    if isinstance(value, Path):
-        return str(value)
-    return value
+def config_hash(config: RoiBenchmarkConfig) -> str:
+    payload = {key: value for key, value in asdict(config).items() if key != "notes"}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def roi_cell_key(*, config_digest: str, record: RoiRecord, crop_digest: str) -> str:
+    truth_digest = (
+        file_sha256(record.manual_points_path)
+        if record.manual_points_path is not None and Path(record.manual_points_path).exists()
+        else ""
+    )
+    payload = json.dumps([config_digest, record.roi_id, crop_digest, truth_digest])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class BenchmarkResultStore(JsonlIndex):
+    """Append-only JSON-lines store of finished (config, ROI) benchmark cells.
+
+    Each line holds one cell's primary and per-tolerance rows keyed by
+    ``roi_cell_key``. A line truncated by a crash is ignored on reload.
+    """
+
+    def __init__(self, path: str | Path, *, load_existing: bool = True):
+        super().__init__(path, "cell_key", load_existing=load_existing)
+
+    def append(
+        self,
+        cell_key: str,
+        *,
+        config_id: str,
+        roi_id: str,
+        primary: dict[str, Any],
+        per_tolerance_rows: list[dict[str, Any]],
+    ) -> None:
+        self.add(
+            {
+                "cell_key": cell_key,
+                "config_id": config_id,
+                "roi_id": roi_id,
+                "primary": primary,
+                "per_tolerance": per_tolerance_rows,
+            }
+        )
 
 
 def summarize_truth_provenance(records: list[RoiRecord]) -> dict[str, Any]:
@@ -136,31 +177,44 @@ def runtime_options_from_config(config: RoiBenchmarkConfig) -> RuntimeOptions:
     )
 
 
+def group_records_by_source(records: list[RoiRecord]) -> list[tuple[Path, list[tuple[int, RoiRecord]]]]:
+    """Group ROI records by source image, keeping manifest order within and across groups."""
+    groups: dict[Path, list[tuple[int, RoiRecord]]] = {}
+    for index, record in enumerate(records):
+        groups.setdefault(Path(record.image_path), []).append((index, record))
+    return list(groups.items())
+
+
 def run_single_roi_case(
     record: RoiRecord,
     *,
     config: RoiBenchmarkConfig,
     runtime_builder: Callable[..., Any] = build_runtime,
     runtime_runner: Callable[..., Any] = run_array,
+    runtime: Any | None = None,
+    crop: np.ndarray | None = None,
+    meta: dict[str, Any] | None = None,
 ) -> tuple[dict[str, Any], list[dict[str, Any]]]:
-    image, meta = load_any_image(str(record.image_path))
-    crop = crop_2d_or_yxc(image, x0=record.x0, y0=record.y0, width=record.width, height=record.height)
+    if crop is None:
+        image, meta = load_any_image(str(record.image_path))
+        crop = crop_2d_or_yxc(image, x0=record.x0, y0=record.y0, width=record.width, height=record.height)
     manual_points = load_manual_points(record.manual_points_path) if record.manual_points_path else np.empty((0, 2), dtype=float)
 
-    runtime = runtime_builder(runtime_options_from_config(config))
+    if runtime is None:
+        runtime = runtime_builder(runtime_options_from_config(config))
     started = time.perf_counter()
     ctx = runtime_runner(
         runtime,
         image=crop,
         source_path=f"{record.image_path}#roi:{record.roi_id}",
-        meta=meta,
+        meta=dict(meta or {}),
     )
     runtime_seconds = float(time.perf_counter() - started)
     predicted_points = predicted_points_from_context(ctx)
 
     per_tolerance_rows: list[dict[str, Any]] = []
-    for tolerance_px in SENSITIVITY_TOLERANCES_PX:
-        metrics = point_matching_metrics(manual_points, predicted_points, tolerance_px=float(tolerance_px))
+    sweep = point_matching_sweep(manual_points, predicted_points, tolerances_px=SENSITIVITY_TOLERANCES_PX)
+    for metrics in sweep.to_dict("records"):
         per_tolerance_rows.append(
             {
                 "config_id": config.config_id,
@@ -192,6 +246,111 @@ def run_single_roi_case(
     return primary, per_tolerance_rows
 
 
+def run_benchmark_cells(
+    records: list[RoiRecord],
+    configs: list[RoiBenchmarkConfig],
+    *,
+    runtime_builder: Callable[..., Any] = build_runtime,
+    runtime_runner: Callable[..., Any] = run_array,
+    store: BenchmarkResultStore | None = None,
+    max_workers: int = 1,
+    overlay_dirs: dict[str, Path] | None = None,
+) -> dict[str, tuple[list[dict[str, Any]], list[dict[str, Any]]]]:
+    """Evaluate every (config, ROI) cell and return rows per config in manifest order.
+
+    Source images are decoded once per group of ROIs. Cells already present in
+    ``store`` are reused; new cells are appended to it as soon as they finish, so
+    an interrupted run resumes where it stopped. With ``max_workers > 1`` cells
+    run on a thread pool; overlays are always rendered on the calling thread.
+    """
+    runtimes = RuntimeCache(runtime_builder)
+    results: dict[tuple[str, int], tuple[dict[str, Any], list[dict[str, Any]]]] = {}
+    crops: dict[int, np.ndarray] = {}
+
+    def run_cell(config: RoiBenchmarkConfig, record: RoiRecord, crop: np.ndarray, meta: dict[str, Any], cell_key: str):
+        primary, per_tolerance_rows = run_single_roi_case(
+            record,
+            config=config,
+            runtime_builder=runtime_builder,
+            runtime_runner=runtime_runner,
+            runtime=runtimes.get(runtime_options_from_config(config)),
+            crop=crop,
+            meta=meta,
+        )
+        if store is not None:
+            store.append(
+                cell_key,
+                config_id=config.config_id,
+                roi_id=record.roi_id,
+                primary=primary,
+                per_tolerance_rows=per_tolerance_rows,
+            )
+        return primary, per_tolerance_rows
+
+    def finish(
+        config: RoiBenchmarkConfig,
+        index: int,
+        record: RoiRecord,
+        primary: dict[str, Any],
+        rows: list[dict[str, Any]],
+        *,
+        reused: bool = False,
+    ) -> None:
+        results[(config.config_id, index)] = (primary, rows)
+        if overlay_dirs is None or config.config_id not in overlay_dirs:
+            return
+        destination = overlay_dirs[config.config_id] / f"{record.roi_id}__{config.config_id}__tol8.png"
+        if reused and destination.exists():
+            return
+        save_roi_match_overlay(
+            roi_image=crops[index],
+            manual_points_yx=np.asarray(json.loads(primary["manual_points_yx_json"]), dtype=float),
+            predicted_points_yx=np.asarray(json.loads(primary["predicted_points_yx_json"]), dtype=float),
+            tolerance_px=PRIMARY_TOLERANCE_PX,
+            destination=destination,
+            title=f"{record.roi_id} | {config.config_id}",
+        )
+
+    config_digests = {config.config_id: config_hash(config) for config in configs}
+    executor = ThreadPoolExecutor(max_workers=int(max_workers)) if int(max_workers) > 1 else None
+    pending: dict[Any, tuple[RoiBenchmarkConfig, int, RoiRecord]] = {}
+    try:
+        for image_path, group in group_records_by_source(records):
+            image, meta = load_any_image(str(image_path))
+            for index, record in group:
+                # Copy so the decoded source image can be released once its group is queued.
+                crop = np.array(crop_2d_or_yxc(image, x0=record.x0, y0=record.y0, width=record.width, height=record.height))
+                crops[index] = crop
+                crop_digest = hashlib.sha256(np.ascontiguousarray(crop).tobytes()).hexdigest()
+                for config in configs:
+                    cell_key = roi_cell_key(config_digest=config_digests[config.config_id], record=record, crop_digest=crop_digest)
+                    cached = store.get(cell_key) if store is not None else None
+                    if cached is not None:
+                        finish(config, index, record, cached["primary"], cached["per_tolerance"], reused=True)
+                    elif executor is None:
+                        finish(config, index, record, *run_cell(config, record, crop, meta, cell_key))
+                    else:
+                        pending[executor.submit(run_cell, config, record, crop, meta, cell_key)] = (config, index, record)
+            del image
+        for future in as_completed(pending):
+            config, index, record = pending[future]
+            finish(config, index, record, *future.result())
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    out: dict[str, tuple[list[dict[str, Any]], list[dict[str, Any]]]] = {}
+    for config in configs:
+        primary_rows: list[dict[str, Any]] = []
+        all_rows: list[dict[str, Any]] = []
+        for index in range(len(records)):
+            primary, per_tolerance_rows = results[(config.config_id, index)]
+            primary_rows.append(primary)
+            all_rows.extend(per_tolerance_rows)
+        out[config.config_id] = (primary_rows, all_rows)
+    return out
+
+
 def save_roi_match_overlay(
     *,
     roi_image: np.ndarray,
@@ -201,6 +360,8 @@ def save_roi_match_overlay(
     destination: str | Path,
     title: str,
 ) -> Path:
+    import matplotlib.pyplot as plt
+
     destination = Path(destination)
     destination.parent.mkdir(parents=True, exist_ok=True)
     match = match_points(manual_points_yx, predicted_points_yx, tolerance_px=tolerance_px)
@@ -496,7 +657,7 @@ def _write_config_outputs(
     all_frame.to_csv(results_dir / "per_roi_tolerance_metrics.csv", index=False)
     config_summary.to_csv(results_dir / "config_comparison.csv", index=False)
     if not config_summary.empty:
-        payload = {key: _json_ready(value) for key, value in config_summary.iloc[0].to_dict().items()}
+        payload = {key: json_ready(value) for key, value in config_summary.iloc[0].to_dict().items()}
         (results_dir / "best_config.json").write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
     quality_frame.to_csv(report_dir / "benchmark_quality.csv", index=False)
     (report_dir / "benchmark_report.md").write_text(
@@ -534,54 +695,14 @@ def _write_config_outputs(
     }
 
 
-def run_roi_benchmark_config(
+def _finalize_config_run(
     *,
-    roi_manifest: str | Path,
-    output_dir: str | Path,
-    config: RoiBenchmarkConfig,
-    save_overlays: bool = False,
-    runtime_builder: Callable[..., Any] = build_runtime,
-    runtime_runner: Callable[..., Any] = run_array,
-    include_splits: list[str] | None = None,
-    exclude_splits: list[str] | None = None,
+    output_dir: Path,
+    manifest: pd.DataFrame,
+    provenance_summary: dict[str, Any],
+    primary_rows: list[dict[str, Any]],
+    all_rows: list[dict[str, Any]],
 ) -> dict[str, Any]:
-    manifest = filter_roi_manifest_by_split(
-        load_roi_manifest(roi_manifest),
-        include_splits=include_splits,
-        exclude_splits=exclude_splits,
-    )
-    records = iter_roi_records(manifest, manifest_path=roi_manifest)
-    output_dir = Path(output_dir)
-    provenance_summary = summarize_truth_provenance(records)
-
-    primary_rows: list[dict[str, Any]] = []
-    all_rows: list[dict[str, Any]] = []
-    overlay_dir = output_dir / "results" / "overlays"
-
-    for record in records:
-        primary, per_tolerance_rows = run_single_roi_case(
-            record,
-            config=config,
-            runtime_builder=runtime_builder,
-            runtime_runner=runtime_runner,
-        )
-        primary_rows.append(primary)
-        all_rows.extend(per_tolerance_rows)
-
-        if save_overlays:
-            image, _ = load_any_image(str(record.image_path))
-            crop = crop_2d_or_yxc(image, x0=record.x0, y0=record.y0, width=record.width, height=record.height)
-            manual_points = np.asarray(json.loads(primary["manual_points_yx_json"]), dtype=float)
-            predicted_points = np.asarray(json.loads(primary["predicted_points_yx_json"]), dtype=float)
-            save_roi_match_overlay(
-                roi_image=crop,
-                manual_points_yx=manual_points,
-                predicted_points_yx=predicted_points,
-                tolerance_px=PRIMARY_TOLERANCE_PX,
-                destination=overlay_dir / f"{record.roi_id}__{config.config_id}__tol8.png",
-                title=f"{record.roi_id} | {config.config_id}",
-            )
-
     primary_frame = pd.DataFrame(primary_rows)
     all_frame = pd.DataFrame(all_rows)
     config_summary = summarize_config_results(all_frame)
@@ -612,8 +733,6 @@ def run_roi_benchmark_config(
         roi_manifest=manifest,
     )
     return {
-        "manifest": manifest,
-        "records": records,
         "primary_frame": primary_frame,
         "all_frame": all_frame,
         "config_summary": config_summary,
@@ -623,6 +742,54 @@ def run_roi_benchmark_config(
     }
 
 
+def run_roi_benchmark_config(
+    *,
+    roi_manifest: str | Path,
+    output_dir: str | Path,
+    config: RoiBenchmarkConfig,
+    save_overlays: bool = False,
+    runtime_builder: Callable[..., Any] = build_runtime,
+    runtime_runner: Callable[..., Any] = run_array,
+    include_splits: list[str] | None = None,
+    exclude_splits: list[str] | None = None,
+    max_workers: int = 1,
+    resume: bool = True,
+) -> dict[str, Any]:
+    manifest = filter_roi_manifest_by_split(
+        load_roi_manifest(roi_manifest),
+        include_splits=include_splits,
+        exclude_splits=exclude_splits,
+    )
+    records = iter_roi_records(manifest, manifest_path=roi_manifest)
+    output_dir = Path(output_dir)
+    provenance_summary = summarize_truth_provenance(records)
+
+    store = BenchmarkResultStore(output_dir / "results" / RESULT_STORE_FILENAME, load_existing=resume)
+    cell_rows = run_benchmark_cells(
+        records,
+        [config],
+        runtime_builder=runtime_builder,
+        runtime_runner=runtime_runner,
+        store=store,
+        max_workers=max_workers,
+        overlay_dirs={config.config_id: output_dir / "results" / "overlays"} if save_overlays else None,
+    )
+    primary_rows, all_rows = cell_rows[config.config_id]
+    result = _finalize_config_run(
+        output_dir=output_dir,
+        manifest=manifest,
+        provenance_summary=provenance_summary,
+        primary_rows=primary_rows,
+        all_rows=all_rows,
+    )
+    return {
+        "manifest": manifest,
+        "records": records,
+        "store_path": store.path,
+        **result,
+    }
+
+
 def default_config_manifest_for_marker(marker: str) -> pd.DataFrame:
     normalized = str(marker).strip().upper()
     if normalized not in {"RBPMS", "BRN3A"}:
@@ -742,6 +909,8 @@ def run_benchmark_suite(
     runtime_runner: Callable[..., Any] = run_array,
     include_splits: list[str] | None = None,
     exclude_splits: list[str] | None = None,
+    max_workers: int = 1,
+    resume: bool = True,
 ) -> dict[str, Any]:
     manifest = filter_roi_manifest_by_split(
         load_roi_manifest(roi_manifest),
@@ -761,24 +930,31 @@ def run_benchmark_suite(
     results_root.mkdir(parents=True, exist_ok=True)
     report_root.mkdir(parents=True, exist_ok=True)
 
+    configs = configs_from_manifest(config_manifest, use_gpu=use_gpu)
+    store = BenchmarkResultStore(results_root / RESULT_STORE_FILENAME, load_existing=resume)
+    cell_rows = run_benchmark_cells(
+        records,
+        configs,
+        runtime_builder=runtime_builder,
+        runtime_runner=runtime_runner,
+        store=store,
+        max_workers=max_workers,
+        overlay_dirs={config.config_id: results_root / config.config_id / "results" / "overlays" for config in configs} if save_overlays else None,
+    )
+
     primary_frames: list[pd.DataFrame] = []
     all_frames: list[pd.DataFrame] = []
-    comparison_rows: list[dict[str, Any]] = []
-
-    for config in configs_from_manifest(config_manifest, use_gpu=use_gpu):
-        run_result = run_roi_benchmark_config(
-            roi_manifest=roi_manifest,
+    for config in configs:
+        primary_rows, all_rows = cell_rows[config.config_id]
+        run_result = _finalize_config_run(
             output_dir=results_root / config.config_id,
-            config=config,
-            save_overlays=save_overlays,
-            runtime_builder=runtime_builder,
-            runtime_runner=runtime_runner,
-            include_splits=include_splits,
-            exclude_splits=exclude_splits,
+            manifest=manifest,
+            provenance_summary=provenance_summary,
+            primary_rows=primary_rows,
+            all_rows=all_rows,
         )
         primary_frames.append(run_result["primary_frame"])
         all_frames.append(run_result["all_frame"])
-        comparison_rows.append(run_result["summary_row"])
 
     all_primary = pd.concat(primary_frames, ignore_index=True) if primary_frames else pd.DataFrame()
     all_tolerance = pd.concat(all_frames, ignore_index=True) if all_frames else pd.DataFrame()
@@ -830,7 +1006,7 @@ def run_benchmark_suite(
         json.dumps(
             {
                 "ranking_rule": "f1_desc_then_recall_desc_then_mae_asc_then_runtime_asc",
-                **{key: _json_ready(value) for key, value in best_payload.items()},
+                **{key: json_ready(value) for key, value in best_payload.items()},
             },
             indent=2,
         )
@@ -859,4 +1035,5 @@ def run_benchmark_suite(
         "best_path": results_root / "best_config.json",
         "quality_path": report_root / "benchmark_quality.csv",
         "report_path": report_root / "benchmark_report.md",
+        "store_path": store.path,
     }
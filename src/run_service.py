@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import copy
-from dataclasses import dataclass, replace
+import hashlib
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, Generator
 
 import numpy as np
-import torch
 
 from src import utils
 from src.atlas_subtypes import (
@@ -27,10 +30,10 @@ from src.config import (
     data as CONFIG_DATA,
 )
 from src.context import RunContext
-from src.io_ome import load_any_image, save_labels_to_ome_zarr
+from src.io_ome import load_any_image, open_lazy_image, save_labels_to_ome_zarr
 from src.measurements import object_table_path_for, write_object_table
 from src.model_registry import ModelSpec, model_spec_to_dict, model_summary_fields, model_warning, resolve_model_spec
-from src.modalities import adapt_image_for_modality
+from src.modalities import adapt_image_for_modality, is_volumetric_modality
 from src.models import build_segmenter
 from src.phenotype import load_rules
 from src.phenotype_engine import load_engine_config
@@ -47,7 +50,7 @@ from src.retina_coords import (
 )
 from src.review import resolve_edit_log_path
 from src.uncertainty_io import save_float_map
-from src.visualize import apply_out_of_focus_overlay, create_debug_overlay, save_debug_image
+from src.visualize import apply_out_of_focus_overlay, create_debug_overlay, preview_step, save_debug_image
 from src.spatial import (
     pair_correlation_plot_output_path,
     ripley_l_plot_output_path,
@@ -82,6 +85,7 @@ class RuntimeOptions:
     modality_channel_index: int | None = 0
     modality_slab_start: int | None = None
     modality_slab_end: int | None = None
+    modality_projection_workers: int = 1
     apply_clahe: bool = False
     focus_mode: str = "none"
     sam_checkpoint: str | None = None
@@ -96,19 +100,27 @@ class RuntimeOptions:
     spatial_mode: str = "legacy"
     spatial_envelope_sims: int = 999
     spatial_random_seed: int = 1337
+    spatial_workers: int = 1
     register_retina: bool = False
     region_schema: str = "mouse_flatmount_v1"
+    region_area_engine: str = "raster"
+    tissue_mask_scale: int | None = None
+    memory_budget_mb: float | None = None
+    debug_allocations: bool = False
     onh_mode: str = "cli"
     onh_xy: tuple[float, float] | None = None
     dorsal_xy: tuple[float, float] | None = None
     retina_frame_path: str | None = None
     save_debug: bool = True
+    debug_overlay_mode: str = "fill"
+    debug_overlay_max_side: int | None = None
     save_ome_zarr: bool = False
     write_html_report: bool = True
     write_object_table: bool = True
     write_provenance: bool = True
     write_uncertainty_maps: bool = False
     write_qc_maps: bool = False
+    export_workers: int = 1
     strict_schemas: bool = False
     apply_edits: str | None = None
     tiling: bool = False
@@ -181,6 +193,8 @@ def _resolved_config(runtime: AppRuntime) -> dict[str, Any]:
         "dorsal_xy": options.dorsal_xy,
         "retina_frame_path": options.retina_frame_path,
         "save_debug": options.save_debug,
+        "debug_overlay_mode": options.debug_overlay_mode,
+        "debug_overlay_max_side": options.debug_overlay_max_side,
         "save_ome_zarr": options.save_ome_zarr,
         "write_html_report": options.write_html_report,
         "write_object_table": options.write_object_table,
@@ -192,6 +206,7 @@ def _resolved_config(runtime: AppRuntime) -> dict[str, Any]:
         "tiling": options.tiling,
         "tile_size": options.tile_size,
         "tile_overlap": options.tile_overlap,
+        "memory_budget_mb": options.memory_budget_mb,
         "source": "napari",
     }
 
@@ -237,7 +252,7 @@ def build_runtime(
     model_type = options.model_type or MODEL_TYPE
     min_size = int(options.min_size if options.min_size is not None else MIN_CELL_SIZE)
     max_size = int(options.max_size if options.max_size is not None else MAX_CELL_SIZE)
-    use_gpu = bool(options.use_gpu) if options.use_gpu is not None else bool(USE_GPU and torch.cuda.is_available())
+    use_gpu = bool(options.use_gpu) if options.use_gpu is not None else bool(USE_GPU and _cuda_available())
     if segmenter_override is not None and (options.backend or "cellpose").lower() not in {"cellpose", "stardist", "sam", "blob_watershed"}:
         backend_name = (options.backend or "override").lower()
         model_spec = ModelSpec(
@@ -281,6 +296,8 @@ def build_runtime(
         "tiling": options.tiling,
         "tile_size": options.tile_size,
         "tile_overlap": options.tile_overlap,
+        "memory_budget_mb": options.memory_budget_mb,
+        "debug_allocations": options.debug_allocations,
         "min_size": min_size,
         "max_size": max_size,
         "qc_config": copy.deepcopy(CONFIG_DATA.get("qc", {})),
@@ -288,6 +305,9 @@ def build_runtime(
         "spatial_mode": options.spatial_mode,
         "spatial_envelope_sims": options.spatial_envelope_sims,
         "spatial_random_seed": options.spatial_random_seed,
+        "spatial_workers": options.spatial_workers,
+        "region_area_engine": options.region_area_engine,
+        "tissue_mask_scale": options.tissue_mask_scale,
         "backend": backend,
         "use_gpu": use_gpu,
         "segmentation_preset": options.segmentation_preset,
@@ -333,16 +353,55 @@ def build_runtime(
     return runtime
 
 
-def _run_with_cfg(
+def _cuda_available() -> bool:
+    import torch
+
+    return bool(torch.cuda.is_available())
+
+
+def runtime_options_key(options: RuntimeOptions) -> str:
+    payload = json.dumps(asdict(options), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RuntimeCache:
+    """Reuse built runtimes for identical ``RuntimeOptions``.
+
+    Runtimes are kept per thread so a segmenter is never shared between
+    concurrently running workers.
+    """
+
+    def __init__(self, runtime_builder: Callable[..., Any] | None = None):
+        self._runtime_builder = runtime_builder or build_runtime
+        self._local = threading.local()
+
+    def get(self, options: RuntimeOptions) -> Any:
+        runtimes = getattr(self._local, "runtimes", None)
+        if runtimes is None:
+            runtimes = self._local.runtimes = {}
+        key = runtime_options_key(options)
+        if key not in runtimes:
+            runtimes[key] = self._runtime_builder(options)
+        return runtimes[key]
+
+
+@dataclass(frozen=True)
+class StageProgress:
+    index: int
+    total: int
+    stage: str
+    ctx: RunContext
+
+
+def _prepare_run(
     runtime: AppRuntime,
     *,
     image: np.ndarray,
     source_path: str | Path,
-    meta: dict[str, Any] | None = None,
-    modality_override: str | None = None,
-    pipeline_cfg_overrides: dict[str, Any] | None = None,
-) -> RunContext:
-    modality = modality_override or runtime.options.modality
+    meta: dict[str, Any] | None,
+    modality: str,
+    pipeline_cfg_overrides: dict[str, Any] | None,
+) -> tuple[RunContext, dict[str, Any]]:
     adapted_image, adapted_meta = adapt_image_for_modality(
         image,
         meta,
@@ -351,6 +410,7 @@ def _run_with_cfg(
         channel_index=runtime.options.modality_channel_index,
         slab_start=runtime.options.modality_slab_start,
         slab_end=runtime.options.modality_slab_end,
+        projection_workers=runtime.options.modality_projection_workers,
     )
     if adapted_meta is None:
         adapted_meta = {}
@@ -360,25 +420,84 @@ def _run_with_cfg(
     if pipeline_cfg_overrides:
         pipeline_cfg.update(copy.deepcopy(pipeline_cfg_overrides))
 
-    ctx = RunContext(path=Path(source_path), image=adapted_image, meta=adapted_meta)
-    ctx = runtime.pipeline.run(ctx, pipeline_cfg)
+    return RunContext(path=Path(source_path), image=adapted_image, meta=adapted_meta), pipeline_cfg
+
+
+def _finish_run(ctx: RunContext, modality: str) -> RunContext:
     ctx.metrics["modality"] = modality
     ctx.summary_row["modality"] = modality
     return ctx
 
 
+def _run_with_cfg(
+    runtime: AppRuntime,
+    *,
+    image: np.ndarray,
+    source_path: str | Path,
+    meta: dict[str, Any] | None = None,
+    modality_override: str | None = None,
+    pipeline_cfg_overrides: dict[str, Any] | None = None,
+) -> RunContext:
+    modality = modality_override or runtime.options.modality
+    ctx, pipeline_cfg = _prepare_run(
+        runtime,
+        image=image,
+        source_path=source_path,
+        meta=meta,
+        modality=modality,
+        pipeline_cfg_overrides=pipeline_cfg_overrides,
+    )
+    ctx = runtime.pipeline.run(ctx, pipeline_cfg)
+    return _finish_run(ctx, modality)
+
+
+def iter_run_array(
+    runtime: AppRuntime,
+    *,
+    image: np.ndarray,
+    source_path: str | Path,
+    meta: dict[str, Any] | None = None,
+) -> Generator[StageProgress, None, RunContext]:
+    """Generator form of ``run_array`` that yields after every pipeline stage.
+
+    Closing the generator between stages abandons the run; the finished
+    context is the generator's return value.
+    """
+    modality = runtime.options.modality
+    ctx, pipeline_cfg = _prepare_run(
+        runtime,
+        image=image,
+        source_path=source_path,
+        meta=meta,
+        modality=modality,
+        pipeline_cfg_overrides=None,
+    )
+    total = len(runtime.pipeline.stages)
+    for index, stage_name, ctx in runtime.pipeline.iter_run(ctx, pipeline_cfg):
+        yield StageProgress(index=index, total=total, stage=stage_name, ctx=ctx)
+    return _finish_run(ctx, modality)
+
+
 def run_array(
     runtime: AppRuntime,
     *,
     image: np.ndarray,
     source_path: str | Path,
     meta: dict[str, Any] | None = None,
+    memory_budget_mb: float | None = None,
 ) -> RunContext:
+    """Run the pipeline on an in-memory image.
+
+    ``memory_budget_mb`` overrides the runtime's budget for this image; the
+    pipeline then picks tiling, tile size and whether to keep intermediate
+    maps from the image's shape, dtype and the backend (see ``src.memory_plan``).
+    """
     return _run_with_cfg(
         runtime,
         image=image,
         source_path=source_path,
         meta=meta,
+        pipeline_cfg_overrides={"memory_budget_mb": float(memory_budget_mb)} if memory_budget_mb is not None else None,
     )
 
 
@@ -389,7 +508,10 @@ def run_one_image(
     modality_override: str | None = None,
     pipeline_cfg_overrides: dict[str, Any] | None = None,
 ) -> RunContext:
-    image, meta = load_any_image(str(image_path))
+    # Volumes are projected chunk by chunk, so leave them on disk until then.
+    modality = modality_override or runtime.options.modality
+    loader = open_lazy_image if is_volumetric_modality(modality) else load_any_image
+    image, meta = loader(str(image_path))
     return _run_with_cfg(
         runtime,
         image=image,
@@ -416,41 +538,74 @@ def summarize_context(ctx: RunContext) -> str:
     return "\n".join(lines)
 
 
-def build_debug_preview(ctx: RunContext, *, focus_mode: str) -> np.ndarray | None:
+def build_debug_preview(
+    ctx: RunContext,
+    *,
+    focus_mode: str,
+    mode: str = "fill",
+    max_side: int | None = None,
+) -> np.ndarray | None:
     if ctx.gray is None or ctx.labels is None:
         return None
-    debug_image = create_debug_overlay(ctx.gray, ctx.labels, alpha=OVERLAY_ALPHA)
+    debug_image = create_debug_overlay(ctx.gray, ctx.labels, alpha=OVERLAY_ALPHA, mode=mode, max_side=max_side)
     if focus_mode in ("auto", "qc") and ctx.qc_mask is not None:
-        debug_image = apply_out_of_focus_overlay(debug_image, ctx.qc_mask, alpha=0.3)
+        step = preview_step(ctx.gray.shape, max_side)
+        debug_image = apply_out_of_focus_overlay(debug_image, ctx.qc_mask[::step, ::step], alpha=0.3)
     return debug_image
 
 
-def _write_debug_artifact(
-    *,
-    ctx: RunContext,
-    runtime: AppRuntime,
-    output_dir: Path,
-    saved_images_for_report: list[tuple[str, str]],
-) -> None:
+@dataclass
+class _ExportPart:
+    """Artifacts and report entries produced by one export task, merged in task order."""
+
+    artifacts: dict[str, Path] = field(default_factory=dict)
+    images: list[tuple[str, str]] = field(default_factory=list)
+    assets: list[tuple[str, str]] = field(default_factory=list)
+    tables: list[dict[str, str]] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+
+
+# pyplot keeps global figure state, so plots rendered from export worker threads take turns.
+_PYPLOT_LOCK = threading.Lock()
+
+
+def _image_stem(ctx: RunContext) -> str:
+    return ctx.path.name.rsplit(".", 1)[0]
+
+
+def _export_results_csv(runtime: AppRuntime, ctx: RunContext, output_dir: Path) -> _ExportPart:
+    csv_path = output_dir / "results.csv"
+    utils.save_results_to_csv([dict(ctx.summary_row)], str(csv_path))
+    return _ExportPart(artifacts={"results_csv": csv_path})
+
+
+def _export_debug_artifacts(runtime: AppRuntime, ctx: RunContext, output_dir: Path) -> _ExportPart:
+    part = _ExportPart()
     if not runtime.options.save_debug:
-        return
-    debug_image = build_debug_preview(ctx, focus_mode=runtime.options.focus_mode)
+        return part
+    debug_image = build_debug_preview(
+        ctx,
+        focus_mode=runtime.options.focus_mode,
+        mode=runtime.options.debug_overlay_mode,
+        max_side=runtime.options.debug_overlay_max_side,
+    )
     if debug_image is None:
-        return
-    debug_path = output_dir / f"{ctx.path.name.rsplit('.', 1)[0]}_debug.png"
+        return part
+    debug_path = output_dir / f"{_image_stem(ctx)}_debug.png"
     save_debug_image(debug_image, str(debug_path))
-    ctx.artifacts["debug_overlay"] = debug_path
-    saved_images_for_report.append((f"Debug overlay {ctx.path.name}", debug_path.name))
+    part.artifacts["debug_overlay"] = debug_path
+    part.images.append((f"Debug overlay {ctx.path.name}", debug_path.name))
 
-    if runtime.options.spatial_stats and "isodensity_map" in ctx.state:
+    if runtime.options.spatial_stats and "isodensity_grid" in ctx.state:
         import cv2
 
-        iso8 = utils.safe_uint8(ctx.state["isodensity_map"])
+        iso8 = utils.safe_uint8(ctx.state["isodensity_grid"].render(debug_image.shape[:2]))
         iso_color = cv2.applyColorMap(iso8, cv2.COLORMAP_JET)
-        iso_path = output_dir / f"{ctx.path.name.rsplit('.', 1)[0]}_isodensity.png"
+        iso_path = output_dir / f"{_image_stem(ctx)}_isodensity.png"
         cv2.imwrite(str(iso_path), iso_color)
-        ctx.artifacts["isodensity_map"] = iso_path
-        saved_images_for_report.append((f"Isodensity {ctx.path.name}", iso_path.name))
+        part.artifacts["isodensity_map"] = iso_path
+        part.images.append((f"Isodensity {ctx.path.name}", iso_path.name))
+    return part
 
 
 def _save_map_preview(array: np.ndarray, destination: Path) -> Path:
@@ -462,198 +617,343 @@ def _save_map_preview(array: np.ndarray, destination: Path) -> Path:
     return destination
 
 
-def export_context(
-    runtime: AppRuntime,
+def _export_ome_zarr(runtime: AppRuntime, ctx: RunContext, output_dir: Path) -> _ExportPart:
+    if not runtime.options.save_ome_zarr or ctx.gray is None or ctx.labels is None:
+        return _ExportPart()
+    zarr_dir = output_dir / f"{_image_stem(ctx)}.zarr"
+    save_labels_to_ome_zarr(
+        ctx.gray,
+        ctx.labels,
+        str(zarr_dir),
+        {
+            "backend": ctx.seg_info.get("backend", runtime.backend),
+            "use_gpu": runtime.use_gpu,
+            "microns_per_pixel": MICRONS_PER_PIXEL,
+        },
+        max_workers=runtime.options.export_workers,
+    )
+    return _ExportPart(artifacts={"ome_zarr": zarr_dir})
+
+
+def _export_object_table(runtime: AppRuntime, ctx: RunContext, output_dir: Path) -> _ExportPart:
+    part = _ExportPart()
+    if not runtime.options.write_object_table or ctx.object_table is None:
+        return part
+    object_path = write_object_table(
+        ctx.object_table,
+        object_table_path_for(output_dir, ctx.path),
+        strict=runtime.options.strict_schemas,
+    )
+    part.artifacts["object_table"] = object_path
+    if object_path.suffix != ".parquet":
+        part.warnings.append("Object table written as CSV because no parquet engine was available.")
+    return part
+
+
+def _export_float_map(
     ctx: RunContext,
-    output_dir: str | Path,
-) -> dict[str, Path]:
-    output_dir = Path(output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
-    saved_images_for_report: list[tuple[str, str]] = []
-    report_assets: list[tuple[str, str]] = []
-    report_tables: list[dict[str, str]] = []
+    output_dir: Path,
+    *,
+    state_key: str,
+    subdir: str,
+    suffix: str,
+    artifact_key: str,
+    title: str,
+    preview_title: str,
+) -> _ExportPart:
+    part = _ExportPart()
+    map_dir = output_dir / subdir
+    tif_path = save_float_map(
+        ctx.state[state_key],
+        map_dir / f"{_image_stem(ctx)}_{suffix}.tif",
+        metadata={"kind": state_key, "image_id": _image_stem(ctx)},
+    )
+    part.artifacts[artifact_key] = tif_path
+    part.assets.append((title, str(tif_path.relative_to(output_dir))))
+    preview = _save_map_preview(ctx.state[state_key], map_dir / f"{_image_stem(ctx)}_{suffix}_preview.png")
+    part.artifacts[f"{artifact_key}_preview"] = preview
+    part.images.append((preview_title, str(preview.relative_to(output_dir))))
+    return part
+
+
+def _export_uncertainty_map(runtime: AppRuntime, ctx: RunContext, output_dir: Path) -> _ExportPart:
+    if not runtime.options.write_uncertainty_maps or ctx.state.get("foreground_probability") is None:
+        return _ExportPart()
+    return _export_float_map(
+        ctx,
+        output_dir,
+        state_key="foreground_probability",
+        subdir="uncertainty",
+        suffix="fgprob",
+        artifact_key="foreground_probability",
+        title="Foreground probability map",
+        preview_title="Foreground probability preview",
+    )
 
-    csv_path = output_dir / "results.csv"
-    utils.save_results_to_csv([dict(ctx.summary_row)], str(csv_path))
-    ctx.artifacts["results_csv"] = csv_path
 
-    _write_debug_artifact(
-        ctx=ctx,
-        runtime=runtime,
-        output_dir=output_dir,
-        saved_images_for_report=saved_images_for_report,
+def _export_qc_map(runtime: AppRuntime, ctx: RunContext, output_dir: Path) -> _ExportPart:
+    if not runtime.options.write_qc_maps or ctx.state.get("focus_score_map") is None:
+        return _ExportPart()
+    return _export_float_map(
+        ctx,
+        output_dir,
+        state_key="focus_score_map",
+        subdir="qc_maps",
+        suffix="focus_score",
+        artifact_key="focus_score_map",
+        title="Focus score map",
+        preview_title="Focus score preview",
     )
 
-    if runtime.options.save_ome_zarr and ctx.gray is not None and ctx.labels is not None:
-        zarr_dir = output_dir / f"{ctx.path.name.rsplit('.', 1)[0]}.zarr"
-        save_labels_to_ome_zarr(
-            ctx.gray,
-            ctx.labels,
-            str(zarr_dir),
-            {
-                "backend": ctx.seg_info.get("backend", runtime.backend),
-                "use_gpu": runtime.use_gpu,
-                "microns_per_pixel": MICRONS_PER_PIXEL,
-            },
-            chunk=256,
-        )
-        ctx.artifacts["ome_zarr"] = zarr_dir
 
-    if runtime.options.write_object_table and ctx.object_table is not None:
-        object_path = write_object_table(
-            ctx.object_table,
-            object_table_path_for(output_dir, ctx.path),
-            strict=runtime.options.strict_schemas,
-        )
-        ctx.artifacts["object_table"] = object_path
-        if object_path.suffix != ".parquet":
-            ctx.warnings.append("Object table written as CSV because no parquet engine was available.")
-
-    if runtime.options.write_uncertainty_maps and ctx.state.get("foreground_probability") is not None:
-        uncertainty_dir = output_dir / "uncertainty"
-        tif_path = save_float_map(
-            ctx.state["foreground_probability"],
-            uncertainty_dir / f"{ctx.path.name.rsplit('.', 1)[0]}_fgprob.tif",
-            metadata={"kind": "foreground_probability", "image_id": ctx.path.name.rsplit('.', 1)[0]},
-        )
-        ctx.artifacts["foreground_probability"] = tif_path
-        report_assets.append(("Foreground probability map", str(tif_path.relative_to(output_dir))))
-        preview = _save_map_preview(ctx.state["foreground_probability"], uncertainty_dir / f"{ctx.path.name.rsplit('.', 1)[0]}_fgprob_preview.png")
-        ctx.artifacts["foreground_probability_preview"] = preview
-        saved_images_for_report.append(("Foreground probability preview", str(preview.relative_to(output_dir))))
-
-    if runtime.options.write_qc_maps and ctx.state.get("focus_score_map") is not None:
-        qc_dir = output_dir / "qc_maps"
-        tif_path = save_float_map(
-            ctx.state["focus_score_map"],
-            qc_dir / f"{ctx.path.name.rsplit('.', 1)[0]}_focus_score.tif",
-            metadata={"kind": "focus_score_map", "image_id": ctx.path.name.rsplit('.', 1)[0]},
+def _export_atlas_subtypes(runtime: AppRuntime, ctx: RunContext, output_dir: Path) -> _ExportPart:
+    part = _ExportPart()
+    if "atlas_subtypes" not in ctx.state:
+        return part
+    subtype_payload = ctx.state["atlas_subtypes"]
+    summary = subtype_payload.get("summary")
+    region_summary = subtype_payload.get("region_summary")
+    if summary is not None and not summary.empty:
+        summary_path = write_atlas_subtype_table(summary, atlas_subtype_summary_output_path(output_dir, ctx.path))
+        part.artifacts["atlas_subtype_summary"] = summary_path
+        part.assets.append(("Atlas subtype summary", str(summary_path.relative_to(output_dir))))
+        part.tables.append({"title": "Atlas Subtype Priors", "html": summary.to_html(index=False)})
+    if region_summary is not None and not region_summary.empty:
+        region_summary_path = write_atlas_subtype_table(
+            region_summary,
+            atlas_subtype_region_summary_output_path(output_dir, ctx.path),
         )
-        ctx.artifacts["focus_score_map"] = tif_path
-        report_assets.append(("Focus score map", str(tif_path.relative_to(output_dir))))
-        preview = _save_map_preview(ctx.state["focus_score_map"], qc_dir / f"{ctx.path.name.rsplit('.', 1)[0]}_focus_score_preview.png")
-        ctx.artifacts["focus_score_map_preview"] = preview
-        saved_images_for_report.append(("Focus score preview", str(preview.relative_to(output_dir))))
-
-    if "atlas_subtypes" in ctx.state:
-        subtype_payload = ctx.state["atlas_subtypes"]
-        summary = subtype_payload.get("summary")
-        region_summary = subtype_payload.get("region_summary")
-        if summary is not None and not summary.empty:
-            summary_path = write_atlas_subtype_table(summary, atlas_subtype_summary_output_path(output_dir, ctx.path))
-            ctx.artifacts["atlas_subtype_summary"] = summary_path
-            report_assets.append(("Atlas subtype summary", str(summary_path.relative_to(output_dir))))
-            report_tables.append({"title": "Atlas Subtype Priors", "html": summary.to_html(index=False)})
-        if region_summary is not None and not region_summary.empty:
-            region_summary_path = write_atlas_subtype_table(
-                region_summary,
-                atlas_subtype_region_summary_output_path(output_dir, ctx.path),
-            )
-            ctx.artifacts["atlas_subtype_region_summary"] = region_summary_path
-            report_assets.append(("Atlas subtype region summary", str(region_summary_path.relative_to(output_dir))))
-            report_tables.append({"title": "Atlas Subtype Priors (Regions)", "html": region_summary.head(40).to_html(index=False)})
-
-    if "rigorous_spatial" in ctx.state:
-        rigorous = ctx.state["rigorous_spatial"]
-        summary = rigorous.get("summary", None)
-        curves = rigorous.get("curves", None)
-        if summary is not None and not summary.empty:
-            summary_path = write_spatial_summary(summary, spatial_summary_output_path(output_dir, ctx.path))
-            ctx.artifacts["spatial_summary"] = summary_path
-            report_assets.append(("Rigorous spatial summary", str(summary_path.relative_to(output_dir))))
-            report_tables.append({"title": "Spatial Analysis", "html": summary.to_html(index=False)})
-            global_summary = summary[summary["analysis_level"] == "global"]
-            if not global_summary.empty:
-                report_tables.append({"title": "Spatial Analysis (Global)", "html": global_summary.to_html(index=False)})
-            region_summary = summary[summary["analysis_level"] == "region"]
-            if not region_summary.empty:
-                report_tables.append({"title": "Spatial Analysis (Regions)", "html": region_summary.head(24).to_html(index=False)})
-        if curves is not None and not curves.empty:
-            curves_path = write_spatial_curves(curves, spatial_curves_output_path(output_dir, ctx.path))
-            ctx.artifacts["spatial_curves"] = curves_path
-            report_assets.append(("Rigorous spatial curves", str(curves_path.relative_to(output_dir))))
-            global_curves = curves[curves["analysis_level"] == "global"]
-            if not global_curves.empty:
+        part.artifacts["atlas_subtype_region_summary"] = region_summary_path
+        part.assets.append(("Atlas subtype region summary", str(region_summary_path.relative_to(output_dir))))
+        part.tables.append({"title": "Atlas Subtype Priors (Regions)", "html": region_summary.head(40).to_html(index=False)})
+    return part
+
+
+def _export_rigorous_spatial(runtime: AppRuntime, ctx: RunContext, output_dir: Path) -> _ExportPart:
+    part = _ExportPart()
+    if "rigorous_spatial" not in ctx.state:
+        return part
+    rigorous = ctx.state["rigorous_spatial"]
+    summary = rigorous.get("summary", None)
+    curves = rigorous.get("curves", None)
+    if summary is not None and not summary.empty:
+        summary_path = write_spatial_summary(summary, spatial_summary_output_path(output_dir, ctx.path))
+        part.artifacts["spatial_summary"] = summary_path
+        part.assets.append(("Rigorous spatial summary", str(summary_path.relative_to(output_dir))))
+        part.tables.append({"title": "Spatial Analysis", "html": summary.to_html(index=False)})
+        global_summary = summary[summary["analysis_level"] == "global"]
+        if not global_summary.empty:
+            part.tables.append({"title": "Spatial Analysis (Global)", "html": global_summary.to_html(index=False)})
+        region_summary = summary[summary["analysis_level"] == "region"]
+        if not region_summary.empty:
+            part.tables.append({"title": "Spatial Analysis (Regions)", "html": region_summary.head(24).to_html(index=False)})
+    if curves is not None and not curves.empty:
+        curves_path = write_spatial_curves(curves, spatial_curves_output_path(output_dir, ctx.path))
+        part.artifacts["spatial_curves"] = curves_path
+        part.assets.append(("Rigorous spatial curves", str(curves_path.relative_to(output_dir))))
+        global_curves = curves[curves["analysis_level"] == "global"]
+        if not global_curves.empty:
+            with _PYPLOT_LOCK:
                 l_plot = save_ripley_l_plot(global_curves, ripley_l_plot_output_path(output_dir, ctx.path))
                 g_plot = save_pair_correlation_plot(global_curves, pair_correlation_plot_output_path(output_dir, ctx.path))
-                ctx.artifacts["ripley_l_global_plot"] = l_plot
-                ctx.artifacts["pair_correlation_global_plot"] = g_plot
-                saved_images_for_report.append(("Ripley L (global)", str(l_plot.relative_to(output_dir))))
-                saved_images_for_report.append(("Pair correlation g (global)", str(g_plot.relative_to(output_dir))))
-
-    if runtime.options.register_retina and "retina_frame" in ctx.state:
-        frame_path = write_retina_frame_json(ctx.state["retina_frame"], retina_frame_output_path(output_dir, ctx.path))
-        ctx.artifacts["retina_frame"] = frame_path
-
-        if ctx.region_table is not None:
-            region_path = write_region_table(
-                ctx.region_table,
-                region_table_path_for(output_dir, ctx.path),
-                strict=runtime.options.strict_schemas,
-            )
-            ctx.artifacts["region_table"] = region_path
+            part.artifacts["ripley_l_global_plot"] = l_plot
+            part.artifacts["pair_correlation_global_plot"] = g_plot
+            part.images.append(("Ripley L (global)", str(l_plot.relative_to(output_dir))))
+            part.images.append(("Pair correlation g (global)", str(g_plot.relative_to(output_dir))))
+    return part
+
+
+def _export_retina_registration(runtime: AppRuntime, ctx: RunContext, output_dir: Path) -> _ExportPart:
+    part = _ExportPart()
+    if not runtime.options.register_retina or "retina_frame" not in ctx.state:
+        return part
+    frame_path = write_retina_frame_json(ctx.state["retina_frame"], retina_frame_output_path(output_dir, ctx.path))
+    part.artifacts["retina_frame"] = frame_path
+
+    if ctx.region_table is not None:
+        region_path = write_region_table(
+            ctx.region_table,
+            region_table_path_for(output_dir, ctx.path),
+            strict=runtime.options.strict_schemas,
+        )
+        part.artifacts["region_table"] = region_path
 
-        if ctx.object_table is not None and not ctx.object_table.empty:
+    if ctx.object_table is not None and not ctx.object_table.empty:
+        with _PYPLOT_LOCK:
             map_png = save_registered_density_plot(
                 ctx.object_table,
                 registered_density_plot_path(output_dir, ctx.path, suffix=".png"),
             )
-            ctx.artifacts["registered_density_map_png"] = map_png
-            saved_images_for_report.append(("Registered density map", str(map_png.relative_to(output_dir))))
-
             map_svg = save_registered_density_plot(
                 ctx.object_table,
                 registered_density_plot_path(output_dir, ctx.path, suffix=".svg"),
             )
-            ctx.artifacts["registered_density_map_svg"] = map_svg
-
-    edit_log = resolve_edit_log_path(ctx.path, runtime.options.apply_edits)
-    if edit_log is not None and edit_log.exists():
-        ctx.artifacts.setdefault("edit_log", edit_log)
-        report_assets.append(("Review edits", str(edit_log.relative_to(output_dir)) if edit_log.is_relative_to(output_dir) else edit_log.name))
-
-    if runtime.options.write_html_report:
-        report_path = write_html_report(
-            str(output_dir),
-            {
-                "source": "napari",
-                "backend": runtime.backend,
-                "model_label": runtime.model_spec.model_label,
-                "model_source": runtime.model_spec.source,
-                "segmentation_preset": runtime.options.segmentation_preset,
-                "modality": runtime.options.modality,
-                "diameter": runtime.diameter,
-                "min_size": runtime.min_size,
-                "max_size": runtime.max_size,
-                "gpu": runtime.use_gpu,
-                "focus_mode": runtime.options.focus_mode,
-                "tta": runtime.options.tta,
-                "spatial_mode": runtime.options.spatial_mode if runtime.options.spatial_stats else "off",
-                "atlas_subtype_priors": runtime.options.atlas_subtype_priors,
-            },
-            [dict(ctx.summary_row)],
-            images=saved_images_for_report,
-            notes="Exported from the napari dock widget.",
-            assets=report_assets,
-            tables=report_tables,
-        )
-        ctx.artifacts["html_report"] = Path(report_path)
-
-    if runtime.options.write_provenance:
-        provenance_path = write_provenance(
-            output_dir / "provenance.json",
-            build_run_provenance(
-                args={"source": "napari", "output_dir": str(output_dir)},
-                resolved_config=runtime.resolved_config,
-                contexts=[ctx],
-                run_started_at=runtime.created_at,
-                run_finished_at=datetime.now(),
-                results_csv_path=csv_path,
-                model_spec=model_spec_to_dict(runtime.model_spec),
-                spatial_analysis=ctx.state.get("rigorous_spatial", {}).get("spatial_analysis"),
-                atlas_subtypes=ctx.metrics.get("atlas_subtypes"),
-            ),
-        )
-        ctx.artifacts["provenance"] = provenance_path
+        part.artifacts["registered_density_map_png"] = map_png
+        part.images.append(("Registered density map", str(map_png.relative_to(output_dir))))
+        part.artifacts["registered_density_map_svg"] = map_svg
+    return part
+
+
+_EXPORT_TASKS: tuple[Callable[[AppRuntime, RunContext, Path], _ExportPart], ...] = (
+    _export_results_csv,
+    _export_debug_artifacts,
+    _export_ome_zarr,
+    _export_object_table,
+    _export_uncertainty_map,
+    _export_qc_map,
+    _export_atlas_subtypes,
+    _export_rigorous_spatial,
+    _export_retina_registration,
+)
+
+
+def _write_report(
+    runtime: AppRuntime,
+    ctx: RunContext,
+    output_dir: Path,
+    *,
+    images: list[tuple[str, str]],
+    assets: list[tuple[str, str]],
+    tables: list[dict[str, str]],
+) -> Path:
+    report_path = write_html_report(
+        str(output_dir),
+        {
+            "source": "napari",
+            "backend": runtime.backend,
+            "model_label": runtime.model_spec.model_label,
+            "model_source": runtime.model_spec.source,
+            "segmentation_preset": runtime.options.segmentation_preset,
+            "modality": runtime.options.modality,
+            "diameter": runtime.diameter,
+            "min_size": runtime.min_size,
+            "max_size": runtime.max_size,
+            "gpu": runtime.use_gpu,
+            "focus_mode": runtime.options.focus_mode,
+            "tta": runtime.options.tta,
+            "spatial_mode": runtime.options.spatial_mode if runtime.options.spatial_stats else "off",
+            "atlas_subtype_priors": runtime.options.atlas_subtype_priors,
+        },
+        [dict(ctx.summary_row)],
+        images=images,
+        notes="Exported from the napari dock widget.",
+        assets=assets,
+        tables=tables,
+    )
+    return Path(report_path)
+
+
+def _write_context_provenance(runtime: AppRuntime, ctx: RunContext, output_dir: Path, csv_path: Path) -> Path:
+    return write_provenance(
+        output_dir / "provenance.json",
+        build_run_provenance(
+            args={"source": "napari", "output_dir": str(output_dir)},
+            resolved_config=runtime.resolved_config,
+            contexts=[ctx],
+            run_started_at=runtime.created_at,
+            run_finished_at=datetime.now(),
+            results_csv_path=csv_path,
+            model_spec=model_spec_to_dict(runtime.model_spec),
+            spatial_analysis=ctx.state.get("rigorous_spatial", {}).get("spatial_analysis"),
+            atlas_subtypes=ctx.metrics.get("atlas_subtypes"),
+        ),
+    )
+
+
+def export_context(
+    runtime: AppRuntime,
+    ctx: RunContext,
+    output_dir: str | Path,
+    *,
+    max_workers: int | None = None,
+) -> dict[str, Path]:
+    """Write every artifact for ``ctx`` and return the artifact paths.
+
+    Independent artifacts are written on a pool of ``max_workers`` I/O threads
+    (default ``runtime.options.export_workers``). The HTML report and the
+    provenance record run after them, because they list what was written.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = int(max_workers if max_workers is not None else runtime.options.export_workers)
+    saved_images_for_report: list[tuple[str, str]] = []
+    report_assets: list[tuple[str, str]] = []
+    report_tables: list[dict[str, str]] = []
+
+    executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        if executor is None:
+            parts = [task(runtime, ctx, output_dir) for task in _EXPORT_TASKS]
+        else:
+            parts = list(executor.map(lambda task: task(runtime, ctx, output_dir), _EXPORT_TASKS))
+        # Merge in task order so report sections and warnings are stable regardless of scheduling.
+        for part in parts:
+            ctx.artifacts.update(part.artifacts)
+            saved_images_for_report.extend(part.images)
+            report_assets.extend(part.assets)
+            report_tables.extend(part.tables)
+            ctx.warnings.extend(part.warnings)
+        csv_path = ctx.artifacts["results_csv"]
+
+        edit_log = resolve_edit_log_path(ctx.path, runtime.options.apply_edits)
+        if edit_log is not None and edit_log.exists():
+            ctx.artifacts.setdefault("edit_log", edit_log)
+            report_assets.append(("Review edits", str(edit_log.relative_to(output_dir)) if edit_log.is_relative_to(output_dir) else edit_log.name))
+
+        finalizers: dict[str, Callable[[], Path]] = {}
+        if runtime.options.write_html_report:
+            finalizers["html_report"] = lambda: _write_report(
+                runtime,
+                ctx,
+                output_dir,
+                images=saved_images_for_report,
+                assets=report_assets,
+                tables=report_tables,
+            )
+        if runtime.options.write_provenance:
+            finalizers["provenance"] = lambda: _write_context_provenance(runtime, ctx, output_dir, csv_path)
+        if executor is None:
+            finalized = {key: finalize() for key, finalize in finalizers.items()}
+        else:
+            futures = {key: executor.submit(finalize) for key, finalize in finalizers.items()}
+            finalized = {key: future.result() for key, future in futures.items()}
+        ctx.artifacts.update(finalized)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
 
     return {key: value for key, value in ctx.artifacts.items()}
+
+
+class ArtifactExporter:
+    """Fire-and-forget ``export_context`` on a background thread.
+
+    ``submit`` returns a future for the artifact dict, so the caller can start
+    the next image while the previous one is still being encoded and written.
+    At most ``max_pending`` exports are queued; further submissions block, so
+    finished contexts cannot pile up in memory faster than they are written.
+    """
+
+    def __init__(self, *, max_pending: int = 2, export_workers: int | None = None):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifact-export")
+        self._slots = threading.BoundedSemaphore(max(int(max_pending), 1))
+        self._export_workers = export_workers
+
+    def submit(self, runtime: AppRuntime, ctx: RunContext, output_dir: str | Path) -> Future:
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(export_context, runtime, ctx, output_dir, max_workers=self._export_workers)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "ArtifactExporter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
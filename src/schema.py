@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import importlib.util
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 
@@ -34,6 +36,10 @@ REGION_REQUIRED = {
     "density_cells_per_mm2": "float64",
 }
 
+# Arrow-backed strings take a fraction of the memory of Python string objects;
+# existing columns with either storage already satisfy a "string" requirement.
+STRING_DTYPE = pd.StringDtype("pyarrow") if importlib.util.find_spec("pyarrow") is not None else pd.StringDtype()
+
 STUDY_REQUIRED = {
     "schema_version": "string",
     "table_kind": "string",
@@ -135,32 +141,66 @@ STUDY_TABLE_COLUMNS = [
 def order_columns(frame: pd.DataFrame, preferred: list[str]) -> pd.DataFrame:
     present = [column for column in preferred if column in frame.columns]
     extra = [column for column in frame.columns if column not in present]
-    return frame[present + extra]
+    ordered = present + extra
+    if ordered == list(frame.columns):
+        return frame
+    if not frame.columns.is_unique:
+        return frame[ordered]
+    # Rebuilding from the column objects reorders without the block copy ``frame[ordered]`` makes.
+    out = pd.DataFrame({column: frame[column] for column in ordered}, index=frame.index, copy=False)
+    out.attrs = dict(frame.attrs)
+    return out
+
+
+def _as_string(series: pd.Series) -> pd.Series:
+    if isinstance(series.dtype, pd.StringDtype):
+        return series
+    return series.astype(STRING_DTYPE)
+
+
+def _constant_string(value: str, index: pd.Index) -> pd.Series:
+    if STRING_DTYPE.storage == "pyarrow":
+        import pyarrow as pa
+
+        # Decoding a one-entry dictionary skips creating a Python object per row.
+        codes = pa.array(np.zeros(len(index), dtype=np.int8))
+        values = pa.DictionaryArray.from_arrays(codes, pa.array([value], type=pa.string())).cast(pa.string())
+        return pd.Series(pd.arrays.ArrowStringArray(values), index=index)
+    return pd.Series(pd.array(np.full(len(index), value, dtype=object), dtype=STRING_DTYPE), index=index)
+
+
+def _path_stems(series: pd.Series) -> pd.Series:
+    # Object tables repeat one path per row; parse each distinct path once.
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    stems = pd.array([Path(str(value)).name.rsplit(".", 1)[0] for value in uniques], dtype=STRING_DTYPE)
+    return pd.Series(stems.take(codes), index=series.index)
 
 
 def _image_id_from_frame(frame: pd.DataFrame) -> pd.Series:
     if "image_id" in frame.columns:
-        return frame["image_id"].astype("string")
+        return _as_string(frame["image_id"])
     if "filename" in frame.columns:
-        return frame["filename"].map(lambda value: Path(str(value)).name.rsplit(".", 1)[0]).astype("string")
+        return _path_stems(frame["filename"])
     if "source_path" in frame.columns:
-        return frame["source_path"].map(lambda value: Path(str(value)).name.rsplit(".", 1)[0]).astype("string")
+        return _path_stems(frame["source_path"])
     if "sample_id" in frame.columns:
-        return frame["sample_id"].astype("string")
-    return pd.Series([""] * len(frame), index=frame.index, dtype="string")
+        return _as_string(frame["sample_id"])
+    return _constant_string("", frame.index)
 
 
-def _fill_defaults(frame: pd.DataFrame, table_kind: str) -> pd.DataFrame:
-    out = frame.copy()
-    out["schema_version"] = SCHEMA_VERSION
-    out["table_kind"] = table_kind
+def _fill_defaults(frame: pd.DataFrame, table_kind: str, *, copy: bool = False) -> pd.DataFrame:
+    # Only whole columns are assigned below, so a shallow copy keeps the
+    # caller's frame untouched without duplicating every column.
+    out = frame.copy(deep=copy)
+    out["schema_version"] = _constant_string(SCHEMA_VERSION, out.index)
+    out["table_kind"] = _constant_string(table_kind, out.index)
 
     if table_kind == "object":
         out["image_id"] = _image_id_from_frame(out)
         if "kept" not in out.columns:
             out["kept"] = True
         if "phenotype" not in out.columns:
-            out["phenotype"] = "unclassified"
+            out["phenotype"] = _constant_string("unclassified", out.index)
         if "object_table_version" not in out.columns:
             out["object_table_version"] = OBJECT_TABLE_VERSION
         if "region_schema" not in out.columns and "retina_region_schema" in out.columns:
@@ -173,13 +213,27 @@ def _fill_defaults(frame: pd.DataFrame, table_kind: str) -> pd.DataFrame:
             out["retina_region_schema"] = out["region_schema"]
     elif table_kind == "study":
         if "sample_id" in out.columns:
-            out["sample_id"] = out["sample_id"].astype("string")
+            out["sample_id"] = _as_string(out["sample_id"])
     return out
 
 
+def dtype_matches(dtype: Any, required: str) -> bool:
+    """Whether a column dtype already satisfies a schema dtype, so no cast is needed."""
+    if required == "string":
+        return isinstance(dtype, pd.StringDtype)
+    if required == "boolean":
+        return isinstance(dtype, pd.BooleanDtype)
+    try:
+        return dtype == np.dtype(required)
+    except TypeError:
+        return False
+
+
 def _coerce_column(series: pd.Series, dtype: str) -> pd.Series:
+    if dtype_matches(series.dtype, dtype):
+        return series
     if dtype == "string":
-        return series.astype("string")
+        return series.astype(STRING_DTYPE)
     if dtype == "boolean":
         return series.astype("boolean")
     return series.astype(dtype)
@@ -191,8 +245,16 @@ def validate_table(
     required: dict[str, str],
     table_kind: str,
     strict: bool = False,
+    copy: bool = False,
 ) -> pd.DataFrame:
-    out = _fill_defaults(frame, table_kind)
+    """
+    Fill contract defaults and coerce required columns to their schema dtypes.
+
+    Columns whose dtype already matches are passed through untouched and the
+    result shares their memory with ``frame`` unless ``copy=True``; ``frame``
+    itself is never modified.
+    """
+    out = _fill_defaults(frame, table_kind, copy=copy)
     missing = [column for column in required if column not in out.columns]
     if missing and strict:
         raise ValueError(f"Missing required {table_kind} column(s): {missing}")
@@ -201,20 +263,78 @@ def validate_table(
         if column not in out.columns:
             out[column] = pd.Series([pd.NA] * len(out), index=out.index)
         try:
-            out[column] = _coerce_column(out[column], dtype)
+            coerced = _coerce_column(out[column], dtype)
         except Exception:
             if strict:
                 raise
+            continue
+        if coerced is not out[column]:
+            out[column] = coerced
     return out
 
 
-def validate_object_table(frame: pd.DataFrame, strict: bool = False) -> pd.DataFrame:
-    return order_columns(validate_table(frame, required=OBJECT_REQUIRED, table_kind="object", strict=strict), OBJECT_TABLE_COLUMNS)
+def _arrow_type_matches(arrow_type: Any, required: str) -> bool:
+    import pyarrow as pa
+
+    if pa.types.is_dictionary(arrow_type):
+        arrow_type = arrow_type.value_type
+    if required == "string":
+        return pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)
+    if required == "boolean":
+        return pa.types.is_boolean(arrow_type)
+    if required == "int64":
+        return pa.types.is_int64(arrow_type)
+    if required == "float64":
+        return pa.types.is_float64(arrow_type)
+    return False
+
+
+def validate_parquet_schema(
+    source: Any,
+    *,
+    required: dict[str, str],
+    table_kind: str,
+    strict: bool = False,
+) -> dict[str, str]:
+    """
+    Check a parquet file, directory dataset or ``pyarrow`` schema/dataset
+    against ``required`` from its schema alone, without reading any rows.
+
+    Returns ``{column: problem}`` for missing or mistyped required columns;
+    with ``strict=True`` any problem raises ``ValueError`` instead.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError as exc:
+        raise RuntimeError("pyarrow is required to validate parquet schemas.") from exc
+
+    if isinstance(source, pa.Schema):
+        schema = source
+    elif isinstance(source, ds.Dataset):
+        schema = source.schema
+    else:
+        schema = ds.dataset(Path(source), format="parquet").schema
+
+    problems: dict[str, str] = {}
+    for column, dtype in required.items():
+        index = schema.get_field_index(column)
+        if index < 0:
+            problems[column] = "missing"
+        elif not _arrow_type_matches(schema.field(index).type, dtype):
+            problems[column] = f"expected {dtype}, found {schema.field(index).type}"
+    if problems and strict:
+        raise ValueError(f"Invalid {table_kind} parquet schema: {problems}")
+    return problems
+
+
+def validate_object_table(frame: pd.DataFrame, strict: bool = False, *, copy: bool = False) -> pd.DataFrame:
+    return order_columns(validate_table(frame, required=OBJECT_REQUIRED, table_kind="object", strict=strict, copy=copy), OBJECT_TABLE_COLUMNS)
 
 
-def validate_region_table(frame: pd.DataFrame, strict: bool = False) -> pd.DataFrame:
-    return order_columns(validate_table(frame, required=REGION_REQUIRED, table_kind="region", strict=strict), REGION_TABLE_COLUMNS)
+def validate_region_table(frame: pd.DataFrame, strict: bool = False, *, copy: bool = False) -> pd.DataFrame:
+    return order_columns(validate_table(frame, required=REGION_REQUIRED, table_kind="region", strict=strict, copy=copy), REGION_TABLE_COLUMNS)
 
 
-def validate_study_table(frame: pd.DataFrame, strict: bool = False) -> pd.DataFrame:
-    return order_columns(validate_table(frame, required=STUDY_REQUIRED, table_kind="study", strict=strict), STUDY_TABLE_COLUMNS)
+def validate_study_table(frame: pd.DataFrame, strict: bool = False, *, copy: bool = False) -> pd.DataFrame:
+    return order_columns(validate_table(frame, required=STUDY_REQUIRED, table_kind="study", strict=strict, copy=copy), STUDY_TABLE_COLUMNS)
@@ -0,0 +1,184 @@
+"""Private shared-memory plumbing for handing large arrays to worker processes.
+
+No pipeline stage or ``run_service`` entry point runs in worker processes yet,
+so only the array registry lives here; a process-based runner adds its own
+context handling on top of it. Not part of the public API.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from dataclasses import dataclass, field
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any
+
+import numpy as np
+
+
+_TRACKER_LOCK = threading.Lock()
+_ATTACH_LOCK = threading.Lock()
+_ATTACHED: dict[str, list[Any]] = {}
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    """Picklable descriptor of an array living in a named shared-memory block."""
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+    @property
+    def nbytes(self) -> int:
+        return int(np.prod(self.shape, dtype=np.int64)) * np.dtype(self.dtype).itemsize
+
+
+def _skip_register(name: str, rtype: str) -> None:
+    return None
+
+
+def _open_segment(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    # Before Python 3.13 every attach registers the block with the resource
+    # tracker, which then unlinks it when the attaching process exits; only
+    # the publishing registry may own the block's lifetime.
+    with _TRACKER_LOCK:
+        register = resource_tracker.register
+        resource_tracker.register = _skip_register
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def attach_shared_array(handle: SharedArray) -> np.ndarray:
+    """
+    Map a published array into this process without copying it.
+
+    The returned array is read-only. Attachments are counted per process, and
+    the mapping stays open until ``detach_shared_array`` has been called once
+    per attach.
+    """
+    with _ATTACH_LOCK:
+        entry = _ATTACHED.get(handle.name)
+        if entry is None:
+            entry = [_open_segment(handle.name), 0]
+            _ATTACHED[handle.name] = entry
+        entry[1] += 1
+        segment = entry[0]
+    array = np.ndarray(handle.shape, dtype=np.dtype(handle.dtype), buffer=segment.buf)
+    array.flags.writeable = False
+    return array
+
+
+def detach_shared_array(handle: SharedArray) -> None:
+    with _ATTACH_LOCK:
+        entry = _ATTACHED.get(handle.name)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] > 0:
+            return
+        del _ATTACHED[handle.name]
+    try:
+        entry[0].close()
+    except BufferError:
+        # Views of the block are still referenced; the mapping is released when they are.
+        pass
+
+
+def _weak(array: Any) -> weakref.ref | None:
+    try:
+        return weakref.ref(array)
+    except TypeError:
+        return None
+
+
+@dataclass
+class _Published:
+    segment: shared_memory.SharedMemory
+    handle: SharedArray
+    source: weakref.ref | None
+    refs: int = 1
+
+
+@dataclass
+class SharedArrayRegistry:
+    """
+    Owner of shared-memory copies of arrays handed to worker processes.
+
+    ``publish`` copies an array into a new block once; publishing the same
+    array object again returns the same handle and adds a reference.
+    ``retain``/``release`` count the tasks using a handle, and the block is
+    unlinked when its count drops to zero or when the registry is closed.
+    """
+
+    _entries: dict[str, _Published] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def __enter__(self) -> "SharedArrayRegistry":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def publish(self, array: np.ndarray) -> SharedArray:
+        source = np.asarray(array)
+        # Creating under the lock keeps two threads publishing the same array
+        # from both missing the reuse check and leaking a second block.
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.source is not None and entry.source() is array:
+                    entry.refs += 1
+                    return entry.handle
+            with _TRACKER_LOCK:
+                # ``_open_segment`` may have swapped out the tracker's register
+                # hook; a block created meanwhile would go untracked.
+                segment = shared_memory.SharedMemory(create=True, size=max(int(source.nbytes), 1))
+            target = np.ndarray(source.shape, dtype=source.dtype, buffer=segment.buf)
+            np.copyto(target, source)
+            del target
+            handle = SharedArray(name=segment.name, shape=tuple(int(dim) for dim in source.shape), dtype=source.dtype.str)
+            self._entries[handle.name] = _Published(segment=segment, handle=handle, source=_weak(array))
+        return handle
+
+    def retain(self, handle: SharedArray) -> SharedArray:
+        with self._lock:
+            self._entries[handle.name].refs += 1
+        return handle
+
+    def release(self, handle: SharedArray) -> None:
+        with self._lock:
+            entry = self._entries.get(handle.name)
+            if entry is None:
+                return
+            entry.refs -= 1
+            if entry.refs > 0:
+                return
+            del self._entries[handle.name]
+        self._unlink(entry)
+
+    def close(self) -> None:
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            self._unlink(entry)
+
+    @staticmethod
+    def _unlink(entry: _Published) -> None:
+        try:
+            entry.segment.close()
+        except BufferError:
+            pass
+        try:
+            entry.segment.unlink()
+        except FileNotFoundError:
+            pass
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Sequence
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 from scipy.ndimage import distance_transform_edt, gaussian_filter
 from scipy.spatial import QhullError, Voronoi, cKDTree
+import shapely
+from shapely import STRtree
+from shapely.affinity import translate
 from shapely.geometry import MultiPolygon, Polygon, box
 
 from src.config import MICRONS_PER_PIXEL
@@ -20,19 +23,112 @@ DEFAULT_RIGOROUS_RADII_PX: tuple[float, ...] = (25.0, 50.0, 75.0, 100.0, 150.0,
 MIN_RIGOROUS_POINTS = 5
 
 
+@dataclass(frozen=True)
+class DomainGeometry:
+    """Bounding-box-local view of a domain mask plus the fields every analysis pass reuses.
+
+    ``mask`` is cropped to the domain's bounding box, padded by one background
+    pixel wherever the box does not touch the image edge, so ``boundary_distance``
+    equals the full-image distance transform inside the box. ``candidate_index``
+    holds the row-major flat indices of domain pixels in the crop, in the same
+    order as ``np.where`` on the full mask.
+    """
+
+    offset_yx: tuple[int, int]
+    image_shape: tuple[int, int]
+    mask: np.ndarray
+    boundary_distance: np.ndarray
+    candidate_index: np.ndarray
+    area_px: float
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> "DomainGeometry":
+        full = np.asarray(mask, dtype=bool)
+        image_shape = (int(full.shape[0]), int(full.shape[1]))
+        rows = np.flatnonzero(full.any(axis=1))
+        if rows.size == 0:
+            empty = np.zeros((0, 0), dtype=bool)
+            return cls(
+                offset_yx=(0, 0),
+                image_shape=image_shape,
+                mask=empty,
+                boundary_distance=np.zeros((0, 0), dtype=float),
+                candidate_index=np.empty(0, dtype=np.int64),
+                area_px=0.0,
+            )
+        cols = np.flatnonzero(full.any(axis=0))
+        y0 = max(int(rows[0]) - 1, 0)
+        y1 = min(int(rows[-1]) + 2, image_shape[0])
+        x0 = max(int(cols[0]) - 1, 0)
+        x1 = min(int(cols[-1]) + 2, image_shape[1])
+        crop = np.ascontiguousarray(full[y0:y1, x0:x1])
+        index_dtype = np.int32 if crop.size < np.iinfo(np.int32).max else np.int64
+        candidate_index = np.flatnonzero(crop).astype(index_dtype, copy=False)
+        return cls(
+            offset_yx=(y0, x0),
+            image_shape=image_shape,
+            mask=crop,
+            boundary_distance=distance_transform_edt(crop),
+            candidate_index=candidate_index,
+            area_px=float(candidate_index.size),
+        )
+
+    def full_mask(self) -> np.ndarray:
+        full = np.zeros(self.image_shape, dtype=bool)
+        y0, x0 = self.offset_yx
+        full[y0 : y0 + self.mask.shape[0], x0 : x0 + self.mask.shape[1]] = self.mask
+        return full
+
+    def polygon(self) -> Polygon | MultiPolygon:
+        if self.area_px <= 0:
+            return Polygon()
+        local = _coerce_polygon(mask_to_polygon(self.mask))
+        y0, x0 = self.offset_yx
+        return translate(local, xoff=float(x0), yoff=float(y0)) if (x0 or y0) else local
+
+    def boundary_distances(self, points_yx: np.ndarray) -> np.ndarray:
+        if len(points_yx) == 0:
+            return np.empty(0, dtype=float)
+        ys = np.clip(np.round(points_yx[:, 0]).astype(int), 0, self.image_shape[0] - 1) - self.offset_yx[0]
+        xs = np.clip(np.round(points_yx[:, 1]).astype(int), 0, self.image_shape[1] - 1) - self.offset_yx[1]
+        inside = (ys >= 0) & (ys < self.mask.shape[0]) & (xs >= 0) & (xs < self.mask.shape[1])
+        distances = np.zeros(len(points_yx), dtype=float)
+        distances[inside] = self.boundary_distance[ys[inside], xs[inside]]
+        return distances
+
+    def sample_points(self, count: int, seed: int) -> np.ndarray:
+        if self.candidate_index.size < count or count <= 0:
+            return np.empty((0, 2), dtype=np.float64)
+        rng = np.random.default_rng(seed)
+        take = rng.choice(self.candidate_index.size, size=count, replace=False)
+        ys, xs = np.divmod(self.candidate_index[take].astype(np.int64), self.mask.shape[1])
+        return np.column_stack(((ys + self.offset_yx[0]).astype(float), (xs + self.offset_yx[1]).astype(float)))
+
+
 @dataclass(frozen=True)
 class SpatialDomain:
     image_id: str
     analysis_level: str
     region_axis: str
     region_label: str
-    mask: np.ndarray
+    geometry: DomainGeometry
     polygon: Polygon | MultiPolygon
     area_px: float
     area_mm2: float
     domain_source: str
     random_seed: int
 
+    @property
+    def mask(self) -> np.ndarray:
+        """Full-image boolean mask, rebuilt from the cropped geometry on demand."""
+        return self.geometry.full_mask()
+
+
+def _as_geometry(domain_mask: np.ndarray | DomainGeometry) -> DomainGeometry:
+    if isinstance(domain_mask, DomainGeometry):
+        return domain_mask
+    return DomainGeometry.from_mask(domain_mask)
+
 
 @dataclass(frozen=True)
 class RigorousSpatialResult:
@@ -124,15 +220,131 @@ def ripley_k(centroids: np.ndarray, radii: Sequence[float], area_px: float) -> d
     return results
 
 
+@dataclass(frozen=True)
+class DensityGrid:
+    """Gaussian-smoothed point density on a coarse regular grid.
+
+    ``values[i, j]`` is the density (points per unit^2) at the centre of the
+    cell whose corner is ``origin + (i, j) * cell_size``; ``extent`` is the
+    (height, width) the grid stands for in source units (pixels or um).
+    """
+
+    values: np.ndarray
+    origin: tuple[float, float]
+    cell_size: float
+    extent: tuple[float, float]
+    sigma: float
+
+    def render(self, shape: tuple[int, int]) -> np.ndarray:
+        """Bilinearly resample onto ``shape`` pixels spanning ``extent``; memory scales with ``shape`` only."""
+        out_h, out_w = int(shape[0]), int(shape[1])
+        rows = ((np.arange(out_h) + 0.5) * (self.extent[0] / max(out_h, 1))) / self.cell_size - 0.5
+        cols = ((np.arange(out_w) + 0.5) * (self.extent[1] / max(out_w, 1))) / self.cell_size - 0.5
+        resampled = _linear_resample_axis(self.values, rows, axis=0)
+        return _linear_resample_axis(resampled, cols, axis=1).astype(np.float32, copy=False)
+
+
+def _linear_resample_axis(values: np.ndarray, coords: np.ndarray, *, axis: int) -> np.ndarray:
+    size = values.shape[axis]
+    coords = np.clip(coords, 0.0, size - 1)
+    lower = np.floor(coords).astype(np.intp)
+    upper = np.minimum(lower + 1, size - 1)
+    weight = (coords - lower).astype(np.float32)
+    shape = [1, 1]
+    shape[axis] = -1
+    weight = weight.reshape(shape)
+    return np.take(values, lower, axis=axis) * (1.0 - weight) + np.take(values, upper, axis=axis) * weight
+
+
+def density_grid(
+    points_yx: np.ndarray,
+    extent: tuple[float, float],
+    sigma: float,
+    *,
+    origin: tuple[float, float] = (0.0, 0.0),
+    cell_size: float | None = None,
+) -> DensityGrid:
+    """
+    Splat points onto cells of about ``sigma / 4`` and blur the counts there.
+
+    A Gaussian of ``sigma`` spans four or more cells, so the coarse estimate
+    tracks the full-resolution splat-and-blur closely while the blur runs on a
+    grid (sigma / 4)^2 times smaller than the frame.
+    """
+    sigma = float(sigma)
+    cell = float(cell_size) if cell_size is not None else sigma / 4.0
+    n_rows = max(1, int(np.ceil(float(extent[0]) / cell)))
+    n_cols = max(1, int(np.ceil(float(extent[1]) / cell)))
+    counts = np.zeros(n_rows * n_cols, dtype=np.float64)
+    points = np.asarray(points_yx, dtype=float).reshape(-1, 2)
+    if len(points):
+        # Cloud-in-cell: split each point bilinearly over the four nearest cell
+        # centres so the estimate is not quantized to the cell size.
+        grid_y = (points[:, 0] - origin[0]) / cell - 0.5
+        grid_x = (points[:, 1] - origin[1]) / cell - 0.5
+        row0 = np.floor(grid_y)
+        col0 = np.floor(grid_x)
+        frac_y = grid_y - row0
+        frac_x = grid_x - col0
+        for d_row, w_row in ((0, 1.0 - frac_y), (1, frac_y)):
+            rows = np.clip(row0.astype(np.intp) + d_row, 0, n_rows - 1)
+            for d_col, w_col in ((0, 1.0 - frac_x), (1, frac_x)):
+                cols = np.clip(col0.astype(np.intp) + d_col, 0, n_cols - 1)
+                counts += np.bincount(rows * n_cols + cols, weights=w_row * w_col, minlength=n_rows * n_cols)
+    # Linear splatting and linear rendering each add a triangle kernel of
+    # variance cell^2 / 6 per axis; take it out of the Gaussian.
+    blur_sigma = np.sqrt(max(sigma * sigma - cell * cell / 3.0, 0.0)) / cell
+    values = gaussian_filter(counts.reshape(n_rows, n_cols), sigma=blur_sigma) / (cell * cell)
+    return DensityGrid(
+        values=values.astype(np.float32),
+        origin=(float(origin[0]), float(origin[1])),
+        cell_size=cell,
+        extent=(float(extent[0]), float(extent[1])),
+        sigma=sigma,
+    )
+
+
+def image_density_grid(centroids: np.ndarray, shape: tuple[int, int], sigma_px: float = 50.0) -> DensityGrid:
+    """Coarse isodensity grid over an image frame; centroids are (y, x) pixels."""
+    points = np.asarray(centroids, dtype=float).reshape(-1, 2) + 0.5
+    return density_grid(points, (float(shape[0]), float(shape[1])), sigma_px, cell_size=max(1.0, float(sigma_px) / 4.0))
+
+
+def registered_density_grid(
+    object_table: pd.DataFrame,
+    *,
+    sigma_um: float | None = None,
+    cell_um: float | None = None,
+) -> DensityGrid:
+    """
+    Density grid in registered retina coordinates (rows follow ``ret_y_um``,
+    columns ``ret_x_um``). The default kernel is 1/28 of the larger span,
+    the resolution of the former hexbin plot, padded by three kernels.
+    Like that plot, every row is counted, rejected objects included.
+    """
+    table = object_table
+    if table.empty or not {"ret_x_um", "ret_y_um"}.issubset(table.columns):
+        points = np.empty((0, 2), dtype=float)
+    else:
+        points = table[["ret_y_um", "ret_x_um"]].to_numpy(dtype=float)
+        points = points[np.isfinite(points).all(axis=1)]
+    if len(points) == 0:
+        low = np.array([-1.0, -1.0])
+        high = np.array([1.0, 1.0])
+    else:
+        low = np.minimum(points.min(axis=0), 0.0)
+        high = np.maximum(points.max(axis=0), 0.0)
+    span = float(max(high - low)) or 1.0
+    sigma = float(sigma_um) if sigma_um is not None else span / 28.0
+    pad = 3.0 * sigma
+    origin = (float(low[0] - pad), float(low[1] - pad))
+    extent = (float(high[0] - low[0] + 2 * pad), float(high[1] - low[1] + 2 * pad))
+    return density_grid(points, extent, sigma, origin=origin, cell_size=cell_um)
+
+
 def isodensity_map(centroids: np.ndarray, shape: tuple[int, int], sigma_px: float = 50.0) -> np.ndarray:
-    """Build a smoothed density map by splatting centroids and applying Gaussian blur."""
-    m = np.zeros(shape, dtype=np.float32)
-    if len(centroids) == 0:
-        return m
-    yi = np.clip(np.round(centroids[:, 0]).astype(int), 0, shape[0] - 1)
-    xi = np.clip(np.round(centroids[:, 1]).astype(int), 0, shape[1] - 1)
-    m[yi, xi] = 1.0
-    return gaussian_filter(m, sigma=sigma_px)
+    """Smoothed density map at ``shape``, estimated on a coarse grid and upsampled."""
+    return image_density_grid(centroids, shape, sigma_px=sigma_px).render(shape)
 
 
 def _stable_hash(*parts: object) -> int:
@@ -186,18 +398,13 @@ def rigorous_points_from_object_table(
     return subset[["centroid_y_px", "centroid_x_px"]].to_numpy(dtype=float)
 
 
-def _boundary_distances(points_yx: np.ndarray, domain_mask: np.ndarray) -> np.ndarray:
-    if len(points_yx) == 0:
-        return np.empty(0, dtype=float)
-    distance_map = distance_transform_edt(domain_mask.astype(bool))
-    ys = np.clip(np.round(points_yx[:, 0]).astype(int), 0, domain_mask.shape[0] - 1)
-    xs = np.clip(np.round(points_yx[:, 1]).astype(int), 0, domain_mask.shape[1] - 1)
-    return distance_map[ys, xs].astype(float, copy=False)
+def _boundary_distances(points_yx: np.ndarray, domain_mask: np.ndarray | DomainGeometry) -> np.ndarray:
+    return _as_geometry(domain_mask).boundary_distances(points_yx)
 
 
 def choose_valid_radii_px(
     points_yx: np.ndarray,
-    domain_mask: np.ndarray,
+    domain_mask: np.ndarray | DomainGeometry,
     requested_radii_px: Sequence[float],
     *,
     min_points: int = MIN_RIGOROUS_POINTS,
@@ -205,7 +412,8 @@ def choose_valid_radii_px(
     min_finite_radii: int = 2,
 ) -> dict[str, Any]:
     requested = [float(radius) for radius in requested_radii_px]
-    if float(domain_mask.sum()) <= 0:
+    geometry = _as_geometry(domain_mask)
+    if geometry.area_px <= 0:
         return {
             "requested_radii_px": requested,
             "used_radii_px": [],
@@ -226,7 +434,7 @@ def choose_valid_radii_px(
             "status_reason": "insufficient_points",
         }
 
-    boundary_distances = _boundary_distances(np.asarray(points_yx, dtype=float), domain_mask)
+    boundary_distances = geometry.boundary_distances(np.asarray(points_yx, dtype=float))
     used = [float(radius) for radius in requested if int(np.sum(boundary_distances >= float(radius))) >= int(min_eligible_points)]
     usable_max_radius = float(np.max(boundary_distances)) if boundary_distances.size else 0.0
     status_reason = "ok" if len(used) >= int(min_finite_radii) else "no_valid_radii"
@@ -241,13 +449,8 @@ def choose_valid_radii_px(
     }
 
 
-def _sample_points_from_mask(mask: np.ndarray, count: int, seed: int) -> np.ndarray:
-    ys, xs = np.where(mask)
-    if len(xs) < count or count <= 0:
-        return np.empty((0, 2), dtype=np.float64)
-    rng = np.random.default_rng(seed)
-    take = rng.choice(len(xs), size=count, replace=False)
-    return np.column_stack((ys[take].astype(float), xs[take].astype(float)))
+def _sample_points_from_mask(mask: np.ndarray | DomainGeometry, count: int, seed: int) -> np.ndarray:
+    return _as_geometry(mask).sample_points(count, seed)
 
 
 def _domain_seed(image_id: str, region_axis: str, region_label: str, base_seed: int) -> int:
@@ -321,19 +524,32 @@ def exact_voronoi_clipped_areas(
     except QhullError:
         return np.array([], dtype=float)
     regions, vertices = _voronoi_finite_polygons_2d(vor)
-
-    areas: list[float] = []
-    for region in regions:
-        poly = Polygon(vertices[region])
-        if not poly.is_valid:
-            poly = poly.buffer(0)
-        clipped = poly.intersection(polygon)
-        if clipped.is_empty:
-            continue
-        area = float(clipped.area)
-        if area > 0:
-            areas.append(area)
-    return np.asarray(areas, dtype=float)
+    cells = _voronoi_cell_array(regions, vertices)
+
+    # The tree narrows the domain to cells it touches and, of those, the ones it
+    # fully contains; only cells crossing the boundary need a real intersection.
+    tree = STRtree(cells)
+    touching = np.sort(tree.query(polygon, predicate="intersects"))
+    inside = tree.query(polygon, predicate="contains_properly")
+
+    areas = np.zeros(len(cells), dtype=float)
+    areas[inside] = shapely.area(cells[inside])
+    boundary = np.setdiff1d(touching, inside, assume_unique=True)
+    if boundary.size:
+        areas[boundary] = shapely.area(shapely.intersection(cells[boundary], polygon))
+    areas = areas[touching]
+    return areas[areas > 0]
+
+
+def _voronoi_cell_array(regions: list[list[int]], vertices: np.ndarray) -> np.ndarray:
+    counts = np.fromiter((len(region) for region in regions), dtype=np.int64, count=len(regions))
+    flat = np.fromiter((vertex for region in regions for vertex in region), dtype=np.int64, count=int(counts.sum()))
+    rings = shapely.linearrings(vertices[flat], indices=np.repeat(np.arange(len(regions)), counts))
+    cells = shapely.polygons(rings)
+    invalid = ~shapely.is_valid(cells)
+    if invalid.any():
+        cells[invalid] = shapely.buffer(cells[invalid], 0)
+    return cells
 
 
 def rigorous_voronoi_metrics(
@@ -367,19 +583,20 @@ def exact_voronoi_clip_area(poly_xy: np.ndarray, *, width: int, height: int, dom
     return float(clipped.area) if not clipped.is_empty else 0.0
 
 
-def _border_corrected_l_values(points_yx: np.ndarray, domain_mask: np.ndarray, radii_px: Sequence[float]) -> np.ndarray:
+def _border_corrected_l_values(points_yx: np.ndarray, domain_mask: np.ndarray | DomainGeometry, radii_px: Sequence[float]) -> np.ndarray:
     radii = np.asarray(radii_px, dtype=float)
     values = np.full(len(radii), np.nan, dtype=float)
     n_points = len(points_yx)
     if n_points < MIN_RIGOROUS_POINTS:
         return values
 
-    area_px = float(domain_mask.sum())
+    geometry = _as_geometry(domain_mask)
+    area_px = geometry.area_px
     if area_px <= 0:
         return values
 
     tree = cKDTree(points_yx)
-    boundary_distances = _boundary_distances(points_yx, domain_mask)
+    boundary_distances = geometry.boundary_distances(points_yx)
 
     for index, radius in enumerate(radii):
         eligible = boundary_distances >= radius
@@ -395,19 +612,20 @@ def _border_corrected_l_values(points_yx: np.ndarray, domain_mask: np.ndarray, r
     return values
 
 
-def _pair_correlation_values(points_yx: np.ndarray, domain_mask: np.ndarray, radii_px: Sequence[float]) -> np.ndarray:
+def _pair_correlation_values(points_yx: np.ndarray, domain_mask: np.ndarray | DomainGeometry, radii_px: Sequence[float]) -> np.ndarray:
     radii = np.asarray(radii_px, dtype=float)
     values = np.full(len(radii), np.nan, dtype=float)
     n_points = len(points_yx)
     if n_points < MIN_RIGOROUS_POINTS:
         return values
 
-    area_px = float(domain_mask.sum())
+    geometry = _as_geometry(domain_mask)
+    area_px = geometry.area_px
     if area_px <= 0:
         return values
 
     tree = cKDTree(points_yx)
-    boundary_distances = _boundary_distances(points_yx, domain_mask)
+    boundary_distances = geometry.boundary_distances(points_yx)
 
     prev_radius = 0.0
     for index, radius in enumerate(radii):
@@ -429,23 +647,25 @@ def _pair_correlation_values(points_yx: np.ndarray, domain_mask: np.ndarray, rad
     return values
 
 
-def simulate_csr_points(domain_mask: np.ndarray, n_points: int, *, seed: int) -> np.ndarray:
-    return _sample_points_from_mask(domain_mask.astype(bool), n_points, seed)
+def simulate_csr_points(domain_mask: np.ndarray | DomainGeometry, n_points: int, *, seed: int) -> np.ndarray:
+    return _as_geometry(domain_mask).sample_points(n_points, seed)
 
 
 def compute_csr_envelopes(
     points_yx: np.ndarray,
-    domain_mask: np.ndarray,
+    domain_mask: np.ndarray | DomainGeometry,
     *,
     radii_px: Sequence[float],
     simulation_count: int,
     seed: int,
 ) -> dict[str, Any]:
     radii = np.asarray(radii_px, dtype=float)
-    observed_l = _border_corrected_l_values(points_yx, domain_mask, radii)
-    observed_g = _pair_correlation_values(points_yx, domain_mask, radii)
+    # Distance field and candidate pixels are computed once and shared by every simulation.
+    geometry = _as_geometry(domain_mask)
+    observed_l = _border_corrected_l_values(points_yx, geometry, radii)
+    observed_g = _pair_correlation_values(points_yx, geometry, radii)
 
-    if len(points_yx) < MIN_RIGOROUS_POINTS or domain_mask.sum() <= 0 or simulation_count <= 0:
+    if len(points_yx) < MIN_RIGOROUS_POINTS or geometry.area_px <= 0 or simulation_count <= 0:
         return {
             "l_obs": observed_l,
             "g_obs": observed_g,
@@ -464,9 +684,9 @@ def compute_csr_envelopes(
     sim_stats: list[float] = []
 
     for sim_index in range(simulation_count):
-        sim_points = simulate_csr_points(domain_mask, len(points_yx), seed=seed + sim_index)
-        sim_l = _border_corrected_l_values(sim_points, domain_mask, radii)
-        sim_g = _pair_correlation_values(sim_points, domain_mask, radii)
+        sim_points = simulate_csr_points(geometry, len(points_yx), seed=seed + sim_index)
+        sim_l = _border_corrected_l_values(sim_points, geometry, radii)
+        sim_g = _pair_correlation_values(sim_points, geometry, radii)
         l_sims.append(sim_l)
         g_sims.append(sim_g)
         if np.isfinite(sim_l).any():
@@ -521,14 +741,14 @@ def _safe_percentile(stack: np.ndarray, percentile: float) -> np.ndarray:
 
 
 def _domain_status(
-    domain_mask: np.ndarray,
+    domain_area_px: float,
     point_count: int,
     *,
     n_radii_used: int,
     n_finite_l: int,
     n_finite_g: int,
 ) -> str:
-    if float(domain_mask.sum()) <= 0:
+    if float(domain_area_px) <= 0:
         return "empty_domain"
     if point_count < MIN_RIGOROUS_POINTS:
         return "insufficient_points"
@@ -578,17 +798,17 @@ def build_spatial_domains(
 ) -> list[SpatialDomain]:
     domains: list[SpatialDomain] = []
     global_mask = _coerce_bool_mask(tissue_mask, tissue_mask.shape)
-    global_polygon = _coerce_polygon(mask_to_polygon(global_mask))
+    global_geometry = DomainGeometry.from_mask(global_mask)
     domains.append(
         SpatialDomain(
             image_id=image_id,
             analysis_level="global",
             region_axis="global",
             region_label="global",
-            mask=global_mask,
-            polygon=global_polygon,
-            area_px=float(global_mask.sum()),
-            area_mm2=float(global_mask.sum()) * (float(um_per_px) ** 2) / 1e6,
+            geometry=global_geometry,
+            polygon=global_geometry.polygon(),
+            area_px=global_geometry.area_px,
+            area_mm2=global_geometry.area_px * (float(um_per_px) ** 2) / 1e6,
             domain_source="tissue_mask",
             random_seed=_domain_seed(image_id, "global", "global", base_seed),
         )
@@ -603,18 +823,19 @@ def build_spatial_domains(
         schema_name=schema_name,
         max_ecc_um=float(max_ecc_um),
     )
-    for (axis, label), region_mask in sorted(region_masks.items()):
-        polygon = _coerce_polygon(mask_to_polygon(region_mask))
+    for axis, label in sorted(region_masks):
+        # Crop each full-image region mask as soon as it is consumed.
+        geometry = DomainGeometry.from_mask(region_masks.pop((axis, label)))
         domains.append(
             SpatialDomain(
                 image_id=image_id,
                 analysis_level="region",
                 region_axis=str(axis),
                 region_label=str(label),
-                mask=np.asarray(region_mask, dtype=bool),
-                polygon=polygon,
-                area_px=float(np.asarray(region_mask, dtype=bool).sum()),
-                area_mm2=float(np.asarray(region_mask, dtype=bool).sum()) * (float(um_per_px) ** 2) / 1e6,
+                geometry=geometry,
+                polygon=geometry.polygon(),
+                area_px=geometry.area_px,
+                area_mm2=geometry.area_px * (float(um_per_px) ** 2) / 1e6,
                 domain_source="registered_region",
                 random_seed=_domain_seed(image_id, axis, label, base_seed),
             )
@@ -631,7 +852,7 @@ def analyze_rigorous_domain(
     simulation_count: int,
 ) -> RigorousSpatialResult:
     points = np.asarray(points_yx, dtype=float)
-    radii_info = choose_valid_radii_px(points, domain.mask, radii_px)
+    radii_info = choose_valid_radii_px(points, domain.geometry, radii_px)
     requested_radii = np.asarray(radii_info["requested_radii_px"], dtype=float)
     used_radii = np.asarray(radii_info["used_radii_px"], dtype=float)
     legacy_nn = nn_regularity_index(points)
@@ -639,7 +860,7 @@ def analyze_rigorous_domain(
     rigorous_voronoi = rigorous_voronoi_metrics(points, domain.polygon, image_shape=image_shape)
     envelopes = compute_csr_envelopes(
         points,
-        domain.mask,
+        domain.geometry,
         radii_px=used_radii,
         simulation_count=simulation_count,
         seed=domain.random_seed,
@@ -664,7 +885,7 @@ def analyze_rigorous_domain(
     n_finite_l = int(np.isfinite(aligned["l_obs"]).sum())
     n_finite_g = int(np.isfinite(aligned["g_obs"]).sum())
     status = _domain_status(
-        domain.mask,
+        domain.area_px,
         len(points),
         n_radii_used=int(radii_info["n_radii_used"]),
         n_finite_l=n_finite_l,
@@ -750,6 +971,7 @@ def compute_rigorous_spatial_bundle(
     radii_px: Sequence[float] = DEFAULT_RIGOROUS_RADII_PX,
     simulation_count: int = 999,
     base_seed: int = 1337,
+    max_workers: int = 1,
 ) -> dict[str, Any]:
     resolved_um_per_px = float(um_per_px if um_per_px is not None else MICRONS_PER_PIXEL)
 
@@ -763,8 +985,8 @@ def compute_rigorous_spatial_bundle(
         max_ecc_um=max_ecc_um,
     )
 
-    results = [
-        analyze_rigorous_domain(
+    def analyze(domain: SpatialDomain) -> RigorousSpatialResult:
+        return analyze_rigorous_domain(
             domain,
             points_yx=rigorous_points_from_object_table(
                 object_table,
@@ -776,8 +998,14 @@ def compute_rigorous_spatial_bundle(
             radii_px=radii_px,
             simulation_count=simulation_count,
         )
-        for domain in domains
-    ]
+
+    # Each domain carries its own seed, so results do not depend on scheduling;
+    # executor.map keeps them in domain order.
+    if int(max_workers) > 1 and len(domains) > 1:
+        with ThreadPoolExecutor(max_workers=min(int(max_workers), len(domains))) as executor:
+            results = list(executor.map(analyze, domains))
+    else:
+        results = [analyze(domain) for domain in domains]
     summary = pd.DataFrame([result.summary_row for result in results])
     curves = pd.concat([result.curve_frame for result in results], ignore_index=True) if results else pd.DataFrame()
     global_row = summary[(summary["analysis_level"] == "global") & (summary["region_axis"] == "global")].head(1)
@@ -825,6 +1053,8 @@ def _plot_curve_frame(
     ylabel: str,
     title: str,
 ) -> Path:
+    import matplotlib.pyplot as plt
+
     destination = Path(destination)
     destination.parent.mkdir(parents=True, exist_ok=True)
     fig, ax = plt.subplots(figsize=(6, 4))
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -448,7 +449,11 @@ def _serialize_outcome_decision(
     }
 
 
-def _run_sample_statistics(sample_table: pd.DataFrame, requested_mode: str) -> tuple[pd.DataFrame, pd.DataFrame, dict[str, Any]]:
+def _run_sample_statistics(
+    sample_table: pd.DataFrame,
+    requested_mode: str,
+    race_optimizers: bool = False,
+) -> tuple[pd.DataFrame, pd.DataFrame, dict[str, Any]]:
     outcome = "cell_count"
     warnings_list: list[str] = []
     simple_frame = empty_simple_stats_frame()
@@ -469,7 +474,7 @@ def _run_sample_statistics(sample_table: pd.DataFrame, requested_mode: str) -> t
     if requested_mode == "mixed":
         if not eligible:
             raise RuntimeError(f"Sample mixed-effects was requested but is not eligible: {eligibility_reason}")
-        result = fit_sample_mixed_effects(sample_table, outcome=outcome)
+        result = fit_sample_mixed_effects(sample_table, outcome=outcome, race_optimizers=race_optimizers)
         return simple_frame, result.frame, _serialize_outcome_decision(
             analysis_level="sample",
             outcome=outcome,
@@ -481,7 +486,7 @@ def _run_sample_statistics(sample_table: pd.DataFrame, requested_mode: str) -> t
 
     if eligible:
         try:
-            result = fit_sample_mixed_effects(sample_table, outcome=outcome)
+            result = fit_sample_mixed_effects(sample_table, outcome=outcome, race_optimizers=race_optimizers)
             return simple_frame, result.frame, _serialize_outcome_decision(
                 analysis_level="sample",
                 outcome=outcome,
@@ -518,7 +523,11 @@ def _run_sample_statistics(sample_table: pd.DataFrame, requested_mode: str) -> t
     )
 
 
-def _run_region_statistics(region_table: pd.DataFrame, requested_mode: str) -> tuple[pd.DataFrame, pd.DataFrame, dict[str, Any]]:
+def _run_region_statistics(
+    region_table: pd.DataFrame,
+    requested_mode: str,
+    race_optimizers: bool = False,
+) -> tuple[pd.DataFrame, pd.DataFrame, dict[str, Any]]:
     outcome = "density_cells_per_mm2"
     warnings_list: list[str] = []
     simple_frame = empty_region_stats_frame()
@@ -549,7 +558,7 @@ def _run_region_statistics(region_table: pd.DataFrame, requested_mode: str) -> t
     if requested_mode == "mixed":
         if not eligible:
             raise RuntimeError(f"Region mixed-effects was requested but is not eligible: {eligibility_reason}")
-        result = fit_region_mixed_effects(region_table, outcome=outcome)
+        result = fit_region_mixed_effects(region_table, outcome=outcome, race_optimizers=race_optimizers)
         return simple_frame, result.frame, _serialize_outcome_decision(
             analysis_level="region",
             outcome=outcome,
@@ -561,7 +570,7 @@ def _run_region_statistics(region_table: pd.DataFrame, requested_mode: str) -> t
 
     if eligible:
         try:
-            result = fit_region_mixed_effects(region_table, outcome=outcome)
+            result = fit_region_mixed_effects(region_table, outcome=outcome, race_optimizers=race_optimizers)
             return simple_frame, result.frame, _serialize_outcome_decision(
                 analysis_level="region",
                 outcome=outcome,
@@ -603,13 +612,23 @@ def run_study_statistics(
     region_table: pd.DataFrame | None = None,
     *,
     requested_mode: str = "auto",
+    max_workers: int = 1,
+    race_optimizers: bool = False,
 ) -> StudyStatisticsResult:
     region_table = region_table if region_table is not None else pd.DataFrame()
     design_audit = build_design_audit(sample_table, region_table)
     design_audit_markdown = render_design_audit_markdown(design_audit)
 
-    study_stats, sample_mixed, sample_decision = _run_sample_statistics(sample_table, requested_mode)
-    region_stats, region_mixed, region_decision = _run_region_statistics(region_table, requested_mode)
+    if int(max_workers) > 1:
+        # Optimizers are pure-Python and hold the GIL, so the two levels fit in separate processes.
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            sample_future = executor.submit(_run_sample_statistics, sample_table, requested_mode, race_optimizers)
+            region_future = executor.submit(_run_region_statistics, region_table, requested_mode, race_optimizers)
+            study_stats, sample_mixed, sample_decision = sample_future.result()
+            region_stats, region_mixed, region_decision = region_future.result()
+    else:
+        study_stats, sample_mixed, sample_decision = _run_sample_statistics(sample_table, requested_mode, race_optimizers)
+        region_stats, region_mixed, region_decision = _run_region_statistics(region_table, requested_mode, race_optimizers)
 
     decision = {
         "requested_mode": requested_mode,
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import multiprocessing
 from dataclasses import dataclass
-from typing import Any
+from functools import partial
+from typing import Any, Callable
 import warnings
 
 import numpy as np
@@ -34,6 +36,9 @@ MIXED_COLUMNS = [
 ]
 
 
+MIXEDLM_OPTIMIZERS: tuple[str, ...] = ("lbfgs", "powell", "cg", "nm")
+
+
 def empty_mixed_frame() -> pd.DataFrame:
     return pd.DataFrame(columns=MIXED_COLUMNS)
 
@@ -111,26 +116,89 @@ def _finalize_mixed_result(
     return MixedModelResult(frame=out[MIXED_COLUMNS], meta=meta)
 
 
+def _warm_start_params(fit):
+    if fit is None or not np.isfinite(float(getattr(fit, "llf", np.nan))):
+        return None
+    if not np.isfinite(np.asarray(fit.params, dtype=float)).all():
+        return None
+    return fit.params_object
+
+
 def _fit_mixedlm_with_retries(model):
-    last_fit = None
+    # Each optimizer starts from the best likelihood reached so far instead of
+    # repeating the default OLS start that the previous optimizer already failed from.
+    best_fit = None
     errors: list[str] = []
-    for method in ("lbfgs", "powell", "cg", "nm"):
-        try:
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                fit = model.fit(reml=False, method=method, disp=False)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for method in MIXEDLM_OPTIMIZERS:
+            try:
+                fit = model.fit(reml=False, method=method, disp=False, start_params=_warm_start_params(best_fit))
+            except Exception as exc:
+                errors.append(f"{method}: {exc}")
+                continue
             if bool(getattr(fit, "converged", False)):
                 return fit
-            last_fit = fit
             errors.append(f"{method}: not converged")
-        except Exception as exc:
-            errors.append(f"{method}: {exc}")
-    if last_fit is not None:
-        return last_fit
+            if best_fit is None or float(fit.llf) > float(best_fit.llf) or not np.isfinite(float(best_fit.llf)):
+                best_fit = fit
+    if best_fit is not None:
+        return best_fit
+    raise RuntimeError("Mixed-effects fit failed across all optimizers: " + "; ".join(errors))
+
+
+def _fit_and_finalize_with_optimizer(
+    build_model: Callable[[], Any],
+    method: str,
+    finalize_kwargs: dict[str, Any],
+) -> MixedModelResult:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        fit = build_model().fit(reml=False, method=method, disp=False)
+    return _finalize_mixed_result(fit, **finalize_kwargs)
+
+
+def _race_mixedlm_optimizers(build_model: Callable[[], Any], finalize_kwargs: dict[str, Any]) -> MixedModelResult:
+    """Run every optimizer in its own process and keep the first usable fit in preference order.
+
+    Fit objects hold patsy design state that does not pickle, so each worker
+    returns the finalized coefficient table instead. Waiting in
+    ``MIXEDLM_OPTIMIZERS`` order, not completion order, keeps the selected fit
+    deterministic; the pool is terminated as soon as one succeeds so slower
+    optimizers do not keep running.
+    """
+    errors: list[str] = []
+    with multiprocessing.Pool(processes=len(MIXEDLM_OPTIMIZERS)) as pool:
+        pending = [
+            (method, pool.apply_async(_fit_and_finalize_with_optimizer, (build_model, method, finalize_kwargs)))
+            for method in MIXEDLM_OPTIMIZERS
+        ]
+        for method, async_result in pending:
+            try:
+                return async_result.get()
+            except Exception as exc:
+                errors.append(f"{method}: {exc}")
     raise RuntimeError("Mixed-effects fit failed across all optimizers: " + "; ".join(errors))
 
 
-def fit_sample_mixed_effects(sample_table: pd.DataFrame, outcome: str = "cell_count") -> MixedModelResult:
+def _fit_mixed_candidate(
+    build_model: Callable[[], Any],
+    *,
+    race_optimizers: bool,
+    **finalize_kwargs: Any,
+) -> MixedModelResult:
+    if race_optimizers:
+        return _race_mixedlm_optimizers(build_model, finalize_kwargs)
+    fit = _fit_mixedlm_with_retries(build_model())
+    return _finalize_mixed_result(fit, **finalize_kwargs)
+
+
+def fit_sample_mixed_effects(
+    sample_table: pd.DataFrame,
+    outcome: str = "cell_count",
+    *,
+    race_optimizers: bool = False,
+) -> MixedModelResult:
     try:
         import statsmodels.formula.api as smf
     except ImportError as exc:
@@ -167,16 +235,17 @@ def fit_sample_mixed_effects(sample_table: pd.DataFrame, outcome: str = "cell_co
     errors: list[str] = []
     for vc_formula, vc_used in candidate_vc:
         try:
-            model = smf.mixedlm(
+            build_model = partial(
+                smf.mixedlm,
                 formula=formula,
                 data=frame,
                 groups=frame[grouping_factor],
                 re_formula="1",
                 vc_formula=vc_formula or None,
             )
-            fit = _fit_mixedlm_with_retries(model)
-            return _finalize_mixed_result(
-                fit,
+            return _fit_mixed_candidate(
+                build_model,
+                race_optimizers=race_optimizers,
                 frame=frame,
                 formula=formula,
                 grouping_factor=grouping_factor,
@@ -189,7 +258,12 @@ def fit_sample_mixed_effects(sample_table: pd.DataFrame, outcome: str = "cell_co
     raise RuntimeError("Sample mixed-effects fit failed: " + "; ".join(errors))
 
 
-def fit_region_mixed_effects(region_table: pd.DataFrame, outcome: str = "density_cells_per_mm2") -> MixedModelResult:
+def fit_region_mixed_effects(
+    region_table: pd.DataFrame,
+    outcome: str = "density_cells_per_mm2",
+    *,
+    race_optimizers: bool = False,
+) -> MixedModelResult:
     try:
         import statsmodels.formula.api as smf
     except ImportError as exc:
@@ -241,16 +315,17 @@ def fit_region_mixed_effects(region_table: pd.DataFrame, outcome: str = "density
             continue
         seen.add(signature)
         try:
-            model = smf.mixedlm(
+            build_model = partial(
+                smf.mixedlm,
                 formula=formula,
                 data=frame,
                 groups=frame[grouping_factor],
                 re_formula="1",
                 vc_formula=vc_formula or None,
             )
-            fit = _fit_mixedlm_with_retries(model)
-            return _finalize_mixed_result(
-                fit,
+            return _fit_mixed_candidate(
+                build_model,
+                race_optimizers=race_optimizers,
                 frame=frame,
                 formula=formula,
                 grouping_factor=grouping_factor,
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import shutil
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from src.context import RunContext
+from src.jsonl_index import JsonlIndex, json_ready
+
+
+SAMPLE_STORE_DIRNAME = "sample_store"
+SAMPLE_STORE_VERSION = 1
+_INDEX_FILENAME = "index.jsonl"
+
+
+def _is_json_ready(value: Any) -> bool:
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _has_parquet_engine() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None or importlib.util.find_spec("fastparquet") is not None
+
+
+def _write_frame(frame: pd.DataFrame, stem: Path) -> str:
+    if _has_parquet_engine():
+        try:
+            frame.to_parquet(stem.with_suffix(".parquet"), index=False)
+            return stem.with_suffix(".parquet").name
+        except Exception:
+            pass
+    frame.to_csv(stem.with_suffix(".csv"), index=False)
+    return stem.with_suffix(".csv").name
+
+
+def _read_frame(path: Path) -> pd.DataFrame:
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def image_fingerprint(path: str | Path, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of an image's bytes; directory stores (``.zarr``) hash every file in path order."""
+    path = Path(path)
+    digest = hashlib.sha256()
+    if path.is_dir():
+        files = sorted(item for item in path.rglob("*") if item.is_file())
+    else:
+        files = [path]
+    for item in files:
+        if path.is_dir():
+            digest.update(item.relative_to(path).as_posix().encode("utf-8"))
+        with item.open("rb") as handle:
+            while True:
+                block = handle.read(chunk_size)
+                if not block:
+                    break
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def sample_config_hash(payload: dict[str, Any]) -> str:
+    """Hash of everything besides the pixels that determines a sample's outputs."""
+    body = {"store_version": SAMPLE_STORE_VERSION, **payload}
+    return hashlib.sha256(json.dumps(body, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def sample_result_key(fingerprint: str, config_hash: str) -> str:
+    return hashlib.sha256(json.dumps([fingerprint, config_hash]).encode("utf-8")).hexdigest()
+
+
+class SampleResultStore(JsonlIndex):
+    """Per-sample study results keyed by image fingerprint and resolved config hash.
+
+    Each finished sample gets a directory under ``entries/`` holding its
+    summary row, metrics, artifacts, region and object tables and report
+    contributions. The entry only becomes visible once its line is appended
+    to ``index.jsonl``, so a sample interrupted mid-write is recomputed; a
+    line truncated by a crash is ignored on reload.
+    """
+
+    def __init__(self, root: str | Path, *, load_existing: bool = True):
+        self.root = Path(root)
+        super().__init__(self.root / _INDEX_FILENAME, "sample_key", load_existing=load_existing)
+
+    def _entry_dir(self, sample_key: str) -> Path:
+        return self.root / "entries" / sample_key
+
+    def put(
+        self,
+        sample_key: str,
+        ctx: RunContext,
+        *,
+        sample_id: str,
+        fingerprint: str,
+        config_hash: str,
+        report: dict[str, list[Any]] | None = None,
+        keep_gray: bool = False,
+    ) -> None:
+        entry_dir = self._entry_dir(sample_key)
+        if entry_dir.exists():
+            shutil.rmtree(entry_dir)
+        entry_dir.mkdir(parents=True)
+
+        tables: dict[str, str] = {}
+        if ctx.object_table is not None:
+            tables["object_table"] = _write_frame(ctx.object_table, entry_dir / "objects")
+        if ctx.region_table is not None:
+            tables["region_table"] = _write_frame(ctx.region_table, entry_dir / "regions")
+
+        state: dict[str, Any] = {}
+        for name, value in ctx.state.items():
+            if not isinstance(value, dict):
+                continue
+            kept: dict[str, Any] = {}
+            for field_name, field_value in value.items():
+                if isinstance(field_value, pd.DataFrame):
+                    tables[f"state:{name}:{field_name}"] = _write_frame(field_value, entry_dir / f"state_{name}_{field_name}")
+                elif _is_json_ready(field_value):
+                    kept[field_name] = field_value
+            if kept:
+                state[name] = kept
+
+        has_gray = bool(keep_gray and ctx.gray is not None)
+        if has_gray:
+            np.save(entry_dir / "gray.npy", np.asarray(ctx.gray), allow_pickle=False)
+
+        payload = {
+            "path": str(ctx.path),
+            "meta": ctx.meta,
+            "summary_row": ctx.summary_row,
+            "metrics": ctx.metrics,
+            "warnings": list(ctx.warnings),
+            "artifacts": {key: str(value) for key, value in ctx.artifacts.items()},
+            "seg_info": {key: value for key, value in ctx.seg_info.items() if _is_json_ready(value)},
+            "state": state,
+            "tables": tables,
+            "report": report or {},
+        }
+        (entry_dir / "result.json").write_text(json.dumps(payload, default=json_ready), encoding="utf-8")
+
+        entry = {
+            "sample_key": sample_key,
+            "sample_id": sample_id,
+            "image_fingerprint": fingerprint,
+            "config_hash": config_hash,
+            "has_gray": has_gray,
+        }
+        self.add(entry)
+
+    def load(self, sample_key: str, *, require_gray: bool = False) -> tuple[RunContext, dict[str, list[Any]]] | None:
+        """Rebuild a slim ``RunContext`` (no pixel data besides an optional gray image)."""
+        entry = self._entries.get(sample_key)
+        if entry is None or (require_gray and not entry.get("has_gray")):
+            return None
+        entry_dir = self._entry_dir(sample_key)
+        try:
+            payload = json.loads((entry_dir / "result.json").read_text(encoding="utf-8"))
+            tables = {name: _read_frame(entry_dir / filename) for name, filename in payload["tables"].items()}
+            gray = np.load(entry_dir / "gray.npy", allow_pickle=False) if entry.get("has_gray") else None
+        except (OSError, ValueError, KeyError):
+            return None
+
+        state: dict[str, Any] = {name: dict(value) for name, value in payload["state"].items()}
+        for name, frame in tables.items():
+            if name.startswith("state:"):
+                _, state_name, field_name = name.split(":", 2)
+                state.setdefault(state_name, {})[field_name] = frame
+
+        ctx = RunContext(
+            path=Path(payload["path"]),
+            image=np.empty((0, 0), dtype=np.uint8),
+            meta=payload["meta"],
+            gray=gray,
+            object_table=tables.get("object_table"),
+            region_table=tables.get("region_table"),
+            artifacts={key: Path(value) for key, value in payload["artifacts"].items()},
+            metrics=payload["metrics"],
+            warnings=list(payload["warnings"]),
+            seg_info=payload["seg_info"],
+            summary_row=payload["summary_row"],
+            state=state,
+        )
+        report = {key: [tuple(item) if isinstance(item, list) else item for item in value] for key, value in payload["report"].items()}
+        return ctx, report
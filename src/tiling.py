@@ -5,6 +5,7 @@ from typing import Any
 
 import numpy as np
 
+from src.dtypes import INTENSITY_DTYPE, LABEL_DTYPE, as_labels, label_dtype_for
 from src.uncertainty import segment_with_tta
 
 
@@ -69,9 +70,12 @@ def _segment_tile(
     *,
     use_tta: bool,
     transforms: list[str] | None,
+    preprocessed: bool = False,
 ) -> tuple[np.ndarray, dict[str, Any]]:
     if use_tta:
-        return segment_with_tta(segmenter, tile, transforms=transforms)
+        return segment_with_tta(segmenter, tile, transforms=transforms, preprocessed=preprocessed)
+    if preprocessed:
+        return segmenter.segment(tile, preprocessed=True)
     return segmenter.segment(tile)
 
 
@@ -150,21 +154,25 @@ def _paint_core_with_roots(canvas: np.ndarray, record: TileRecord, uf: UnionFind
         (window.core_y0 - window.y0):(window.core_y1 - window.y0),
         (window.core_x0 - window.x0):(window.core_x1 - window.x0),
     ]
+    local_ids = [int(value) for value in np.unique(core) if int(value) != 0]
+    if not local_ids:
+        return
+    roots = [uf.find(record.local_to_global[local_id]) for local_id in local_ids]
+    lut = np.zeros(local_ids[-1] + 1, dtype=label_dtype_for(max(roots)))
+    lut[local_ids] = roots
     target = canvas[window.core_y0:window.core_y1, window.core_x0:window.core_x1]
-    for local_id in (int(value) for value in np.unique(core) if int(value) != 0):
-        root = uf.find(record.local_to_global[local_id])
-        target[core == local_id] = root
+    foreground = core > 0
+    target[foreground] = lut[core[foreground]]
 
 
 def _relabel_sequential(labels: np.ndarray) -> tuple[np.ndarray, dict[int, int]]:
-    out = np.zeros_like(labels, dtype=np.uint32)
-    mapping: dict[int, int] = {}
-    next_id = 1
-    for old_id in (int(value) for value in np.unique(labels) if int(value) != 0):
-        mapping[old_id] = next_id
-        out[labels == old_id] = next_id
-        next_id += 1
-    return out, mapping
+    old_ids = [int(value) for value in np.unique(labels) if int(value) != 0]
+    mapping = {old_id: new_id for new_id, old_id in enumerate(old_ids, start=1)}
+    if not old_ids:
+        return np.zeros_like(labels, dtype=LABEL_DTYPE), mapping
+    lut = np.zeros(old_ids[-1] + 1, dtype=LABEL_DTYPE)
+    lut[old_ids] = np.arange(1, len(old_ids) + 1, dtype=LABEL_DTYPE)
+    return lut[labels], mapping
 
 
 def segment_tiled(
@@ -175,9 +183,10 @@ def segment_tiled(
     overlap: int = 128,
     use_tta: bool = False,
     transforms: list[str] | None = None,
+    preprocessed: bool = False,
 ) -> tuple[np.ndarray, dict[str, Any]]:
-    canvas = np.zeros(image.shape[:2], dtype=np.uint32)
-    fg_probability = np.zeros(image.shape[:2], dtype=np.float32) if use_tta else None
+    canvas = np.zeros(image.shape[:2], dtype=LABEL_DTYPE)
+    fg_probability = np.zeros(image.shape[:2], dtype=INTENSITY_DTYPE) if use_tta else None
     first_info: dict[str, Any] = {}
     tile_records: list[TileRecord] = []
     next_global_id = 1
@@ -185,17 +194,19 @@ def segment_tiled(
 
     for window in generate_windows(image.shape[:2], tile_size=tile_size, overlap=overlap):
         tile = image[window.y0:window.y1, window.x0:window.x1]
-        labels, info = _segment_tile(segmenter, tile, use_tta=use_tta, transforms=transforms)
+        labels, info = _segment_tile(segmenter, tile, use_tta=use_tta, transforms=transforms, preprocessed=preprocessed)
         if not first_info:
             first_info = dict(info)
 
         local_to_global, next_global_id = _next_global_mapping(labels, next_global_id)
         for global_id in local_to_global.values():
             uf.find(global_id)
-        tile_records.append(TileRecord(window=window, labels=np.asarray(labels, dtype=np.uint32), local_to_global=local_to_global))
+        tile_records.append(TileRecord(window=window, labels=as_labels(labels), local_to_global=local_to_global))
 
-        if fg_probability is not None and info.get("foreground_probability") is not None:
-            tile_prob = np.asarray(info["foreground_probability"], dtype=np.float32)
+        if info.get("foreground_probability") is not None:
+            if fg_probability is None:
+                fg_probability = np.zeros(image.shape[:2], dtype=INTENSITY_DTYPE)
+            tile_prob = np.asarray(info["foreground_probability"], dtype=INTENSITY_DTYPE)
             fg_probability[window.core_y0:window.core_y1, window.core_x0:window.core_x1] = tile_prob[
                 (window.core_y0 - window.y0):(window.core_y1 - window.y0),
                 (window.core_x0 - window.x0):(window.core_x1 - window.x0),
@@ -224,6 +235,8 @@ def segment_tiled(
 
     stitched_canvas, root_mapping = _relabel_sequential(canvas)
     result_info = dict(first_info)
+    # A tile's own probability map never matches the stitched canvas.
+    result_info.pop("foreground_probability", None)
     result_info["tiling"] = True
     result_info["tile_count"] = len(tile_records)
     result_info["tile_size"] = int(tile_size)
@@ -235,4 +248,4 @@ def segment_tiled(
     result_info["stitched_object_count"] = int(len(root_mapping))
     if fg_probability is not None:
         result_info["foreground_probability"] = fg_probability
-    return stitched_canvas.astype(np.uint32), result_info
+    return stitched_canvas, result_info
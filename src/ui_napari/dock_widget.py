@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from dataclasses import replace
+from datetime import datetime
 from pathlib import Path
 
 import numpy as np
+from napari.qt.threading import thread_worker
 from qtpy.QtWidgets import (
     QCheckBox,
     QComboBox,
@@ -18,22 +21,62 @@ from qtpy.QtWidgets import (
 )
 
 from src.edits import default_edit_log_path, save_edit_log
-from src.run_service import RuntimeOptions, build_runtime, export_context, run_array, summarize_context
+from src.run_service import (
+    RuntimeOptions,
+    build_runtime,
+    export_context,
+    iter_run_array,
+    runtime_options_key,
+    summarize_context,
+)
 from src.ui_napari.helpers import (
     format_xy_text,
+    incremental_layer_payload,
     landmarks_from_points,
     parse_optional_float,
     parse_optional_int,
     parse_xy_text,
+    stage_status_text,
 )
 
 
+@thread_worker
+def _pipeline_worker(
+    options: RuntimeOptions,
+    cached_runtime,
+    cached_key: str | None,
+    image: np.ndarray,
+    source_path: str,
+    meta: dict,
+):
+    # Runs off the Qt thread. Yields status text or per-stage layer snapshots;
+    # quitting the worker abandons the run at the next stage boundary.
+    options_key = runtime_options_key(options)
+    if cached_runtime is not None and cached_key == options_key:
+        runtime = replace(cached_runtime, created_at=datetime.now())
+    else:
+        yield "Building runtime..."
+        runtime = build_runtime(options)
+
+    shown: set[str] = set()
+    stages = iter_run_array(runtime, image=image, source_path=source_path, meta=meta)
+    while True:
+        try:
+            progress = next(stages)
+        except StopIteration as finished:
+            return runtime, options_key, finished.value
+        yield stage_status_text(progress.index, progress.total, progress.stage), incremental_layer_payload(progress.ctx, shown)
+
+
 class RGCCounterDockWidget(QWidget):
     def __init__(self, napari_viewer):
         super().__init__()
         self.viewer = napari_viewer
         self._last_ctx = None
         self._last_runtime = None
+        self._last_runtime_key: str | None = None
+        self._worker = None
+        self._running_layer_name: str | None = None
         self._pending_edits: list[dict[str, object]] = []
 
         self.setWindowTitle("retinal-phenotyper")
@@ -169,9 +212,13 @@ class RGCCounterDockWidget(QWidget):
         button_row = QHBoxLayout()
         self.run_button = QPushButton("Run")
         self.run_button.clicked.connect(self.run_pipeline)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_pipeline)
         self.export_button = QPushButton("Export")
         self.export_button.clicked.connect(self.export_latest_run)
         button_row.addWidget(self.run_button)
+        button_row.addWidget(self.cancel_button)
         button_row.addWidget(self.export_button)
         root.addLayout(button_row)
 
@@ -398,6 +445,10 @@ class RGCCounterDockWidget(QWidget):
             self._upsert_points_layer(f"{image_layer_name} [RGC centroids]", points, features=features)
 
     def run_pipeline(self) -> None:
+        if self._worker is not None:
+            self.status_label.setText("A run is already in progress.")
+            return
+
         image_layer_name = self.image_layer_combo.currentText().strip()
         if not image_layer_name:
             self.status_label.setText("Choose an image layer first.")
@@ -410,26 +461,73 @@ class RGCCounterDockWidget(QWidget):
 
         try:
             options = self._collect_options()
-            runtime = build_runtime(options)
-            ctx = run_array(
-                runtime,
-                image=np.asarray(image_layer.data),
-                source_path=self._get_source_path(image_layer),
-                meta={"reader": "napari", "layer_name": image_layer_name},
-            )
         except Exception as exc:
             self.status_label.setText(f"Run failed: {exc}")
             self.summary.setPlainText(str(exc))
             return
 
+        worker = _pipeline_worker(
+            options,
+            self._last_runtime,
+            self._last_runtime_key,
+            np.asarray(image_layer.data),
+            self._get_source_path(image_layer),
+            {"reader": "napari", "layer_name": image_layer_name},
+        )
+        worker.yielded.connect(self._on_run_progress)
+        worker.returned.connect(self._on_run_returned)
+        worker.errored.connect(self._on_run_errored)
+        worker.aborted.connect(self._on_run_aborted)
+        worker.finished.connect(self._on_run_finished)
+        self._worker = worker
+        self._running_layer_name = image_layer_name
+        self.run_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.status_label.setText("Starting run...")
+        worker.start()
+
+    def cancel_pipeline(self) -> None:
+        if self._worker is None:
+            return
+        self.status_label.setText("Cancelling after the current stage...")
+        self.cancel_button.setEnabled(False)
+        self._worker.quit()
+
+    def _on_run_progress(self, update) -> None:
+        if isinstance(update, str):
+            self.status_label.setText(update)
+            return
+        message, payload = update
+        self.status_label.setText(message)
+        layer_name = self._running_layer_name
+        if "labels" in payload:
+            self._upsert_labels_layer(f"{layer_name} [RGC labels]", payload["labels"], opacity=0.55)
+        if "points" in payload:
+            self._upsert_points_layer(f"{layer_name} [RGC centroids]", payload["points"], features=payload["features"])
+
+    def _on_run_returned(self, result) -> None:
+        runtime, runtime_key, ctx = result
         self._last_runtime = runtime
+        self._last_runtime_key = runtime_key
         self._last_ctx = ctx
         if not self.edit_log_path_edit.text().strip():
             self.edit_log_path_edit.setText(str(default_edit_log_path(ctx.path)))
-        self._display_context(image_layer_name, ctx)
+        self._display_context(self._running_layer_name, ctx)
         self.status_label.setText("Run completed.")
         self.summary.setPlainText(summarize_context(ctx))
 
+    def _on_run_errored(self, exc: Exception) -> None:
+        self.status_label.setText(f"Run failed: {exc}")
+        self.summary.setPlainText(str(exc))
+
+    def _on_run_aborted(self) -> None:
+        self.status_label.setText("Run cancelled.")
+
+    def _on_run_finished(self) -> None:
+        self._worker = None
+        self.run_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+
     def export_latest_run(self) -> None:
         if self._last_ctx is None or self._last_runtime is None:
             self.status_label.setText("Run an image before exporting.")
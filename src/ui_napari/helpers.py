@@ -45,3 +45,25 @@ def landmarks_from_points(points: Any) -> dict[str, tuple[float, float]]:
         "onh_xy": (float(onh_x), float(onh_y)),
         "dorsal_xy": (float(dorsal_x), float(dorsal_y)),
     }
+
+
+def stage_status_text(index: int, total: int, stage: str) -> str:
+    return f"Finished {stage} ({index + 1}/{total})..."
+
+
+def incremental_layer_payload(ctx: Any, shown: set[str]) -> dict[str, Any]:
+    """Snapshot layer data that became available since the last stage.
+
+    Runs on the worker thread, so arrays are copied before the next stage can
+    modify them. ``shown`` records which layers were already sent.
+    """
+    payload: dict[str, Any] = {}
+    if "labels" not in shown and getattr(ctx, "labels", None) is not None:
+        payload["labels"] = np.array(ctx.labels, copy=True)
+        shown.add("labels")
+    object_table = getattr(ctx, "object_table", None)
+    if "points" not in shown and object_table is not None and not object_table.empty:
+        payload["points"] = object_table[["centroid_y_px", "centroid_x_px"]].to_numpy(dtype=float)
+        payload["features"] = object_table.copy()
+        shown.add("points")
+    return payload
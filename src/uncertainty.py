@@ -5,6 +5,8 @@ from typing import List, Tuple, Dict, Any, Callable
 import numpy as np
 from scipy.ndimage import rotate
 
+from src.dtypes import INTENSITY_DTYPE, compact_labels
+
 
 Transform = Callable[[np.ndarray], np.ndarray]
 InverseTransform = Callable[[np.ndarray], np.ndarray]
@@ -40,31 +42,45 @@ TRANSFORMS = {
     "rot270": (_rot270, _inv_rot270),
 }
 
-def _label_to_binary(label: np.ndarray) -> np.ndarray:
-    """Foreground/background binary image."""
-    return (label > 0).astype(np.uint8)
+def _vote_counter(shape: Tuple[int, ...], n_views: int) -> np.ndarray:
+    return np.zeros(shape, dtype=np.uint8 if n_views <= np.iinfo(np.uint8).max else np.uint16)
 
-def _pixel_vote(aggregated_bins: List[np.ndarray], threshold: float = 0.5) -> np.ndarray:
-    """Combine foreground votes and return a clean binary mask."""
-    stack = np.stack(aggregated_bins, axis=0).astype(np.float32)
-    prob = stack.mean(axis=0)
+def _add_vote(votes: np.ndarray, label: np.ndarray) -> None:
+    """Count one view's foreground in place."""
+    np.add(votes, label > 0, out=votes, casting="unsafe")
+
+def _votes_to_probability(votes: np.ndarray, n_views: int, threshold: float = 0.5) -> Tuple[np.ndarray, np.ndarray]:
+    prob = votes.astype(INTENSITY_DTYPE)
+    prob /= INTENSITY_DTYPE.type(n_views)
     bin_mask = (prob >= threshold).astype(np.uint8)
     return bin_mask, prob
 
+def _pixel_vote(aggregated_bins: List[np.ndarray], threshold: float = 0.5) -> np.ndarray:
+    """Combine foreground votes and return a clean binary mask."""
+    votes = _vote_counter(aggregated_bins[0].shape, len(aggregated_bins))
+    for binary in aggregated_bins:
+        _add_vote(votes, binary)
+    return _votes_to_probability(votes, len(aggregated_bins), threshold)
+
 def _binary_to_instances(bin_mask: np.ndarray) -> np.ndarray:
     """Connected components to instances."""
     from scipy.ndimage import label
-    lbl, _ = label(bin_mask)
-    return lbl.astype(np.uint16)
+    lbl, n_objects = label(bin_mask)
+    return compact_labels(lbl, max_label=int(n_objects))
 
 def segment_with_tta(segmenter,
                      image: np.ndarray,
                      transforms: List[str] | None = None,
-                     combine: str = "pixel_vote") -> Tuple[np.ndarray, Dict[str, Any]]:
+                     combine: str = "pixel_vote",
+                     *,
+                     preprocessed: bool = False) -> Tuple[np.ndarray, Dict[str, Any]]:
     """
     Run segmentation with test-time augmentations and combine results.
     combine = 'pixel_vote' uses pixel-level majority voting across transforms.
+    preprocessed = True passes each view on as already-preprocessed input, so
+    all views share the whole image's normalization.
     """
+    segment_kwargs = {"preprocessed": True} if preprocessed else {}
     transforms = transforms or []
     fwd_inv = [(lambda x: x, lambda x: x)]  # identity
     for tname in transforms:
@@ -73,19 +89,20 @@ def segment_with_tta(segmenter,
         fwd_inv.append(TRANSFORMS[tname])
 
     # Segment original
-    masks0, info0 = segmenter.segment(image)
-    agg_bin = [_label_to_binary(masks0)]
+    masks0, info0 = segmenter.segment(image, **segment_kwargs)
+    # Votes are counted as each view finishes instead of stacking per-view masks.
+    votes = _vote_counter(masks0.shape, len(fwd_inv))
+    _add_vote(votes, masks0)
 
     # Apply TTA
     for fwd, inv in fwd_inv[1:]:
         img_t = fwd(image)
-        masks_t, _ = segmenter.segment(img_t)
-        masks_back = inv(masks_t)
-        agg_bin.append(_label_to_binary(masks_back))
+        masks_t, _ = segmenter.segment(img_t, **segment_kwargs)
+        _add_vote(votes, inv(masks_t))
 
     # Combine
     if combine == "pixel_vote":
-        bin_mask, prob = _pixel_vote(agg_bin, threshold=0.5)
+        bin_mask, prob = _votes_to_probability(votes, len(fwd_inv), threshold=0.5)
         inst = _binary_to_instances(bin_mask)
         info = dict(info0)
         info["tta"] = True
@@ -4,12 +4,13 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import tifffile
 from scipy.optimize import linear_sum_assignment
-from scipy.spatial.distance import cdist
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
 
 
 def count_labels(path: str | Path) -> int:
@@ -39,12 +40,157 @@ class PointMatchResult:
     unmatched_manual_indices: np.ndarray
 
 
+def _matching_metrics_from_counts(
+    *,
+    manual_count: int,
+    predicted_count: int,
+    true_positive: int,
+    mean_match_distance_px: float,
+    tolerance_px: float,
+) -> dict[str, float]:
+    if manual_count == 0 and predicted_count == 0:
+        return {
+            "manual_count": 0.0,
+            "predicted_count": 0.0,
+            "true_positive": 0.0,
+            "false_positive": 0.0,
+            "false_negative": 0.0,
+            "precision": 1.0,
+            "recall": 1.0,
+            "f1": 1.0,
+            "count_bias": 0.0,
+            "count_mae": 0.0,
+            "match_tolerance_px": tolerance_px,
+            "mean_match_distance_px": float("nan"),
+        }
+
+    false_positive = int(max(predicted_count - true_positive, 0))
+    false_negative = int(max(manual_count - true_positive, 0))
+    precision = float(true_positive / (true_positive + false_positive)) if (true_positive + false_positive) > 0 else 0.0
+    recall = float(true_positive / (true_positive + false_negative)) if (true_positive + false_negative) > 0 else 0.0
+    f1 = float((2.0 * precision * recall) / (precision + recall)) if (precision + recall) > 0 else 0.0
+    count_bias = float(predicted_count - manual_count)
+
+    return {
+        "manual_count": float(manual_count),
+        "predicted_count": float(predicted_count),
+        "true_positive": float(true_positive),
+        "false_positive": float(false_positive),
+        "false_negative": float(false_negative),
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "count_bias": count_bias,
+        "count_mae": float(abs(count_bias)),
+        "match_tolerance_px": tolerance_px,
+        "mean_match_distance_px": float(mean_match_distance_px),
+    }
+
+
+def point_matching_metrics(
+    manual_points_yx: np.ndarray,
+    predicted_points_yx: np.ndarray,
+    *,
+    tolerance_px: float = 8.0,
+) -> dict[str, float]:
+    manual = np.asarray(manual_points_yx, dtype=float).reshape(-1, 2)
+    predicted = np.asarray(predicted_points_yx, dtype=float).reshape(-1, 2)
+    tolerance = float(tolerance_px)
+
+    if len(manual) == 0 and len(predicted) == 0:
+        return _matching_metrics_from_counts(
+            manual_count=0,
+            predicted_count=0,
+            true_positive=0,
+            mean_match_distance_px=float("nan"),
+            tolerance_px=tolerance,
+        )
+
+    matches = match_points(manual, predicted, tolerance_px=tolerance)
+    return _matching_metrics_from_counts(
+        manual_count=len(manual),
+        predicted_count=len(predicted),
+        true_positive=int(len(matches.matched_distances_px)),
+        mean_match_distance_px=float(np.mean(matches.matched_distances_px)) if len(matches.matched_distances_px) else float("nan"),
+        tolerance_px=tolerance,
+    )
+
+
+@dataclass
+class _MatchComponent:
+    edge_indices: np.ndarray
+    max_distance: float
+    matched_edges: np.ndarray
+
+    @property
+    def true_positive(self) -> int:
+        return int(len(self.matched_edges))
+
+
+def _solve_match_components(
+    edge_indices: np.ndarray,
+    *,
+    pred_idx: np.ndarray,
+    manual_idx: np.ndarray,
+    distances: np.ndarray,
+) -> list[_MatchComponent]:
+    """Split candidate edges into connected components and match each one optimally."""
+    if len(edge_indices) == 0:
+        return []
+    local_pred, pred_inverse = np.unique(pred_idx[edge_indices], return_inverse=True)
+    local_manual, manual_inverse = np.unique(manual_idx[edge_indices], return_inverse=True)
+    n_pred = len(local_pred)
+    n_nodes = n_pred + len(local_manual)
+    graph = coo_matrix(
+        (np.ones(len(edge_indices), dtype=np.int8), (pred_inverse, n_pred + manual_inverse)),
+        shape=(n_nodes, n_nodes),
+    )
+    _, node_labels = connected_components(graph, directed=False)
+    edge_labels = node_labels[pred_inverse]
+
+    components: list[_MatchComponent] = []
+    order = np.argsort(edge_labels, kind="stable")
+    boundaries = np.flatnonzero(np.diff(edge_labels[order])) + 1
+    for group in np.split(order, boundaries):
+        component_edges = edge_indices[group]
+        component_distances = distances[component_edges]
+        rows, row_index = np.unique(pred_inverse[group], return_inverse=True)
+        cols, col_index = np.unique(manual_inverse[group], return_inverse=True)
+        if len(rows) == 1 or len(cols) == 1:
+            matched = component_edges[[int(np.argmin(component_distances))]]
+        else:
+            # Missing pairs cost more than any complete within-tolerance matching, so the
+            # assignment maximizes the number of matches first and total distance second.
+            penalty = float(component_distances.max() + 1.0) * float(min(len(rows), len(cols)) + 1)
+            cost = np.full((len(rows), len(cols)), penalty, dtype=float)
+            cost[row_index, col_index] = component_distances
+            edge_lookup = np.full((len(rows), len(cols)), -1, dtype=int)
+            edge_lookup[row_index, col_index] = component_edges
+            assigned_rows, assigned_cols = linear_sum_assignment(cost)
+            keep = cost[assigned_rows, assigned_cols] < penalty
+            matched = edge_lookup[assigned_rows[keep], assigned_cols[keep]]
+        components.append(
+            _MatchComponent(
+                edge_indices=component_edges,
+                max_distance=float(component_distances.max()),
+                matched_edges=matched,
+            )
+        )
+    return components
+
+
+def _candidate_pairs(predicted: np.ndarray, manual: np.ndarray, max_distance: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    pairs = cKDTree(predicted).sparse_distance_matrix(cKDTree(manual), float(max_distance), output_type="ndarray")
+    return pairs["i"].astype(int), pairs["j"].astype(int), pairs["v"].astype(float)
+
+
 def match_points(
     manual_points_yx: np.ndarray,
     predicted_points_yx: np.ndarray,
     *,
     tolerance_px: float = 8.0,
 ) -> PointMatchResult:
+    """One-to-one matching with the most pairs within ``tolerance_px``, then the smallest total distance."""
     manual = np.asarray(manual_points_yx, dtype=float).reshape(-1, 2)
     predicted = np.asarray(predicted_points_yx, dtype=float).reshape(-1, 2)
     tolerance = float(tolerance_px)
@@ -58,22 +204,19 @@ def match_points(
             unmatched_manual_indices=np.arange(len(manual), dtype=int),
         )
 
-    distances = cdist(predicted, manual, metric="euclidean")
-    row_ind, col_ind = linear_sum_assignment(distances)
-
-    matched_pred: list[int] = []
-    matched_manual: list[int] = []
-    matched_distances: list[float] = []
-    for pred_idx, manual_idx in zip(row_ind, col_ind):
-        distance = float(distances[pred_idx, manual_idx])
-        if distance <= tolerance:
-            matched_pred.append(int(pred_idx))
-            matched_manual.append(int(manual_idx))
-            matched_distances.append(distance)
-
-    matched_pred_arr = np.asarray(matched_pred, dtype=int)
-    matched_manual_arr = np.asarray(matched_manual, dtype=int)
-    matched_distances_arr = np.asarray(matched_distances, dtype=float)
+    pred_idx, manual_idx, distances = _candidate_pairs(predicted, manual, tolerance)
+    components = _solve_match_components(
+        np.arange(len(distances), dtype=int),
+        pred_idx=pred_idx,
+        manual_idx=manual_idx,
+        distances=distances,
+    )
+    matched_edges = np.concatenate([component.matched_edges for component in components]) if components else np.empty(0, dtype=int)
+    matched_edges = matched_edges[np.argsort(pred_idx[matched_edges], kind="stable")]
+
+    matched_pred_arr = pred_idx[matched_edges].astype(int)
+    matched_manual_arr = manual_idx[matched_edges].astype(int)
+    matched_distances_arr = distances[matched_edges].astype(float)
     unmatched_pred = np.setdiff1d(np.arange(len(predicted), dtype=int), matched_pred_arr, assume_unique=False)
     unmatched_manual = np.setdiff1d(np.arange(len(manual), dtype=int), matched_manual_arr, assume_unique=False)
 
@@ -86,55 +229,66 @@ def match_points(
     )
 
 
-def point_matching_metrics(
+def point_matching_sweep(
     manual_points_yx: np.ndarray,
     predicted_points_yx: np.ndarray,
     *,
-    tolerance_px: float = 8.0,
-) -> dict[str, float]:
+    tolerances_px: tuple[float, ...] | list[float],
+) -> pd.DataFrame:
+    """Point-matching metrics at several tolerances from one candidate graph.
+
+    Candidate pairs are found once at the largest tolerance. Each smaller
+    tolerance only re-solves the components that contain an edge longer than
+    it; the rest keep their matching. Within a component the matching has the
+    most pairs possible inside the tolerance, then the smallest total distance.
+    Returns one row per tolerance with the columns of ``point_matching_metrics``.
+    """
     manual = np.asarray(manual_points_yx, dtype=float).reshape(-1, 2)
     predicted = np.asarray(predicted_points_yx, dtype=float).reshape(-1, 2)
-    tolerance = float(tolerance_px)
-
-    if len(manual) == 0 and len(predicted) == 0:
-        return {
-            "manual_count": 0.0,
-            "predicted_count": 0.0,
-            "true_positive": 0.0,
-            "false_positive": 0.0,
-            "false_negative": 0.0,
-            "precision": 1.0,
-            "recall": 1.0,
-            "f1": 1.0,
-            "count_bias": 0.0,
-            "count_mae": 0.0,
-            "match_tolerance_px": tolerance,
-            "mean_match_distance_px": float("nan"),
-        }
+    tolerances = list(dict.fromkeys(float(value) for value in tolerances_px))
+    if not tolerances:
+        return pd.DataFrame()
 
-    matches = match_points(manual, predicted, tolerance_px=tolerance)
-    true_positive = int(len(matches.matched_distances_px))
-    false_positive = int(max(len(predicted) - true_positive, 0))
-    false_negative = int(max(len(manual) - true_positive, 0))
-    precision = float(true_positive / (true_positive + false_positive)) if (true_positive + false_positive) > 0 else 0.0
-    recall = float(true_positive / (true_positive + false_negative)) if (true_positive + false_negative) > 0 else 0.0
-    f1 = float((2.0 * precision * recall) / (precision + recall)) if (precision + recall) > 0 else 0.0
-    count_bias = float(len(predicted) - len(manual))
+    by_tolerance: dict[float, dict[str, float]] = {}
+    if len(manual) == 0 or len(predicted) == 0:
+        for tolerance in tolerances:
+            by_tolerance[tolerance] = _matching_metrics_from_counts(
+                manual_count=len(manual),
+                predicted_count=len(predicted),
+                true_positive=0,
+                mean_match_distance_px=float("nan"),
+                tolerance_px=tolerance,
+            )
+    else:
+        pred_idx, manual_idx, distances = _candidate_pairs(predicted, manual, max(tolerances))
+
+        components: list[_MatchComponent] | None = None
+        for tolerance in sorted(tolerances, reverse=True):
+            if components is None:
+                within = np.flatnonzero(distances <= tolerance)
+                components = _solve_match_components(within, pred_idx=pred_idx, manual_idx=manual_idx, distances=distances)
+            else:
+                next_components: list[_MatchComponent] = []
+                for component in components:
+                    if component.max_distance <= tolerance:
+                        next_components.append(component)
+                        continue
+                    within = component.edge_indices[distances[component.edge_indices] <= tolerance]
+                    next_components.extend(
+                        _solve_match_components(within, pred_idx=pred_idx, manual_idx=manual_idx, distances=distances)
+                    )
+                components = next_components
+            true_positive = int(sum(component.true_positive for component in components))
+            distance_sum = float(sum(distances[component.matched_edges].sum() for component in components))
+            by_tolerance[tolerance] = _matching_metrics_from_counts(
+                manual_count=len(manual),
+                predicted_count=len(predicted),
+                true_positive=true_positive,
+                mean_match_distance_px=distance_sum / true_positive if true_positive else float("nan"),
+                tolerance_px=tolerance,
+            )
 
-    return {
-        "manual_count": float(len(manual)),
-        "predicted_count": float(len(predicted)),
-        "true_positive": float(true_positive),
-        "false_positive": float(false_positive),
-        "false_negative": float(false_negative),
-        "precision": precision,
-        "recall": recall,
-        "f1": f1,
-        "count_bias": count_bias,
-        "count_mae": float(abs(count_bias)),
-        "match_tolerance_px": tolerance,
-        "mean_match_distance_px": float(np.mean(matches.matched_distances_px)) if len(matches.matched_distances_px) else float("nan"),
-    }
+    return pd.DataFrame([by_tolerance[tolerance] for tolerance in tolerances])
 
 
 def validate_roi_benchmark_manifest(manifest_df: pd.DataFrame) -> pd.DataFrame:
@@ -330,6 +484,8 @@ def summarize_validation(validation_table: pd.DataFrame) -> pd.DataFrame:
 
 
 def save_bland_altman_plot(validation_table: pd.DataFrame, destination: str | Path) -> Path:
+    import matplotlib.pyplot as plt
+
     destination = Path(destination)
     destination.parent.mkdir(parents=True, exist_ok=True)
     predicted = validation_table["cell_count"].to_numpy(dtype=float)
@@ -355,6 +511,8 @@ def save_bland_altman_plot(validation_table: pd.DataFrame, destination: str | Pa
 
 
 def save_agreement_scatter_plot(validation_table: pd.DataFrame, destination: str | Path) -> Path:
+    import matplotlib.pyplot as plt
+
     destination = Path(destination)
     destination.parent.mkdir(parents=True, exist_ok=True)
     predicted = validation_table["cell_count"].to_numpy(dtype=float)
@@ -2,47 +2,100 @@
 
 import numpy as np
 import cv2
-import matplotlib.pyplot as plt
 from src.config import OVERLAY_ALPHA
 
-def create_debug_overlay(image, masks, alpha=OVERLAY_ALPHA):
+OVERLAY_MODES = ("fill", "contours")
+OVERLAY_BAND_ROWS = 2048
+
+
+def _display_band(band, max_value):
+    if band.dtype == np.uint8:
+        return band
+    if max_value <= 0.0:
+        return np.zeros(band.shape, dtype=np.uint8)
+    return (band / max_value * 255).astype(np.uint8)
+
+
+def _label_boundaries(labels_with_halo, top, bottom):
+    """Pixels of a labelled band whose 4-neighbourhood holds another id.
+
+    ``labels_with_halo`` carries ``top``/``bottom`` extra rows from the
+    neighbouring bands so band edges match the untiled result.
+    """
+    lab = labels_with_halo
+    edge = np.zeros(lab.shape, dtype=bool)
+    edge[1:, :] |= lab[1:, :] != lab[:-1, :]
+    edge[:-1, :] |= lab[:-1, :] != lab[1:, :]
+    edge[:, 1:] |= lab[:, 1:] != lab[:, :-1]
+    edge[:, :-1] |= lab[:, :-1] != lab[:, 1:]
+    edge &= lab != 0
+    return edge[top:lab.shape[0] - bottom]
+
+
+def preview_step(shape, max_side=None):
+    """Stride that brings the longest of ``shape[:2]`` down to ``max_side`` pixels."""
+    if max_side is None or max(shape[:2]) <= int(max_side):
+        return 1
+    return int(np.ceil(max(shape[:2]) / int(max_side)))
+
+
+def label_color_lut(masks, seed=42, band_rows=OVERLAY_BAND_ROWS):
+    """
+    Colour lookup table indexed by label id, shape (max_id + 1, 3), uint8.
+
+    Present ids receive colours in ascending order from a fixed seed, which
+    reproduces the per-object colours of the original renderer; id 0 and
+    absent ids stay black. Presence is counted band by band so no full-size
+    temporary is created.
+    """
+    max_id = int(np.max(masks)) if masks.size else 0
+    present = np.zeros(max_id + 1, dtype=bool)
+    for y0 in range(0, masks.shape[0], band_rows):
+        present |= np.bincount(np.ravel(masks[y0:y0 + band_rows]), minlength=max_id + 1) > 0
+    present[0] = False
+    lut = np.zeros((max_id + 1, 3), dtype=np.uint8)
+    colors = np.random.RandomState(seed).randint(0, 255, size=(int(present.sum()), 3))
+    lut[present] = colors
+    return lut
+
+
+def create_debug_overlay(image, masks, alpha=OVERLAY_ALPHA, *, mode="fill", max_side=None, band_rows=OVERLAY_BAND_ROWS):
     """
     Draws colored labels on top of the grayscale image for verification.
     Returns an RGB image.
+
+    Colours come from a lookup table indexed by label id, so each band of
+    rows is coloured in a single gather. ``mode="contours"`` colours only
+    object boundaries. ``max_side`` renders a strided preview whose longest
+    side is at most that many pixels; the full-resolution RGB image is never
+    built, and at most ``band_rows`` rows are converted at a time.
     """
+    if mode not in OVERLAY_MODES:
+        raise ValueError(f"Unsupported overlay mode: {mode}")
+    image = np.asarray(image)
+    masks = np.asarray(masks)
     # Make sure image is 0-255 range for visualization
-    if image.dtype != np.uint8:
-        max_value = float(np.max(image)) if image.size else 0.0
-        if max_value <= 0.0:
-            disp_img = np.zeros_like(image, dtype=np.uint8)
+    max_value = float(np.max(image)) if image.size and image.dtype != np.uint8 else 0.0
+
+    step = preview_step(image.shape, max_side)
+    image = image[::step, ::step]
+    masks = masks[::step, ::step]
+
+    lut = label_color_lut(masks, band_rows=band_rows)
+    height = image.shape[0]
+    debug_image = np.empty(image.shape[:2] + (3,), dtype=np.uint8)
+    for y0 in range(0, height, band_rows):
+        y1 = min(y0 + band_rows, height)
+        disp = cv2.cvtColor(_display_band(image[y0:y1], max_value), cv2.COLOR_GRAY2RGB)
+        labels = masks[y0:y1]
+        if mode == "contours":
+            top, bottom = int(y0 > 0), int(y1 < height)
+            painted = _label_boundaries(masks[y0 - top:y1 + bottom], top, bottom)
         else:
-            disp_img = (image / max_value * 255).astype(np.uint8)
-    else:
-        disp_img = image.copy()
-    
-    # Convert grayscale to RGB
-    disp_img = cv2.cvtColor(disp_img, cv2.COLOR_GRAY2RGB)
-    
-    # Generate random colors for each mask ID
-    unique_ids = np.unique(masks)
-    unique_ids = unique_ids[unique_ids != 0]
-    
-    color_map = {}
-    np.random.seed(42)  # for reproducible colors
-    for oid in unique_ids:
-        color_map[oid] = (
-            np.random.randint(0, 255),
-            np.random.randint(0, 255),
-            np.random.randint(0, 255),
-        )
-    
-    overlay = disp_img.copy()
-    
-    for oid in unique_ids:
-        overlay[masks == oid] = color_map[oid]
-    
-    # Blend
-    debug_image = cv2.addWeighted(overlay, alpha, disp_img, 1 - alpha, 0)
+            painted = labels != 0
+        overlay = np.where(painted[..., None], lut[labels], disp)
+        # Blend
+        cv2.addWeighted(overlay, alpha, disp, 1 - alpha, 0, dst=debug_image[y0:y1])
     return debug_image
 
 def apply_out_of_focus_overlay(image_rgb, in_focus_mask, alpha=0.3, color=(128,128,128)):
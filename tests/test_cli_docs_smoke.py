@@ -3,12 +3,14 @@ from __future__ import annotations
 import json
 import subprocess
 import sys
+import time
 from pathlib import Path
 
 import pandas as pd
 
 
 ROOT = Path(__file__).resolve().parents[1]
+HELP_IMPORT_BUDGET_SECONDS = 6.0
 
 
 def test_main_version_flag_reports_current_package_version():
@@ -23,6 +25,36 @@ def test_main_version_flag_reports_current_package_version():
     assert "1.0.0" in completed.stdout
 
 
+def test_main_help_stays_within_import_budget():
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "main.py", "--help"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < HELP_IMPORT_BUDGET_SECONDS
+
+
+def test_importing_main_defers_model_and_plotting_backends():
+    probe = (
+        "import sys, main; "
+        "print(','.join(sorted(m for m in ('torch', 'cellpose', 'matplotlib.pyplot', 'statsmodels') if m in sys.modules)))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert completed.stdout.strip() == ""
+
+
 def test_readme_links_to_researcher_docs():
     readme = (ROOT / "README.md").read_text(encoding="utf-8")
 
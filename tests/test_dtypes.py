@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from src.dtypes import as_labels, compact_labels, relabel_lut
+from src.run_service import RuntimeOptions, build_runtime, run_array
+from src.uncertainty import _binary_to_instances, _pixel_vote
+
+
+def test_label_helpers_check_overflow_instead_of_wrapping():
+    labels = np.array([[0, 3], [70000, 3]], dtype=np.int64)
+
+    assert as_labels(labels).dtype == np.uint32
+    assert compact_labels(labels).dtype == np.uint32
+    assert compact_labels(labels.clip(max=5)).dtype == np.uint16
+    with pytest.raises(ValueError):
+        as_labels(np.array([[-1, 2]], dtype=np.int32))
+    with pytest.raises(OverflowError):
+        as_labels(np.array([2**33], dtype=np.int64))
+
+    lut = relabel_lut(70000, np.arange(1, 70001))
+    assert lut.dtype == np.uint32 and lut[70000] == 70000
+
+
+def test_tta_vote_counts_match_float_stack_and_instances_do_not_wrap():
+    rng = np.random.default_rng(0)
+    views = [(rng.random((40, 50)) > 0.5).astype(np.uint8) for _ in range(5)]
+
+    bin_mask, prob = _pixel_vote(views)
+    expected = np.stack(views).astype(np.float32).mean(axis=0)
+    assert prob.dtype == np.float32
+    np.testing.assert_array_equal(prob, expected)
+    np.testing.assert_array_equal(bin_mask, (expected >= 0.5).astype(np.uint8))
+
+    checker = np.zeros((600, 600), dtype=np.uint8)
+    checker[::2, ::2] = 1
+    instances = _binary_to_instances(checker)
+    assert instances.dtype == np.uint32
+    assert int(instances.max()) == 300 * 300
+
+
+def test_debug_allocations_records_each_stage():
+    image = np.zeros((64, 64), dtype=np.uint16)
+    image[20:26, 20:26] = 500
+    runtime = build_runtime(RuntimeOptions(backend="blob_watershed", focus_mode="none", debug_allocations=True))
+
+    ctx = run_array(runtime, image=image, source_path="alloc.tif")
+
+    records = ctx.metrics["allocations"]
+    assert [record["stage"] for record in records] == [stage.name for stage in runtime.pipeline.stages]
+    assert all(record["peak_bytes"] >= 0 for record in records)
+    assert "allocations" not in run_array(build_runtime(RuntimeOptions(backend="blob_watershed", focus_mode="none")), image=image, source_path="alloc.tif").metrics
@@ -35,3 +35,78 @@ def test_load_any_image_squeezes_singleton_tiff_dimensions(tmp_path):
     if meta["reader"] == "aicsimageio":
         assert meta["aics_requested_dims"] == "CZYX"
         assert meta["aics_raw_shape"] == [1, 1, 16, 16]
+
+
+def test_save_labels_to_ome_zarr_writes_mode_downsampled_pyramid_from_tiles(tmp_path):
+    import zarr
+
+    from src.io_ome import downsample_labels_mode, save_labels_to_ome_zarr
+
+    labels = np.zeros((300, 260), dtype=np.uint32)
+    labels[10:40, 10:40] = 7
+    labels[100:101, :] = 3
+    image = np.zeros((300, 260), dtype=np.uint8)
+
+    in_memory = save_labels_to_ome_zarr(image, labels, str(tmp_path / "a.zarr"), {"backend": "x"}, chunk=64, levels=3)
+    tiles = ((y0, x0, labels[y0:y0 + 64, x0:x0 + 64]) for y0 in range(0, 300, 64) for x0 in range(0, 260, 64))
+    streamed = save_labels_to_ome_zarr(
+        image,
+        tiles,
+        str(tmp_path / "b.zarr"),
+        chunk=64,
+        levels=3,
+        max_workers=4,
+        label_shape=labels.shape,
+        label_dtype=labels.dtype,
+    )
+
+    group = zarr.open_group(in_memory, mode="r")["labels/masks"]
+    other = zarr.open_group(streamed, mode="r")["labels/masks"]
+    assert [d["path"] for d in group.attrs["multiscales"][0]["datasets"]] == ["0", "1", "2"]
+    assert group.attrs["backend"] == "x"
+    np.testing.assert_array_equal(group["0"][0], labels)
+    level1 = downsample_labels_mode(labels)
+    np.testing.assert_array_equal(group["1"][0], level1)
+    np.testing.assert_array_equal(group["2"][0], downsample_labels_mode(level1))
+    for level in ("0", "1", "2"):
+        np.testing.assert_array_equal(other[level][:], group[level][:])
+
+
+def test_downsample_labels_mode_keeps_thin_lines_on_odd_rows_and_columns():
+    from src.io_ome import downsample_labels_mode
+
+    labels = np.zeros((64, 64), dtype=np.uint16)
+    labels[27, :] = 4
+    labels[:, 45] = 9
+    labels[2:4, 2:4] = [[0, 6], [5, 7]]
+
+    level = labels
+    for _ in range(4):
+        level = downsample_labels_mode(level)
+        assert {4, 9} <= set(np.unique(level).tolist())
+    assert downsample_labels_mode(labels)[1, 1] == 6
+    majority = np.array([[0, 0], [0, 3]], dtype=np.uint16)
+    assert downsample_labels_mode(majority)[0, 0] == 0
+
+
+def test_streamed_label_tiles_off_the_chunk_grid_are_not_lost(tmp_path):
+    import zarr
+
+    from src.io_ome import save_labels_to_ome_zarr
+
+    rng = np.random.default_rng(5)
+    labels = rng.integers(1, 50, size=(200, 190)).astype(np.uint32)
+    tiles = [(y0, x0, labels[y0:y0 + 48, x0:x0 + 48]) for y0 in range(0, 200, 48) for x0 in range(0, 190, 48)]
+    tiles += [(y0, x0, labels[y0:y0 + 64, x0:x0 + 64]) for y0 in range(0, 200, 64) for x0 in range(0, 190, 64)]
+    streamed = save_labels_to_ome_zarr(
+        np.zeros((200, 190), dtype=np.uint8),
+        iter(tiles),
+        str(tmp_path / "c.zarr"),
+        chunk=64,
+        levels=1,
+        max_workers=8,
+        label_shape=labels.shape,
+        label_dtype=labels.dtype,
+    )
+
+    np.testing.assert_array_equal(zarr.open_group(streamed, mode="r")["labels/masks/0"][0], labels)
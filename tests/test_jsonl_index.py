@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.jsonl_index import JsonlIndex, json_ready
+
+
+def test_json_ready_converts_numpy_and_paths_and_rejects_unknown_objects():
+    payload = {"count": np.int64(3), "shape": np.array([2, 4]), "path": Path("a/b.tif"), "name": "S1"}
+
+    assert json.loads(json.dumps(payload, default=json_ready)) == {"count": 3, "shape": [2, 4], "path": "a/b.tif", "name": "S1"}
+    assert {key: json_ready(value) for key, value in payload.items()}["name"] == "S1"
+    with pytest.raises(TypeError, match="object"):
+        json.dumps({"value": object()}, default=json_ready)
+
+
+def test_jsonl_index_later_lines_win_and_truncated_lines_are_skipped(tmp_path: Path):
+    index = JsonlIndex(tmp_path / "index.jsonl", "key")
+    index.add({"key": "a", "value": 1})
+    index.add({"key": "a", "value": 2})
+    with (tmp_path / "index.jsonl").open("a", encoding="utf-8") as handle:
+        handle.write('{"key": "b", "val')
+
+    reloaded = JsonlIndex(tmp_path / "index.jsonl", "key")
+    reloaded.add({"key": "c", "value": 3})
+
+    assert len(reloaded) == 2
+    assert reloaded.get("a") == {"key": "a", "value": 2}
+    assert "c" in JsonlIndex(tmp_path / "index.jsonl", "key")
@@ -1,6 +1,6 @@
 import numpy as np
 
-from src.landmarks import build_tissue_mask, detect_onh_hole
+from src.landmarks import build_tissue_mask, build_tissue_mask_levels, detect_onh_hole
 
 
 def test_detect_onh_hole_finds_central_void():
@@ -27,3 +27,24 @@ def test_build_tissue_mask_returns_nonempty_mask_for_bright_disc():
 
     assert mask.dtype == bool
     assert mask.sum() > 0
+
+
+def test_coarse_tissue_mask_matches_full_resolution_result():
+    yy, xx = np.mgrid[:1536, :1280]
+    dist = np.sqrt((xx - 600) ** 2 + (yy - 800) ** 2)
+    rng = np.random.default_rng(0)
+    image = rng.normal(30, 8, size=(1536, 1280))
+    image[(dist <= 560) & (dist >= 40)] += 150
+    image = np.clip(image, 0, 255).astype(np.uint8)
+
+    full = build_tissue_mask_levels(image, scale=1)
+    coarse = build_tissue_mask_levels(image, scale=4)
+    full_onh, full_info = detect_onh_hole(image, tissue=full)
+    coarse_onh, coarse_info = detect_onh_hole(image, tissue=coarse)
+
+    assert coarse.coarse.shape == (384, 320)
+    assert np.count_nonzero(coarse.mask != full.mask) <= 0.001 * full.mask.sum()
+    assert coarse_info["scale"] == 4
+    assert abs(coarse_onh[0] - full_onh[0]) < 0.5
+    assert abs(coarse_onh[1] - full_onh[1]) < 0.5
+    assert abs(coarse_info["confidence"] - full_info["confidence"]) < 0.01
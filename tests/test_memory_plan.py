@@ -0,0 +1,84 @@
+import numpy as np
+
+from src.memory_plan import MB, estimate_stage_memory, plan_memory
+from src.run_service import RuntimeOptions, build_runtime, run_array
+
+
+def _plan(budget_mb: float, **kwargs):
+    params = dict(
+        image_shape=(4096, 4096),
+        image_dtype=np.uint16,
+        gray_shape=(4096, 4096),
+        gray_dtype=np.uint16,
+        backend="cellpose",
+        gray_is_image=True,
+    )
+    params.update(kwargs)
+    return plan_memory(budget_mb=budget_mb, **params)
+
+
+def test_plan_memory_prefers_untiled_then_largest_fitting_tile():
+    untiled = _plan(8192)
+    assert not untiled.tiling
+    assert untiled.keep_intermediate_maps and untiled.within_budget
+
+    tiled = _plan(1024)
+    assert tiled.tiling and tiled.within_budget
+    assert tiled.estimated_peak_bytes <= 1024 * MB
+    larger = _plan(1024, tiling=True, tile_size=tiled.tile_size * 2)
+    assert larger.tile_size == tiled.tile_size
+
+    capped = _plan(8192, tiling=True, tile_size=512)
+    assert capped.tiling and capped.tile_size == 512
+
+    impossible = _plan(16)
+    assert not impossible.within_budget
+    assert impossible.tile_size == 256 and not impossible.keep_intermediate_maps
+
+
+def test_estimate_stage_memory_accounts_for_tta_and_tiles():
+    common = dict(image_shape=(2048, 2048), image_dtype=np.uint8, gray_shape=(2048, 2048), gray_dtype=np.uint8, backend="blob_watershed")
+    single = estimate_stage_memory(**common)
+    tta = estimate_stage_memory(tta_views=4, **common)
+    tiled = estimate_stage_memory(tile_size=512, **common)
+
+    assert tta["segment"] > single["segment"]
+    assert tiled["segment"] < single["segment"]
+    assert tiled["prepare"] == single["prepare"]
+
+
+def test_run_array_memory_budget_selects_tiling_and_drops_intermediates():
+    rng = np.random.default_rng(3)
+    image = (rng.random((600, 600)) * 30).astype(np.uint16)
+    yy, xx = np.mgrid[:600, :600]
+    for cy, cx in rng.integers(20, 580, size=(60, 2)):
+        image[(yy - cy) ** 2 + (xx - cx) ** 2 < 36] += 400
+
+    runtime = build_runtime(RuntimeOptions(backend="blob_watershed", focus_mode="none"))
+    ctx = run_array(runtime, image=image, source_path="budget.tif", memory_budget_mb=14)
+
+    plan = ctx.metrics["memory_plan"]
+    assert plan["tiling"] and plan["tile_size"] < 600
+    assert plan["within_budget"] and plan["keep_intermediate_maps"]
+    assert "segmentation_input" in ctx.state
+    assert ctx.metrics["tiling"]["tile_size"] == plan["tile_size"]
+
+    explicit = build_runtime(RuntimeOptions(backend="blob_watershed", focus_mode="none", tiling=True, tile_size=plan["tile_size"]))
+    reference = run_array(explicit, image=image, source_path="budget.tif")
+    np.testing.assert_array_equal(ctx.labels, reference.labels)
+
+    tight = run_array(runtime, image=image, source_path="budget.tif", memory_budget_mb=12)
+    assert not tight.metrics["memory_plan"]["keep_intermediate_maps"]
+    assert "segmentation_input" not in tight.state
+    assert any("exceeds" in warning for warning in tight.warnings)
+    untouched = run_array(runtime, image=image, source_path="budget.tif")
+    assert "memory_plan" not in untouched.metrics
+
+
+def test_over_budget_warning_describes_untiled_plans():
+    runtime = build_runtime(RuntimeOptions(backend="blob_watershed", focus_mode="none"))
+    ctx = run_array(runtime, image=np.zeros((200, 200), dtype=np.uint16), source_path="small.tif", memory_budget_mb=0.1)
+
+    assert not ctx.metrics["memory_plan"]["tiling"]
+    warning = next(warning for warning in ctx.warnings if "exceeds" in warning)
+    assert "untiled" in warning and "px tiles" not in warning
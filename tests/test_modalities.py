@@ -35,3 +35,100 @@ def test_lightsheet_adapter_projects_volume():
     assert adapted.shape == (8, 8)
     assert adapted.max() == 12
     assert meta["modality_adapter"] == "lightsheet"
+
+
+def test_project_volume_reduces_memmap_in_chunks(tmp_path):
+    from src.modalities.common import project_volume
+
+    rng = np.random.default_rng(0)
+    volume = rng.integers(0, 65535, size=(12, 16, 10), dtype=np.uint16)
+    mapped = np.memmap(tmp_path / "volume.raw", dtype=np.uint16, mode="w+", shape=volume.shape)
+    mapped[:] = volume
+    mapped.flush()
+    lazy = np.memmap(tmp_path / "volume.raw", dtype=np.uint16, mode="r", shape=volume.shape)
+
+    for projection, reference in (("max", np.max), ("sum", np.sum), ("mean", np.mean)):
+        for workers in (1, 3):
+            projected, info = project_volume(
+                lazy,
+                projection=projection,
+                depth_axis=0,
+                slab_start=2,
+                slab_end=11,
+                chunk_bytes=16 * 10 * 2 * 2,
+                max_workers=workers,
+            )
+            expected = reference(volume[2:11], axis=0)
+            assert info["n_chunks"] == 5
+            assert projected.dtype == expected.dtype
+            np.testing.assert_array_equal(projected, expected)
+
+
+class _RecordingVolume:
+    """Array-like that records the shape of every read."""
+
+    def __init__(self, array: np.ndarray):
+        self.array = array
+        self.shape = array.shape
+        self.dtype = array.dtype
+        self.reads: list[tuple[int, ...]] = []
+
+    def __getitem__(self, key):
+        out = self.array[key]
+        self.reads.append(out.shape)
+        return out
+
+
+def test_channel_selection_happens_per_depth_chunk():
+    from src.modalities.common import project_volume
+
+    rng = np.random.default_rng(2)
+    volume = rng.integers(0, 4000, size=(6, 14, 12, 3), dtype=np.uint16)
+    lazy = _RecordingVolume(volume)
+
+    adapted, meta = adapt_image_for_modality(lazy, {}, modality="oct", projection="mean", channel_index=2)
+    np.testing.assert_array_equal(adapted, np.mean(volume[..., 2], axis=0))
+    assert meta["modality_channel_index"] == 2
+
+    lazy.reads.clear()
+    projected, info = project_volume(lazy, depth_axis=0, chunk_bytes=14 * 12 * 2 * 2, channel_index=1)
+    np.testing.assert_array_equal(projected, volume[..., 1].max(axis=0))
+    assert info["n_chunks"] == 3
+    assert all(len(shape) == 3 and shape[0] <= 2 for shape in lazy.reads)
+
+    lazy.reads.clear()
+    adapted, _ = adapt_image_for_modality(lazy, {}, modality="vis_octf", projection="sum")
+    np.testing.assert_array_equal(adapted, np.sum(volume, axis=0))
+    assert len(lazy.reads) == 1
+
+
+def test_volumetric_cli_runs_read_tiffs_lazily(tmp_path, monkeypatch):
+    import tifffile
+
+    from src import run_service
+    from src.io_ome import load_any_image, open_lazy_image
+    from src.run_service import RuntimeOptions, build_runtime, run_one_image
+
+    rng = np.random.default_rng(4)
+    volume = (rng.random((6, 48, 40)) * 30).astype(np.uint16)
+    volume[3, 20:26, 18:24] = 900
+    plain = tmp_path / "plain.tif"
+    tiled = tmp_path / "tiled.tif"
+    tifffile.imwrite(plain, volume)
+    tifffile.imwrite(tiled, volume[:, None], compression="zlib", tile=(16, 16))
+
+    for path, reader in ((plain, "memmap"), (tiled, "zarr")):
+        lazy, meta = open_lazy_image(str(path))
+        eager, eager_meta = load_any_image(str(path))
+        assert not isinstance(lazy, np.ndarray) or isinstance(lazy, np.memmap)
+        assert meta["lazy_reader"] == reader
+        assert meta["canonical_loaded_shape"] == eager_meta["canonical_loaded_shape"]
+        np.testing.assert_array_equal(np.asarray(lazy), eager)
+
+    def eager_load(path):
+        raise AssertionError("volumetric input was loaded eagerly")
+
+    monkeypatch.setattr(run_service, "load_any_image", eager_load)
+    runtime = build_runtime(RuntimeOptions(backend="blob_watershed", focus_mode="none", modality="lightsheet"))
+    ctx = run_one_image(runtime, image_path=tiled)
+    np.testing.assert_array_equal(ctx.image, volume.max(axis=0))
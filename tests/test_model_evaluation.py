@@ -1,4 +1,5 @@
 import json
+import os
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -6,12 +7,16 @@ import numpy as np
 import pandas as pd
 import tifffile
 
+from src import model_evaluation
 from src.model_evaluation import (
+    ModelAssetHashes,
     evaluate_model_manifest,
     load_model_manifest,
+    prediction_cache_key,
     write_evaluation_outputs,
 )
 from src.model_registry import ModelSpec
+from src.run_service import RuntimeOptions
 
 
 @dataclass
@@ -279,3 +284,98 @@ def test_write_evaluation_outputs(tmp_path: Path):
     assert outputs["per_run_metrics"].exists()
     assert outputs["model_summary"].exists()
     assert json.loads(outputs["best_model"].read_text(encoding="utf-8"))["model_label"] == "builtin"
+
+
+def test_evaluate_model_manifest_reuses_runtime_and_prediction_cache(tmp_path: Path):
+    labels = np.zeros((8, 8), dtype=np.uint16)
+    labels[1:4, 1:4] = 1
+    rows = []
+    for index in range(3):
+        image_path = tmp_path / f"image_{index}.tif"
+        tifffile.imwrite(image_path, np.full((8, 8), index, dtype=np.uint8))
+        rows.append(
+            {
+                "run_id": f"r{index}",
+                "image_path": str(image_path),
+                "label_path": None,
+                "manual_count": 1,
+                "backend": "blob_watershed",
+                "model_type": None,
+                "cellpose_model": None,
+                "stardist_weights": None,
+                "sam_checkpoint": None,
+                "model_alias": None,
+                "diameter": None,
+                "channel_index": 0,
+                "notes": "",
+            }
+        )
+    manifest = pd.DataFrame(rows)
+    builds: list[object] = []
+    runs: list[str] = []
+
+    def fake_runtime_builder(options):
+        builds.append(options)
+        return FakeRuntime(
+            model_spec=ModelSpec(
+                backend="blob_watershed",
+                source="builtin",
+                model_label="blob_watershed",
+                display_label="blob_watershed",
+                builtin_name="blob_watershed",
+                asset_path=None,
+                model_type="blob_watershed",
+                alias=None,
+                trust_mode="builtin",
+            )
+        )
+
+    def fake_runtime_runner(runtime, image, source_path, meta):
+        runs.append(str(source_path))
+        return FakeContext(labels)
+
+    cache_dir = tmp_path / "prediction_cache"
+    first, _, _ = evaluate_model_manifest(
+        manifest,
+        runtime_builder=fake_runtime_builder,
+        runtime_runner=fake_runtime_runner,
+        prediction_cache_dir=cache_dir,
+    )
+    second, _, _ = evaluate_model_manifest(
+        manifest,
+        runtime_builder=fake_runtime_builder,
+        runtime_runner=fake_runtime_runner,
+        prediction_cache_dir=cache_dir,
+        max_workers=2,
+    )
+
+    assert len(builds) == 1
+    assert len(runs) == 3
+    assert len(list(cache_dir.glob("*.npz"))) == 3
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_model_asset_hashes_are_memoized_until_the_weights_change(tmp_path: Path, monkeypatch):
+    weights = tmp_path / "weights.pth"
+    weights.write_bytes(b"v1")
+    image_path = tmp_path / "image.tif"
+    tifffile.imwrite(image_path, np.zeros((4, 4), dtype=np.uint8))
+    calls: list[str] = []
+    original = model_evaluation.model_asset_sha256
+
+    def counting_sha256(path):
+        calls.append(str(path))
+        return original(path)
+
+    monkeypatch.setattr(model_evaluation, "model_asset_sha256", counting_sha256)
+    hashes = ModelAssetHashes()
+    options = RuntimeOptions(backend="cellpose", cellpose_model=str(weights))
+
+    first = prediction_cache_key(options, image_path, asset_hashes=hashes)
+    assert prediction_cache_key(options, image_path, asset_hashes=hashes) == first
+    assert len(calls) == 1
+
+    weights.write_bytes(b"v2-longer")
+    os.utime(weights, ns=(weights.stat().st_atime_ns, weights.stat().st_mtime_ns + 10**9))
+    assert prediction_cache_key(options, image_path, asset_hashes=hashes) != first
+    assert len(calls) == 2
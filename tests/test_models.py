@@ -39,3 +39,26 @@ def test_blob_watershed_respects_size_filter():
     )
 
     assert int(labels.max()) == 1
+
+
+def test_blob_watershed_mean_intensity_filter_keeps_label_order():
+    image = np.zeros((64, 96), dtype=np.float32)
+    yy, xx = np.ogrid[:64, :96]
+    image[(yy - 20) ** 2 + (xx - 20) ** 2 <= 25] = 1.0
+    image[(yy - 20) ** 2 + (xx - 50) ** 2 <= 25] = 0.3
+    image[(yy - 44) ** 2 + (xx - 76) ** 2 <= 25] = 1.0
+
+    labels, info = segment_blob_watershed(
+        image,
+        threshold_rel=0.05,
+        min_distance=8,
+        min_size=10,
+        max_size=400,
+        min_mean_intensity=0.5,
+    )
+
+    assert info["n_regions"] == 2
+    assert sorted(np.unique(labels).tolist()) == [0, 1, 2]
+    assert labels[20, 20] == 1
+    assert labels[20, 50] == 0
+    assert labels[44, 76] == 2
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.figures import save_object_eccentricity_plot
+from src.object_dataset import append_object_table, prune_object_dataset, read_object_dataset
+
+
+def _objects(n: int, *, with_ecc: bool) -> pd.DataFrame:
+    rng = np.random.default_rng(n)
+    return pd.DataFrame(
+        {
+            "source_path": "sample.tif",
+            "object_id": np.arange(1, n + 1),
+            "centroid_x_px": rng.random(n) * 100,
+            "centroid_y_px": rng.random(n) * 100,
+            "area_px": np.full(n, 12),
+            "kept": np.arange(n) % 2 == 0,
+            "ring": rng.integers(0, 3, n) if with_ecc else np.full(n, np.nan),
+            "ecc_um": rng.random(n) * 1000 if with_ecc else np.full(n, np.nan),
+        }
+    )
+
+
+def test_object_dataset_appends_partitions_and_reads_selected_columns(tmp_path: Path):
+    root = tmp_path / "objects_dataset"
+    append_object_table(root, _objects(10, with_ecc=False), sample_id="S1", study_id="st", condition="control", animal_id="M1")
+    append_object_table(root, _objects(20, with_ecc=True), sample_id="S2", study_id="st", condition="treated", animal_id="M2")
+    written = append_object_table(root, _objects(8, with_ecc=True), sample_id="S1", study_id="st", condition="treated", animal_id="M1")
+
+    assert written[0].parent.relative_to(root).as_posix() == "study_id=st/condition=treated/animal_id=M1"
+    assert not list((root / "study_id=st" / "condition=control").rglob("*.parquet"))
+
+    kept = read_object_dataset(root, columns=["sample_id", "ecc_um"], filters=[("kept", "==", True), ("condition", "==", "treated")])
+    assert list(kept.columns) == ["sample_id", "ecc_um"]
+    assert kept.groupby("sample_id").size().to_dict() == {"S1": 4, "S2": 10}
+    assert kept["ecc_um"].dtype == np.float64
+    assert read_object_dataset(tmp_path / "missing", columns=["ecc_um"]).empty
+
+
+def test_reappending_a_sample_keeps_samples_whose_id_it_prefixes(tmp_path: Path):
+    root = tmp_path / "objects_dataset"
+    for sample_id in ["M1", "M1-OS", "M1-2", "M1 OS", "M1_OS"]:
+        append_object_table(root, _objects(4, with_ecc=True), sample_id=sample_id, study_id="st", condition="c", animal_id="M1")
+    append_object_table(root, _objects(6, with_ecc=True), sample_id="M1", study_id="st", condition="c", animal_id="M1")
+
+    counts = read_object_dataset(root, columns=["sample_id"])["sample_id"].value_counts().to_dict()
+    assert counts == {"M1": 6, "M1-OS": 4, "M1-2": 4, "M1 OS": 4, "M1_OS": 4}
+
+
+def test_object_dataset_reads_files_with_older_string_and_all_missing_types(tmp_path: Path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    root = tmp_path / "objects_dataset"
+    partition = root / "study_id=st" / "condition=c" / "animal_id=M1"
+    partition.mkdir(parents=True)
+    legacy = _objects(3, with_ecc=False).drop(columns=["ring"])
+    legacy["phenotype"] = "unclassified"
+    legacy["sample_id"] = "OLD"
+    legacy["subtype"] = np.nan
+    # Before the dataset pinned its storage types, strings were written as
+    # "string", later as "large_string", and all-missing columns as double.
+    pq.write_table(pa.Table.from_pandas(legacy, preserve_index=False), partition / "OLD-0.parquet")
+    large = pa.Table.from_pandas(legacy.assign(sample_id="LARGE"), preserve_index=False)
+    large = large.cast(pa.schema([field.with_type(pa.large_string()) if pa.types.is_string(field.type) else field for field in large.schema]))
+    pq.write_table(large, partition / "LARGE-0.parquet")
+
+    written = append_object_table(root, _objects(5, with_ecc=True).assign(subtype="ON"), sample_id="NEW", study_id="st", condition="c", animal_id="M1")
+    assert {pq.read_schema(written[0]).field(name).type for name in ["sample_id", "phenotype", "subtype"]} == {pa.string()}
+    append_object_table(root, _objects(2, with_ecc=False).assign(subtype=np.nan), sample_id="GAP", study_id="st", condition="c", animal_id="M1")
+    frame = read_object_dataset(root, columns=["sample_id", "subtype", "ring"])
+    assert frame["sample_id"].value_counts().to_dict() == {"NEW": 5, "OLD": 3, "LARGE": 3, "GAP": 2}
+    assert set(frame.loc[frame["sample_id"] == "NEW", "subtype"]) == {"ON"}
+    assert frame.loc[frame["sample_id"] != "NEW", "subtype"].isna().all()
+    assert frame["ring"].dtype == np.float64
+
+    append_object_table(root, _objects(4, with_ecc=True), sample_id="OLD", study_id="st", condition="c", animal_id="M1")
+    assert not (partition / "OLD-0.parquet").exists()
+    assert read_object_dataset(root, columns=["sample_id"])["sample_id"].value_counts()["OLD"] == 4
+
+
+def test_unregistered_object_dataset_reads_without_missing_columns(tmp_path: Path):
+    root = tmp_path / "objects_dataset"
+    unregistered = _objects(6, with_ecc=False).drop(columns=["ring", "ecc_um"])
+    append_object_table(root, unregistered, sample_id="S1", study_id="st", condition="c", animal_id="M1")
+
+    objects = read_object_dataset(root, columns=["condition", "ecc_um"], filters=[("kept", "==", True)])
+    assert list(objects.columns) == ["condition"]
+    assert len(objects) == 3
+    assert read_object_dataset(root, columns=["sample_id"], filters=[("ecc_um", ">", 0)]).empty
+    assert save_object_eccentricity_plot(root, tmp_path / "ecc.png") is None
+
+
+def test_prune_object_dataset_drops_samples_outside_the_cohort(tmp_path: Path):
+    root = tmp_path / "objects_dataset"
+    for sample_id, condition in [("S1", "c"), ("S2", "t"), ("S10", "c")]:
+        append_object_table(root, _objects(4, with_ecc=True), sample_id=sample_id, study_id="st", condition=condition, animal_id="M1")
+
+    removed = prune_object_dataset(root, ["S1", "S10"])
+
+    assert len(removed) == 1
+    counts = read_object_dataset(root, columns=["sample_id"])["sample_id"].value_counts().to_dict()
+    assert counts == {"S1": 4, "S10": 4}
@@ -1,8 +1,16 @@
 from __future__ import annotations
 
 import numpy as np
+import pandas as pd
+from skimage import feature
 
-from src.point_detection import detect_dog_peaks, detect_hmax_peaks, detect_log_peaks, score_peak_candidates
+from src.point_detection import (
+    detect_dog_peaks,
+    detect_hmax_peaks,
+    detect_log_peaks,
+    prepare_detector_input,
+    score_peak_candidates,
+)
 
 
 def _synthetic_image() -> np.ndarray:
@@ -42,3 +50,25 @@ def test_score_peak_candidates_adds_score_column():
 
     assert list(scored.columns) == ["y_px", "x_px", "score", "radius_px", "detector"]
     assert scored["score"].max() > 0
+
+
+def test_detector_input_reuses_scale_space_across_threshold_sweeps():
+    rng = np.random.default_rng(0)
+    image = _synthetic_image() + rng.random((64, 64)).astype(np.float32) * 0.05
+    prepared = prepare_detector_input(image)
+
+    for threshold, min_distance in [(0.04, 6), (0.08, 8), (0.12, 10)]:
+        cached = detect_log_peaks(prepared, sigma_min=2.5, sigma_max=5.0, num_sigma=4, threshold=threshold, min_distance=min_distance)
+        fresh = detect_log_peaks(image, sigma_min=2.5, sigma_max=5.0, num_sigma=4, threshold=threshold, min_distance=min_distance)
+        pd.testing.assert_frame_equal(cached, fresh)
+        pd.testing.assert_frame_equal(
+            detect_dog_peaks(prepared, sigma_min=2.5, sigma_max=5.0, threshold=threshold, min_distance=min_distance),
+            detect_dog_peaks(image, sigma_min=2.5, sigma_max=5.0, threshold=threshold, min_distance=min_distance),
+        )
+
+    assert len(prepared._scale_spaces) == 2
+    cube, sigma_list = prepared.log_scale_space(2.5, 5.0, 4)
+    assert cube.shape == (64, 64, 4) and len(sigma_list) == 4
+    blobs = feature.blob_log(prepared.image, min_sigma=2.5, max_sigma=5.0, num_sigma=4, threshold=0.04)
+    log_points = detect_log_peaks(prepared, sigma_min=2.5, sigma_max=5.0, num_sigma=4, threshold=0.04, min_distance=0)
+    assert sorted(map(tuple, log_points[["y_px", "x_px"]].to_numpy())) == sorted(map(tuple, blobs[:, :2].astype(float)))
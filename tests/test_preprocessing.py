@@ -0,0 +1,111 @@
+from pathlib import Path
+
+import numpy as np
+
+from src.context import RunContext
+from src.pipeline import PrepareImageStage, SegmentationStage
+from src.preprocessing import PreprocessCache, preprocess_cache, robust_intensity_stats
+
+
+def test_robust_intensity_stats_is_exact_below_sample_limit_and_close_above():
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 4000, size=(300, 400), dtype=np.uint16)
+
+    exact = robust_intensity_stats(image)
+    sampled = robust_intensity_stats(image, max_samples=10_000)
+
+    expected = np.percentile(image.astype(np.float32), [1.0, 99.5])
+    assert exact.sample_step == 1
+    assert exact.intensity_range == (float(expected[0]), float(expected[1]))
+    assert exact.max == float(image.max())
+    assert sampled.sample_step == 4
+    assert abs(sampled.low - exact.low) < 40
+    assert abs(sampled.high - exact.high) < 40
+
+
+def test_preprocess_cache_reuses_results_for_the_same_array_only():
+    cache = PreprocessCache()
+    image = np.arange(100, dtype=np.float32).reshape(10, 10)
+    builds = []
+
+    def build(source, stats):
+        builds.append(stats)
+        return source / stats.max
+
+    first = cache.image("scaled", image, build)
+    second = cache.image("scaled", image, build)
+    cache.image("scaled", image.copy(), build)
+
+    assert first is second
+    assert len(builds) == 2
+    assert cache.stats(image) is builds[0]
+
+
+class _GlobalScaleSegmenter:
+    def __init__(self):
+        self.preprocess_calls = 0
+        self.tile_maxima: list[float] = []
+
+    def preprocess_key(self):
+        return ("global_scale",)
+
+    def preprocess(self, image, stats):
+        self.preprocess_calls += 1
+        return image.astype(np.float32) / stats.max
+
+    def segment(self, image, *, preprocessed=False):
+        assert preprocessed
+        self.tile_maxima.append(float(image.max()))
+        return (image > 0.5).astype(np.uint16), {"backend": "fake"}
+
+
+def test_segmentation_stage_normalizes_whole_image_before_tiling_and_tta():
+    image = np.zeros((64, 64), dtype=np.uint16)
+    image[:, 32:] = 200
+    image[40:44, 40:44] = 400
+    ctx = RunContext(path=Path("synthetic.tif"), image=image, meta={}, gray=image)
+    ctx.state["segmentation_input"] = image
+    segmenter = _GlobalScaleSegmenter()
+
+    SegmentationStage(segmenter=segmenter).run(
+        ctx,
+        {"tiling": True, "tile_size": 32, "tile_overlap": 8, "tta": True, "tta_transforms": ["flip_h"]},
+    )
+
+    assert segmenter.preprocess_calls == 1
+    assert preprocess_cache(ctx).stats(image).max == 400.0
+    assert max(segmenter.tile_maxima) == 1.0
+    assert 0.5 in segmenter.tile_maxima
+
+
+def test_pipeline_measures_intensity_stats_once_on_the_segmented_input(monkeypatch):
+    from src import preprocessing
+    from src.run_service import RuntimeOptions, build_runtime, run_array
+
+    measured: list[tuple[int, ...]] = []
+    original = preprocessing.robust_intensity_stats
+
+    def counting_stats(image, **kwargs):
+        measured.append(tuple(np.shape(image)))
+        return original(image, **kwargs)
+
+    monkeypatch.setattr(preprocessing, "robust_intensity_stats", counting_stats)
+    image = np.zeros((96, 96), dtype=np.uint16)
+    image[30:36, 30:36] = 500
+
+    for focus_mode in ("none", "auto"):
+        measured.clear()
+        runtime = build_runtime(RuntimeOptions(backend="blob_watershed", focus_mode=focus_mode))
+        run_array(runtime, image=image, source_path="stats.tif")
+        assert measured == [(96, 96)]
+
+    class RawSegmenter:
+        def segment(self, image):
+            return (image > 0).astype(np.uint16), {"backend": "raw"}
+
+    measured.clear()
+    ctx = RunContext(path=Path("raw.tif"), image=image, meta={})
+    PrepareImageStage().run(ctx, {})
+    ctx.state["segmentation_input"] = ctx.gray
+    SegmentationStage(segmenter=RawSegmenter()).run(ctx, {})
+    assert measured == []
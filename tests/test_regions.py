@@ -63,3 +63,84 @@ def test_summarize_regions_returns_area_and_count_tables():
     ring_rows = summary[summary["region_axis"] == "ring"]
     assert int(ring_rows["object_count"].sum()) == 2
     assert ring_rows["area_px"].sum() > 0
+
+
+def test_summarize_regions_raster_areas_match_registered_region_masks():
+    from src.regions import build_registered_region_masks
+    from src.retina_coords import register_focus_mask_pixels
+
+    yy, xx = np.mgrid[0:96, 0:96]
+    tissue_mask = (yy - 48) ** 2 + (xx - 50) ** 2 < 40**2
+    frame = retina_frame_from_points(
+        onh_xy_px=(46.0, 44.0),
+        dorsal_xy_px=(46.0, 4.0),
+        um_per_px=1.0,
+        source="cli",
+    )
+    tissue_pixels = register_focus_mask_pixels(tissue_mask, frame)
+    object_table = pd.DataFrame({"centroid_y_px": [44.0, 80.0], "centroid_x_px": [46.0, 50.0]})
+    kwargs = dict(
+        object_table=object_table,
+        focus_pixels=tissue_pixels,
+        tissue_pixels=tissue_pixels,
+        tissue_mask=tissue_mask,
+        frame=frame,
+        schema_name="mouse_flatmount_v1",
+        source_path="sample.tif",
+    )
+
+    raster = summarize_regions(**kwargs).set_index(["region_axis", "region_label"])
+    polygon = summarize_regions(**kwargs, area_engine="polygon").set_index(["region_axis", "region_label"])
+    masks = build_registered_region_masks(
+        tissue_pixels=tissue_pixels,
+        tissue_mask=tissue_mask,
+        schema_name="mouse_flatmount_v1",
+        max_ecc_um=float(tissue_pixels["ecc_um"].max()),
+    )
+
+    assert list(raster.index) == list(polygon.index)
+    for key, mask in masks.items():
+        assert raster.loc[key, "area_px"] == int(mask.sum())
+    assert raster.loc[("ring", "central"), "object_count"] == 1
+    assert raster.loc[("ring", "peripheral"), "object_count"] == 1
+    np.testing.assert_allclose(raster["area_px"], polygon["area_px"], rtol=0.1)
+
+
+def test_raster_engine_reuses_registered_tissue_pixels(monkeypatch):
+    from src import regions
+    from src.regions import rasterize_region_schema
+    from src.retina_coords import register_focus_mask_pixels
+
+    yy, xx = np.mgrid[0:64, 0:64]
+    tissue_mask = (yy - 32) ** 2 + (xx - 30) ** 2 < 28**2
+    frame = retina_frame_from_points(onh_xy_px=(30.0, 34.0), dorsal_xy_px=(30.0, 2.0), um_per_px=2.0, source="cli")
+    tissue_pixels = register_focus_mask_pixels(tissue_mask, frame)
+    max_ecc_um = float(tissue_pixels["ecc_um"].max())
+    expected = rasterize_region_schema(tissue_mask, frame, schema_name="rat_flatmount_v1", max_ecc_um=max_ecc_um)
+
+    def fail_registration(*args, **kwargs):
+        raise AssertionError("tissue mask registered twice")
+
+    monkeypatch.setattr(regions, "register_focus_mask_pixels", fail_registration)
+    label_images = rasterize_region_schema(
+        tissue_mask,
+        frame,
+        schema_name="rat_flatmount_v1",
+        max_ecc_um=max_ecc_um,
+        tissue_pixels=tissue_pixels,
+    )
+    assigned = assign_regions(tissue_pixels, schema_name="rat_flatmount_v1", max_ecc_um=max_ecc_um)
+    schema = regions.get_region_schema("rat_flatmount_v1")
+    for axis, labels in regions._axis_label_order(schema).items():
+        np.testing.assert_array_equal(label_images[axis], expected[axis])
+        codes = label_images[axis][assigned["y_px"].to_numpy(), assigned["x_px"].to_numpy()]
+        assert list(np.asarray(labels, dtype=object)[codes]) == list(assigned[axis])
+    summarize_regions(
+        object_table=pd.DataFrame({"centroid_y_px": [32.0], "centroid_x_px": [30.0]}),
+        focus_pixels=tissue_pixels,
+        tissue_pixels=tissue_pixels,
+        tissue_mask=tissue_mask,
+        frame=frame,
+        schema_name="rat_flatmount_v1",
+        source_path="sample.tif",
+    )
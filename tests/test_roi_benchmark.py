@@ -153,3 +153,59 @@ def test_run_roi_benchmark_writes_expected_artifacts(tmp_path: Path):
     best = json.loads((output_dir / "results" / "best_config.json").read_text(encoding="utf-8"))
     assert best["config_id"] == "blob_config"
     assert result["summary_row"]["config_id"] == "blob_config"
+
+
+def test_run_roi_benchmark_config_reuses_runtime_and_source_image(tmp_path: Path, monkeypatch):
+    import src.roi_benchmark as roi_benchmark
+
+    manifest_path = _write_manifest(tmp_path)
+    frame = pd.read_csv(manifest_path)
+    second = frame.iloc[0].copy()
+    second["roi_id"] = "ROI_002"
+    second["width"] = 16
+    pd.concat([frame, second.to_frame().T], ignore_index=True).to_csv(manifest_path, index=False)
+
+    builds: list[object] = []
+    loads: list[str] = []
+    real_loader = roi_benchmark.load_any_image
+
+    def counting_builder(options):
+        builds.append(options)
+        return _fake_runtime_builder(options)
+
+    def counting_loader(path):
+        loads.append(path)
+        return real_loader(path)
+
+    monkeypatch.setattr(roi_benchmark, "load_any_image", counting_loader)
+    result = roi_benchmark.run_roi_benchmark_config(
+        roi_manifest=manifest_path,
+        output_dir=tmp_path / "output",
+        config=RoiBenchmarkConfig(config_id="blob", backend="blob_watershed"),
+        save_overlays=True,
+        runtime_builder=counting_builder,
+        runtime_runner=_fake_runtime_runner,
+    )
+
+    assert len(builds) == 1
+    assert len(loads) == 1
+    assert result["primary_frame"]["roi_id"].tolist() == ["ROI_001", "ROI_002"]
+    assert len(list((tmp_path / "output" / "results" / "overlays").glob("*.png"))) == 2
+
+
+def test_benchmark_result_store_ignores_truncated_line(tmp_path: Path):
+    from src.roi_benchmark import BenchmarkResultStore
+
+    store = BenchmarkResultStore(tmp_path / "cells.jsonl")
+    store.append("abc", config_id="blob", roi_id="ROI_001", primary={"f1": float("nan")}, per_tolerance_rows=[])
+    with (tmp_path / "cells.jsonl").open("a", encoding="utf-8") as handle:
+        handle.write('{"cell_key": "def", "prim')
+
+    reloaded = BenchmarkResultStore(tmp_path / "cells.jsonl")
+
+    assert "abc" in reloaded
+    assert "def" not in reloaded
+    assert np.isnan(reloaded.get("abc")["primary"]["f1"])
+    reloaded.append("ghi", config_id="blob", roi_id="ROI_002", primary={}, per_tolerance_rows=[])
+    assert "ghi" in BenchmarkResultStore(tmp_path / "cells.jsonl")
+    assert len(BenchmarkResultStore(tmp_path / "cells.jsonl", load_existing=False)) == 0
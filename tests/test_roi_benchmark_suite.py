@@ -193,3 +193,47 @@ def test_suite_runner_filters_out_qc_split_rows(tmp_path: Path):
     comparison = pd.read_csv(output_dir / "results" / "config_comparison.csv")
     assert result["exit_code"] == 0
     assert set(comparison["n_rois"]) == {22}
+
+
+def test_suite_runner_parallel_matches_serial_and_resumes_from_store(tmp_path: Path):
+    manifest = _write_manifest(tmp_path, n_rois=6)
+    config_manifest = _write_config_manifest(tmp_path)
+
+    serial = run_benchmark_suite(
+        roi_manifest=manifest,
+        config_manifest=config_manifest,
+        output_dir=tmp_path / "serial",
+        runtime_builder=_fake_runtime_builder,
+        runtime_runner=_fake_runtime_runner,
+    )
+    parallel = run_benchmark_suite(
+        roi_manifest=manifest,
+        config_manifest=config_manifest,
+        output_dir=tmp_path / "parallel",
+        runtime_builder=_fake_runtime_builder,
+        runtime_runner=_fake_runtime_runner,
+        max_workers=4,
+    )
+
+    columns = ["config_id", "roi_id", "match_tolerance_px", "true_positive", "f1"]
+    pd.testing.assert_frame_equal(serial["all_frame"][columns], parallel["all_frame"][columns])
+    assert len(parallel["store_path"].read_text(encoding="utf-8").splitlines()) == 18
+
+    calls: list[str] = []
+
+    def counting_runner(runtime, image, source_path, meta):
+        calls.append(source_path)
+        return _fake_runtime_runner(runtime, image, source_path, meta)
+
+    resumed = run_benchmark_suite(
+        roi_manifest=manifest,
+        config_manifest=config_manifest,
+        output_dir=tmp_path / "parallel",
+        runtime_builder=_fake_runtime_builder,
+        runtime_runner=counting_runner,
+        max_workers=4,
+    )
+
+    assert calls == []
+    assert resumed["best_payload"]["config_id"] == parallel["best_payload"]["config_id"]
+    assert len(resumed["primary_frame"]) == 18
@@ -1,3 +1,4 @@
+import re
 from types import SimpleNamespace
 from pathlib import Path
 
@@ -6,7 +7,7 @@ import pandas as pd
 import tifffile
 
 from main import _run_manifest_contexts
-from src.run_service import RuntimeOptions, build_runtime, export_context, run_array, run_one_image
+from src.run_service import ArtifactExporter, RuntimeOptions, build_runtime, export_context, iter_run_array, run_array, run_one_image
 
 
 class FakeSegmenter:
@@ -47,6 +48,28 @@ def test_run_service_exports_single_image_bundle(tmp_path: Path):
     assert results.loc[0, "model_source"] == "builtin"
 
 
+def test_iter_run_array_yields_each_stage_and_returns_context():
+    image = np.zeros((16, 16), dtype=np.uint16)
+    labels = np.zeros((16, 16), dtype=np.uint16)
+    labels[2:5, 2:5] = 1
+    labels[10:14, 9:13] = 2
+    runtime = build_runtime(RuntimeOptions(backend="fake", focus_mode="none"), segmenter_override=FakeSegmenter(labels))
+
+    stages = iter_run_array(runtime, image=image, source_path="sample.tif", meta={"reader": "test"})
+    progress = []
+    while True:
+        try:
+            progress.append(next(stages))
+        except StopIteration as finished:
+            ctx = finished.value
+            break
+
+    assert [item.stage for item in progress] == [stage.name for stage in runtime.pipeline.stages]
+    assert progress[-1].index + 1 == progress[-1].total
+    assert ctx.summary_row["modality"] == "flatmount"
+    assert ctx.summary_row["cell_count"] == run_array(runtime, image=image, source_path="sample.tif").summary_row["cell_count"]
+
+
 def test_run_service_exports_retina_registration_artifacts(tmp_path: Path):
     image = np.zeros((16, 16), dtype=np.uint16)
     labels = np.zeros((16, 16), dtype=np.uint16)
@@ -150,6 +173,49 @@ def test_run_service_exports_rigorous_spatial_artifacts(tmp_path: Path):
     assert "spatial_analysis" in provenance
 
 
+def test_export_context_parallel_and_background_match_serial_export(tmp_path: Path):
+    image = np.zeros((64, 64), dtype=np.uint16)
+    image[4:60, 4:60] = 200
+    labels = np.zeros((64, 64), dtype=np.uint16)
+    for index, (y, x) in enumerate([(10, 10), (10, 40), (40, 10), (40, 40), (25, 25), (50, 28)], start=1):
+        labels[y : y + 6, x : x + 6] = index
+
+    runtime = build_runtime(
+        RuntimeOptions(
+            backend="fake",
+            focus_mode="none",
+            spatial_stats=True,
+            spatial_mode="rigorous",
+            spatial_envelope_sims=4,
+            register_retina=True,
+            onh_mode="cli",
+            onh_xy=(32.0, 32.0),
+            dorsal_xy=(32.0, 4.0),
+            write_html_report=True,
+            write_provenance=True,
+        ),
+        segmenter_override=FakeSegmenter(labels),
+    )
+
+    serial_ctx = run_array(runtime, image=image, source_path="export.tif", meta={"reader": "test"})
+    serial = export_context(runtime, serial_ctx, tmp_path / "serial_export")
+    parallel_ctx = run_array(runtime, image=image, source_path="export.tif", meta={"reader": "test"})
+    parallel = export_context(runtime, parallel_ctx, tmp_path / "parallel_export", max_workers=4)
+    with ArtifactExporter(export_workers=4) as exporter:
+        background_ctx = run_array(runtime, image=image, source_path="export.tif", meta={"reader": "test"})
+        background = exporter.submit(runtime, background_ctx, tmp_path / "background_export").result()
+
+    def strip_timestamps(text: str) -> str:
+        return re.sub(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}", "", text)
+
+    assert list(serial) == list(parallel) == list(background)
+    for artifacts, root in [(parallel, "parallel_export"), (background, "background_export")]:
+        assert all(path.exists() for path in artifacts.values())
+        report = artifacts["html_report"].read_text(encoding="utf-8").replace(root, "serial_export")
+        assert strip_timestamps(report) == strip_timestamps(serial["html_report"].read_text(encoding="utf-8"))
+    assert serial_ctx.warnings == parallel_ctx.warnings == background_ctx.warnings
+
+
 def test_run_service_exports_atlas_subtype_artifacts(tmp_path: Path):
     image = np.zeros((32, 32, 2), dtype=np.uint8)
     image[4:10, 4:10, 0] = 220
@@ -229,6 +295,94 @@ subtypes:
     assert "atlas_subtypes" in provenance
 
 
+def test_run_manifest_contexts_reuses_stored_samples_and_runs_new_ones(tmp_path: Path):
+    from src.cohort import build_sample_table, build_study_region_table
+    from src.study_store import SampleResultStore
+
+    labels = np.zeros((32, 32), dtype=np.uint16)
+    labels[4:10, 4:10] = 1
+    labels[18:24, 18:24] = 2
+    calls: list[int] = []
+
+    class CountingSegmenter(FakeSegmenter):
+        def segment(self, image: np.ndarray):
+            calls.append(1)
+            return super().segment(image)
+
+    runtime = build_runtime(
+        RuntimeOptions(backend="fake", focus_mode="none", write_html_report=False, write_provenance=False, save_debug=False),
+        segmenter_override=CountingSegmenter(labels),
+    )
+    rows = []
+    for index in range(3):
+        image_path = tmp_path / f"sample_{index}.tif"
+        tifffile.imwrite(image_path, np.full((32, 32), index, dtype=np.uint16))
+        rows.append({"sample_id": f"S{index}", "path": str(image_path), "modality": "flatmount", "condition": "c"})
+    args = SimpleNamespace(register_retina=False, retina_frame_path=None, modality="flatmount")
+
+    def run(manifest: pd.DataFrame):
+        contexts, _, _, _ = _run_manifest_contexts(
+            args=args,
+            manifest_df=manifest,
+            runtime=runtime,
+            pipeline_cfg=runtime.pipeline_cfg,
+            output_root=None,
+            write_artifacts=False,
+            sample_store=SampleResultStore(tmp_path / "sample_store"),
+        )
+        return contexts
+
+    first = run(pd.DataFrame(rows[:2]))
+    assert len(calls) == 2
+    tifffile.imwrite(rows[1]["path"], np.full((32, 32), 9, dtype=np.uint16))
+    extended = pd.DataFrame(rows)
+    second = run(extended)
+
+    assert len(calls) == 4
+    pd.testing.assert_frame_equal(
+        build_sample_table(extended.iloc[:1], second[:1]),
+        build_sample_table(extended.iloc[:1], first[:1]),
+    )
+    pd.testing.assert_frame_equal(second[0].object_table, first[0].object_table)
+    pd.testing.assert_frame_equal(
+        build_study_region_table(extended.iloc[:1], second[:1]),
+        build_study_region_table(extended.iloc[:1], first[:1]),
+    )
+
+
+def test_run_manifest_contexts_recomputes_samples_when_an_edit_log_appears(tmp_path: Path):
+    from src.edits import default_edit_log_path, save_edit_log
+    from src.study_store import SampleResultStore
+
+    labels = np.zeros((32, 32), dtype=np.uint16)
+    labels[4:10, 4:10] = 1
+    labels[18:24, 18:24] = 2
+    runtime = build_runtime(
+        RuntimeOptions(backend="fake", focus_mode="none", write_html_report=False, write_provenance=False, save_debug=False),
+        segmenter_override=FakeSegmenter(labels),
+    )
+    image_path = tmp_path / "sample.tif"
+    tifffile.imwrite(image_path, np.zeros((32, 32), dtype=np.uint16))
+    manifest = pd.DataFrame([{"sample_id": "S0", "path": str(image_path), "modality": "flatmount"}])
+    args = SimpleNamespace(register_retina=False, retina_frame_path=None, modality="flatmount")
+
+    def cell_count() -> int:
+        contexts, _, _, _ = _run_manifest_contexts(
+            args=args,
+            manifest_df=manifest,
+            runtime=runtime,
+            pipeline_cfg=runtime.pipeline_cfg,
+            output_root=None,
+            write_artifacts=False,
+            sample_store=SampleResultStore(tmp_path / "sample_store"),
+        )
+        return int(contexts[0].metrics["cell_count"])
+
+    assert cell_count() == 2
+    save_edit_log({"edits": [{"op": "delete_object", "object_id": 1}]}, default_edit_log_path(image_path))
+    assert cell_count() == 1
+
+
 def test_run_one_image_matches_study_wrapper_for_same_input(tmp_path: Path):
     image_path = tmp_path / "sample.tif"
     image = np.zeros((32, 32), dtype=np.uint16)
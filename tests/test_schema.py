@@ -1,7 +1,14 @@
+import numpy as np
 import pandas as pd
 import pytest
 
-from src.schema import validate_object_table, validate_region_table, validate_study_table
+from src.schema import (
+    REGION_REQUIRED,
+    validate_object_table,
+    validate_parquet_schema,
+    validate_region_table,
+    validate_study_table,
+)
 
 
 def test_validate_object_table_adds_contract_columns_in_permissive_mode():
@@ -53,3 +60,47 @@ def test_validate_study_table_strict_raises_on_missing_required_columns():
 
     with pytest.raises(ValueError):
         validate_study_table(frame, strict=True)
+
+
+def test_validate_object_table_reuses_matching_columns_and_leaves_input_untouched():
+    frame = pd.DataFrame(
+        {
+            "image_id": pd.Series(["a", "b"], dtype="string"),
+            "object_id": [1, 2],
+            "centroid_x_px": [1.0, 2.0],
+            "centroid_y_px": [3.0, 4.0],
+            "area_px": [10, 12],
+            "kept": [True, False],
+        }
+    )
+    columns_before = list(frame.columns)
+
+    out = validate_object_table(frame)
+
+    assert list(frame.columns) == columns_before
+    assert frame["kept"].dtype == bool
+    assert np.shares_memory(out["centroid_x_px"].to_numpy(), frame["centroid_x_px"].to_numpy())
+    assert str(out["kept"].dtype) == "boolean"
+    assert str(out["phenotype"].dtype) == "string"
+    assert not np.shares_memory(
+        validate_object_table(frame, copy=True)["centroid_x_px"].to_numpy(), frame["centroid_x_px"].to_numpy()
+    )
+
+
+def test_validate_parquet_schema_reads_no_rows(tmp_path):
+    pytest.importorskip("pyarrow")
+    frame = validate_region_table(
+        pd.DataFrame(
+            [{"image_id": "x", "region_schema": "s", "region_axis": "ring", "region_label": "c", "area_mm2": 0.1, "object_count": 2, "density_cells_per_mm2": 20.0}]
+        )
+    )
+    path = tmp_path / "regions.parquet"
+    frame.to_parquet(path, index=False)
+    frame.drop(columns=["area_mm2"]).assign(object_count=1.5).to_parquet(tmp_path / "broken.parquet", index=False)
+
+    assert validate_parquet_schema(path, required=REGION_REQUIRED, table_kind="region") == {}
+    problems = validate_parquet_schema(tmp_path / "broken.parquet", required=REGION_REQUIRED, table_kind="region")
+    assert problems["area_mm2"] == "missing"
+    assert problems["object_count"].startswith("expected int64")
+    with pytest.raises(ValueError):
+        validate_parquet_schema(tmp_path / "broken.parquet", required=REGION_REQUIRED, table_kind="region", strict=True)
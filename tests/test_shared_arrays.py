@@ -0,0 +1,83 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pytest
+
+from src.shared_arrays import SharedArrayRegistry, attach_shared_array, detach_shared_array
+
+
+def _worker_summary(handle):
+    view = attach_shared_array(handle)
+    try:
+        return int(view.sum()), int(view.max()), bool(view.flags.writeable)
+    finally:
+        del view
+        detach_shared_array(handle)
+
+
+def test_published_array_is_attached_zero_copy_in_worker_processes():
+    gray = np.arange(64 * 48, dtype=np.uint16).reshape(64, 48)
+
+    with SharedArrayRegistry() as registry:
+        handle = registry.publish(gray)
+        assert registry.publish(gray) == handle
+        assert len(registry) == 1
+
+        with ProcessPoolExecutor(max_workers=2, mp_context=get_context("spawn")) as executor:
+            results = list(executor.map(_worker_summary, [handle, handle]))
+
+        assert results == [(int(gray.sum()), int(gray.max()), False)] * 2
+        view = attach_shared_array(handle)
+        np.testing.assert_array_equal(view, gray)
+        del view
+        detach_shared_array(handle)
+
+        registry.release(handle)
+        assert len(registry) == 1
+        registry.release(handle)
+        assert len(registry) == 0
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=handle.name)
+
+
+def test_concurrent_publishes_share_one_tracked_block(monkeypatch):
+    import threading
+
+    from src import shared_arrays
+
+    created = []
+    real_shared_memory = shared_arrays.shared_memory.SharedMemory
+
+    class CheckedSharedMemory(real_shared_memory):
+        def __init__(self, *args, create=False, **kwargs):
+            if create:
+                # The tracker hook is only swapped while _TRACKER_LOCK is held.
+                assert shared_arrays._TRACKER_LOCK.locked()
+                created.append(True)
+            super().__init__(*args, create=create, **kwargs)
+
+    monkeypatch.setattr(shared_arrays.shared_memory, "SharedMemory", CheckedSharedMemory)
+    array = np.ones((256, 256), dtype=np.float32)
+    barrier = threading.Barrier(8)
+    handles = []
+
+    def publish(registry):
+        barrier.wait()
+        handles.append(registry.publish(array))
+
+    with SharedArrayRegistry() as registry:
+        threads = [threading.Thread(target=publish, args=(registry,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(created) == 1 and len(registry) == 1
+        assert len(set(handles)) == 1
+        for handle in handles[:-1]:
+            registry.release(handle)
+        assert len(registry) == 1
+        registry.release(handles[-1])
+        assert len(registry) == 0
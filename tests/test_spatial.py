@@ -6,15 +6,21 @@ from shapely.geometry import Polygon
 from src.regions import assign_regions
 from src.retina_coords import register_cells, register_focus_mask_pixels, retina_frame_from_points
 from src.spatial import (
+    image_density_grid,
+    isodensity_map,
+    registered_density_grid,
+    DomainGeometry,
     choose_valid_radii_px,
     compute_csr_envelopes,
     compute_rigorous_spatial_bundle,
     exact_voronoi_clip_area,
+    exact_voronoi_clipped_areas,
     centroids_from_masks,
     nn_regularity_index,
     ripley_k,
     voronoi_regulariry_index,
 )
+from scipy.ndimage import distance_transform_edt
 
 
 def _grid_points() -> np.ndarray:
@@ -84,6 +90,23 @@ def test_exact_voronoi_clip_area_uses_exact_domain_intersection():
     assert wedge_area == pytest.approx(50.0)
 
 
+def test_exact_voronoi_clipped_areas_matches_per_cell_intersection():
+    from scipy.spatial import Voronoi
+
+    from src.spatial import _voronoi_finite_polygons_2d
+
+    points = np.random.default_rng(4).uniform(0.0, 100.0, size=(200, 2))
+    domain = Polygon([(10.0, 10.0), (90.0, 10.0), (90.0, 90.0), (50.0, 40.0), (10.0, 90.0)])
+    regions, vertices = _voronoi_finite_polygons_2d(Voronoi(points[:, ::-1]))
+    expected = [Polygon(vertices[region]).intersection(domain).area for region in regions]
+    expected = np.asarray([area for area in expected if area > 0], dtype=float)
+
+    areas = exact_voronoi_clipped_areas(points, domain)
+
+    assert 0 < len(areas) < len(points)
+    np.testing.assert_allclose(areas, expected, rtol=1e-12)
+
+
 def test_compute_csr_envelopes_is_deterministic_for_fixed_seed():
     mask = np.ones((128, 128), dtype=bool)
     points = _grid_points()
@@ -290,3 +313,87 @@ def test_domain_status_not_ok_when_all_curves_nan():
     assert bool(global_row["spatial_curve_valid"]) is False
     assert int(global_row["n_finite_l"]) == 0
     assert int(global_row["n_finite_g"]) == 0
+
+
+def test_domain_geometry_matches_full_mask_distance_and_sampling():
+    tissue_mask = np.zeros((80, 96), dtype=bool)
+    tissue_mask[12:50, 20:70] = True
+    tissue_mask[30:44, 40:52] = False
+    tissue_mask[0:6, 0:10] = True
+    geometry = DomainGeometry.from_mask(tissue_mask)
+
+    ys, xs = np.mgrid[0:80, 0:96]
+    grid = np.column_stack((ys.ravel(), xs.ravel())).astype(float)
+    np.testing.assert_array_equal(geometry.full_mask(), tissue_mask)
+    np.testing.assert_array_equal(geometry.boundary_distances(grid), distance_transform_edt(tissue_mask).ravel())
+
+    mask_ys, mask_xs = np.where(tissue_mask)
+    take = np.random.default_rng(11).choice(len(mask_xs), size=40, replace=False)
+    expected = np.column_stack((mask_ys[take], mask_xs[take])).astype(float)
+    np.testing.assert_array_equal(geometry.sample_points(40, 11), expected)
+
+
+def test_compute_rigorous_bundle_parallel_matches_serial():
+    tissue_mask = np.ones((128, 128), dtype=bool)
+    frame = retina_frame_from_points(
+        onh_xy_px=(64.0, 64.0),
+        dorsal_xy_px=(64.0, 8.0),
+        um_per_px=1.0,
+        source="cli",
+    )
+    tissue_pixels = register_focus_mask_pixels(tissue_mask, frame)
+    points = np.random.default_rng(3).uniform(6.0, 122.0, size=(60, 2))
+    kwargs = dict(
+        image_id="sample",
+        object_table=_object_table_from_points(points),
+        image_shape=tissue_mask.shape,
+        tissue_mask=tissue_mask,
+        um_per_px=1.0,
+        registered_tissue_pixels=tissue_pixels,
+        schema_name="mouse_flatmount_v1",
+        max_ecc_um=float(tissue_pixels["ecc_um"].max()),
+        radii_px=[4.0, 8.0],
+        simulation_count=6,
+        base_seed=9,
+    )
+
+    serial = compute_rigorous_spatial_bundle(**kwargs)
+    parallel = compute_rigorous_spatial_bundle(**kwargs, max_workers=4)
+
+    assert len(serial["summary"]) > 1
+    pd.testing.assert_frame_equal(serial["summary"], parallel["summary"])
+    pd.testing.assert_frame_equal(serial["curves"], parallel["curves"])
+
+
+def test_isodensity_map_matches_full_resolution_blur():
+    from scipy.ndimage import gaussian_filter
+
+    rng = np.random.default_rng(3)
+    shape = (400, 300)
+    centroids = rng.random((200, 2)) * np.array(shape)
+    splat = np.zeros(shape, dtype=np.float32)
+    np.add.at(splat, (np.round(centroids[:, 0]).astype(int).clip(0, shape[0] - 1), np.round(centroids[:, 1]).astype(int).clip(0, shape[1] - 1)), 1.0)
+    reference = gaussian_filter(splat, sigma=20.0)
+
+    dense = isodensity_map(centroids, shape, sigma_px=20.0)
+    grid = image_density_grid(centroids, shape, sigma_px=20.0)
+
+    assert dense.shape == shape
+    assert grid.values.shape == (80, 60)
+    assert np.abs(dense - reference).max() < 0.02 * reference.max()
+    assert grid.render((40, 30)).shape == (40, 30)
+
+
+def test_registered_density_grid_integrates_to_every_object_row():
+    table = pd.DataFrame(
+        {
+            "ret_x_um": [-100.0, 0.0, 50.0, 300.0],
+            "ret_y_um": [20.0, -40.0, 10.0, 80.0],
+            "kept": [True, True, True, False],
+        }
+    )
+
+    grid = registered_density_grid(table, sigma_um=30.0)
+
+    assert grid.values.sum() * grid.cell_size**2 == pytest.approx(4.0, rel=1e-3)
+
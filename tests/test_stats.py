@@ -114,6 +114,41 @@ def test_run_study_statistics_mixed_outputs_region_coefficients():
     assert set(out.region_mixed["analysis_level"]) == {"region"}
 
 
+def test_run_study_statistics_parallel_and_raced_fits_match_serial():
+    rows = []
+    regions = [("central", 100.0), ("peripheral", 80.0)]
+    for animal_index, animal in enumerate(["A1", "A2", "A3"]):
+        for eye, condition, shift in [("OD", "control", 0.0), ("OS", "treated", -25.0)]:
+            sample_id = f"{animal}_{eye}"
+            for label, base in regions:
+                rows.append(
+                    {
+                        "sample_id": sample_id,
+                        "animal_id": animal,
+                        "eye": eye,
+                        "condition": condition,
+                        "timepoint_dpi": 7,
+                        "region_axis": "ring",
+                        "region_label": label,
+                        "density_cells_per_mm2": base + shift + 3.0 * animal_index - (4.0 if label == "peripheral" and shift else 0.0),
+                    }
+                )
+    region_table = pd.DataFrame(rows)
+    sample_table = (
+        region_table.groupby(["sample_id", "animal_id", "eye", "condition", "timepoint_dpi"], as_index=False)["density_cells_per_mm2"]
+        .sum()
+        .rename(columns={"density_cells_per_mm2": "cell_count"})
+    )
+
+    serial = run_study_statistics(sample_table, region_table, requested_mode="auto")
+    parallel = run_study_statistics(sample_table, region_table, requested_mode="auto", max_workers=2, race_optimizers=True)
+
+    assert serial.decision == parallel.decision
+    pd.testing.assert_frame_equal(serial.study_stats, parallel.study_stats)
+    pd.testing.assert_frame_equal(serial.sample_mixed, parallel.sample_mixed, atol=1e-6)
+    pd.testing.assert_frame_equal(serial.region_mixed, parallel.region_mixed, atol=1e-6)
+
+
 def test_run_study_statistics_auto_falls_back_to_simple_when_mixed_fails():
     sample_table = pd.DataFrame(
         [
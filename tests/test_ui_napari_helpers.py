@@ -3,6 +3,7 @@ import pytest
 
 from src.ui_napari.helpers import (
     format_xy_text,
+    incremental_layer_payload,
     landmarks_from_points,
     parse_optional_float,
     parse_optional_int,
@@ -33,3 +34,24 @@ def test_landmarks_from_points_uses_yx_input_order():
 def test_landmarks_from_points_requires_two_points():
     with pytest.raises(ValueError):
         landmarks_from_points(np.array([[5.0, 10.0]]))
+
+
+def test_incremental_layer_payload_sends_each_layer_once():
+    import pandas as pd
+    from types import SimpleNamespace
+
+    labels = np.zeros((4, 4), dtype=np.uint16)
+    labels[1:3, 1:3] = 1
+    ctx = SimpleNamespace(labels=labels, object_table=None)
+    shown: set[str] = set()
+
+    first = incremental_layer_payload(ctx, shown)
+    labels[0, 0] = 9
+    ctx.object_table = pd.DataFrame({"centroid_y_px": [1.5], "centroid_x_px": [1.5], "object_id": [1]})
+    second = incremental_layer_payload(ctx, shown)
+
+    assert set(first) == {"labels"}
+    assert first["labels"][0, 0] == 0
+    assert set(second) == {"points", "features"}
+    assert second["points"].tolist() == [[1.5, 1.5]]
+    assert incremental_layer_payload(ctx, shown) == {}
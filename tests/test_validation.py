@@ -10,6 +10,7 @@ from src.validation import (
     build_validation_table,
     match_points,
     point_matching_metrics,
+    point_matching_sweep,
     summarize_roi_benchmark,
     summarize_validation,
     validate_roi_benchmark_manifest,
@@ -215,3 +216,40 @@ def test_validate_roi_benchmark_manifest_preserves_optional_provenance_columns()
 
     assert "image_source_channel" in validated.columns
     assert "truth_source_channel" in validated.columns
+
+
+def test_point_matching_sweep_matches_per_tolerance_metrics():
+    rng = np.random.default_rng(7)
+    manual = rng.uniform(0, 400, size=(150, 2))
+    predicted = np.vstack([manual[:120] + rng.normal(0, 3.0, size=(120, 2)), rng.uniform(0, 400, size=(20, 2))])
+    tolerances = (6.0, 8.0, 10.0)
+
+    sweep = point_matching_sweep(manual, predicted, tolerances_px=tolerances)
+
+    assert sweep["match_tolerance_px"].tolist() == list(tolerances)
+    for row in sweep.to_dict("records"):
+        expected = point_matching_metrics(manual, predicted, tolerance_px=row["match_tolerance_px"])
+        for key in ["true_positive", "false_positive", "false_negative", "precision", "recall", "f1", "count_mae"]:
+            assert row[key] == pytest.approx(expected[key])
+        assert row["mean_match_distance_px"] == pytest.approx(expected["mean_match_distance_px"])
+
+
+def test_point_matching_sweep_resolves_shrinking_components():
+    manual = np.asarray([[0.0, 0.0], [0.0, 9.0]], dtype=float)
+    predicted = np.asarray([[0.0, 4.0], [0.0, 13.5]], dtype=float)
+
+    sweep = point_matching_sweep(manual, predicted, tolerances_px=(10.0, 5.0, 4.0)).set_index("match_tolerance_px")
+
+    assert sweep.loc[10.0, "true_positive"] == 2
+    assert sweep.loc[10.0, "mean_match_distance_px"] == pytest.approx(4.25)
+    assert sweep.loc[5.0, "true_positive"] == 2
+    assert sweep.loc[4.0, "true_positive"] == 1
+    assert sweep.loc[4.0, "mean_match_distance_px"] == pytest.approx(4.0)
+
+
+def test_point_matching_sweep_handles_empty_inputs():
+    sweep = point_matching_sweep(np.empty((0, 2)), [[1.0, 1.0]], tolerances_px=(6.0, 8.0))
+
+    assert sweep["false_positive"].tolist() == [1.0, 1.0]
+    assert sweep["precision"].tolist() == [0.0, 0.0]
+    assert point_matching_sweep([], [], tolerances_px=(8.0,)).iloc[0]["f1"] == 1.0
@@ -0,0 +1,42 @@
+import numpy as np
+import cv2
+
+from src.visualize import create_debug_overlay, label_color_lut
+
+
+def _labels():
+    labels = np.zeros((60, 50), dtype=np.uint16)
+    labels[5:15, 5:15] = 3
+    labels[20:40, 10:30] = 7
+    labels[38:55, 28:45] = 12
+    return labels
+
+
+def test_debug_overlay_lut_matches_per_object_painting():
+    image = np.arange(60 * 50, dtype=np.uint16).reshape(60, 50)
+    labels = _labels()
+
+    disp = cv2.cvtColor((image / image.max() * 255).astype(np.uint8), cv2.COLOR_GRAY2RGB)
+    expected = disp.copy()
+    rng = np.random.RandomState(42)
+    for oid in (3, 7, 12):
+        expected[labels == oid] = rng.randint(0, 255, size=3)
+    expected = cv2.addWeighted(expected, 0.4, disp, 0.6, 0)
+
+    assert label_color_lut(labels).shape == (13, 3)
+    np.testing.assert_array_equal(create_debug_overlay(image, labels, alpha=0.4), expected)
+    np.testing.assert_array_equal(create_debug_overlay(image, labels, alpha=0.4, band_rows=7), expected)
+
+
+def test_debug_overlay_contours_and_preview_are_band_independent():
+    image = np.full((60, 50), 100, dtype=np.uint8)
+    labels = _labels()
+
+    contours = create_debug_overlay(image, labels, mode="contours")
+    banded = create_debug_overlay(image, labels, mode="contours", band_rows=9)
+    preview = create_debug_overlay(image, labels, max_side=20)
+
+    np.testing.assert_array_equal(contours, banded)
+    assert np.array_equal(contours[10, 10], [100, 100, 100])
+    assert not np.array_equal(contours[5, 10], [100, 100, 100])
+    assert preview.shape == (20, 17, 3)